@@ -0,0 +1,161 @@
+# Caching
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+# Every cached value belongs to a namespace (`taxonomy`, `fragments`, ...),
+# which defines its key prefix and its default timeout in
+# `settings.CACHE_NAMESPACE_TIMEOUTS`. Hits and misses are counted per
+# namespace so the effectiveness of the shared cache can be observed.
+
+import threading
+from collections import Counter
+from typing import Callable, TypeVar, final
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from eiger.instrumentation import get_request_metrics
+
+_ValueT = TypeVar('_ValueT')
+
+_MISSING = object()
+
+
+@final
+class CacheStats(object):
+    """Thread-safe hit and miss counters of this process, per namespace."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Counter[tuple[str, str]] = Counter()
+
+    def record(self, namespace: str, *, hit: bool, count: int = 1) -> None:
+        with self._lock:
+            self._counters[(namespace, 'hits' if hit else 'misses')] += count
+        metrics = get_request_metrics()
+        if metrics is not None:
+            metrics.record_cache_access(hit=hit, count=count)
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            counters = dict(self._counters)
+        namespaces = {namespace for namespace, _ in counters}
+        return {
+            namespace: {
+                'hits': counters.get((namespace, 'hits'), 0),
+                'misses': counters.get((namespace, 'misses'), 0),
+            }
+            for namespace in sorted(namespaces)
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+cache_stats = CacheStats()
+
+
+@final
+class NamespacedCache(object):
+    """
+    Thin wrapper around a cache alias scoped to a namespace.
+
+    Keys are prefixed with the namespace, so the same key can be reused
+    across features, and the timeout defaults to the namespace one.
+    """
+
+    def __init__(self, namespace: str, alias: str = 'default') -> None:
+        self.namespace = namespace
+        self.alias = alias
+
+    @property
+    def backend(self) -> BaseCache:
+        return caches[self.alias]
+
+    @property
+    def is_shared(self) -> bool:
+        """Whether the values are seen by the other processes."""
+        return not isinstance(self.backend, (LocMemCache, DummyCache))
+
+    @property
+    def timeout(self) -> int | None:
+        return settings.CACHE_NAMESPACE_TIMEOUTS.get(
+            self.namespace, self.backend.default_timeout
+        )
+
+    def make_key(self, key: str) -> str:
+        return f'{self.namespace}:{key}'
+
+    def _timeout(self, timeout: float | None | object) -> float | None:
+        return (
+            self.timeout
+            if timeout is DEFAULT_TIMEOUT
+            else timeout  # type: ignore[return-value]
+        )
+
+    def get(self, key: str, default: _ValueT | None = None) -> _ValueT | None:
+        value = self.backend.get(self.make_key(key), _MISSING)
+        cache_stats.record(self.namespace, hit=value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def get_many(self, keys: list[str]) -> dict[str, object]:
+        values = self.backend.get_many([self.make_key(key) for key in keys])
+        prefix_length = len(self.namespace) + 1
+        cache_stats.record(self.namespace, hit=True, count=len(values))
+        cache_stats.record(
+            self.namespace, hit=False, count=len(keys) - len(values)
+        )
+        return {key[prefix_length:]: value for key, value in values.items()}
+
+    def get_or_set(
+        self,
+        key: str,
+        default: Callable[[], _ValueT],
+        timeout: float | None | object = DEFAULT_TIMEOUT,
+    ) -> _ValueT:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = default()
+            self.set(key, value, timeout)
+        return value  # type: ignore[return-value]
+
+    def set(
+        self,
+        key: str,
+        value: object,
+        timeout: float | None | object = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.backend.set(self.make_key(key), value, self._timeout(timeout))
+
+    def set_many(
+        self,
+        data: dict[str, object],
+        timeout: float | None | object = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.backend.set_many(
+            {self.make_key(key): value for key, value in data.items()},
+            self._timeout(timeout),
+        )
+
+    def add(
+        self,
+        key: str,
+        value: object,
+        timeout: float | None | object = DEFAULT_TIMEOUT,
+    ) -> bool:
+        return self.backend.add(
+            self.make_key(key), value, self._timeout(timeout)
+        )
+
+    def delete(self, key: str) -> bool:
+        return self.backend.delete(self.make_key(key))
+
+    def delete_many(self, keys: list[str]) -> None:
+        self.backend.delete_many([self.make_key(key) for key in keys])
+
+
+def get_cache(namespace: str, alias: str = 'default') -> NamespacedCache:
+    return NamespacedCache(namespace=namespace, alias=alias)
@@ -0,0 +1,241 @@
+# Instrumentation
+# https://docs.djangoproject.com/en/4.2/topics/db/instrumentation/
+
+# `RequestMetricsMiddleware` measures, per request, the SQL queries and the
+# time spent running them, the cache hits and misses of `eiger.caching` and
+# the template render time. The measures are bound to the structlog context
+# of the request, sent in the `Server-Timing` header and checked against the
+# query budget of the resolved view, which catches N+1 regressions.
+# They are also recorded by `eiger.metrics`, which exposes them on `/metrics`.
+#
+# The connections are thread-local, and under ASGI the ORM calls of a request
+# run in other threads than its middleware, through `sync_to_async`. So the
+# queries are recorded by a wrapper installed on every connection when it is
+# opened, which finds the metrics of the request in its context, copied into
+# those threads by `sync_to_async`:
+#
+#   QUERY_BUDGETS = {'home': 10}
+#   QUERY_BUDGET_ACTION = 'raise'  # or 'log'
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterator, final
+
+import structlog
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends.django import DjangoTemplates
+
+from eiger.metrics import observe_request
+
+if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from django.http import HttpRequest, HttpResponse
+
+UNRESOLVED_VIEW_NAME = 'unresolved'
+
+logger = structlog.get_logger()
+
+_request_metrics: ContextVar['RequestMetrics | None'] = ContextVar(
+    'request_metrics', default=None
+)
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a view runs more queries than its budget."""
+
+
+@dataclass
+class RequestMetrics(object):
+    queries: int = 0
+    db_seconds: float = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    template_seconds: float = 0
+
+    def record_cache_access(self, *, hit: bool, count: int = 1) -> None:
+        if hit:
+            self.cache_hits += count
+        else:
+            self.cache_misses += count
+
+    def __call__(self, execute, sql, params, many, context):  # type: ignore
+        """Time the queries, as a database execute wrapper."""
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started_at
+            self.queries += 1
+
+
+def get_request_metrics() -> RequestMetrics | None:
+    """Return the metrics of the request being handled, if any."""
+    return _request_metrics.get()
+
+
+def record_query(execute, sql, params, many, context):  # type: ignore
+    """Time the query in the metrics of the request being handled, if any."""
+    metrics = _request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_recorder(
+    sender: object, connection: 'BaseDatabaseWrapper', **kwargs
+) -> None:
+    # The wrappers outlive the reconnections of the connection:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def get_query_budget(view_name: str) -> int | None:
+    return settings.QUERY_BUDGETS.get(view_name, settings.QUERY_BUDGET_DEFAULT)
+
+
+def format_server_timing(metrics: RequestMetrics, total_seconds: float) -> str:
+    return ', '.join(
+        (
+            f'db;dur={metrics.db_seconds * 1000:.2f};desc="{metrics.queries}'
+            ' queries"',
+            f'cache;desc="{metrics.cache_hits} hits, {metrics.cache_misses}'
+            ' misses"',
+            f'template;dur={metrics.template_seconds * 1000:.2f}',
+            f'total;dur={total_seconds * 1000:.2f}',
+        )
+    )
+
+
+@final
+class RequestMetricsMiddleware(object):
+    """Measure the requests and enforce the query budgets of the views."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: 'Callable[[HttpRequest], HttpResponse]',
+    ) -> None:
+        """Django's API-compatible constructor."""
+        self.get_response = get_response
+        self._is_async = iscoroutinefunction(get_response)
+        if self._is_async:
+            markcoroutinefunction(self)
+
+    def __call__(
+        self, request: 'HttpRequest'
+    ) -> 'HttpResponse | Awaitable[HttpResponse]':
+        if self._is_async:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        started_at = time.perf_counter()
+        with self._measure(metrics):
+            response = self.get_response(request)
+        return self._report(
+            request, response, metrics, time.perf_counter() - started_at
+        )
+
+    async def __acall__(self, request: 'HttpRequest') -> 'HttpResponse':
+        metrics = RequestMetrics()
+        started_at = time.perf_counter()
+        with self._measure(metrics):
+            response = await self.get_response(request)  # type: ignore[misc]
+        return self._report(
+            request, response, metrics, time.perf_counter() - started_at
+        )
+
+    @contextmanager
+    def _measure(self, metrics: RequestMetrics) -> Iterator[None]:
+        token = _request_metrics.set(metrics)
+        try:
+            yield
+        finally:
+            _request_metrics.reset(token)
+
+    def _report(
+        self,
+        request: 'HttpRequest',
+        response: 'HttpResponse',
+        metrics: RequestMetrics,
+        total_seconds: float,
+    ) -> 'HttpResponse':
+        view_name = (
+            request.resolver_match.view_name
+            if request.resolver_match
+            else UNRESOLVED_VIEW_NAME
+        )
+        structlog.contextvars.bind_contextvars(
+            view=view_name,
+            db_queries=metrics.queries,
+            db_time_ms=round(metrics.db_seconds * 1000, 2),
+            cache_hits=metrics.cache_hits,
+            cache_misses=metrics.cache_misses,
+            template_time_ms=round(metrics.template_seconds * 1000, 2),
+        )
+        response['Server-Timing'] = format_server_timing(
+            metrics, total_seconds
+        )
+        logger.info(
+            'Handled the request to %s with status %s.',
+            view_name,
+            response.status_code,
+        )
+        observe_request(
+            view_name,
+            request.method or '',
+            response.status_code,
+            total_seconds,
+            metrics,
+        )
+        self._check_query_budget(view_name, metrics)
+        return response
+
+    def _check_query_budget(
+        self, view_name: str, metrics: RequestMetrics
+    ) -> None:
+        budget = get_query_budget(view_name)
+        if budget is None or metrics.queries <= budget:
+            return
+        message = (
+            f'The view {view_name} ran {metrics.queries} queries, over its'
+            f' budget of {budget}.'
+        )
+        if settings.QUERY_BUDGET_ACTION == 'raise':
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class _TimedTemplate(object):
+    """Add the render time of the template to the request metrics."""
+
+    def __init__(self, template) -> None:  # type: ignore[no-untyped-def]
+        self._template = template
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._template, name)
+
+    def render(self, context=None, request=None) -> str:  # type: ignore
+        started_at = time.perf_counter()
+        try:
+            return self._template.render(context, request)
+        finally:
+            metrics = get_request_metrics()
+            if metrics is not None:
+                metrics.template_seconds += time.perf_counter() - started_at
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Django templates backend timing the rendered templates."""
+
+    def from_string(self, template_code: str) -> _TimedTemplate:
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name: str) -> _TimedTemplate:
+        return _TimedTemplate(super().get_template(template_name))
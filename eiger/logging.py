@@ -5,9 +5,10 @@
 # 'Do not log' by Nikita Sobolev (@sobolevn)
 # https://sobolevn.me/2020/03/do-not-log
 
-from typing import TYPE_CHECKING, Callable, final
+from typing import TYPE_CHECKING, Awaitable, Callable, final
 
 import structlog
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 
 if TYPE_CHECKING:
     from django.http import HttpRequest, HttpResponse
@@ -17,24 +18,40 @@ if TYPE_CHECKING:
 class LoggingContextVarsMiddleware(object):
     """Used to reset ContextVars in structlog on each request."""
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(
         self,
         get_response: 'Callable[[HttpRequest], HttpResponse]',
     ) -> None:
         """Django's API-compatible constructor."""
         self.get_response = get_response
+        # Served by an ASGI worker, the whole chain is awaited:
+        self._is_async = iscoroutinefunction(get_response)
+        if self._is_async:
+            markcoroutinefunction(self)
 
-    def __call__(self, request: 'HttpRequest') -> 'HttpResponse':
+    def __call__(
+        self, request: 'HttpRequest'
+    ) -> 'HttpResponse | Awaitable[HttpResponse]':
         """
         Handle requests.
 
         Add your logging metadata here.
         Example: https://github.com/jrobichaud/django-structlog
         """
+        if self._is_async:
+            return self.__acall__(request)
         response = self.get_response(request)
         structlog.contextvars.clear_contextvars()
         return response
 
+    async def __acall__(self, request: 'HttpRequest') -> 'HttpResponse':
+        response = await self.get_response(request)  # type: ignore[misc]
+        structlog.contextvars.clear_contextvars()
+        return response
+
 
 if not structlog.is_configured():
     structlog.configure(
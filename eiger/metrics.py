@@ -0,0 +1,226 @@
+# Metrics
+# https://prometheus.github.io/client_python/multiprocess/
+
+# Requests are counted and timed per URL name by `RequestMetricsMiddleware`
+# and exposed, in the Prometheus text format, on `/metrics`.
+# Gunicorn runs several worker processes, each with its own metrics, so when
+# `PROMETHEUS_MULTIPROC_DIR` is set (to a directory in `/dev/shm`, see
+# `scripts/gunicorn.sh`) every process writes its values to memory-mapped
+# files there, and the endpoint aggregates the files of all the workers.
+# The connections opened by the processes are counted as well, and every
+# scrape reads the connections held on the database server, which tells
+# whether the workers, or PgBouncer in front of them, stay within the
+# server `max_connections`.
+# The endpoint is served by the workers themselves, which may be reachable
+# without the proxy, and every scrape queries the database, so it requires
+# the `METRICS_TOKEN` as a bearer token.
+
+import os
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Iterator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.db.models import Sum
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from django.http import HttpRequest
+
+    from eiger.instrumentation import RequestMetrics
+
+MULTIPROCESS_DIR_VARIABLE = 'PROMETHEUS_MULTIPROC_DIR'
+
+# Most views answer within tens of milliseconds, exports take seconds:
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+)
+
+REQUESTS = Counter(
+    'eiger_requests',
+    'Requests handled, by URL name, method and status code.',
+    ['view', 'method', 'status'],
+)
+REQUEST_LATENCY = Histogram(
+    'eiger_request_duration_seconds',
+    'Time spent handling the requests, by URL name.',
+    ['view', 'method'],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Counter(
+    'eiger_db_queries',
+    'SQL queries run by the requests, by URL name.',
+    ['view'],
+)
+DB_QUERY_TIME = Histogram(
+    'eiger_db_query_duration_seconds',
+    'Time spent running the SQL queries of a request, by URL name.',
+    ['view'],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_ACCESSES = Counter(
+    'eiger_cache_accesses',
+    'Cache reads of the requests, by URL name and result (hit or miss).',
+    ['view', 'result'],
+)
+DB_CONNECTIONS_OPENED = Counter(
+    'eiger_db_connections_opened',
+    'Database connections opened by the processes, by database alias.',
+    ['alias'],
+)
+
+
+def observe_request(
+    view_name: str,
+    method: str,
+    status: int,
+    seconds: float,
+    metrics: 'RequestMetrics',
+) -> None:
+    REQUESTS.labels(view_name, method, str(status)).inc()
+    REQUEST_LATENCY.labels(view_name, method).observe(seconds)
+    DB_QUERIES.labels(view_name).inc(metrics.queries)
+    DB_QUERY_TIME.labels(view_name).observe(metrics.db_seconds)
+    CACHE_ACCESSES.labels(view_name, 'hit').inc(metrics.cache_hits)
+    CACHE_ACCESSES.labels(view_name, 'miss').inc(metrics.cache_misses)
+
+
+@receiver(connection_created)
+def observe_connection_created(
+    sender: object, connection: 'BaseDatabaseWrapper', **kwargs
+) -> None:
+    DB_CONNECTIONS_OPENED.labels(connection.alias).inc()
+
+
+def get_server_connections() -> dict[str, int]:
+    """
+    Count the client connections to the database, by state, and its limit.
+
+    Behind PgBouncer these are the server connections of its pools, which
+    are shared by the connections of the workers to PgBouncer.
+    """
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT coalesce(state, 'unknown'), count(*)
+            FROM pg_stat_activity
+            WHERE datname = current_database()
+                AND backend_type = 'client backend'
+            GROUP BY 1
+            """
+        )
+        counts = dict(cursor.fetchall())
+        cursor.execute("SELECT current_setting('max_connections')::int")
+        counts['max'] = cursor.fetchone()[0]
+    return counts
+
+
+class ReviewQueueCollector(Collector):
+    """Read the number of entries waiting for a review on every scrape."""
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        # Imported here, the metrics are loaded before the apps are ready:
+        from eiger.trainers.models import PendingReviewCounter  # noqa: WPS433
+
+        totals = PendingReviewCounter.objects.aggregate(
+            exercise=Sum('pending_exercises'),
+            variation=Sum('pending_variations'),
+        )
+        gauge = GaugeMetricFamily(
+            'eiger_review_queue_depth',
+            'Entries waiting for a review, by kind.',
+            labels=['kind'],
+        )
+        for kind, total in totals.items():
+            gauge.add_metric([kind], total or 0)
+        yield gauge
+
+
+class ServerConnectionsCollector(Collector):
+    """Read the connections held on the database server on every scrape."""
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        counts = get_server_connections()
+        limit = counts.pop('max')
+        gauge = GaugeMetricFamily(
+            'eiger_db_server_connections',
+            'Client connections held on the database server, by state.',
+            labels=['state'],
+        )
+        for state, count in sorted(counts.items()):
+            gauge.add_metric([state], count)
+        yield gauge
+        yield GaugeMetricFamily(
+            'eiger_db_server_max_connections',
+            'The `max_connections` setting of the database server.',
+            value=limit,
+        )
+
+
+def build_registry(multiprocess_dir: str | None = None) -> CollectorRegistry:
+    """
+    Build the registry collected by the endpoint.
+
+    With a multiprocess directory, the metrics are read from the files of
+    every worker instead of from this process memory.
+    """
+    registry = CollectorRegistry()
+    if multiprocess_dir:
+        multiprocess.MultiProcessCollector(registry, path=multiprocess_dir)
+    else:
+        registry.register(_ProcessRegistryCollector())
+    registry.register(ReviewQueueCollector())
+    registry.register(ServerConnectionsCollector())
+    return registry
+
+
+class _ProcessRegistryCollector(Collector):
+    """Expose the metrics of the default registry of this process."""
+
+    def collect(self) -> Iterator[object]:
+        return REGISTRY.collect()
+
+
+@require_GET
+def metrics_view(request: 'HttpRequest') -> HttpResponse:
+    if not settings.METRICS_TOKEN:
+        raise Http404('The metrics are disabled.')
+    if not constant_time_compare(
+        request.headers.get('Authorization', ''),
+        f'Bearer {settings.METRICS_TOKEN}',
+    ):
+        return HttpResponse(
+            status=HTTPStatus.UNAUTHORIZED,
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
+    registry = build_registry(os.environ.get(MULTIPROCESS_DIR_VARIABLE))
+    return HttpResponse(
+        generate_latest(registry), content_type=CONTENT_TYPE_LATEST
+    )
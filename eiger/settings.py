@@ -14,7 +14,7 @@ from typing import Tuple
 
 import django_stubs_ext
 import structlog
-from decouple import AutoConfig, Csv
+from decouple import AutoConfig, Choices, Csv
 
 from eiger.trainers.apps import TrainersConfig
 
@@ -50,6 +50,7 @@ INSTALLED_APPS: Tuple[str, ...] = (
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # django-admin:
     'django.contrib.admindocs',
     'django.contrib.admin',
@@ -63,6 +64,7 @@ INSTALLED_APPS: Tuple[str, ...] = (
 MIDDLEWARE: Tuple[str, ...] = (
     # Logging:
     'eiger.logging.LoggingContextVarsMiddleware',
+    'eiger.instrumentation.RequestMetricsMiddleware',
     # Django
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -77,7 +79,7 @@ ROOT_URLCONF = 'eiger.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'eiger.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [BASE_DIR.joinpath('eiger', 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -86,6 +88,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'eiger.trainers.context_processors.pending_review_counter',
             ],
         },
     },
@@ -93,10 +96,40 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'eiger.wsgi.application'
 
+# Route the busiest views to their `eiger.trainers.async_views` versions,
+# enabled when gunicorn runs uvicorn workers with `eiger.asgi`:
+ASYNC_VIEWS = config('ASYNC_VIEWS', cast=bool, default=False)
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Every process keeps its connections for `CONN_MAX_AGE` seconds, so the
+# gunicorn workers of all the containers, plus the threads of the async
+# views and of the task workers, can exceed the server `max_connections`.
+# With `DATABASE_POOLER=pgbouncer`, `DJANGO_DATABASE_HOST` points to a
+# PgBouncer in transaction pooling mode instead, which shares a few server
+# connections between all of them. A server connection then only belongs
+# to a process for one transaction, so:
+# - Server-side cursors, which outlive the transaction of `.iterator()`
+#   without `atomic`, are disabled.
+# - The `statement_timeout` startup option is rejected by PgBouncer, set it
+#   on the role instead: `ALTER ROLE eiger SET statement_timeout = '15s'`.
+DATABASE_POOLER = config(
+    'DATABASE_POOLER',
+    cast=Choices(['direct', 'pgbouncer']),
+    default='direct',
+)
+_DATABASE_OPTIONS = {
+    'direct': {
+        'connect_timeout': 10,
+        'options': '-c statement_timeout=15000ms',
+    },
+    'pgbouncer': {
+        'connect_timeout': 10,
+    },
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -106,13 +139,204 @@ DATABASES = {
         'HOST': config('DJANGO_DATABASE_HOST'),
         'PORT': config('DJANGO_DATABASE_PORT', cast=int),
         'CONN_MAX_AGE': config('CONN_MAX_AGE', cast=int, default=60),
-        'OPTIONS': {
-            'connect_timeout': 10,
-            'options': '-c statement_timeout=15000ms',
-        },
+        # Persistent connections closed by the server, or PgBouncer, are
+        # replaced at the start of the next request instead of failing it:
+        'CONN_HEALTH_CHECKS': config(
+            'CONN_HEALTH_CHECKS', cast=bool, default=True
+        ),
+        'DISABLE_SERVER_SIDE_CURSORS': DATABASE_POOLER == 'pgbouncer',
+        'OPTIONS': _DATABASE_OPTIONS[DATABASE_POOLER],
+    },
+}
+
+# Caching
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+# `locmem` keeps a cache per process, `file` shares one cache between the
+# workers of a single host and `redis` shares it between hosts (it requires
+# the `redis` package to be installed).
+_CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+_CACHE_LOCATIONS = {
+    'locmem': 'eiger',
+    'file': '/dev/shm/eiger-cache',  # noqa: S108
+    'redis': 'redis://localhost:6379/0',
+}
+CACHE_BACKEND = config(
+    'CACHE_BACKEND',
+    default='locmem',
+    cast=Choices(tuple(_CACHE_BACKENDS)),
+)
+CACHES = {
+    'default': {
+        'BACKEND': _CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': config(
+            'CACHE_LOCATION', default=_CACHE_LOCATIONS[CACHE_BACKEND]
+        ),
+        'TIMEOUT': config('CACHE_TIMEOUT', cast=int, default=300),
+        'KEY_PREFIX': 'eiger',
+        # Bump it to discard every cached value after an incompatible deploy:
+        'VERSION': config('CACHE_VERSION', cast=int, default=1),
     },
 }
 
+# Sessions
+# https://docs.djangoproject.com/en/4.2/topics/http/sessions/
+
+# `cached_db` reads the sessions from the cache and writes them through to
+# the database, `cache` only keeps them in the cache, so they are lost on
+# eviction, and `signed_cookies` keeps them in the client cookie.
+# The cache backed engines need a cache shared by every worker: with
+# `locmem` a worker would keep serving a session deleted by another one,
+# such as after a logout, hence the `db` default.
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_BACKEND = config(
+    'SESSION_BACKEND',
+    default='db' if CACHE_BACKEND == 'locmem' else 'cached_db',
+    cast=Choices(tuple(SESSION_ENGINES)),
+)
+SESSION_ENGINE = SESSION_ENGINES[SESSION_BACKEND]
+SESSION_CACHE_ALIAS = config('SESSION_CACHE_ALIAS', default='default')
+# Pruned by the `prune_sessions` command:
+SESSION_COOKIE_AGE = config(
+    'SESSION_COOKIE_AGE', cast=int, default=60 * 60 * 24 * 14
+)
+
+# Default timeout, in seconds, of each `eiger.caching` namespace:
+CACHE_NAMESPACE_TIMEOUTS = {
+    'taxonomy': config(
+        'CACHE_TAXONOMY_TIMEOUT', cast=int, default=60 * 60 * 24
+    ),
+    'fragments': config(
+        'CACHE_FRAGMENTS_TIMEOUT', cast=int, default=60 * 60 * 24
+    ),
+    # Unless the trainer logs a session, see `eiger.trainers.analytics`:
+    'analytics': config(
+        'CACHE_ANALYTICS_TIMEOUT', cast=int, default=6 * 60 * 60
+    ),
+}
+
+# Taxonomy cache
+# Cache alias shared by the workers to store the Category -> ExerciseType
+# tree, leave it empty to keep the tree only in each process memory. With
+# `locmem` the alias isn't shared by the workers, hence the empty default.
+TAXONOMY_CACHE_ALIAS = config(
+    'TAXONOMY_CACHE_ALIAS',
+    default='' if CACHE_BACKEND == 'locmem' else 'default',
+)
+# Seconds a version of the tree is trusted, which bounds how long a worker
+# missed by an invalidation keeps serving the outdated tree:
+TAXONOMY_VERSION_TIMEOUT = config(
+    'TAXONOMY_VERSION_TIMEOUT', cast=int, default=5 * 60
+)
+
+# Training analytics cache
+# Cache alias storing the training analytics of the trainers, see
+# `eiger.trainers.analytics`, leave it empty to compute them on every
+# request. A logged session invalidates them and the
+# `compute_training_analytics` command precomputes them, so the alias must
+# be shared by the processes, hence the empty default with `locmem`.
+ANALYTICS_CACHE_ALIAS = config(
+    'ANALYTICS_CACHE_ALIAS',
+    default='' if CACHE_BACKEND == 'locmem' else 'default',
+)
+
+# Fragment cache
+# Cache alias storing the rendered exercise and variation cards, see
+# `eiger.trainers.templatetags.fragments`.
+FRAGMENTS_CACHE_ALIAS = config('FRAGMENTS_CACHE_ALIAS', default='default')
+
+# Query budgets
+# Maximum number of queries run by each view, by URL name, checked by
+# `eiger.instrumentation.RequestMetricsMiddleware`. Views without a budget
+# use the default one, `None` disables the check.
+QUERY_BUDGET_DEFAULT = config('QUERY_BUDGET_DEFAULT', cast=int, default=20)
+QUERY_BUDGETS = {
+    'index': 3,
+    'home': 9,
+    'retrieve_exercise': 7,
+    'update_exercise': 16,
+    'retrieve_category_exercise_types': 4,
+    'retrieve_exercise_variation': 7,
+    'update_exercise_variation': 16,
+    'admin:trainers_exercise_changelist': 12,
+    'admin:trainers_exercisevariation_changelist': 12,
+}
+# `log` a warning or `raise` when a view exceeds its budget:
+QUERY_BUDGET_ACTION = config(
+    'QUERY_BUDGET_ACTION',
+    default='raise' if DEBUG else 'log',
+    cast=Choices(('log', 'raise')),
+)
+
+# Metrics
+# Bearer token Prometheus sends to scrape `/metrics`, see `eiger.metrics`.
+# The endpoint answers 404 while no token is set:
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Review jobs
+# Entries selected by the admin review action are reviewed by the
+# `run_review_jobs` task, see `eiger.trainers.reviews`. Selections up to
+# the inline limit are still reviewed within the admin request.
+REVIEW_JOB_CHUNK_SIZE = config('REVIEW_JOB_CHUNK_SIZE', cast=int, default=500)
+REVIEW_JOB_INLINE_LIMIT = config(
+    'REVIEW_JOB_INLINE_LIMIT', cast=int, default=100
+)
+# Seconds without progress after which a running job is claimed again:
+REVIEW_JOB_STALE_AFTER = config(
+    'REVIEW_JOB_STALE_AFTER', cast=int, default=5 * 60
+)
+
+# Tasks
+# Deferred work is queued in the `Task` table and run by the `run_worker`
+# command, see `eiger.trainers.tasks`.
+TASK_MAX_ATTEMPTS = config('TASK_MAX_ATTEMPTS', cast=int, default=3)
+# Seconds before the first retry, doubled on each attempt up to the maximum:
+TASK_RETRY_BACKOFF = config('TASK_RETRY_BACKOFF', cast=int, default=30)
+TASK_RETRY_BACKOFF_MAX = config(
+    'TASK_RETRY_BACKOFF_MAX', cast=int, default=60 * 60
+)
+# Seconds between the touches of a running task by its worker, and seconds
+# without a touch after which the task is presumed lost and run again:
+TASK_HEARTBEAT_INTERVAL = config(
+    'TASK_HEARTBEAT_INTERVAL', cast=int, default=60
+)
+TASK_STALE_AFTER = config('TASK_STALE_AFTER', cast=int, default=15 * 60)
+# Seconds between the runs of the periodic tasks, by task name:
+TASK_SCHEDULE = {
+    'reconcile_pending_counters': config(
+        'RECONCILE_PENDING_COUNTERS_EVERY', cast=int, default=60 * 60
+    ),
+    'create_training_log_partitions': config(
+        'CREATE_TRAINING_LOG_PARTITIONS_EVERY', cast=int, default=24 * 60 * 60
+    ),
+}
+
+# Training log
+# Months whose partition of the training log is created ahead of time, see
+# `eiger.trainers.training_log`:
+TRAINING_LOG_PARTITIONS_AHEAD = config(
+    'TRAINING_LOG_PARTITIONS_AHEAD', cast=int, default=3
+)
+# Entries folded per transaction into the daily and weekly rollups, see
+# `eiger.trainers.rollups`:
+ROLLUP_BATCH_SIZE = config('ROLLUP_BATCH_SIZE', cast=int, default=5000)
+
+# Session planner
+# Seconds each process keeps its snapshot of the reviewed variations
+# planned by `eiger.trainers.planner`:
+PLANNER_CATALOGUE_MAX_AGE = config(
+    'PLANNER_CATALOGUE_MAX_AGE', cast=int, default=5 * 60
+)
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -229,6 +453,8 @@ else:
     SECURE_REDIRECT_EXEMPT = [
         # This is required for healthcheck to work:
         '^healthcheck/',
+        # Prometheus scrapes the workers directly, over HTTP:
+        '^metrics$',
     ]
     SECURE_HSTS_INCLUDE_SUBDOMAINS = True
     SECURE_HSTS_PRELOAD = True
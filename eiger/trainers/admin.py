@@ -1,15 +1,139 @@
+import io
 from gettext import ngettext
 
+from django.conf import settings
 from django.contrib import admin, messages
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.exceptions import PermissionDenied
 from django.db.models import QuerySet
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import URLPattern, path
+from django.utils.translation import gettext_lazy as _
 
+from eiger.trainers.forms import ImportExercisesForm
+from eiger.trainers.importers import ExerciseImporter
 from eiger.trainers.models import (
     Category,
     Exercise,
     ExerciseType,
     ExerciseVariation,
+    PendingReviewCounter,
+    ReviewJob,
+    Task,
 )
+from eiger.trainers.reviews import enqueue_review_job
+from eiger.trainers.search import SEARCH_RANK_FIELD, search_exercises
+from eiger.trainers.taxonomy import get_taxonomy
+
+# Errors of an upload shown to the user, the others are only counted:
+IMPORT_REPORTED_ERRORS = 10
+
+
+class CategoryListFilter(admin.SimpleListFilter):
+    """Filter by category using the taxonomy cache for its choices."""
+
+    title = _('category')
+    parameter_name = 'category__id__exact'
+
+    def lookups(
+        self, request: HttpRequest, model_admin: admin.ModelAdmin[ExerciseType]
+    ) -> list[tuple[int, str]]:
+        return [
+            (category.id, category.name)
+            for category in get_taxonomy().categories
+        ]
+
+    def queryset(
+        self, request: HttpRequest, queryset: QuerySet[ExerciseType]
+    ) -> QuerySet[ExerciseType]:
+        if self.value() is None:
+            return queryset
+        return queryset.filter(category_id=self.value())
+
+
+class ExerciseTypeListFilter(admin.SimpleListFilter):
+    """Filter by exercise type using the taxonomy cache for its choices."""
+
+    title = _('exercise type')
+    parameter_name = 'exercise_type__id__exact'
+
+    def lookups(
+        self, request: HttpRequest, model_admin: admin.ModelAdmin[Exercise]
+    ) -> list[tuple[int, str]]:
+        return [
+            (exercise_type.id, str(exercise_type))
+            for exercise_type in get_taxonomy().exercise_types
+        ]
+
+    def queryset(
+        self, request: HttpRequest, queryset: QuerySet[Exercise]
+    ) -> QuerySet[Exercise]:
+        if self.value() is None:
+            return queryset
+        return queryset.filter(exercise_type_id=self.value())
+
+
+class RangeListFilter(admin.SimpleListFilter):
+    """Filter an indexed integer field by the bounds of named ranges."""
+
+    field_name: str
+    # Lookup values mapped to their label and `[lower, upper)` bounds:
+    ranges: dict[str, tuple[str, int | None, int | None]]
+
+    def lookups(
+        self,
+        request: HttpRequest,
+        model_admin: admin.ModelAdmin[ExerciseVariation],
+    ) -> list[tuple[str, str]]:
+        return [(value, label) for value, (label, *_) in self.ranges.items()]
+
+    def queryset(
+        self, request: HttpRequest, queryset: QuerySet[ExerciseVariation]
+    ) -> QuerySet[ExerciseVariation]:
+        if self.value() not in self.ranges:
+            return queryset
+        _, lower, upper = self.ranges[self.value()]  # type: ignore[index]
+        if lower is not None:
+            queryset = queryset.filter(**{f'{self.field_name}__gte': lower})
+        if upper is not None:
+            queryset = queryset.filter(**{f'{self.field_name}__lt': upper})
+        return queryset
+
+
+class DurationListFilter(RangeListFilter):
+    title = _('duration')
+    parameter_name = 'duration'
+    field_name = 'total_duration_seconds'
+    ranges = {
+        'under_5': (_('Under 5 minutes'), None, 5 * 60),
+        '5_to_10': (_('5 to 10 minutes'), 5 * 60, 10 * 60),
+        '10_to_20': (_('10 to 20 minutes'), 10 * 60, 20 * 60),
+        'over_20': (_('Over 20 minutes'), 20 * 60, None),
+    }
+
+
+class VolumeListFilter(RangeListFilter):
+    title = _('volume')
+    parameter_name = 'volume'
+    field_name = 'total_volume'
+    ranges = {
+        'under_500': (_('Under 500 kg'), None, 500),
+        '500_to_2000': (_('500 to 2000 kg'), 500, 2000),
+        'over_2000': (_('Over 2000 kg'), 2000, None),
+    }
+
+
+class SearchRankChangeList(ChangeList):
+    """Order search results by relevance unless a column is sorted."""
+
+    def get_ordering(
+        self, request: HttpRequest, queryset: QuerySet[Exercise]
+    ) -> list[str]:
+        if self.query.strip() and ORDER_VAR not in self.params:
+            return [f'-{SEARCH_RANK_FIELD}', '-pk']
+        return super().get_ordering(request, queryset)
 
 
 @admin.register(Category)
@@ -21,7 +145,7 @@ class CategoryAdmin(admin.ModelAdmin[Category]):
 @admin.register(ExerciseType)
 class ExerciseTypeAdmin(admin.ModelAdmin[ExerciseType]):
     list_display = ['name', 'category']
-    list_filter = ['category']
+    list_filter = [CategoryListFilter]
     search_fields = ['name']
 
     def get_queryset(self, request: HttpRequest) -> QuerySet[ExerciseType]:
@@ -40,44 +164,139 @@ class ReviewEntryAdminActionMixin(admin.ModelAdmin):  # type: ignore[type-arg]
         request: HttpRequest,
         queryset: QuerySet[Exercise | ExerciseVariation],
     ) -> None:
-        updated = queryset.filter(reviewed=False).update(reviewed=True)
-        if not updated:
+        job = enqueue_review_job(
+            queryset,
+            requested_by=request.user,  # type: ignore[arg-type]
+            inline_limit=settings.REVIEW_JOB_INLINE_LIMIT,
+        )
+        level = messages.SUCCESS
+        if job is None:
             message = 'Selected entries were already reviewed.'
+        elif job.status == ReviewJob.Status.QUEUED:
+            message = (
+                f'{job.total} entries were queued for a review, follow their'
+                f' progress in the review job {job.pk}.'
+            )
+            level = messages.INFO
+        elif job.status == ReviewJob.Status.FAILED:
+            message = f'The review failed: {job.error}'
+            level = messages.ERROR
         else:
             message = (
                 ngettext(
                     '%d exercise was successfully marked as reviewed.',
                     '%d exercises were successfully marked as reviewed.',
-                    updated,
+                    job.reviewed,
                 )
-                % updated
+                % job.reviewed
             )
 
         self.message_user(
             request=request,
             message=message,
-            level=messages.SUCCESS,
+            level=level,
         )
 
 
 @admin.register(Exercise)
 class ExerciseAdmin(ReviewEntryAdminActionMixin):
     list_display = ['name', 'exercise_type', 'created_by', 'reviewed']
-    list_filter = ['exercise_type', 'created_by', 'reviewed']
+    list_filter = [ExerciseTypeListFilter, 'created_by', 'reviewed']
     search_fields = ['name', 'description']
+    change_list_template = 'admin/trainers/exercise/change_list.html'
+
+    def get_changelist(
+        self, request: HttpRequest, **kwargs
+    ) -> type[SearchRankChangeList]:
+        return SearchRankChangeList
+
+    def get_urls(self) -> list[URLPattern]:
+        return [
+            path(
+                'import/',
+                self.admin_site.admin_view(self.import_view),
+                name='trainers_exercise_import',
+            ),
+            *super().get_urls(),
+        ]
+
+    def import_view(self, request: HttpRequest) -> HttpResponse:
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        form = ImportExercisesForm(
+            data=request.POST or None, files=request.FILES or None
+        )
+        if request.method == 'POST' and form.is_valid():
+            importer = ExerciseImporter(
+                request.user,  # type: ignore[arg-type]
+                on_conflict=form.cleaned_data['on_conflict'],
+                reviewed=form.cleaned_data['reviewed'],
+            )
+            stream = io.TextIOWrapper(
+                form.cleaned_data['file'].file, encoding='utf-8', newline=''
+            )
+            report = importer.run(stream, form.cleaned_data['file_format'])
+            level = messages.WARNING if report.failed_rows else messages.INFO
+            self.message_user(
+                request=request, message=report.summary(), level=level
+            )
+            for error in report.errors[:IMPORT_REPORTED_ERRORS]:
+                self.message_user(
+                    request=request,
+                    message=f'Line {error.line}: {error.message}',
+                    level=messages.ERROR,
+                )
+            return redirect('admin:trainers_exercise_changelist')
+
+        return TemplateResponse(
+            request,
+            'admin/trainers/exercise/import.html',
+            {
+                **self.admin_site.each_context(request),
+                'opts': self.model._meta,
+                'title': _('Import exercises'),
+                'form': form,
+            },
+        )
 
     def get_queryset(self, request: HttpRequest) -> QuerySet[Exercise]:
         queryset = super().get_queryset(request)
-        queryset = queryset.select_related('exercise_type', 'created_by')
+        queryset = queryset.select_related(
+            'exercise_type__category', 'created_by'
+        )
         return queryset
 
+    def get_search_results(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet[Exercise],
+        search_term: str,
+    ) -> tuple[QuerySet[Exercise], bool]:
+        # Use the full-text index instead of `ILIKE` on `search_fields`:
+        if not search_term.strip():
+            return queryset, False
+        return search_exercises(queryset, search_term), False
+
     review_entry_short_description = 'Mark selected exercises as reviewed.'
 
 
 @admin.register(ExerciseVariation)
 class ExerciseVariationAdmin(ReviewEntryAdminActionMixin):
-    list_display = ['exercise', 'created_by', 'reviewed']
-    list_filter = ['exercise', 'created_by', 'reviewed']
+    list_display = [
+        'exercise',
+        'total_duration_seconds',
+        'total_volume',
+        'created_by',
+        'reviewed',
+    ]
+    list_filter = [
+        DurationListFilter,
+        VolumeListFilter,
+        'exercise',
+        'created_by',
+        'reviewed',
+    ]
     search_fields = ['exercise__name']
 
     def get_queryset(
@@ -87,4 +306,101 @@ class ExerciseVariationAdmin(ReviewEntryAdminActionMixin):
         queryset = queryset.select_related('exercise', 'created_by')
         return queryset
 
+    def get_search_results(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet[ExerciseVariation],
+        search_term: str,
+    ) -> tuple[QuerySet[ExerciseVariation], bool]:
+        if not search_term.strip():
+            return queryset, False
+        exercises = search_exercises(Exercise.objects.all(), search_term)
+        return queryset.filter(exercise__in=exercises.values('id')), False
+
     review_entry_short_description = 'Mark selected variations as reviewed.'
+
+
+@admin.register(PendingReviewCounter)
+class PendingReviewCounterAdmin(admin.ModelAdmin[PendingReviewCounter]):
+    list_display = [
+        'user',
+        'pending_exercises',
+        'pending_variations',
+        'last_submitted_at',
+    ]
+    ordering = ['-pending_exercises', '-pending_variations']
+    search_fields = ['user__username']
+
+    def get_queryset(
+        self, request: HttpRequest
+    ) -> QuerySet[PendingReviewCounter]:
+        return super().get_queryset(request).select_related('user')
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: PendingReviewCounter | None = None
+    ) -> bool:
+        # The counters are derived from the entries, see `counters.py`.
+        return False
+
+
+@admin.register(ReviewJob)
+class ReviewJobAdmin(admin.ModelAdmin[ReviewJob]):
+    list_display = [
+        '__str__',
+        'status',
+        'progress_percentage',
+        'reviewed',
+        'requested_by',
+        'created_at',
+        'finished_at',
+    ]
+    list_filter = ['status', 'target']
+    ordering = ['-created_at', '-id']
+    # The selected ids can be many, the progress is enough:
+    exclude = ['entry_ids']
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[ReviewJob]:
+        return (
+            super()
+            .get_queryset(request)
+            .defer('entry_ids')
+            .select_related('requested_by')
+        )
+
+    @admin.display(description=_('progress'))
+    def progress_percentage(self, job: ReviewJob) -> str:
+        return f'{job.progress:.0%}'
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: ReviewJob | None = None
+    ) -> bool:
+        # The jobs are only updated by the workers, see `reviews.py`.
+        return False
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin[Task]):
+    list_display = [
+        '__str__',
+        'status',
+        'attempts',
+        'run_at',
+        'finished_at',
+    ]
+    list_filter = ['status', 'name']
+    ordering = ['-run_at', '-id']
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: Task | None = None
+    ) -> bool:
+        # The tasks are only updated by the workers, see `tasks.py`.
+        return False
@@ -0,0 +1,314 @@
+"""
+Training load analytics of the trainers, computed with NumPy.
+
+The sets of the analysed window are read by a single `values_list` query,
+with their local day already numbered by the database, into an integer
+NumPy table. Every metric is then computed over whole columns:
+
+* the daily load is the time under tension of the sets, in seconds,
+  summed per day with `bincount`, and its 7 days rolling sum is taken
+  from its cumulative sum;
+* the acute and chronic loads are exponentially weighted averages of the
+  daily load over 7 and 28 days, whose ratio is the acute:chronic
+  workload ratio. The averages are computed in closed form over chunks
+  short enough for the powers of the decay not to overflow;
+* the volume, the kilograms lifted, is summed per week and category with
+  `add.at` over a weeks by categories grid;
+* the max hang load of each exercise is estimated from its weighted sets
+  with the Epley formula, counting each `HANG_REFERENCE_SECONDS` of hang
+  as a repetition, and the best estimate is kept with `maximum.at`.
+
+The chronic average needs a few weeks of history to settle, so the query
+reaches `WARMUP_DAYS` before the window. The results of a trainer are
+cached for the day in the `analytics` namespace of the cache named by
+`settings.ANALYTICS_CACHE_ALIAS`, until they log a session, and the
+`compute_training_analytics` command precomputes those of the active
+trainers.
+"""
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from itertools import chain
+from typing import Any
+
+import numpy
+import structlog
+from django.conf import settings
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.db.models import Func, IntegerField
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from eiger.caching import NamespacedCache, get_cache
+from eiger.trainers.models import TrainingLogEntry
+
+WINDOW_DAYS = 90
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+WARMUP_DAYS = 2 * CHRONIC_DAYS
+ROLLING_DAYS = 7
+HANG_REFERENCE_SECONDS = 10
+# The powers of the decay computed by `ewma` stay within `1e±100`:
+MAX_DECAY_EXPONENT = 100 * math.log(10)
+# 1970-01-05, the first Monday after the epoch, is its day 4:
+FIRST_MONDAY = 4
+ANALYTICS_CACHE_NAMESPACE = 'analytics'
+CACHE_KEY = '{user_id}:{day}'
+
+# Columns of the table of sets, see `load_sets`:
+DAY, REPETITIONS, WEIGHT, DURATION, PACE, EXERCISE, CATEGORY = range(7)
+
+logger = structlog.get_logger()
+
+
+class EpochDay(Func):
+    """The number of days between the epoch and a date."""
+
+    template = "(%(expressions)s - DATE '1970-01-01')"
+    output_field = IntegerField()
+
+
+def ewma(values: numpy.ndarray, alpha: float) -> numpy.ndarray:
+    """
+    Return the exponentially weighted moving average of the values.
+
+    `y[k] = alpha * x[k] + (1 - alpha) * y[k - 1]`, starting from zero,
+    is computed as `d ** (k + 1) * sum(alpha * x[j] / d ** (j + 1))` with
+    the decay `d = 1 - alpha`, chunk by chunk so `d ** -k` can't overflow.
+    """
+    decay = 1 - alpha
+    if decay == 0:
+        return values.astype(numpy.float64)
+    chunk_size = max(1, int(MAX_DECAY_EXPONENT / -math.log(decay)))
+    averages = numpy.empty(len(values), dtype=numpy.float64)
+    carry = 0.0
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:][:chunk_size]
+        powers = decay ** numpy.arange(1, len(chunk) + 1, dtype=numpy.float64)
+        stop = start + len(chunk)
+        averages[start:stop] = powers * (
+            carry + alpha * numpy.cumsum(chunk / powers)
+        )
+        carry = averages[stop - 1]
+    return averages
+
+
+def rolling_sum(values: numpy.ndarray, window: int) -> numpy.ndarray:
+    """Return the sums of the last `window` values, fewer at the start."""
+    sums = numpy.concatenate(([0], numpy.cumsum(values)))
+    ends = numpy.arange(1, len(values) + 1)
+    return sums[ends] - sums[numpy.maximum(ends - window, 0)]
+
+
+def load_sets(
+    user: AbstractBaseUser, first_day: date, last_day: date
+) -> numpy.ndarray:
+    """
+    Read the sets of the trainer logged within the days into a table.
+
+    Its rows hold the epoch day, the repetitions, weight, duration and
+    variation pace of a set, `-1` for an unknown duration and `0` for
+    the other unknown values, then its exercise and category.
+    """
+    rows = TrainingLogEntry.objects.filter(
+        user=user,
+        performed_at__gte=_get_day_start(first_day),
+        performed_at__lt=_get_day_start(last_day + timedelta(days=1)),
+    ).values_list(
+        EpochDay(TruncDate('performed_at')),
+        Coalesce('repetitions', 0),
+        Coalesce('weight_in_kilos', 0),
+        Coalesce('duration_seconds', -1),
+        Coalesce('exercise_variation__seconds_per_repetition', 0),
+        'exercise_variation__exercise',
+        'exercise_variation__exercise__exercise_type__category',
+    )
+    return numpy.fromiter(
+        chain.from_iterable(rows), dtype=numpy.int64
+    ).reshape(-1, 7)
+
+
+def _get_day_start(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time()))
+
+
+@dataclass(frozen=True)
+class TrainingAnalytics:
+    first_day: date
+    last_day: date
+    days: int
+    sets: numpy.ndarray
+
+    @property
+    def first_epoch_day(self) -> int:
+        return self.first_day.toordinal() - date(1970, 1, 1).toordinal()
+
+    def get_window_sets(self) -> numpy.ndarray:
+        """Return the sets logged after the warmup."""
+        return self.sets[
+            self.sets[:, DAY] >= self.first_epoch_day + WARMUP_DAYS
+        ]
+
+    def get_time_under_tension(self) -> numpy.ndarray:
+        sets = self.sets
+        return numpy.where(
+            sets[:, DURATION] >= 0,
+            sets[:, DURATION],
+            sets[:, REPETITIONS] * sets[:, PACE],
+        )
+
+    def get_daily_metrics(self) -> list[dict[str, Any]]:
+        """Return the load metrics of each day after the warmup."""
+        loads = numpy.bincount(
+            self.sets[:, DAY] - self.first_epoch_day,
+            weights=self.get_time_under_tension(),
+            minlength=self.days,
+        )
+        acute = ewma(loads, 2 / (ACUTE_DAYS + 1))
+        chronic = ewma(loads, 2 / (CHRONIC_DAYS + 1))
+        ratios = numpy.divide(
+            acute,
+            chronic,
+            out=numpy.full(self.days, numpy.nan),
+            where=chronic > 0,
+        )
+        rolling_loads = rolling_sum(loads, ROLLING_DAYS).astype(numpy.int64)
+        window = slice(WARMUP_DAYS, None)
+        columns = zip(
+            loads[window].astype(numpy.int64).tolist(),
+            rolling_loads[window].tolist(),
+            numpy.round(acute[window], 2).tolist(),
+            numpy.round(chronic[window], 2).tolist(),
+            numpy.round(ratios[window], 3).tolist(),
+        )
+        return [
+            {
+                'day': self.first_day + timedelta(days=WARMUP_DAYS + index),
+                'load': load,
+                'rolling_load': rolling_load,
+                'acute_load': acute_load,
+                'chronic_load': chronic_load,
+                'acute_chronic_ratio': None if math.isnan(ratio) else ratio,
+            }
+            for index, (
+                load,
+                rolling_load,
+                acute_load,
+                chronic_load,
+                ratio,
+            ) in enumerate(columns)
+        ]
+
+    def get_weekly_volumes(self) -> list[dict[str, Any]]:
+        """Return the kilograms lifted per week, from Monday, and category."""
+        sets = self.get_window_sets()
+        weeks = (sets[:, DAY] - FIRST_MONDAY) // 7
+        category_ids, categories = numpy.unique(
+            sets[:, CATEGORY], return_inverse=True
+        )
+        first_week = weeks.min(initial=0)
+        shape = (weeks.max(initial=0) - first_week + 1, len(category_ids))
+        volumes = numpy.zeros(shape, dtype=numpy.int64)
+        counts = numpy.zeros(shape, dtype=numpy.int64)
+        cells = (weeks - first_week, categories)
+        numpy.add.at(volumes, cells, sets[:, REPETITIONS] * sets[:, WEIGHT])
+        numpy.add.at(counts, cells, 1)
+        return [
+            {
+                'week_start': date.fromordinal(
+                    date(1970, 1, 1).toordinal()
+                    + FIRST_MONDAY
+                    + 7 * (int(week) + int(first_week))
+                ),
+                'category': int(category_ids[category]),
+                'volume': int(volumes[week, category]),
+            }
+            for week, category in zip(*numpy.nonzero(counts))
+        ]
+
+    def get_max_hang_loads(self) -> list[dict[str, Any]]:
+        """Return the best estimated max load of each weighted exercise."""
+        sets = self.get_window_sets()
+        hang_seconds = numpy.where(
+            (sets[:, DURATION] >= 0) & (sets[:, REPETITIONS] > 0),
+            sets[:, DURATION] / numpy.maximum(sets[:, REPETITIONS], 1),
+            sets[:, PACE],
+        )
+        weighted = (sets[:, WEIGHT] > 0) & (hang_seconds > 0)
+        estimates = sets[weighted, WEIGHT] * (
+            1 + hang_seconds[weighted] / HANG_REFERENCE_SECONDS / 30
+        )
+        exercise_ids, exercises = numpy.unique(
+            sets[weighted, EXERCISE], return_inverse=True
+        )
+        best = numpy.zeros(len(exercise_ids))
+        numpy.maximum.at(best, exercises, estimates)
+        return [
+            {
+                'exercise': int(exercise_id),
+                'estimated_max_load': round(float(estimate), 1),
+            }
+            for exercise_id, estimate in zip(exercise_ids, best)
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'since': self.first_day + timedelta(days=WARMUP_DAYS),
+            'until': self.last_day,
+            'daily': self.get_daily_metrics(),
+            'weekly_volumes': self.get_weekly_volumes(),
+            'max_hang_loads': self.get_max_hang_loads(),
+        }
+
+
+def compute_training_analytics(
+    user: AbstractBaseUser, last_day: date | None = None
+) -> dict[str, Any]:
+    """Compute the analytics of the `WINDOW_DAYS` up to the last day."""
+    last_day = last_day or timezone.localdate()
+    days = WARMUP_DAYS + WINDOW_DAYS
+    first_day = last_day - timedelta(days=days - 1)
+    return TrainingAnalytics(
+        first_day=first_day,
+        last_day=last_day,
+        days=days,
+        sets=load_sets(user, first_day, last_day),
+    ).as_dict()
+
+
+def get_analytics_cache() -> NamespacedCache | None:
+    """Return the cache of the analytics, `None` when they aren't cached."""
+    alias = settings.ANALYTICS_CACHE_ALIAS
+    return get_cache(ANALYTICS_CACHE_NAMESPACE, alias) if alias else None
+
+
+def _get_cache_key(user_id: int) -> str:
+    return CACHE_KEY.format(user_id=user_id, day=timezone.localdate())
+
+
+def refresh_training_analytics(user: AbstractBaseUser) -> dict[str, Any]:
+    analytics = compute_training_analytics(user)
+    analytics_cache = get_analytics_cache()
+    if analytics_cache is not None:
+        analytics_cache.set(_get_cache_key(user.pk), analytics)
+    return analytics
+
+
+def get_training_analytics(user: AbstractBaseUser) -> dict[str, Any]:
+    """Return the cached analytics of the trainer, computing them if none."""
+    analytics_cache = get_analytics_cache()
+    analytics = (
+        None
+        if analytics_cache is None
+        else analytics_cache.get(_get_cache_key(user.pk))
+    )
+    if analytics is None:
+        logger.debug('Computing the training analytics of %s.', user)
+        analytics = refresh_training_analytics(user)
+    return analytics
+
+
+def invalidate_training_analytics(user_id: int) -> None:
+    analytics_cache = get_analytics_cache()
+    if analytics_cache is not None:
+        analytics_cache.delete(_get_cache_key(user_id))
@@ -0,0 +1,307 @@
+"""
+Versioned, read-only JSON API of the exercises catalogue.
+
+Rows are serialised straight from `values()` querysets, restricted to the
+fields requested through `?fields=`, and every response carries a strong
+`ETag` derived from the `updated_at` of the rows it contains, so polling
+clients sending `If-None-Match` get a `304` without any serialisation.
+"""
+import hashlib
+import operator
+from dataclasses import dataclass
+from datetime import datetime
+from functools import reduce
+from http import HTTPStatus
+from typing import Callable, Iterable, Mapping
+
+import structlog
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import BadRequest
+from django.db.models import Model, Q, QuerySet
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import condition, require_GET
+
+from eiger.trainers.models import (
+    Category,
+    Exercise,
+    ExerciseType,
+    ExerciseVariation,
+)
+from eiger.trainers.pagination import paginate_union_by_keyset
+
+API_VERSION = 'v1'
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+logger = structlog.get_logger()
+
+
+def _catalogue_filters(request: HttpRequest) -> tuple[Q, ...]:
+    """Reviewed entries are public, pending ones only to their creator."""
+    return Q(reviewed=True), Q(reviewed=False, created_by=request.user)
+
+
+@dataclass(frozen=True)
+class Resource:
+    model: type[Model]
+    fields: tuple[str, ...]
+    # Disjoint filters whose union is visible to the request user:
+    get_filters: Callable[[HttpRequest], tuple[Q, ...]] = lambda request: (
+        Q(),
+    )
+    # Indexed integer fields filtered by `?<field>__gte=` and `__lte=`:
+    range_fields: tuple[str, ...] = ()
+
+    def get_queryset(self, request: HttpRequest) -> 'QuerySet[Model]':
+        return self.model.objects.filter(
+            reduce(operator.or_, self.get_filters(request))
+        )
+
+    def get_querysets(
+        self, request: HttpRequest
+    ) -> tuple['QuerySet[Model]', ...]:
+        """Return a queryset per filter, so each one can use its index."""
+        return tuple(
+            self.model.objects.filter(query)
+            for query in self.get_filters(request)
+        )
+
+    def parse_fields(self, request: HttpRequest) -> tuple[str, ...]:
+        """
+        Return the sparse fieldset requested through `?fields=`.
+
+        Raises `BadRequest` when an unknown field is requested.
+        """
+        requested = request.GET.get('fields')
+        if not requested:
+            return self.fields
+        fields = tuple(
+            dict.fromkeys(
+                field
+                for field in map(str.strip, requested.split(','))
+                if field
+            )
+        )
+        unknown_fields = set(fields) - set(self.fields)
+        if unknown_fields:
+            raise BadRequest(
+                'Unknown fields: {0}.'.format(
+                    ', '.join(sorted(unknown_fields))
+                )
+            )
+        return fields
+
+    def parse_range_filter(self, request: HttpRequest) -> Q:
+        """
+        Return the range filter requested through `?<field>__gte=<value>`
+        and `?<field>__lte=<value>`.
+
+        Raises `BadRequest` when a bound isn't an integer.
+        """
+        range_filter = Q()
+        for field in self.range_fields:
+            for lookup in ('gte', 'lte'):
+                parameter = f'{field}__{lookup}'
+                bound = request.GET.get(parameter)
+                if bound is None:
+                    continue
+                try:
+                    range_filter &= Q((parameter, int(bound)))
+                except ValueError:
+                    raise BadRequest(f'Invalid {parameter}.') from None
+        return range_filter
+
+
+RESOURCES: dict[str, Resource] = {
+    'categories': Resource(
+        model=Category,
+        fields=('id', 'name', 'color', 'created_at', 'updated_at'),
+    ),
+    'exercise-types': Resource(
+        model=ExerciseType,
+        fields=('id', 'name', 'category', 'created_at', 'updated_at'),
+    ),
+    'exercises': Resource(
+        model=Exercise,
+        fields=(
+            'id',
+            'name',
+            'description',
+            'exercise_type',
+            'should_add_weight',
+            'created_by',
+            'reviewed',
+            'created_at',
+            'updated_at',
+        ),
+        get_filters=_catalogue_filters,
+    ),
+    'exercise-variations': Resource(
+        model=ExerciseVariation,
+        fields=(
+            'id',
+            'exercise',
+            'sets',
+            'repetitions',
+            'seconds_per_repetition',
+            'rest_per_set_in_seconds',
+            'rest_per_repetition_in_seconds',
+            'weight_in_kilos',
+            'total_duration_seconds',
+            'total_volume',
+            'created_by',
+            'reviewed',
+            'created_at',
+            'updated_at',
+        ),
+        get_filters=_catalogue_filters,
+        range_fields=('total_duration_seconds', 'total_volume'),
+    ),
+}
+
+# Columns always retrieved to build the pagination cursor and the ETag:
+_BOOKKEEPING_FIELDS = ('id', 'created_at', 'updated_at')
+
+
+def _make_etag(
+    resource_name: str,
+    fields: Iterable[str],
+    versions: Iterable[tuple[int, datetime]],
+    extra: str = '',
+) -> str:
+    """Hash the fieldset and the `(id, updated_at)` pairs of the rows."""
+    digest = hashlib.md5(usedforsecurity=False)
+    digest.update(f'{API_VERSION}:{resource_name}:'.encode())
+    digest.update(','.join(fields).encode())
+    for pk, updated_at in versions:
+        digest.update(f':{pk}@{updated_at.isoformat()}'.encode())
+    digest.update(extra.encode())
+    return digest.hexdigest()
+
+
+def _serialize(
+    row: Mapping[str, object], fields: tuple[str, ...]
+) -> dict[str, object]:
+    return {field: row[field] for field in fields}
+
+
+def _bad_request(error: BadRequest) -> JsonResponse:
+    return JsonResponse(
+        data={'error': str(error)}, status=HTTPStatus.BAD_REQUEST
+    )
+
+
+def _get_resource(resource_name: str) -> Resource:
+    try:
+        return RESOURCES[resource_name]
+    except KeyError:
+        raise Http404(f'Unknown API resource {resource_name}.') from None
+
+
+@login_required(login_url='/')
+@require_GET
+def api_list_view(request: HttpRequest, resource_name: str) -> HttpResponse:
+    resource = _get_resource(resource_name)
+    logger.debug(
+        'Received the request from user %s to list the %s.',
+        request.user,
+        resource_name,
+    )
+    try:
+        fields = resource.parse_fields(request)
+        range_filter = resource.parse_range_filter(request)
+        page_size = min(
+            int(request.GET.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE
+        )
+        if page_size < 1:
+            raise ValueError(page_size)
+    except ValueError:
+        return _bad_request(BadRequest('Invalid limit.'))
+    except BadRequest as error:
+        return _bad_request(error)
+
+    querysets = [
+        queryset.filter(range_filter).values(
+            *dict.fromkeys(_BOOKKEEPING_FIELDS + fields)
+        )
+        for queryset in resource.get_querysets(request)
+    ]
+    try:
+        page = paginate_union_by_keyset(
+            querysets=querysets,
+            cursor=request.GET.get('cursor'),
+            page_size=page_size,
+        )
+    except BadRequest as error:
+        return _bad_request(error)
+
+    etag = _make_etag(
+        resource_name,
+        fields,
+        ((row['id'], row['updated_at']) for row in page.items),
+        extra=page.next_cursor or '',
+    )
+    not_modified = get_conditional_response(request, etag=f'"{etag}"')
+    if not_modified is not None:
+        return not_modified
+
+    response = JsonResponse(
+        data={
+            'results': [_serialize(row, fields) for row in page.items],
+            'next_cursor': page.next_cursor,
+        }
+    )
+    response.headers['ETag'] = f'"{etag}"'
+    return response
+
+
+def _detail_etag(
+    request: HttpRequest, resource_name: str, pk: int
+) -> str | None:
+    """Compute the ETag from `updated_at` alone, before any serialisation."""
+    resource = _get_resource(resource_name)
+    updated_at = (
+        resource.get_queryset(request)
+        .filter(pk=pk)
+        .values_list('updated_at', flat=True)
+        .first()
+    )
+    if updated_at is None:
+        return None
+    try:
+        fields = resource.parse_fields(request)
+    except BadRequest:
+        return None
+    return _make_etag(resource_name, fields, [(pk, updated_at)])
+
+
+@login_required(login_url='/')
+@require_GET
+@condition(etag_func=_detail_etag)
+def api_detail_view(
+    request: HttpRequest, resource_name: str, pk: int
+) -> HttpResponse:
+    resource = _get_resource(resource_name)
+    logger.debug(
+        'Received the request from user %s to retrieve the %s %s.',
+        request.user,
+        resource_name,
+        pk,
+    )
+    try:
+        fields = resource.parse_fields(request)
+    except BadRequest as error:
+        return _bad_request(error)
+
+    row = (
+        resource.get_queryset(request)
+        .filter(pk=pk)
+        .values(*dict.fromkeys(_BOOKKEEPING_FIELDS + fields))
+        .first()
+    )
+    if row is None:
+        return JsonResponse(
+            data={'error': 'Not found.'}, status=HTTPStatus.NOT_FOUND
+        )
+    return JsonResponse(data=_serialize(row, fields))
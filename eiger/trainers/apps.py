@@ -5,3 +5,16 @@ class TrainersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'eiger.trainers'
     app_name = 'trainers'
+
+    def ready(self) -> None:
+        # Record the queries of the connections, opened from now on:
+        from eiger import instrumentation  # noqa: F401, WPS433
+
+        # Connect the signal handlers and register the tasks:
+        from eiger.trainers import (  # noqa: F401, WPS433
+            counters,
+            reviews,
+            rollups,
+            signals,
+            training_log,
+        )
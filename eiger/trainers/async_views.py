@@ -0,0 +1,210 @@
+"""
+Asynchronous versions of the busiest trainer views.
+
+They are routed instead of their synchronous counterparts of `views` when
+`settings.ASYNC_VIEWS` is set, as `scripts/gunicorn.sh` does for uvicorn
+workers, so a worker waiting on the database or on a slow client serves
+other requests instead of holding a thread.
+They share their queries, forms and templates with `views`. The feed rows
+are read with the async ORM. Django 4.2 has no async authentication, form
+validation or template rendering, so the helpers of `views` doing these
+run in a thread through `sync_to_async`.
+"""
+from functools import wraps
+from typing import Awaitable, Callable, Sequence
+
+import structlog
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user
+from django.contrib.auth.views import redirect_to_login
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    JsonResponse,
+)
+from django.shortcuts import get_object_or_404
+
+from eiger.trainers.conditional import (
+    conditional_page,
+    get_exercise_validators,
+    get_exercise_variation_validators,
+    get_home_validators,
+)
+from eiger.trainers.forms import EditExerciseForm, EditExerciseVariationForm
+from eiger.trainers.pagination import apaginate_by_keyset
+from eiger.trainers.views import (
+    HOME_FEED_PAGE_SIZE,
+    get_category_exercise_types,
+    get_editable_exercise_variations,
+    get_editable_exercises,
+    get_pending_exercise_variations,
+    get_pending_exercises,
+    render_exercise_form,
+    render_exercise_variation_form,
+    render_home,
+    save_exercise_form,
+    save_exercise_variation_form,
+)
+
+LOGIN_URL = '/'
+
+AsyncView = Callable[..., Awaitable[HttpResponse]]
+
+logger = structlog.get_logger()
+
+aget_object_or_404 = sync_to_async(get_object_or_404)
+
+
+def async_login_required(view: AsyncView) -> AsyncView:
+    """Async `login_required`, which only wraps sync views in Django 4.2."""
+
+    @wraps(view)
+    async def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        # The lazy `request.user` would query the database in the event loop:
+        request.user = await sync_to_async(get_user)(request)
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path(), LOGIN_URL)
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def async_require_http_methods(
+    methods: Sequence[str],
+) -> Callable[[AsyncView], AsyncView]:
+    """Async `require_http_methods`, which only wraps sync views in 4.2."""
+
+    def decorator(view: AsyncView) -> AsyncView:
+        @wraps(view)
+        async def wrapper(
+            request: HttpRequest, *args, **kwargs
+        ) -> HttpResponse:
+            if request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+            return await view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+async_require_GET = async_require_http_methods(['GET'])
+async_require_POST = async_require_http_methods(['POST'])
+
+
+@async_login_required
+@async_require_GET
+@conditional_page(get_home_validators)
+async def home_view(request: HttpRequest) -> HttpResponse:
+    user = request.user
+    logger.debug(
+        'Received the request from User %s to access the home view.', user
+    )
+
+    exercises_page = await apaginate_by_keyset(
+        queryset=get_pending_exercises(user),
+        cursor=request.GET.get('exercises_cursor'),
+        page_size=HOME_FEED_PAGE_SIZE,
+    )
+    variations_page = await apaginate_by_keyset(
+        queryset=get_pending_exercise_variations(user),
+        cursor=request.GET.get('variations_cursor'),
+        page_size=HOME_FEED_PAGE_SIZE,
+    )
+    # Context processors may query:
+    return await sync_to_async(render_home)(
+        request, exercises_page, variations_page
+    )
+
+
+@async_login_required
+@async_require_GET
+@conditional_page(get_exercise_validators)
+async def retrieve_exercise_view(
+    request: HttpRequest, exercise_id: int
+) -> HttpResponse:
+    user = request.user
+    logger.debug(
+        'Received the request from user %s to retrieve the exercise %s',
+        user,
+        exercise_id,
+    )
+    exercise = await aget_object_or_404(
+        get_editable_exercises(user), id=exercise_id
+    )
+    return await sync_to_async(render_exercise_form)(
+        request, exercise, EditExerciseForm(exercise)
+    )
+
+
+@async_login_required
+@async_require_POST
+async def update_exercise_view(
+    request: HttpRequest, exercise_id: int
+) -> HttpResponse:
+    user = request.user
+    logger.debug(
+        'Received the request from user %s to update the exercise %s',
+        user,
+        exercise_id,
+    )
+    exercise = await aget_object_or_404(
+        get_editable_exercises(user), id=exercise_id
+    )
+    return await sync_to_async(save_exercise_form)(request, exercise)
+
+
+@async_login_required
+@async_require_GET
+async def retrieve_category_exercise_types_view(
+    request: HttpRequest, category_id: int
+) -> JsonResponse:
+    # The taxonomy may be read from the shared cache backend:
+    exercise_types = await sync_to_async(get_category_exercise_types)(
+        category_id
+    )
+    return JsonResponse(data=exercise_types, safe=False)
+
+
+@async_login_required
+@async_require_POST
+async def update_exercise_variation_view(
+    request: HttpRequest, exercise_variation_id: int
+) -> HttpResponse:
+    user = request.user
+    logger.debug(
+        'Received the request from user %s to update the exercise'
+        ' variation %s',
+        user,
+        exercise_variation_id,
+    )
+    exercise_variation = await aget_object_or_404(
+        get_editable_exercise_variations(user), id=exercise_variation_id
+    )
+    return await sync_to_async(save_exercise_variation_form)(
+        request, exercise_variation
+    )
+
+
+@async_login_required
+@async_require_GET
+@conditional_page(get_exercise_variation_validators)
+async def retrieve_exercise_variation_view(
+    request: HttpRequest, exercise_variation_id: int
+) -> HttpResponse:
+    user = request.user
+    logger.debug(
+        'Received the request from user %s to retrieve the exercise'
+        ' variation %s',
+        user,
+        exercise_variation_id,
+    )
+    exercise_variation = await aget_object_or_404(
+        get_editable_exercise_variations(user), id=exercise_variation_id
+    )
+    return await sync_to_async(render_exercise_variation_form)(
+        request,
+        exercise_variation,
+        EditExerciseVariationForm(exercise_variation),
+    )
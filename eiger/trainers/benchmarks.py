@@ -0,0 +1,600 @@
+"""
+Load benchmarks of the trainer views against a synthetic catalogue.
+
+`seed_benchmark_data` fills the database with users, each owning exercises
+with variations, most of them reviewed as in production.
+`run_benchmark` replays a weighted mix of requests to the trainer views and
+admin changelists, either in process through the Django test client, where
+the queries of every request are counted, or against a running server such
+as a local gunicorn. The report holds the p50/p95/p99 latencies and the
+queries per request of every scenario, plus the RSS of the serving process,
+and can be compared against a baseline report saved by a previous run.
+Requests to a server can be sent concurrently, in which case the report
+also holds the throughput and the peak of the connections held on the
+database server, to compare direct connections with PgBouncer.
+"""
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from itertools import cycle
+from typing import Callable, Iterable, Mapping, Sequence
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import HTTPRedirectHandler, Request, build_opener
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+
+from eiger.metrics import get_server_connections
+from eiger.trainers.counters import refresh_pending_review_counters
+from eiger.trainers.importers import batched
+from eiger.trainers.models import (
+    Category,
+    Exercise,
+    ExerciseType,
+    ExerciseVariation,
+)
+
+BENCHMARK_USERNAME_PREFIX = 'benchmark-'
+BENCHMARK_STAFF_USERNAME = f'{BENCHMARK_USERNAME_PREFIX}staff'
+BENCHMARK_NAME_PREFIX = 'Benchmark'
+BENCHMARK_HOST = 'localhost'
+SEED_BATCH_SIZE = 1000
+SEED_CATEGORIES = 4
+SEED_EXERCISE_TYPES_PER_CATEGORY = 5
+SEED_PENDING_EVERY = 10
+BENCHMARK_SESSION_USERS = 10
+DEFAULT_TOLERANCE = 0.2
+CONNECTIONS_SAMPLING_INTERVAL = 0.05
+PERCENTILES = (50, 95, 99)
+
+# Relative frequency of every scenario in the replayed mix:
+SCENARIO_WEIGHTS = {
+    'home': 30,
+    'retrieve exercise': 20,
+    'update exercise': 10,
+    'category exercise types': 20,
+    'admin exercises': 12,
+    'admin exercise variations': 8,
+}
+
+
+@dataclass(frozen=True)
+class BenchmarkRequest:
+    scenario: str
+    user_id: int
+    method: str
+    path: str
+    data: Mapping[str, object] | None = None
+
+
+@dataclass(frozen=True)
+class Sample:
+    scenario: str
+    status: int
+    seconds: float
+    queries: int | None
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    requests: int
+    errors: int
+    p50: float
+    p95: float
+    p99: float
+    mean_queries: float | None
+    max_queries: int | None
+
+
+@dataclass(frozen=True)
+class Regression:
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+
+    def __str__(self) -> str:
+        return (
+            f'{self.scenario}: {self.metric} went from {self.baseline} to'
+            f' {self.current}'
+        )
+
+
+class BenchmarkError(ValueError):
+    """Raised when the benchmark can't run against the database."""
+
+
+def seed_benchmark_data(users: int, exercises: int, variations: int) -> int:
+    """
+    Create `users` users owning `exercises` exercises with `variations`.
+
+    One exercise in `SEED_PENDING_EVERY` is left pending with its
+    variations. A staff user is created as well, for the admin changelists.
+    Returns the number of exercises created.
+    """
+    user_model = get_user_model()
+    with transaction.atomic():
+        # The benchmark logs the users in without a password:
+        password = make_password(None)
+        authors = user_model.objects.bulk_create(
+            user_model(
+                username=f'{BENCHMARK_USERNAME_PREFIX}{index}',
+                password=password,
+            )
+            for index in range(users)
+        )
+        user_model.objects.create(
+            username=BENCHMARK_STAFF_USERNAME, is_staff=True, is_superuser=True
+        )
+        colors = cycle(color for color, _ in Category.COLOR_PALETTE)
+        categories = Category.objects.bulk_create(
+            Category(name=f'{BENCHMARK_NAME_PREFIX} {index}', color=color)
+            for index, color in zip(range(SEED_CATEGORIES), colors)
+        )
+        exercise_types = ExerciseType.objects.bulk_create(
+            ExerciseType(
+                category=categories[index % SEED_CATEGORIES],
+                name=f'{BENCHMARK_NAME_PREFIX} {index}',
+            )
+            for index in range(
+                SEED_CATEGORIES * SEED_EXERCISE_TYPES_PER_CATEGORY
+            )
+        )
+        total = users * exercises
+        for batch in batched(range(total), SEED_BATCH_SIZE):
+            created = Exercise.objects.bulk_create(
+                Exercise(
+                    name=f'{BENCHMARK_NAME_PREFIX} exercise {index}',
+                    description=(
+                        f'Description of the benchmark exercise {index}.'
+                    ),
+                    exercise_type=exercise_types[index % len(exercise_types)],
+                    created_by=authors[index % users],
+                    reviewed=index % SEED_PENDING_EVERY != 0,
+                )
+                for index in batch
+            )
+            _seed_variations(created, variations)
+        refresh_pending_review_counters(author.id for author in authors)
+    return total
+
+
+def _seed_variations(exercises: Sequence[Exercise], variations: int) -> None:
+    if not variations:
+        return
+    # The number of sets tells the variations of an exercise apart:
+    ExerciseVariation.objects.bulk_create(
+        (
+            ExerciseVariation(
+                exercise=exercise,
+                sets=sets,
+                created_by=exercise.created_by,
+                reviewed=exercise.reviewed,
+            )
+            for exercise in exercises
+            for sets in range(1, variations + 1)
+        ),
+        batch_size=SEED_BATCH_SIZE,
+    )
+
+
+def flush_benchmark_data() -> int:
+    """Delete the benchmark users, their entries and the taxonomy."""
+    with transaction.atomic():
+        deleted, _ = (
+            get_user_model()
+            .objects.filter(username__startswith=BENCHMARK_USERNAME_PREFIX)
+            .delete()
+        )
+        Category.objects.filter(
+            name__startswith=f'{BENCHMARK_NAME_PREFIX} '
+        ).delete()
+    return deleted
+
+
+def build_request_mix(size: int, seed: int = 0) -> list[BenchmarkRequest]:
+    """
+    Draw `size` requests to the views, as made by the benchmark users.
+
+    The draws only depend on `seed` and the seeded data, so the same mix is
+    replayed by every run compared against a baseline.
+    """
+    rng = random.Random(seed)
+    user_model = get_user_model()
+    staff = user_model.objects.filter(
+        username=BENCHMARK_STAFF_USERNAME
+    ).first()
+    user_ids = list(
+        user_model.objects.filter(
+            username__startswith=BENCHMARK_USERNAME_PREFIX, is_staff=False
+        )
+        .order_by('id')
+        .values_list('id', flat=True)[:BENCHMARK_SESSION_USERS]
+    )
+    if staff is None or not user_ids:
+        raise BenchmarkError(
+            'No benchmark data found, run `seed_benchmark_data` first.'
+        )
+    pending_exercises: dict[int, list[Exercise]] = {}
+    for exercise in Exercise.objects.filter(
+        created_by_id__in=user_ids, reviewed=False
+    ).order_by('id'):
+        pending_exercises.setdefault(exercise.created_by_id, []).append(
+            exercise
+        )
+    category_ids = list(
+        Category.objects.order_by('id').values_list('id', flat=True)
+    )
+
+    builders: dict[str, Callable[[int], BenchmarkRequest | None]] = {
+        'home': lambda user_id: BenchmarkRequest(
+            'home', user_id, 'GET', reverse('home')
+        ),
+        'retrieve exercise': lambda user_id: (
+            _retrieve_exercise_request(
+                user_id, rng.choice(pending_exercises[user_id])
+            )
+            if pending_exercises.get(user_id)
+            else None
+        ),
+        'update exercise': lambda user_id: (
+            _update_exercise_request(
+                user_id, rng.choice(pending_exercises[user_id])
+            )
+            if pending_exercises.get(user_id)
+            else None
+        ),
+        'category exercise types': lambda user_id: BenchmarkRequest(
+            'category exercise types',
+            user_id,
+            'GET',
+            reverse(
+                'retrieve_category_exercise_types',
+                args=(rng.choice(category_ids),),
+            ),
+        ),
+        'admin exercises': lambda _: BenchmarkRequest(
+            'admin exercises',
+            staff.id,
+            'GET',
+            reverse('admin:trainers_exercise_changelist'),
+        ),
+        'admin exercise variations': lambda _: BenchmarkRequest(
+            'admin exercise variations',
+            staff.id,
+            'GET',
+            reverse('admin:trainers_exercisevariation_changelist'),
+        ),
+    }
+    scenarios = list(SCENARIO_WEIGHTS)
+    weights = list(SCENARIO_WEIGHTS.values())
+    requests: list[BenchmarkRequest] = []
+    while len(requests) < size:
+        scenario = rng.choices(scenarios, weights)[0]
+        request = builders[scenario](rng.choice(user_ids))
+        if request is not None:
+            requests.append(request)
+    return requests
+
+
+def _retrieve_exercise_request(
+    user_id: int, exercise: Exercise
+) -> BenchmarkRequest:
+    return BenchmarkRequest(
+        'retrieve exercise',
+        user_id,
+        'GET',
+        reverse('retrieve_exercise', args=(exercise.id,)),
+    )
+
+
+def _update_exercise_request(
+    user_id: int, exercise: Exercise
+) -> BenchmarkRequest:
+    # The exercise is saved unchanged, so replays don't alter the catalogue:
+    return BenchmarkRequest(
+        'update exercise',
+        user_id,
+        'POST',
+        reverse('update_exercise', args=(exercise.id,)),
+        data={
+            'name': exercise.name,
+            'exercise_type': exercise.exercise_type_id,
+            'description': exercise.description,
+        },
+    )
+
+
+class ClientRunner(object):
+    """Send the requests in process, counting the queries of each one."""
+
+    def __init__(self) -> None:
+        self._clients: dict[int, Client] = {}
+
+    def _get_client(self, user_id: int) -> Client:
+        if user_id not in self._clients:
+            client = Client(HTTP_HOST=BENCHMARK_HOST)
+            client.force_login(get_user_model().objects.get(id=user_id))
+            self._clients[user_id] = client
+        return self._clients[user_id]
+
+    def prepare(self, request: BenchmarkRequest) -> None:
+        self._get_client(request.user_id)
+
+    def send(self, request: BenchmarkRequest) -> Sample:
+        client = self._get_client(request.user_id)
+        send = client.post if request.method == 'POST' else client.get
+        with CaptureQueriesContext(connection) as queries:
+            started_at = time.perf_counter()
+            response = send(request.path, request.data)
+            seconds = time.perf_counter() - started_at
+        return Sample(
+            request.scenario, response.status_code, seconds, len(queries)
+        )
+
+    def get_rss_kb(self) -> int | None:
+        return read_rss_kb(os.getpid())
+
+
+class _NoRedirectHandler(HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs) -> None:  # type: ignore
+        return None
+
+
+class HTTPRunner(object):
+    """
+    Send the requests to a running server, such as a local gunicorn.
+
+    The sessions are created in the database shared with the server, and
+    the queries can't be counted from here. `server_pid` is the process
+    whose RSS is reported, usually the gunicorn master or its only worker.
+    """
+
+    def __init__(self, base_url: str, server_pid: int | None = None) -> None:
+        self._base_url = base_url.rstrip('/')
+        self._server_pid = server_pid
+        self._sessions: dict[int, tuple[str, str]] = {}
+
+    def _get_cookies(self, user_id: int) -> tuple[str, str]:
+        if user_id not in self._sessions:
+            client = Client()
+            client.force_login(get_user_model().objects.get(id=user_id))
+            session = client.cookies[settings.SESSION_COOKIE_NAME].value
+            self._sessions[user_id] = (session, get_random_string(32))
+        return self._sessions[user_id]
+
+    def prepare(self, request: BenchmarkRequest) -> None:
+        # The sessions are created upfront, the concurrent sends only talk
+        # to the server:
+        self._get_cookies(request.user_id)
+
+    def send(self, request: BenchmarkRequest) -> Sample:
+        session, csrf_token = self._get_cookies(request.user_id)
+        http_request = Request(
+            f'{self._base_url}{request.path}',
+            data=(
+                urlencode(request.data).encode()
+                if request.data is not None
+                else None
+            ),
+            method=request.method,
+            headers={
+                'Cookie': (
+                    f'{settings.SESSION_COOKIE_NAME}={session};'
+                    f' {settings.CSRF_COOKIE_NAME}={csrf_token}'
+                ),
+                'X-CSRFToken': csrf_token,
+                'Referer': self._base_url,
+            },
+        )
+        opener = build_opener(_NoRedirectHandler())
+        started_at = time.perf_counter()
+        try:
+            with opener.open(http_request) as response:
+                response.read()
+                status = response.status
+        except HTTPError as error:
+            status = error.code
+        seconds = time.perf_counter() - started_at
+        return Sample(request.scenario, status, seconds, None)
+
+    def get_rss_kb(self) -> int | None:
+        if self._server_pid is None:
+            return None
+        return read_rss_kb(self._server_pid)
+
+
+def read_rss_kb(pid: int) -> int | None:
+    """Read the resident set size of the process, on Linux only."""
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def percentile(values: Sequence[float], rank: int) -> float:
+    """Nearest-rank percentile of the sorted values."""
+    index = max(math.ceil(rank / 100 * len(values)) - 1, 0)
+    return values[index]
+
+
+def summarise(samples: Iterable[Sample]) -> dict[str, ScenarioResult]:
+    by_scenario: dict[str, list[Sample]] = {}
+    for sample in samples:
+        by_scenario.setdefault(sample.scenario, []).append(sample)
+
+    results = {}
+    for scenario, scenario_samples in sorted(by_scenario.items()):
+        milliseconds = sorted(
+            sample.seconds * 1000 for sample in scenario_samples
+        )
+        queries = [
+            sample.queries
+            for sample in scenario_samples
+            if sample.queries is not None
+        ]
+        p50, p95, p99 = (
+            round(percentile(milliseconds, rank), 2) for rank in PERCENTILES
+        )
+        results[scenario] = ScenarioResult(
+            requests=len(scenario_samples),
+            errors=sum(sample.status >= 400 for sample in scenario_samples),
+            p50=p50,
+            p95=p95,
+            p99=p99,
+            mean_queries=(
+                round(sum(queries) / len(queries), 2) if queries else None
+            ),
+            max_queries=max(queries) if queries else None,
+        )
+    return results
+
+
+class ConnectionsSampler(object):
+    """
+    Sample the connections held on the database server in a thread.
+
+    Used as a context manager around the measured requests, it records the
+    connections before them and the most held at once while they run.
+    """
+
+    def __init__(
+        self, interval: float = CONNECTIONS_SAMPLING_INTERVAL
+    ) -> None:
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._sample)
+        self.before = self.peak = self.max_connections = 0
+
+    def __enter__(self) -> 'ConnectionsSampler':
+        counts = get_server_connections()
+        self.max_connections = counts.pop('max')
+        self.before = self.peak = sum(counts.values())
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _sample(self) -> None:
+        try:
+            while not self._stopped.wait(self._interval):
+                counts = get_server_connections()
+                counts.pop('max')
+                self.peak = max(self.peak, sum(counts.values()))
+        finally:
+            connections.close_all()
+
+
+def run_benchmark(
+    runner: ClientRunner | HTTPRunner,
+    requests: Sequence[BenchmarkRequest],
+    warmup: int = 0,
+    concurrency: int = 1,
+) -> dict[str, object]:
+    """
+    Replay the requests and build the report of the run.
+
+    The first `warmup` requests fill the caches and connection pools and
+    aren't measured. The others are sent by `concurrency` threads, which
+    only an `HTTPRunner` supports, as the test client isn't thread-safe.
+    """
+    if concurrency > 1 and not isinstance(runner, HTTPRunner):
+        raise BenchmarkError('Only requests to a server can be concurrent.')
+    for request in requests[:warmup]:
+        runner.send(request)
+    for request in requests[warmup:]:
+        runner.prepare(request)
+    with ConnectionsSampler() as sampler:
+        started_at = time.perf_counter()
+        if concurrency > 1:
+            with ThreadPoolExecutor(concurrency) as executor:
+                samples = list(executor.map(runner.send, requests[warmup:]))
+        else:
+            samples = [runner.send(request) for request in requests[warmup:]]
+        seconds = time.perf_counter() - started_at
+    return {
+        'requests': len(samples),
+        'concurrency': concurrency,
+        'requests_per_second': round(len(samples) / seconds, 2),
+        'db_connections': {
+            'before': sampler.before,
+            'peak': sampler.peak,
+            'max': sampler.max_connections,
+        },
+        'rss_kb': runner.get_rss_kb(),
+        'scenarios': {
+            scenario: asdict(result)
+            for scenario, result in summarise(samples).items()
+        },
+    }
+
+
+def compare_with_baseline(
+    report: Mapping[str, object],
+    baseline: Mapping[str, object],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[Regression]:
+    """
+    List the metrics of the report that regressed from the baseline.
+
+    Latencies and RSS regress when they grow by more than `tolerance`, as
+    they vary between runs, but any new query per request is a regression.
+    """
+    regressions = []
+    scenarios: Mapping[str, Mapping[str, float]] = report[
+        'scenarios'
+    ]  # type: ignore[assignment]
+    baseline_scenarios: Mapping[str, Mapping[str, float]] = baseline[
+        'scenarios'
+    ]  # type: ignore[assignment]
+    for scenario, result in scenarios.items():
+        expected = baseline_scenarios.get(scenario)
+        if expected is None:
+            continue
+        for metric in ('p50', 'p95', 'p99'):
+            if result[metric] > expected[metric] * (1 + tolerance):
+                regressions.append(
+                    Regression(
+                        scenario, metric, expected[metric], result[metric]
+                    )
+                )
+        if (
+            result['max_queries'] is not None
+            and expected['max_queries'] is not None
+            and result['max_queries'] > expected['max_queries']
+        ):
+            regressions.append(
+                Regression(
+                    scenario,
+                    'max_queries',
+                    expected['max_queries'],
+                    result['max_queries'],
+                )
+            )
+    rss_kb, baseline_rss_kb = report['rss_kb'], baseline['rss_kb']
+    if (
+        isinstance(rss_kb, int)
+        and isinstance(baseline_rss_kb, int)
+        and rss_kb > baseline_rss_kb * (1 + tolerance)
+    ):
+        regressions.append(
+            Regression('process', 'rss_kb', baseline_rss_kb, rss_kb)
+        )
+    return regressions
@@ -0,0 +1,234 @@
+"""
+Conditional GET of the home and edit pages.
+
+The pages only change with the pending entries of the user, the exercise
+types listed by the forms and the CSRF secret embedded in the forms, so
+`conditional_page` reads a validator of that state, with a single query,
+and answers `304 Not Modified` when it matches the `If-None-Match` or
+`If-Modified-Since` headers, before any form is built or template
+rendered. Otherwise the view runs and its response gets the `ETag` and
+`Last-Modified` headers.
+The validators are computed for `request.user`, so the decorator is applied
+under `login_required`: anonymous users are redirected first, and a
+browser shared by several users never revalidates a page of another one.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from functools import wraps
+from http import HTTPStatus
+from typing import Callable, TypeVar
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Greatest
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from eiger.trainers.models import Exercise, ExerciseVariation
+from eiger.trainers.taxonomy import get_taxonomy
+
+_VALIDATED_STATUSES = frozenset((HTTPStatus.OK, HTTPStatus.NOT_MODIFIED))
+
+_ViewT = TypeVar('_ViewT', bound=Callable[..., object])
+
+
+@dataclass(frozen=True)
+class PageValidators:
+    # Values the rendered page depends on, hashed into the ETag, including
+    # the taxonomy version as the cards and forms list the exercise types:
+    version: tuple[object, ...]
+    last_modified: datetime | None = None
+
+
+ValidatorsGetter = Callable[..., PageValidators | None]
+
+
+def make_etag(request: HttpRequest, version: tuple[object, ...]) -> str:
+    """
+    Build a weak ETag of the page version, for the user and CSRF secret.
+
+    Rendering a form issues the CSRF cookie of a new client, so the ETag of
+    a rendered page is built once the view has run.
+    """
+    digest = hashlib.md5(
+        ':'.join(
+            str(part)
+            for part in (
+                request.user.pk,
+                request.META.get('CSRF_COOKIE', ''),
+                *version,
+            )
+        ).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    # The masked CSRF tokens differ on every render, hence a weak ETag:
+    return f'W/"{digest}"'
+
+
+def _pending_subqueries(
+    model: type[Exercise | ExerciseVariation], *updated_at_fields: str
+) -> tuple[Subquery, Subquery]:
+    pending = (
+        model.objects.filter(created_by=OuterRef('pk'), reviewed=False)
+        .order_by()
+        .values('created_by')
+    )
+    latest = (
+        Greatest(*updated_at_fields)
+        if len(updated_at_fields) > 1
+        else updated_at_fields[0]
+    )
+    return (
+        Subquery(pending.annotate(total=Count('id')).values('total')),
+        Subquery(pending.annotate(latest=Max(latest)).values('latest')),
+    )
+
+
+def get_home_validators(request: HttpRequest) -> PageValidators:
+    """
+    Validate the pending entries of the user.
+
+    The counts catch the deleted and reviewed entries, which don't change
+    the latest `updated_at` of the remaining ones. The counter is refreshed
+    with them, so it moves `Last-Modified` too.
+    """
+    exercises_total, exercises_latest = _pending_subqueries(
+        Exercise, 'updated_at'
+    )
+    variations_total, variations_latest = _pending_subqueries(
+        ExerciseVariation, 'updated_at', 'exercise__updated_at'
+    )
+    state = (
+        get_user_model()
+        .objects.filter(pk=request.user.pk)
+        .values_list(
+            exercises_total,
+            exercises_latest,
+            variations_total,
+            variations_latest,
+            'pending_review_counter__updated_at',
+        )
+        .get()
+    )
+    return PageValidators(
+        version=(get_taxonomy().version, *state),
+        last_modified=max(
+            (
+                timestamp
+                for timestamp in (state[1], state[3], state[4])
+                if timestamp
+            ),
+            default=None,
+        ),
+    )
+
+
+def get_exercise_validators(
+    request: HttpRequest, exercise_id: int
+) -> PageValidators | None:
+    updated_at = (
+        Exercise.objects.filter(
+            id=exercise_id, created_by=request.user, reviewed=False
+        )
+        .values_list('updated_at', flat=True)
+        .first()
+    )
+    if updated_at is None:
+        return None
+    return PageValidators(
+        version=(get_taxonomy().version, exercise_id, updated_at),
+        last_modified=updated_at,
+    )
+
+
+def get_exercise_variation_validators(
+    request: HttpRequest, exercise_variation_id: int
+) -> PageValidators | None:
+    updated_at = (
+        ExerciseVariation.objects.filter(
+            id=exercise_variation_id, created_by=request.user, reviewed=False
+        )
+        .values_list(Greatest('updated_at', 'exercise__updated_at'), flat=True)
+        .first()
+    )
+    if updated_at is None:
+        return None
+    return PageValidators(
+        version=(get_taxonomy().version, exercise_variation_id, updated_at),
+        last_modified=updated_at,
+    )
+
+
+def _set_validators(
+    request: HttpRequest,
+    response: HttpResponse,
+    validators: PageValidators | None,
+) -> HttpResponse:
+    if validators is None or response.status_code not in _VALIDATED_STATUSES:
+        return response
+    response.headers.setdefault('ETag', make_etag(request, validators.version))
+    if validators.last_modified:
+        response.headers.setdefault(
+            'Last-Modified', http_date(validators.last_modified.timestamp())
+        )
+    # Revalidated on every visit and never stored by shared caches:
+    response.headers.setdefault('Cache-Control', 'private, no-cache')
+    return response
+
+
+def _not_modified(
+    request: HttpRequest, validators: PageValidators | None
+) -> HttpResponse | None:
+    if validators is None:
+        # Missing entries are left to the view, which answers 404:
+        return None
+    return get_conditional_response(
+        request,
+        etag=make_etag(request, validators.version),
+        last_modified=(
+            int(validators.last_modified.timestamp())
+            if validators.last_modified
+            else None
+        ),
+    )
+
+
+def conditional_page(get_validators: ValidatorsGetter) -> Callable:
+    """
+    Answer the GET requests whose validators match with `304`.
+
+    Like Django's `condition`, but the validators are read once per request
+    and the decorator wraps both the sync and the async views.
+    """
+
+    def decorator(view: _ViewT) -> _ViewT:
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(
+                request: HttpRequest, *args, **kwargs
+            ) -> HttpResponse:
+                validators = await sync_to_async(get_validators)(
+                    request, *args, **kwargs
+                )
+                response = _not_modified(request, validators)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _set_validators(request, response, validators)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @wraps(view)
+        def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            validators = get_validators(request, *args, **kwargs)
+            response = _not_modified(request, validators)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _set_validators(request, response, validators)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,20 @@
+from django.http import HttpRequest
+from django.utils.functional import SimpleLazyObject
+
+from eiger.trainers.counters import get_pending_review_counter
+
+
+def pending_review_counter(request: HttpRequest) -> dict[str, object]:
+    """
+    Add the pending review counter of the authenticated user.
+
+    The counter is only fetched when a template renders it.
+    """
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+    return {
+        'pending_review_counter': SimpleLazyObject(
+            lambda: get_pending_review_counter(user.pk)
+        )
+    }
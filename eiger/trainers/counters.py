@@ -0,0 +1,140 @@
+"""
+Denormalised per-user counters of the entries waiting for a review.
+
+Counting the pending exercises and variations of a user on every page
+would scan both tables, so the counts are kept in `PendingReviewCounter`.
+Saving or deleting an entry applies its delta to the counter with an
+`UPDATE` of the counter row, whatever the number of entries of the user.
+The bulk writes, which bypass the signals, recompute the counters of the
+affected users from the indexed `created_by` columns instead. Deltas drift
+whenever an update path is missed, so the `reconcile_pending_counters`
+command, also run periodically as a task, repairs any remaining drift.
+"""
+from datetime import datetime
+from typing import Iterable
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from eiger.trainers.models import (
+    Exercise,
+    ExerciseVariation,
+    PendingReviewCounter,
+)
+from eiger.trainers.tasks import task
+
+COUNTER_FIELDS = ('pending_exercises', 'pending_variations')
+COUNTER_FIELD_BY_MODEL = dict(
+    zip((Exercise, ExerciseVariation), COUNTER_FIELDS)
+)
+
+
+def compute_pending_review_counters(
+    user_ids: Iterable[int],
+) -> dict[int, PendingReviewCounter]:
+    """Count the pending entries of the users, without saving anything."""
+    counters = {
+        user_id: PendingReviewCounter(user_id=user_id) for user_id in user_ids
+    }
+    if not counters:
+        return counters
+
+    for model, field_name in zip(
+        (Exercise, ExerciseVariation), COUNTER_FIELDS
+    ):
+        rows = (
+            model.objects.filter(created_by_id__in=counters)
+            .values('created_by_id')
+            .annotate(
+                pending=Count('id', filter=Q(reviewed=False)),
+                last_submitted_at=Max('created_at'),
+            )
+            .order_by()
+        )
+        for row in rows:
+            counter = counters[row['created_by_id']]
+            setattr(counter, field_name, row['pending'])
+            counter.last_submitted_at = max(
+                filter(
+                    None, (counter.last_submitted_at, row['last_submitted_at'])
+                ),
+                default=None,
+            )
+    return counters
+
+
+def save_pending_review_counters(
+    counters: Iterable[PendingReviewCounter],
+) -> None:
+    PendingReviewCounter.objects.bulk_create(
+        counters,
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=[*COUNTER_FIELDS, 'last_submitted_at', 'updated_at'],
+    )
+
+
+def refresh_pending_review_counters(user_ids: Iterable[int | None]) -> None:
+    """
+    Recompute and save the counters of the users.
+
+    The users are locked first, so concurrent refreshes of the same user
+    are serialised and the last one always counts the committed entries.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    with transaction.atomic():
+        locked_user_ids = list(
+            get_user_model()
+            .objects.select_for_update()
+            .filter(id__in=user_ids)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        counters = compute_pending_review_counters(locked_user_ids)
+        save_pending_review_counters(counters.values())
+
+
+def apply_pending_review_delta(
+    user_id: int | None,
+    field_name: str,
+    delta: int,
+    submitted_at: datetime | None = None,
+) -> None:
+    """
+    Add `delta` to a counter of the user and record the submission time.
+
+    A user without a counter yet gets one recomputed from their entries,
+    unless the delta removes an entry. A counter never goes below zero.
+    """
+    if user_id is None:
+        return
+    updates: dict[str, object] = {'updated_at': timezone.now()}
+    if delta:
+        updates[field_name] = Greatest(F(field_name) + delta, 0)
+    if submitted_at is not None:
+        # `GREATEST` ignores the `NULL` of a user without submissions:
+        updates['last_submitted_at'] = Greatest(
+            'last_submitted_at', Value(submitted_at)
+        )
+    updated = PendingReviewCounter.objects.filter(user_id=user_id).update(
+        **updates
+    )
+    if not updated and (delta > 0 or submitted_at is not None):
+        refresh_pending_review_counters([user_id])
+
+
+def get_pending_review_counter(user_id: int) -> PendingReviewCounter:
+    """Return the saved counter of the user, or an empty one."""
+    counter = PendingReviewCounter.objects.filter(user_id=user_id).first()
+    return counter or PendingReviewCounter(user_id=user_id)
+
+
+@task
+def reconcile_pending_counters() -> None:
+    call_command('reconcile_pending_counters')
@@ -0,0 +1,235 @@
+"""
+Streaming export of the reviewed exercises catalogue.
+
+Reviewed exercises are iterated through a server-side cursor, or by pages
+of ids behind PgBouncer where those are disabled, with their reviewed
+variations prefetched chunk by chunk, and encoded on the fly, so neither
+the command nor the view ever holds the whole catalogue in memory.
+Rows use the columns read by the importer, plus the ids of the entries:
+
+    exercise_id,name,exercise_type,category,...,variation_id,sets,...
+
+Exercises without reviewed variations are exported as a single row with
+empty variation columns.
+"""
+import csv
+import json
+import zlib
+from typing import Iterable, Iterator, Protocol
+
+from django.db import connections
+from django.db.models import Prefetch, QuerySet
+
+from eiger.trainers.importers import VARIATION_FIELDS, batched
+from eiger.trainers.models import Exercise, ExerciseVariation
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'columnar')
+EXPORT_COMPRESSIONS = ('none', 'gzip', 'brotli')
+DEFAULT_CHUNK_SIZE = 2000
+COLUMNAR_FORMAT_VERSION = 1
+
+EXPORT_COLUMNS = (
+    'exercise_id',
+    'name',
+    'exercise_type',
+    'category',
+    'description',
+    'should_add_weight',
+    'variation_id',
+    *VARIATION_FIELDS,
+)
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'columnar': 'application/x-ndjson',
+    # Compressed exports are downloaded as archives, not decoded in transit:
+    'gzip': 'application/gzip',
+    'brotli': 'application/x-brotli',
+}
+FILE_EXTENSIONS = {
+    'csv': 'csv',
+    'jsonl': 'jsonl',
+    'columnar': 'columnar.jsonl',
+    'gzip': 'gz',
+    'brotli': 'br',
+}
+
+ExportRow = tuple[object, ...]
+
+
+class ExportError(ValueError):
+    """Raised when an export can't be produced with the given options."""
+
+
+def check_export_options(file_format: str, compression: str) -> None:
+    if file_format not in EXPORT_FORMATS:
+        raise ExportError(f'Invalid export format {file_format!r}.')
+    if compression not in EXPORT_COMPRESSIONS:
+        raise ExportError(f'Invalid compression {compression!r}.')
+    if compression == 'brotli' and brotli is None:
+        raise ExportError('The brotli compression requires `brotli`.')
+
+
+def get_content_type(file_format: str, compression: str) -> str:
+    return CONTENT_TYPES[file_format if compression == 'none' else compression]
+
+
+def get_export_filename(file_format: str, compression: str) -> str:
+    filename = f'catalogue.{FILE_EXTENSIONS[file_format]}'
+    if compression != 'none':
+        filename = f'{filename}.{FILE_EXTENSIONS[compression]}'
+    return filename
+
+
+def iter_catalogue_rows(
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[ExportRow]:
+    """Yield the reviewed catalogue as tuples ordered like `EXPORT_COLUMNS`."""
+    exercises = (
+        Exercise.objects.filter(reviewed=True)
+        .select_related('exercise_type__category')
+        .prefetch_related(
+            Prefetch(
+                'exercisevariation_set',
+                queryset=ExerciseVariation.objects.filter(
+                    reviewed=True
+                ).order_by('id'),
+                to_attr='reviewed_variations',
+            )
+        )
+        .order_by('id')
+    )
+    for exercise in _iter_exercises(exercises, chunk_size):
+        exercise_columns = (
+            exercise.id,
+            exercise.name,
+            exercise.exercise_type.name,
+            exercise.exercise_type.category.name,
+            exercise.description,
+            exercise.should_add_weight,
+        )
+        variations = exercise.reviewed_variations  # type: ignore[attr-defined]
+        if not variations:
+            yield (*exercise_columns, *(None,) * (len(VARIATION_FIELDS) + 1))
+        for variation in variations:
+            yield (
+                *exercise_columns,
+                variation.id,
+                *(getattr(variation, name) for name in VARIATION_FIELDS),
+            )
+
+
+def _iter_exercises(
+    exercises: QuerySet[Exercise], chunk_size: int
+) -> Iterator[Exercise]:
+    if not connections[exercises.db].settings_dict[
+        'DISABLE_SERVER_SIDE_CURSORS'
+    ]:
+        yield from exercises.iterator(chunk_size=chunk_size)
+        return
+    # Without server-side cursors `.iterator()` would fetch every row at
+    # once, so the exercises are read by pages of ascending ids instead:
+    last_id = 0
+    while page := list(exercises.filter(id__gt=last_id)[:chunk_size]):
+        yield from page
+        last_id = page[-1].id
+
+
+class _Echo(object):
+    """File-like object returning what is written, for `csv.writer`."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def encode_csv(rows: Iterable[ExportRow]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def encode_jsonl(rows: Iterable[ExportRow]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, row))) + '\n'
+
+
+def encode_columnar(
+    rows: Iterable[ExportRow], block_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Encode the rows as blocks of columns, one JSON document per line.
+
+    The first line describes the columns, every following one holds a block
+    of at most `block_size` rows stored column by column, which compresses
+    much better than rows and lets readers load only the columns they need.
+    """
+    yield json.dumps(
+        {'version': COLUMNAR_FORMAT_VERSION, 'columns': EXPORT_COLUMNS}
+    ) + '\n'
+    for block in batched(rows, block_size):
+        columns = [list(column) for column in zip(*block)]
+        yield json.dumps({'rows': len(block), 'data': columns}) + '\n'
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        ...  # pragma: no cover
+
+    def flush(self) -> bytes:
+        ...  # pragma: no cover
+
+
+class _BrotliCompressor(object):
+    """Expose `brotli.Compressor` through the `zlib` compressor interface."""
+
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def _compress(
+    chunks: Iterable[bytes], compressor: _Compressor
+) -> Iterator[bytes]:
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def export_catalogue(
+    file_format: str,
+    compression: str = 'none',
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Stream the reviewed catalogue encoded and compressed as requested.
+
+    The encoded rows are joined by chunks of `chunk_size`, so the response
+    is written with a few large writes instead of one per row.
+    """
+    check_export_options(file_format, compression)
+    rows = iter_catalogue_rows(chunk_size=chunk_size)
+    if file_format == 'csv':
+        text = encode_csv(rows)
+    elif file_format == 'jsonl':
+        text = encode_jsonl(rows)
+    else:
+        text = encode_columnar(rows, block_size=chunk_size)
+    chunks = (''.join(batch).encode() for batch in batched(text, chunk_size))
+
+    if compression == 'gzip':
+        return _compress(chunks, zlib.compressobj(wbits=16 + zlib.MAX_WBITS))
+    if compression == 'brotli':
+        return _compress(chunks, _BrotliCompressor())
+    return chunks
@@ -0,0 +1,79 @@
+"""
+Flash state of the index forms.
+
+A failed login or registration redirects to the index, which renders the
+form errors again. They are carried by a short-lived signed cookie, read
+and deleted by the next index request, instead of the session: saving them
+there wrote a database session row for every failed attempt, flushed by the
+following page view, which bots hitting the forms turned into a steady
+stream of writes. The cookie is signed, not encrypted, so the passwords
+never leave the form.
+"""
+import json
+from typing import TypedDict
+
+from django import forms
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+FORM_STATE_COOKIE_NAME = 'eiger_form_state'
+FORM_STATE_SALT = 'eiger.trainers.flash'
+# Only read by the redirect that follows the failed form:
+FORM_STATE_MAX_AGE = 60
+
+
+class ContextData(TypedDict):
+    cleaned_data: dict[str, str]
+    errors: dict[str, list[str]]
+
+
+class Context(TypedDict):
+    registration: ContextData | None
+    login: ContextData | None
+
+
+def get_form_context_data(form: forms.Form) -> ContextData:
+    return {
+        'cleaned_data': {
+            field: value
+            for field, value in form.cleaned_data.items()
+            if not isinstance(form.fields[field].widget, forms.PasswordInput)
+        },
+        'errors': {
+            field: list(errors) for field, errors in form.errors.items()
+        },
+    }
+
+
+def set_form_state(response: HttpResponse, context: Context) -> None:
+    response.set_signed_cookie(
+        FORM_STATE_COOKIE_NAME,
+        json.dumps(context),
+        salt=FORM_STATE_SALT,
+        max_age=FORM_STATE_MAX_AGE,
+        secure=settings.SESSION_COOKIE_SECURE,
+        httponly=True,
+        samesite='Lax',
+    )
+
+
+def get_form_state(request: HttpRequest) -> Context:
+    """Return the flashed state, or an empty one if missing or tampered."""
+    empty_context: Context = {'registration': None, 'login': None}
+    value = request.get_signed_cookie(
+        FORM_STATE_COOKIE_NAME,
+        default=None,
+        salt=FORM_STATE_SALT,
+        max_age=FORM_STATE_MAX_AGE,
+    )
+    if value is None:
+        return empty_context
+    try:
+        return json.loads(value)
+    except ValueError:
+        return empty_context
+
+
+def clear_form_state(request: HttpRequest, response: HttpResponse) -> None:
+    if FORM_STATE_COOKIE_NAME in request.COOKIES:
+        response.delete_cookie(FORM_STATE_COOKIE_NAME, samesite='Lax')
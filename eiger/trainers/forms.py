@@ -1,10 +1,15 @@
+from typing import Iterator
+
 from django import forms
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
+from eiger.trainers.importers import IMPORT_FORMATS
 from eiger.trainers.models import Exercise, ExerciseType, ExerciseVariation
+from eiger.trainers.taxonomy import get_taxonomy
 
 
 class TrainerLoginForm(AuthenticationForm):
@@ -30,13 +35,81 @@ class TrainerCreationForm(UserCreationForm[User]):
         return user
 
 
+class TaxonomyChoiceIterator(object):
+    """Lazily yields the exercise type choices from the taxonomy cache."""
+
+    def __init__(self, field: 'ExerciseTypeChoiceField') -> None:
+        self.field = field
+
+    def __iter__(self) -> Iterator[tuple[int | str, str]]:
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for exercise_type in get_taxonomy().exercise_types:
+            yield (exercise_type.id, str(exercise_type))
+
+
+class ExerciseTypeChoiceField(
+    forms.ModelChoiceField  # type: ignore[type-arg]
+):
+    """
+    `ModelChoiceField` backed by the taxonomy cache instead of a queryset.
+
+    Both the rendered choices and the submitted value are resolved from the
+    cached taxonomy, so neither GET nor POST query the exercise types.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(queryset=ExerciseType.objects.none(), **kwargs)
+
+    def _get_choices(self) -> TaxonomyChoiceIterator:
+        return TaxonomyChoiceIterator(self)
+
+    choices = property(  # type: ignore[assignment]
+        _get_choices, forms.ChoiceField._set_choices
+    )
+
+    def to_python(self, value: object) -> ExerciseType | None:
+        if value in self.empty_values:
+            return None
+        if isinstance(value, ExerciseType):
+            value = value.pk
+        try:
+            exercise_type = get_taxonomy().get_exercise_type(
+                int(value)  # type: ignore[call-overload]
+            )
+        except (TypeError, ValueError):
+            exercise_type = None
+        if exercise_type is None:
+            raise forms.ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return exercise_type.to_model()
+
+
 class EditExerciseForm(forms.ModelForm[Exercise]):
+    exercise_type = ExerciseTypeChoiceField(
+        widget=forms.Select(attrs={'class': 'form-control'}),
+        error_messages={
+            'required': _('Please select the exercise type.'),
+        },
+    )
+
     class Meta:
         model = Exercise
         fields = ['name', 'exercise_type', 'description']
         widgets = {
-            'name': forms.TextInput(attrs={'class': 'form-control'}),
-            'exercise_type': forms.Select(attrs={'class': 'form-control'}),
+            'name': forms.TextInput(
+                attrs={
+                    'class': 'form-control',
+                    'autocomplete': 'off',
+                    'list': 'exercise-name-suggestions',
+                    'data-autocomplete-url': reverse_lazy(
+                        'autocomplete_exercises'
+                    ),
+                }
+            ),
             'description': forms.Textarea(attrs={'class': 'form-control'}),
         }
         error_messages = {
@@ -45,9 +118,6 @@ class EditExerciseForm(forms.ModelForm[Exercise]):
                 'unique': _('An exercise with this name already exists.'),
                 'max_length': _('The name cannot exceed 50 characters.'),
             },
-            'exercise_type': {
-                'required': _('Please select the exercise type.'),
-            },
             'description': {
                 'required': _(
                     'Please provide a description for the exercise.'
@@ -59,13 +129,14 @@ class EditExerciseForm(forms.ModelForm[Exercise]):
         kwargs.update({'instance': instance})
         super().__init__(*args, **kwargs)
         self.instance: Exercise = instance
-        self.fields['exercise_type'].initial = self.instance.exercise_type
-        self.fields['exercise_type'].queryset = (  # type: ignore[attr-defined]
-            ExerciseType.objects.select_related('category')
-            .all()
-            .only('category__name', 'category_id', 'id', 'name')
-            .order_by('category__name')
-        )
+        self.fields['exercise_type'].initial = self.instance.exercise_type_id
+
+    def _get_validation_exclusions(self) -> set[str]:
+        # The exercise type was already checked against the taxonomy cache,
+        # skip the model foreign key validation query.
+        exclusions = super()._get_validation_exclusions()
+        exclusions.add('exercise_type')
+        return exclusions
 
     def clean_name(self) -> str:
         name = self.cleaned_data['name']
@@ -118,3 +189,27 @@ class EditExerciseVariationForm(forms.ModelForm[ExerciseVariation]):
 
         for field_name in self.fields.keys():
             self.fields[field_name].widget.attrs['class'] = 'form-control'
+
+
+class ImportExercisesForm(forms.Form):
+    file = forms.FileField(
+        help_text=_(
+            'A CSV or JSONL file with one exercise, and optionally one of'
+            ' its variations, per row.'
+        ),
+    )
+    file_format = forms.ChoiceField(
+        choices=[(file_format, file_format) for file_format in IMPORT_FORMATS],
+        initial='csv',
+    )
+    on_conflict = forms.ChoiceField(
+        choices=[
+            ('ignore', _('Keep existing exercises')),
+            ('update', _('Update existing exercises')),
+        ],
+        initial='ignore',
+    )
+    reviewed = forms.BooleanField(
+        required=False,
+        help_text=_('Mark the imported entries as reviewed.'),
+    )
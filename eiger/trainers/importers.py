@@ -0,0 +1,327 @@
+"""
+Streaming bulk import of exercises and exercise variations.
+
+Rows are read lazily from CSV or JSONL text streams and written with
+`bulk_create` in fixed-size batches, so memory stays constant whatever the
+size of the input. Each row describes an exercise, identified by its unique
+name, and optionally one of its variations:
+
+    name,exercise_type,category,description,should_add_weight,sets,...
+
+Exercise types are resolved by name through the taxonomy cache; invalid
+rows are reported with their line number without aborting their batch.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, Mapping, TextIO, TypeVar
+
+import structlog
+from django.contrib.auth.models import User
+from django.db import DataError, IntegrityError, transaction
+from django.utils import timezone
+
+from eiger.trainers.counters import refresh_pending_review_counters
+from eiger.trainers.models import Exercise, ExerciseVariation
+from eiger.trainers.taxonomy import ExerciseTypeNode, get_taxonomy
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+ON_CONFLICT_CHOICES = ('ignore', 'update')
+DEFAULT_BATCH_SIZE = 1000
+# Only the first errors are kept, so a broken file can't exhaust memory:
+MAX_REPORTED_ERRORS = 100
+
+EXERCISE_NAME_MAX_LENGTH = 50
+POSITIVE_SMALL_INTEGER_MAX = 32767
+VARIATION_FIELDS = (
+    'sets',
+    'repetitions',
+    'seconds_per_repetition',
+    'rest_per_set_in_seconds',
+    'rest_per_repetition_in_seconds',
+    'weight_in_kilos',
+)
+# `bulk_update` doesn't set `auto_now` fields, `updated_at` is set by hand:
+EXERCISE_UPDATE_FIELDS = (
+    'description',
+    'exercise_type',
+    'should_add_weight',
+    'updated_at',
+)
+_TRUE_VALUES = frozenset(('1', 'true', 't', 'yes', 'y'))
+_FALSE_VALUES = frozenset(('', '0', 'false', 'f', 'no', 'n'))
+
+_ItemT = TypeVar('_ItemT')
+
+logger = structlog.get_logger()
+
+
+class RowError(ValueError):
+    """Raised when a row can't be imported."""
+
+
+@dataclass(frozen=True)
+class ReportedError:
+    line: int
+    message: str
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created_exercises: int = 0
+    updated_exercises: int = 0
+    created_variations: int = 0
+    skipped_variations: int = 0
+    failed_rows: int = 0
+    errors: list[ReportedError] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str) -> None:
+        self.failed_rows += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ReportedError(line=line, message=message))
+
+    def summary(self) -> str:
+        return (
+            f'{self.rows} rows read: {self.created_exercises} exercises'
+            f' created, {self.updated_exercises} updated,'
+            f' {self.created_variations} variations created,'
+            f' {self.skipped_variations} already existing and'
+            f' {self.failed_rows} rows failed.'
+        )
+
+
+@dataclass(frozen=True)
+class ImportRow:
+    line: int
+    exercise: Exercise
+    variation: dict[str, int | None] | None
+
+
+def batched(
+    iterable: Iterable[_ItemT], batch_size: int
+) -> Iterator[list[_ItemT]]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def read_records(
+    stream: TextIO, file_format: str
+) -> Iterator[tuple[int, Mapping[str, object] | str]]:
+    """
+    Lazily yield `(line, record)` pairs from the stream.
+
+    CSV records are already decoded mappings, JSONL ones are raw lines
+    decoded by `parse_record` so a malformed line only fails its own row.
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line, text in enumerate(stream, start=1):
+        if text.strip():
+            yield line, text
+
+
+def _parse_bool(value: object) -> bool:
+    if isinstance(value, bool):
+        return value
+    normalized = str(value or '').strip().lower()
+    if normalized in _TRUE_VALUES:
+        return True
+    if normalized in _FALSE_VALUES:
+        return False
+    raise RowError(f'Invalid boolean {value!r}.')
+
+
+def _parse_positive_small_integer(name: str, value: object) -> int | None:
+    if value is None or value == '':
+        return None
+    try:
+        number = int(value)  # type: ignore[call-overload]
+    except (TypeError, ValueError):
+        raise RowError(f'Invalid {name} {value!r}.') from None
+    if not 0 <= number <= POSITIVE_SMALL_INTEGER_MAX:
+        raise RowError(
+            f'The {name} must be between 0 and {POSITIVE_SMALL_INTEGER_MAX}.'
+        )
+    return number
+
+
+class ExerciseImporter(object):
+    """Import exercises and variations created by `created_by`."""
+
+    def __init__(
+        self,
+        created_by: User,
+        *,
+        on_conflict: str = 'ignore',
+        reviewed: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        if on_conflict not in ON_CONFLICT_CHOICES:
+            raise ValueError(f'Invalid on_conflict {on_conflict!r}.')
+        self.created_by = created_by
+        self.on_conflict = on_conflict
+        self.reviewed = reviewed
+        self.batch_size = batch_size
+        self._exercise_types: dict[str, ExerciseTypeNode] = {}
+
+    def run(self, stream: TextIO, file_format: str) -> ImportReport:
+        if file_format not in IMPORT_FORMATS:
+            raise ValueError(f'Invalid import format {file_format!r}.')
+        self._exercise_types = {
+            exercise_type.name: exercise_type
+            for exercise_type in get_taxonomy().exercise_types
+        }
+        report = ImportReport()
+        records = read_records(stream, file_format)
+        for batch in batched(records, self.batch_size):
+            report.rows += len(batch)
+            rows = []
+            for line, record in batch:
+                try:
+                    rows.append(self.parse_record(line, record))
+                except RowError as error:
+                    report.add_error(line, str(error))
+            self._import_rows(rows, report)
+            logger.info('Imported a batch of rows. %s', report.summary())
+        return report
+
+    def parse_record(
+        self, line: int, record: Mapping[str, object] | str
+    ) -> ImportRow:
+        if isinstance(record, str):
+            try:
+                record = json.loads(record)
+            except json.JSONDecodeError as error:
+                raise RowError(f'Invalid JSON: {error.msg}.') from None
+            if not isinstance(record, dict):
+                raise RowError('Each JSON line must be an object.')
+
+        name = str(record.get('name') or '').strip()
+        if not name:
+            raise RowError('The exercise name is required.')
+        if len(name) > EXERCISE_NAME_MAX_LENGTH:
+            raise RowError(
+                'The name cannot exceed'
+                f' {EXERCISE_NAME_MAX_LENGTH} characters.'
+            )
+
+        exercise_type_name = str(record.get('exercise_type') or '').strip()
+        exercise_type = self._exercise_types.get(exercise_type_name)
+        if exercise_type is None:
+            raise RowError(f'Unknown exercise type {exercise_type_name!r}.')
+        category_name = str(record.get('category') or '').strip()
+        if category_name and category_name != exercise_type.category_name:
+            raise RowError(
+                f'The exercise type {exercise_type_name!r} does not belong'
+                f' to the category {category_name!r}.'
+            )
+
+        exercise = Exercise(
+            name=name,
+            description=str(record.get('description') or ''),
+            exercise_type_id=exercise_type.id,
+            should_add_weight=_parse_bool(record.get('should_add_weight')),
+            created_by=self.created_by,
+            reviewed=self.reviewed,
+        )
+        variation = {
+            field_name: _parse_positive_small_integer(
+                field_name, record.get(field_name)
+            )
+            for field_name in VARIATION_FIELDS
+        }
+        has_variation = any(value is not None for value in variation.values())
+        return ImportRow(
+            line=line,
+            exercise=exercise,
+            variation=variation if has_variation else None,
+        )
+
+    def _import_rows(
+        self, rows: list[ImportRow], report: ImportReport
+    ) -> None:
+        if not rows:
+            return
+        try:
+            with transaction.atomic():
+                self._write_batch(rows, report)
+        except (IntegrityError, DataError) as error:
+            if len(rows) == 1:
+                report.add_error(rows[0].line, str(error).strip())
+                return
+            logger.warning(
+                'Failed to write a batch of %s rows, retrying row by row.',
+                len(rows),
+            )
+            for row in rows:
+                self._import_rows([row], report)
+
+    def _write_batch(
+        self, rows: list[ImportRow], report: ImportReport
+    ) -> None:
+        exercises: dict[str, Exercise] = {}
+        for row in rows:
+            exercises.setdefault(row.exercise.name, row.exercise)
+
+        existing_ids = dict(
+            Exercise.objects.filter(name__in=exercises).values_list(
+                'name', 'id'
+            )
+        )
+        new_exercises = [
+            exercise
+            for name, exercise in exercises.items()
+            if name not in existing_ids
+        ]
+        Exercise.objects.bulk_create(new_exercises, ignore_conflicts=True)
+        created_ids = dict(
+            Exercise.objects.filter(
+                name__in=[exercise.name for exercise in new_exercises]
+            ).values_list('name', 'id')
+        )
+
+        updated_exercises = []
+        if self.on_conflict == 'update':
+            updated_at = timezone.now()
+            for name, exercise_id in existing_ids.items():
+                exercise = exercises[name]
+                exercise.id = exercise_id
+                exercise.updated_at = updated_at
+                updated_exercises.append(exercise)
+            Exercise.objects.bulk_update(
+                updated_exercises, EXERCISE_UPDATE_FIELDS
+            )
+
+        exercise_ids = {**existing_ids, **created_ids}
+        variations = [
+            ExerciseVariation(
+                exercise_id=exercise_ids[row.exercise.name],
+                created_by=self.created_by,
+                reviewed=self.reviewed,
+                **row.variation,
+            )
+            for row in rows
+            if row.variation is not None
+        ]
+        variations_queryset = ExerciseVariation.objects.filter(
+            exercise_id__in={variation.exercise_id for variation in variations}
+        )
+        existing_variations = variations_queryset.count()
+        ExerciseVariation.objects.bulk_create(
+            variations, ignore_conflicts=True
+        )
+        created_variations = variations_queryset.count() - existing_variations
+
+        refresh_pending_review_counters([self.created_by.id])
+
+        report.created_exercises += len(created_ids)
+        report.updated_exercises += len(updated_exercises)
+        report.created_variations += created_variations
+        report.skipped_variations += len(variations) - created_variations
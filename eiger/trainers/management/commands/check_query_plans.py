@@ -0,0 +1,83 @@
+import json
+from argparse import ArgumentParser
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from eiger.trainers.query_plans import check_query_plans, seed_catalogue
+
+
+class Command(BaseCommand):
+    help = (
+        'Explain the querysets of the views and fail if any of them'
+        ' sequentially scans the exercises or variations, or reads a next'
+        ' page without starting from its cursor.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help=(
+                'Seed this many exercises and variations before explaining,'
+                ' rolled back afterwards.'
+            ),
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help=(
+                'Discourage sequential scans, so a plan only uses one when'
+                ' no index can serve the query, whatever the table sizes.'
+            ),
+        )
+        parser.add_argument(
+            '--show-plans',
+            action='store_true',
+            help='Print the plan of every query.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            user = get_user_model().objects.create(
+                username='query-plans-check'
+            )
+            if options['seed']:
+                seed_catalogue(user, options['seed'])
+            if options['strict']:
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            checks = check_query_plans(user)
+            transaction.set_rollback(True)
+
+        for check in checks:
+            if check.passed:
+                self.stdout.write(f'{check.name}: ok')
+            if check.seq_scans:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f'{check.name}: sequential scan of'
+                        f' {", ".join(check.seq_scans)}'
+                    )
+                )
+            if check.unbounded_scans:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f'{check.name}: cursor left out of the index'
+                        f' condition of {", ".join(check.unbounded_scans)}'
+                    )
+                )
+            if options['show_plans']:
+                self.stdout.write(json.dumps(check.plan, indent=2))
+
+        failed = [check.name for check in checks if not check.passed]
+        if failed:
+            raise CommandError(
+                f'{len(failed)} queries regressed to a sequential or'
+                ' unbounded scan.'
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f'{len(checks)} query plans checked.')
+        )
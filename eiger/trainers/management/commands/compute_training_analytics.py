@@ -0,0 +1,61 @@
+from argparse import ArgumentParser
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from eiger.trainers.analytics import (
+    get_analytics_cache,
+    refresh_training_analytics,
+)
+from eiger.trainers.models import TrainingLogEntry
+
+DEFAULT_ACTIVE_DAYS = 28
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute and cache the training analytics of the trainers who'
+        ' logged a session recently.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--active-days',
+            type=int,
+            default=DEFAULT_ACTIVE_DAYS,
+            help='The days within which the trainers logged a session.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        # The results must outlive this process to be of any use:
+        analytics_cache = get_analytics_cache()
+        if analytics_cache is None:
+            raise CommandError(
+                'The training analytics are not cached, set'
+                ' ANALYTICS_CACHE_ALIAS.'
+            )
+        if not analytics_cache.is_shared:
+            raise CommandError(
+                f'The cache {analytics_cache.alias!r} is local to this'
+                ' process, set ANALYTICS_CACHE_ALIAS to a shared cache.'
+            )
+
+        # Only the recent partitions are scanned, through the BRIN index:
+        active_since = timezone.now() - timedelta(days=options['active_days'])
+        user_ids = (
+            TrainingLogEntry.objects.filter(performed_at__gte=active_since)
+            .values('user')
+            .distinct()
+        )
+        users = get_user_model().objects.filter(id__in=user_ids).order_by('id')
+        computed = 0
+        for user in users.iterator():
+            refresh_training_analytics(user)
+            computed += 1
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Computed the training analytics of {computed} trainers.'
+            )
+        )
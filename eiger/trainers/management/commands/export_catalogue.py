@@ -0,0 +1,48 @@
+from argparse import ArgumentParser
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from eiger.trainers.exporters import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_COMPRESSIONS,
+    EXPORT_FORMATS,
+    ExportError,
+    check_export_options,
+    export_catalogue,
+)
+
+
+class Command(BaseCommand):
+    help = 'Export the reviewed exercises and exercise variations.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument('output', type=Path, help='The file to write.')
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument(
+            '--compression', choices=EXPORT_COMPRESSIONS, default='none'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='The number of rows fetched per database round trip.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        try:
+            check_export_options(options['format'], options['compression'])
+        except ExportError as error:
+            raise CommandError(str(error)) from None
+
+        chunks = export_catalogue(
+            options['format'],
+            options['compression'],
+            chunk_size=options['chunk_size'],
+        )
+        output: Path = options['output']
+        with output.open('wb') as stream:
+            written = sum(stream.write(chunk) for chunk in chunks)
+        self.stdout.write(
+            self.style.SUCCESS(f'Wrote {written} bytes to {output}.')
+        )
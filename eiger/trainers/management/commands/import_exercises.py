@@ -0,0 +1,80 @@
+from argparse import ArgumentParser
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from eiger.trainers.importers import (
+    DEFAULT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    ON_CONFLICT_CHOICES,
+    ExerciseImporter,
+)
+
+
+class Command(BaseCommand):
+    help = 'Import exercises and exercise variations from a CSV or JSONL file.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument('path', type=Path, help='The file to import.')
+        parser.add_argument(
+            '--format',
+            choices=IMPORT_FORMATS,
+            help='The file format, inferred from its extension by default.',
+        )
+        parser.add_argument(
+            '--created-by',
+            required=True,
+            help='The username of the user the entries are created by.',
+        )
+        parser.add_argument(
+            '--on-conflict',
+            choices=ON_CONFLICT_CHOICES,
+            default='ignore',
+            help='Whether existing exercises are kept or updated.',
+        )
+        parser.add_argument(
+            '--reviewed',
+            action='store_true',
+            help='Mark the imported entries as reviewed.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='The number of rows written per batch.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        path: Path = options['path']
+        file_format = options['format'] or path.suffix.lstrip('.').lower()
+        if file_format not in IMPORT_FORMATS:
+            raise CommandError(
+                f'Unable to infer the format of {path}, use --format.'
+            )
+        try:
+            created_by = get_user_model().objects.get(
+                username=options['created_by']
+            )
+        except get_user_model().DoesNotExist:
+            raise CommandError(
+                f'User {options["created_by"]} does not exist.'
+            ) from None
+
+        importer = ExerciseImporter(
+            created_by,  # type: ignore[arg-type]
+            on_conflict=options['on_conflict'],
+            reviewed=options['reviewed'],
+            batch_size=options['batch_size'],
+        )
+        with path.open(encoding='utf-8', newline='') as stream:
+            report = importer.run(stream, file_format)
+
+        for error in report.errors:
+            self.stderr.write(f'Line {error.line}: {error.message}')
+        if report.failed_rows > len(report.errors):
+            self.stderr.write(
+                f'{report.failed_rows - len(report.errors)} more errors'
+                ' were not reported.'
+            )
+        self.stdout.write(self.style.SUCCESS(report.summary()))
@@ -0,0 +1,81 @@
+import time
+from argparse import ArgumentParser
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete the expired sessions in batches, once or periodically. Unlike'
+        ' `clearsessions`, a large backlog never holds a long transaction.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='The number of sessions deleted per statement.',
+        )
+        parser.add_argument(
+            '--every',
+            type=int,
+            help='Keep pruning every this many seconds instead of once.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options['batch_size'] < 1:
+            raise CommandError('The batch size must be at least 1.')
+        if options['every'] is not None and options['every'] < 1:
+            raise CommandError('The interval must be at least 1 second.')
+        engine = import_module(settings.SESSION_ENGINE)
+        while True:
+            if issubclass(engine.SessionStore, SessionStore):
+                deleted = self._prune_database(
+                    engine.SessionStore, options['batch_size']
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(f'{deleted} expired sessions deleted.')
+                )
+            else:
+                self._prune_backend(engine.SessionStore)
+            if options['every'] is None:
+                return
+            time.sleep(options['every'])
+
+    def _prune_database(
+        self, session_store: type[SessionStore], batch_size: int
+    ) -> int:
+        session_model = session_store.get_model_class()
+        expired = session_model.objects.filter(
+            expire_date__lt=timezone.now()
+        ).values('pk')
+        deleted = 0
+        while True:
+            batch_deleted, _ = session_model.objects.filter(
+                pk__in=expired[:batch_size]
+            ).delete()
+            deleted += batch_deleted
+            if batch_deleted < batch_size:
+                return deleted
+
+    def _prune_backend(self, session_store: type) -> None:
+        # The cache and cookie engines expire their sessions themselves:
+        try:
+            session_store.clear_expired()
+        except NotImplementedError as error:
+            raise CommandError(
+                f'Session engine {settings.SESSION_ENGINE} does not support'
+                ' clearing expired sessions.'
+            ) from error
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Expired sessions cleared by {settings.SESSION_ENGINE}.'
+            )
+        )
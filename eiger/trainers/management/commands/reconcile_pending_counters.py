@@ -0,0 +1,80 @@
+from argparse import ArgumentParser
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from eiger.trainers.counters import (
+    COUNTER_FIELDS,
+    compute_pending_review_counters,
+    save_pending_review_counters,
+)
+from eiger.trainers.importers import batched
+from eiger.trainers.models import PendingReviewCounter
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Recompute the pending review counters and repair the drifted ones.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='The number of users reconciled per transaction.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the drifted counters.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        user_ids = (
+            get_user_model()
+            .objects.order_by('id')
+            .values_list('id', flat=True)
+            .iterator(chunk_size=options['batch_size'])
+        )
+        checked = repaired = 0
+        for batch in batched(user_ids, options['batch_size']):
+            with transaction.atomic():
+                expected = compute_pending_review_counters(batch)
+                saved = (
+                    PendingReviewCounter.objects.select_for_update().in_bulk(
+                        batch
+                    )
+                )
+                drifted = [
+                    counter
+                    for user_id, counter in expected.items()
+                    if _has_drifted(counter, saved.get(user_id))
+                ]
+                if drifted and not options['dry_run']:
+                    save_pending_review_counters(drifted)
+            checked += len(batch)
+            repaired += len(drifted)
+            for counter in drifted:
+                self.stderr.write(
+                    f'Counter of user {counter.user_id} drifted.'
+                )
+
+        action = 'drifted' if options['dry_run'] else 'repaired'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{checked} counters checked, {repaired} {action}.'
+            )
+        )
+
+
+def _has_drifted(
+    expected: PendingReviewCounter, saved: PendingReviewCounter | None
+) -> bool:
+    if saved is None:
+        return bool(expected.last_submitted_at)
+    return any(
+        getattr(expected, field_name) != getattr(saved, field_name)
+        for field_name in (*COUNTER_FIELDS, 'last_submitted_at')
+    )
@@ -0,0 +1,37 @@
+from argparse import ArgumentParser
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from eiger.trainers.rollups import fold_training_log, rebuild_training_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Fold the training log entries logged since the last run into the'
+        ' daily and weekly rollups.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.ROLLUP_BATCH_SIZE,
+            help='The number of entries folded per transaction.',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Delete the rollups and fold the whole training log again.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        rollup = (
+            rebuild_training_rollups
+            if options['rebuild']
+            else fold_training_log
+        )
+        folded = rollup(options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Folded {folded} training log entries.')
+        )
@@ -0,0 +1,185 @@
+import json
+from argparse import ArgumentParser
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from eiger.trainers.benchmarks import (
+    DEFAULT_TOLERANCE,
+    BenchmarkError,
+    ClientRunner,
+    HTTPRunner,
+    build_request_mix,
+    compare_with_baseline,
+    run_benchmark,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay a mix of requests to the trainer views over the data of'
+        ' `seed_benchmark_data` and report their latencies, queries and RSS.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=1000,
+            help='The number of measured requests.',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=50,
+            help='The number of requests sent before measuring.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='The seed drawing the request mix.',
+        )
+        parser.add_argument(
+            '--url',
+            help=(
+                'Send the requests to the server at this URL, such as a'
+                ' local gunicorn, instead of the in-process test client.'
+            ),
+        )
+        parser.add_argument(
+            '--server-pid',
+            type=int,
+            help='The process of the server whose RSS is reported.',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help=(
+                'The number of requests sent to the server at once, to'
+                ' measure the latencies and database connections under load.'
+            ),
+        )
+        parser.add_argument(
+            '--session-engine',
+            choices=tuple(settings.SESSION_ENGINES),
+            help=(
+                'Serve the in-process requests with this session engine,'
+                ' to compare the queries per request of the engines.'
+            ),
+        )
+        parser.add_argument(
+            '--output',
+            type=Path,
+            help='Save the report as JSON to this path.',
+        )
+        parser.add_argument(
+            '--baseline',
+            type=Path,
+            help='Fail if the report regressed from this saved report.',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=DEFAULT_TOLERANCE,
+            help='The relative growth of latency and RSS tolerated.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options['url'] and options['session_engine']:
+            raise CommandError(
+                'The session engine of a running server is set by its'
+                ' `SESSION_BACKEND`.'
+            )
+        if options['concurrency'] > 1 and not options['url']:
+            raise CommandError(
+                'Concurrent requests can only be sent to a server, see --url.'
+            )
+        try:
+            requests = build_request_mix(
+                options['warmup'] + options['requests'], seed=options['seed']
+            )
+        except BenchmarkError as error:
+            raise CommandError(str(error)) from error
+        runner = (
+            HTTPRunner(options['url'], server_pid=options['server_pid'])
+            if options['url']
+            else ClientRunner()
+        )
+        session_engine = (
+            override_settings(
+                SESSION_ENGINE=settings.SESSION_ENGINES[
+                    options['session_engine']
+                ]
+            )
+            if options['session_engine']
+            else nullcontext()
+        )
+        with session_engine:
+            report = run_benchmark(
+                runner,
+                requests,
+                warmup=options['warmup'],
+                concurrency=options['concurrency'],
+            )
+            report['session_engine'] = settings.SESSION_ENGINE
+
+        self.stdout.write(f'Session engine: {report["session_engine"]}')
+        self.stdout.write(
+            f'Concurrency: {report["concurrency"]},'
+            f' {report["requests_per_second"]} requests per second'
+        )
+        db_connections = report['db_connections']
+        self.stdout.write(
+            f'Database connections: {db_connections["before"]} before,'
+            f' {db_connections["peak"]} at peak, of'
+            f' {db_connections["max"]} allowed'
+        )
+        for scenario, result in report['scenarios'].items():
+            queries = (
+                f'{result["mean_queries"]} queries'
+                if result['mean_queries'] is not None
+                else 'queries not counted'
+            )
+            self.stdout.write(
+                f'{scenario}: {result["requests"]} requests,'
+                f' {result["errors"]} errors, p50 {result["p50"]} ms,'
+                f' p95 {result["p95"]} ms, p99 {result["p99"]} ms, {queries}'
+            )
+        self.stdout.write(f'RSS: {report["rss_kb"]} kB')
+        if options['output']:
+            options['output'].write_text(json.dumps(report, indent=2))
+
+        if not options['baseline']:
+            return
+        baseline = json.loads(options['baseline'].read_text())
+        self._write_queries_change(report, baseline)
+        regressions = compare_with_baseline(
+            report, baseline, tolerance=options['tolerance']
+        )
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(str(regression)))
+        if regressions:
+            raise CommandError(
+                f'{len(regressions)} metrics regressed from the baseline.'
+            )
+        self.stdout.write(
+            self.style.SUCCESS('No regression from the baseline.')
+        )
+
+    def _write_queries_change(self, report: dict, baseline: dict) -> None:
+        for scenario, result in report['scenarios'].items():
+            expected = baseline['scenarios'].get(scenario, {})
+            if (
+                expected.get('mean_queries') is None
+                or result['mean_queries'] is None
+            ):
+                continue
+            self.stdout.write(
+                f'{scenario}: {expected["mean_queries"]} ->'
+                f' {result["mean_queries"]} queries per request'
+            )
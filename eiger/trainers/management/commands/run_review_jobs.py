@@ -0,0 +1,55 @@
+import time
+from argparse import ArgumentParser
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from eiger.trainers.models import ReviewJob
+from eiger.trainers.reviews import run_next_review_job
+
+DEFAULT_POLL_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the review jobs queued by the admin, polling the queue until'
+        ' stopped or, with --once, until it is empty.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.REVIEW_JOB_CHUNK_SIZE,
+            help='The number of entries reviewed per transaction.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=DEFAULT_POLL_INTERVAL,
+            help='The seconds waited when the queue is empty.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        while True:
+            job = run_next_review_job(options['chunk_size'])
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+
+            if job.status == ReviewJob.Status.FAILED:
+                self.stderr.write(f'{job} failed: {job.error}')
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'{job} reviewed {job.reviewed} of {job.total}'
+                        ' entries.'
+                    )
+                )
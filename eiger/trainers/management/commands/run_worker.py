@@ -0,0 +1,87 @@
+import threading
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from eiger.trainers.models import Task
+from eiger.trainers.tasks import run_next_task, schedule_periodic_tasks
+
+DEFAULT_CONCURRENCY = 1
+DEFAULT_POLL_INTERVAL = 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the deferred tasks in worker threads, polling the queue until'
+        ' stopped or, with --once, until no task is due.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help='The number of tasks run at the same time.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=DEFAULT_POLL_INTERVAL,
+            help='The seconds waited when no task is due.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no task is due.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        schedule_periodic_tasks()
+        stopped = threading.Event()
+        # Each thread uses its own database connection:
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(stopped, options['poll_interval'], options['once']),
+                name=f'worker-{index}',
+            )
+            for index in range(options['concurrency'])
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        finally:
+            # Let the running tasks finish on interruption:
+            stopped.set()
+            for thread in threads:
+                thread.join()
+
+    def _work(
+        self, stopped: threading.Event, poll_interval: float, once: bool
+    ) -> None:
+        try:
+            while not stopped.is_set():
+                close_old_connections()
+                task = run_next_task()
+                if task is None:
+                    if once:
+                        return
+                    stopped.wait(poll_interval)
+                else:
+                    self._report(task)
+        finally:
+            connections.close_all()
+
+    def _report(self, task: Task) -> None:
+        if task.status == Task.Status.SUCCEEDED:
+            self.stdout.write(self.style.SUCCESS(f'{task} succeeded.'))
+        elif task.status == Task.Status.QUEUED:
+            self.stderr.write(
+                f'{task} failed, retrying at {task.run_at.isoformat()}:'
+                f' {task.error}'
+            )
+        else:
+            self.stderr.write(f'{task} failed: {task.error}')
@@ -0,0 +1,56 @@
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+
+from eiger.trainers.benchmarks import (
+    flush_benchmark_data,
+    seed_benchmark_data,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the database with a synthetic catalogue for `run_benchmark`:'
+        ' users × exercises × variations.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=100,
+            help='The number of users creating entries.',
+        )
+        parser.add_argument(
+            '--exercises',
+            type=int,
+            default=100,
+            help='The number of exercises created by every user.',
+        )
+        parser.add_argument(
+            '--variations',
+            type=int,
+            default=3,
+            help='The number of variations of every exercise.',
+        )
+        parser.add_argument(
+            '--flush',
+            action='store_true',
+            help='Delete the data seeded by a previous run first.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options['flush']:
+            deleted = flush_benchmark_data()
+            self.stdout.write(f'{deleted} benchmark objects deleted.')
+        exercises = seed_benchmark_data(
+            users=options['users'],
+            exercises=options['exercises'],
+            variations=options['variations'],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{options["users"]} users, {exercises} exercises and'
+                f' {exercises * options["variations"]} variations seeded.'
+            )
+        )
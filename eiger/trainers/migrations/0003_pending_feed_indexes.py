@@ -0,0 +1,27 @@
+# Generated by Django 4.2.2 on 2026-10-18 05:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers', '0002_category_color'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exercise',
+            index=models.Index(
+                fields=['created_by', 'reviewed', 'created_at', 'id'],
+                name='exercise_pending_feed_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='exercisevariation',
+            index=models.Index(
+                fields=['created_by', 'reviewed', 'created_at', 'id'],
+                name='variation_pending_feed_idx',
+            ),
+        ),
+    ]
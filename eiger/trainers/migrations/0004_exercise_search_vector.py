@@ -0,0 +1,76 @@
+# Generated by Django 4.2.2 on 2026-10-18 05:49
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# The vector is computed by the database so rows written by `bulk_create`,
+# `bulk_update` or raw SQL are indexed as well, which signals can't ensure.
+# Only the writes of the indexed columns, or of the vector itself as done
+# below to index the existing rows, recompute it.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION trainers_exercise_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A')
+        || setweight(
+            to_tsvector('english', coalesce(NEW.description, '')), 'B'
+        );
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER trainers_exercise_search_vector_trigger
+BEFORE INSERT OR UPDATE OF name, description, search_vector
+ON trainers_exercise
+FOR EACH ROW EXECUTE FUNCTION trainers_exercise_search_vector_update();
+
+UPDATE trainers_exercise SET search_vector = NULL;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS trainers_exercise_search_vector_trigger
+ON trainers_exercise;
+DROP FUNCTION IF EXISTS trainers_exercise_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers', '0003_pending_feed_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='exercise',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                help_text=(
+                    'The weighted lexemes of the name and description,'
+                    ' maintained by a database trigger.'
+                ),
+                null=True,
+            ),
+        ),
+        migrations.RunSQL(sql=CREATE_TRIGGER, reverse_sql=DROP_TRIGGER),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['search_vector'], name='exercise_search_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    'name', name='gin_trgm_ops'
+                ),
+                name='exercise_name_trigram_idx',
+            ),
+        ),
+    ]
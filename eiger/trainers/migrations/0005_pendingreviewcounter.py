@@ -0,0 +1,75 @@
+# Generated by Django 4.2.2 on 2026-10-18 05:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('trainers', '0004_exercise_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingReviewCounter',
+            fields=[
+                (
+                    'user',
+                    models.OneToOneField(
+                        help_text='The user who created the pending entries.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='pending_review_counter',
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    'pending_exercises',
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text=(
+                            'The number of exercises waiting for a review.'
+                        ),
+                    ),
+                ),
+                (
+                    'pending_variations',
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text=(
+                            'The number of exercise variations waiting for'
+                            ' a review.'
+                        ),
+                    ),
+                ),
+                (
+                    'last_submitted_at',
+                    models.DateTimeField(
+                        help_text=(
+                            'The timestamp when the user last created an'
+                            ' entry.'
+                        ),
+                        null=True,
+                    ),
+                ),
+                (
+                    'updated_at',
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text=(
+                            'The timestamp when the counter was last'
+                            ' refreshed.'
+                        ),
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Pending Review Counter',
+                'verbose_name_plural': 'Pending Review Counters',
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.2 on 2026-10-18 05:59
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # The indexes are built without locking the tables against writes,
+    # which can't be done inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('trainers', '0005_pendingreviewcounter'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='exercise',
+            index=models.Index(
+                condition=models.Q(('reviewed', False)),
+                fields=['created_by', 'created_at', 'id'],
+                name='exercise_pending_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='exercise',
+            index=models.Index(
+                condition=models.Q(('reviewed', True)),
+                fields=['created_at', 'id'],
+                name='exercise_reviewed_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='exercisevariation',
+            index=models.Index(
+                condition=models.Q(('reviewed', False)),
+                fields=['created_by', 'created_at', 'id'],
+                name='variation_pending_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='exercisevariation',
+            index=models.Index(
+                condition=models.Q(('reviewed', True)),
+                fields=['created_at', 'id'],
+                name='variation_reviewed_idx',
+            ),
+        ),
+        # Superseded by the smaller partial indexes above:
+        RemoveIndexConcurrently(
+            model_name='exercise',
+            name='exercise_pending_feed_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='exercisevariation',
+            name='variation_pending_feed_idx',
+        ),
+    ]
@@ -0,0 +1,165 @@
+# Generated by Django 4.2.2 on 2026-10-18 06:34
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('trainers', '0006_partial_review_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewJob',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'created_at',
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text='The timestamp when the object was created.',
+                    ),
+                ),
+                (
+                    'updated_at',
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text=(
+                            'The timestamp when the object was last updated.'
+                        ),
+                    ),
+                ),
+                (
+                    'target',
+                    models.CharField(
+                        choices=[
+                            ('exercise', 'Exercises'),
+                            ('exercise_variation', 'Exercise variations'),
+                        ],
+                        help_text='The kind of entries to review.',
+                        max_length=32,
+                    ),
+                ),
+                (
+                    'entry_ids',
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(),
+                        help_text=(
+                            'The ids of the selected entries, in ascending'
+                            ' order.'
+                        ),
+                        size=None,
+                    ),
+                ),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('queued', 'Queued'),
+                            ('running', 'Running'),
+                            ('succeeded', 'Succeeded'),
+                            ('failed', 'Failed'),
+                        ],
+                        default='queued',
+                        help_text='The state of the job.',
+                        max_length=16,
+                    ),
+                ),
+                (
+                    'total',
+                    models.PositiveIntegerField(
+                        help_text='The number of selected entries.'
+                    ),
+                ),
+                (
+                    'processed',
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text=(
+                            'The number of selected entries already processed.'
+                        ),
+                    ),
+                ),
+                (
+                    'reviewed',
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text=(
+                            'The number of entries marked as reviewed by the'
+                            ' job.'
+                        ),
+                    ),
+                ),
+                (
+                    'last_entry_id',
+                    models.BigIntegerField(
+                        default=0,
+                        help_text=(
+                            'The id of the last processed entry, to resume'
+                            ' from.'
+                        ),
+                    ),
+                ),
+                (
+                    'error',
+                    models.TextField(
+                        blank=True,
+                        help_text='The error that made the job fail.',
+                    ),
+                ),
+                (
+                    'started_at',
+                    models.DateTimeField(
+                        help_text=(
+                            'The timestamp when a worker started the job.'
+                        ),
+                        null=True,
+                    ),
+                ),
+                (
+                    'finished_at',
+                    models.DateTimeField(
+                        help_text=(
+                            'The timestamp when the job succeeded or failed.'
+                        ),
+                        null=True,
+                    ),
+                ),
+                (
+                    'requested_by',
+                    models.ForeignKey(
+                        help_text='The staff user who selected the entries.',
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Review Job',
+                'verbose_name_plural': 'Review Jobs',
+                'indexes': [
+                    models.Index(
+                        condition=models.Q(
+                            ('status__in', ['queued', 'running'])
+                        ),
+                        fields=['created_at', 'id'],
+                        name='reviewjob_unfinished_idx',
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,170 @@
+# Generated by Django 4.2.2 on 2026-10-18 07:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers', '0007_reviewjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'created_at',
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text='The timestamp when the object was created.',
+                    ),
+                ),
+                (
+                    'updated_at',
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text=(
+                            'The timestamp when the object was last updated.'
+                        ),
+                    ),
+                ),
+                (
+                    'name',
+                    models.CharField(
+                        help_text=(
+                            'The name the task function was registered with.'
+                        ),
+                        max_length=100,
+                    ),
+                ),
+                (
+                    'args',
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text='The positional arguments of the task.',
+                    ),
+                ),
+                (
+                    'kwargs',
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text='The keyword arguments of the task.',
+                    ),
+                ),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('queued', 'Queued'),
+                            ('running', 'Running'),
+                            ('succeeded', 'Succeeded'),
+                            ('failed', 'Failed'),
+                        ],
+                        default='queued',
+                        help_text='The state of the task.',
+                        max_length=16,
+                    ),
+                ),
+                (
+                    'unique_key',
+                    models.CharField(
+                        blank=True,
+                        help_text=(
+                            'Only one queued task may have the same key.'
+                        ),
+                        max_length=100,
+                        null=True,
+                    ),
+                ),
+                (
+                    'run_at',
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text='The timestamp from which the task may run.',
+                    ),
+                ),
+                (
+                    'attempts',
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text=(
+                            'The number of times a worker started the task.'
+                        ),
+                    ),
+                ),
+                (
+                    'max_attempts',
+                    models.PositiveIntegerField(
+                        default=1,
+                        help_text=(
+                            'The number of attempts before the task fails.'
+                        ),
+                    ),
+                ),
+                (
+                    'error',
+                    models.TextField(
+                        blank=True,
+                        help_text='The error raised by the last attempt.',
+                    ),
+                ),
+                (
+                    'started_at',
+                    models.DateTimeField(
+                        blank=True,
+                        help_text=(
+                            'The timestamp when the last attempt started.'
+                        ),
+                        null=True,
+                    ),
+                ),
+                (
+                    'finished_at',
+                    models.DateTimeField(
+                        blank=True,
+                        help_text=(
+                            'The timestamp when the task succeeded or failed.'
+                        ),
+                        null=True,
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Task',
+                'verbose_name_plural': 'Tasks',
+                'indexes': [
+                    models.Index(
+                        condition=models.Q(('status', 'queued')),
+                        fields=['run_at', 'id'],
+                        name='task_queued_idx',
+                    ),
+                    models.Index(
+                        condition=models.Q(('status', 'running')),
+                        fields=['updated_at'],
+                        name='task_running_idx',
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(('status', 'queued')),
+                fields=('unique_key',),
+                name='task_queued_unique_key',
+            ),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 4.2.2 on 2026-10-18 07:35
+
+from django.db import migrations, models
+
+# The totals are computed by the database, as the search vector of the
+# exercises, so rows written by `bulk_create`, `bulk_update` or raw SQL get
+# them as well. Missing sets and repetitions count as one, missing durations
+# as none, and the volume is unknown without a weight.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION trainers_exercisevariation_totals_update()
+RETURNS trigger AS $$
+DECLARE
+    set_count bigint := coalesce(NEW.sets, 1);
+    repetition_count bigint := coalesce(NEW.repetitions, 1);
+BEGIN
+    NEW.total_duration_seconds :=
+        set_count * (
+            repetition_count * coalesce(NEW.seconds_per_repetition, 0)
+            + (repetition_count - 1)
+            * coalesce(NEW.rest_per_repetition_in_seconds, 0)
+        )
+        + (set_count - 1) * coalesce(NEW.rest_per_set_in_seconds, 0);
+    NEW.total_volume := set_count * repetition_count * NEW.weight_in_kilos;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER trainers_exercisevariation_totals_trigger
+BEFORE INSERT OR UPDATE OF
+    sets,
+    repetitions,
+    seconds_per_repetition,
+    rest_per_set_in_seconds,
+    rest_per_repetition_in_seconds,
+    weight_in_kilos,
+    total_duration_seconds,
+    total_volume
+ON trainers_exercisevariation
+FOR EACH ROW EXECUTE FUNCTION trainers_exercisevariation_totals_update();
+
+UPDATE trainers_exercisevariation SET total_duration_seconds = NULL;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS trainers_exercisevariation_totals_trigger
+ON trainers_exercisevariation;
+DROP FUNCTION IF EXISTS trainers_exercisevariation_totals_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers', '0008_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercisevariation',
+            name='total_duration_seconds',
+            field=models.BigIntegerField(
+                editable=False,
+                help_text=(
+                    'The duration of the sets, repetitions and rests in'
+                    ' seconds, maintained by a database trigger.'
+                ),
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name='exercisevariation',
+            name='total_volume',
+            field=models.BigIntegerField(
+                editable=False,
+                help_text=(
+                    'The kilograms lifted over the sets and repetitions,'
+                    ' maintained by a database trigger.'
+                ),
+                null=True,
+            ),
+        ),
+        # The rows are filled before the indexes are built:
+        migrations.RunSQL(sql=CREATE_TRIGGER, reverse_sql=DROP_TRIGGER),
+        migrations.AddIndex(
+            model_name='exercisevariation',
+            index=models.Index(
+                fields=['total_duration_seconds'],
+                name='variation_duration_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='exercisevariation',
+            index=models.Index(
+                fields=['total_volume'], name='variation_volume_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,148 @@
+# Generated by Django 4.2.2 on 2026-10-18 06:56
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Django can't create a partitioned table, so the table is created as
+# `CreateModel` would, but partitioned by month with the partition key in
+# its primary key. The monthly partitions are created by the
+# `create_training_log_partitions` task, until then the rows land in the
+# default partition.
+CREATE_TABLE = """
+CREATE TABLE "trainers_traininglogentry" (
+    "id" bigint NOT NULL GENERATED BY DEFAULT AS IDENTITY,
+    "performed_at" timestamp with time zone NOT NULL,
+    "repetitions" smallint NULL CHECK ("repetitions" >= 0),
+    "weight_in_kilos" smallint NULL CHECK ("weight_in_kilos" >= 0),
+    "duration_seconds" integer NULL CHECK ("duration_seconds" >= 0),
+    "exercise_variation_id" bigint NOT NULL,
+    "user_id" integer NOT NULL,
+    PRIMARY KEY ("id", "performed_at")
+) PARTITION BY RANGE ("performed_at");
+
+ALTER TABLE "trainers_traininglogentry" ADD CONSTRAINT
+"trainers_traininglog_exercise_variation_i_072b8ead_fk_trainers_"
+FOREIGN KEY ("exercise_variation_id")
+REFERENCES "trainers_exercisevariation" ("id") DEFERRABLE INITIALLY DEFERRED;
+
+ALTER TABLE "trainers_traininglogentry" ADD CONSTRAINT
+"trainers_traininglogentry_user_id_8aca8d9e_fk_auth_user_id"
+FOREIGN KEY ("user_id")
+REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX "trainers_traininglogentry_exercise_variation_id_072b8ead"
+ON "trainers_traininglogentry" ("exercise_variation_id");
+
+CREATE TABLE "trainers_traininglogentry_default"
+PARTITION OF "trainers_traininglogentry" DEFAULT;
+"""
+
+# Drops the partitions as well:
+DROP_TABLE = 'DROP TABLE IF EXISTS "trainers_traininglogentry";'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('trainers', '0009_exercisevariation_totals'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(sql=CREATE_TABLE, reverse_sql=DROP_TABLE),
+            ],
+            state_operations=[
+                migrations.CreateModel(
+                    name='TrainingLogEntry',
+                    fields=[
+                        (
+                            'id',
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name='ID',
+                            ),
+                        ),
+                        (
+                            'performed_at',
+                            models.DateTimeField(
+                                help_text=(
+                                    'The timestamp when the set was performed.'
+                                )
+                            ),
+                        ),
+                        (
+                            'repetitions',
+                            models.PositiveSmallIntegerField(
+                                help_text=(
+                                    'The number of repetitions achieved.'
+                                ),
+                                null=True,
+                            ),
+                        ),
+                        (
+                            'weight_in_kilos',
+                            models.PositiveSmallIntegerField(
+                                help_text='The weight used in kilograms.',
+                                null=True,
+                            ),
+                        ),
+                        (
+                            'duration_seconds',
+                            models.PositiveIntegerField(
+                                help_text=(
+                                    'The duration of the set in seconds.'
+                                ),
+                                null=True,
+                            ),
+                        ),
+                        (
+                            'exercise_variation',
+                            models.ForeignKey(
+                                help_text=(
+                                    'The exercise variation the set'
+                                    ' belongs to.'
+                                ),
+                                on_delete=django.db.models.deletion.PROTECT,
+                                to='trainers.exercisevariation',
+                            ),
+                        ),
+                        (
+                            'user',
+                            models.ForeignKey(
+                                db_index=False,
+                                help_text='The trainer who performed the set.',
+                                on_delete=django.db.models.deletion.CASCADE,
+                                to=settings.AUTH_USER_MODEL,
+                            ),
+                        ),
+                    ],
+                    options={
+                        'verbose_name': 'Training Log Entry',
+                        'verbose_name_plural': 'Training Log Entries',
+                    },
+                ),
+            ],
+        ),
+        # Created on the partitioned table, so on each partition as well:
+        migrations.AddIndex(
+            model_name='traininglogentry',
+            index=models.Index(
+                fields=['user', 'performed_at', 'id'],
+                name='traininglog_user_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='traininglogentry',
+            index=django.contrib.postgres.indexes.BrinIndex(
+                autosummarize=True,
+                fields=['performed_at'],
+                name='traininglog_performed_brin',
+            ),
+        ),
+    ]
@@ -0,0 +1,216 @@
+# Generated by Django 4.2.2 on 2026-10-18 07:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('trainers', '0010_traininglogentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                (
+                    'name',
+                    models.CharField(
+                        help_text='The name of the rollup pipeline.',
+                        max_length=50,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    'last_entry_id',
+                    models.BigIntegerField(
+                        default=0,
+                        help_text=(
+                            'The id of the last training log entry folded.'
+                        ),
+                    ),
+                ),
+                (
+                    'updated_at',
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text=(
+                            'The timestamp when the watermark last moved.'
+                        ),
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Rollup Watermark',
+                'verbose_name_plural': 'Rollup Watermarks',
+            },
+        ),
+        migrations.CreateModel(
+            name='WeeklyTrainingRollup',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'period_start',
+                    models.DateField(help_text='The first day of the period.'),
+                ),
+                (
+                    'sets',
+                    models.PositiveIntegerField(
+                        default=0, help_text='The number of sets performed.'
+                    ),
+                ),
+                (
+                    'repetitions',
+                    models.BigIntegerField(
+                        default=0,
+                        help_text='The number of repetitions performed.',
+                    ),
+                ),
+                (
+                    'volume',
+                    models.BigIntegerField(
+                        default=0,
+                        help_text='The kilograms lifted over the repetitions.',
+                    ),
+                ),
+                (
+                    'time_under_tension_seconds',
+                    models.BigIntegerField(
+                        default=0,
+                        help_text='The seconds spent performing the sets.',
+                    ),
+                ),
+                (
+                    'updated_at',
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text=(
+                            'The timestamp when the totals were last folded.'
+                        ),
+                    ),
+                ),
+                (
+                    'category',
+                    models.ForeignKey(
+                        help_text='The category of the exercises of the sets.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to='trainers.category',
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        db_index=False,
+                        help_text='The trainer who performed the sets.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Weekly Training Rollup',
+                'verbose_name_plural': 'Weekly Training Rollups',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyTrainingRollup',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'period_start',
+                    models.DateField(help_text='The first day of the period.'),
+                ),
+                (
+                    'sets',
+                    models.PositiveIntegerField(
+                        default=0, help_text='The number of sets performed.'
+                    ),
+                ),
+                (
+                    'repetitions',
+                    models.BigIntegerField(
+                        default=0,
+                        help_text='The number of repetitions performed.',
+                    ),
+                ),
+                (
+                    'volume',
+                    models.BigIntegerField(
+                        default=0,
+                        help_text='The kilograms lifted over the repetitions.',
+                    ),
+                ),
+                (
+                    'time_under_tension_seconds',
+                    models.BigIntegerField(
+                        default=0,
+                        help_text='The seconds spent performing the sets.',
+                    ),
+                ),
+                (
+                    'updated_at',
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text=(
+                            'The timestamp when the totals were last folded.'
+                        ),
+                    ),
+                ),
+                (
+                    'category',
+                    models.ForeignKey(
+                        help_text='The category of the exercises of the sets.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to='trainers.category',
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        db_index=False,
+                        help_text='The trainer who performed the sets.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Daily Training Rollup',
+                'verbose_name_plural': 'Daily Training Rollups',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='weeklytrainingrollup',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'period_start', 'category'),
+                name='unique_weekly_training_rollup',
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='dailytrainingrollup',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'period_start', 'category'),
+                name='unique_daily_training_rollup',
+            ),
+        ),
+    ]
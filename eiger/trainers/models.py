@@ -1,6 +1,10 @@
 from colorfield.fields import ColorField
 from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BrinIndex, GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -102,6 +106,14 @@ class Exercise(BaseModel):
             'Indicates whether weight should be added to this exercise.'
         ),
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text=_(
+            'The weighted lexemes of the name and description, maintained'
+            ' by a database trigger.'
+        ),
+    )
 
     def __str__(self) -> str:
         return self.name
@@ -109,6 +121,25 @@ class Exercise(BaseModel):
     class Meta:
         verbose_name = _('Exercise')
         verbose_name_plural = _('Exercises')
+        indexes = [
+            # Only the pending rows are indexed for the feeds of their
+            # creators, and the reviewed ones for the catalogue:
+            models.Index(
+                fields=['created_by', 'created_at', 'id'],
+                condition=models.Q(reviewed=False),
+                name='exercise_pending_idx',
+            ),
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(reviewed=True),
+                name='exercise_reviewed_idx',
+            ),
+            GinIndex(fields=['search_vector'], name='exercise_search_idx'),
+            GinIndex(
+                OpClass('name', name='gin_trgm_ops'),
+                name='exercise_name_trigram_idx',
+            ),
+        ]
 
 
 class ExerciseVariation(BaseModel):
@@ -150,6 +181,22 @@ class ExerciseVariation(BaseModel):
             'Indicates whether the exercise variation has been reviewed.'
         ),
     )
+    total_duration_seconds = models.BigIntegerField(
+        null=True,
+        editable=False,
+        help_text=_(
+            'The duration of the sets, repetitions and rests in seconds,'
+            ' maintained by a database trigger.'
+        ),
+    )
+    total_volume = models.BigIntegerField(
+        null=True,
+        editable=False,
+        help_text=_(
+            'The kilograms lifted over the sets and repetitions, maintained'
+            ' by a database trigger.'
+        ),
+    )
 
     def __str__(self) -> str:
         return f'Variation of {self.exercise.name}'
@@ -157,6 +204,24 @@ class ExerciseVariation(BaseModel):
     class Meta:
         verbose_name = _('Exercise Variation')
         verbose_name_plural = _('Exercise Variations')
+        indexes = [
+            models.Index(
+                fields=['created_by', 'created_at', 'id'],
+                condition=models.Q(reviewed=False),
+                name='variation_pending_idx',
+            ),
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(reviewed=True),
+                name='variation_reviewed_idx',
+            ),
+            # Range filters such as "under 10 minutes":
+            models.Index(
+                fields=['total_duration_seconds'],
+                name='variation_duration_idx',
+            ),
+            models.Index(fields=['total_volume'], name='variation_volume_idx'),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=[
@@ -171,3 +236,383 @@ class ExerciseVariation(BaseModel):
                 name='unique_exercise_variation',
             )
         ]
+
+
+class PendingReviewCounter(models.Model):
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='pending_review_counter',
+        help_text=_('The user who created the pending entries.'),
+    )
+    pending_exercises = models.PositiveIntegerField(
+        default=0,
+        help_text=_('The number of exercises waiting for a review.'),
+    )
+    pending_variations = models.PositiveIntegerField(
+        default=0,
+        help_text=_('The number of exercise variations waiting for a review.'),
+    )
+    last_submitted_at = models.DateTimeField(
+        null=True,
+        help_text=_('The timestamp when the user last created an entry.'),
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text=_('The timestamp when the counter was last refreshed.'),
+    )
+
+    def __str__(self) -> str:
+        return f'Pending reviews of {self.user}'
+
+    @property
+    def pending_entries(self) -> int:
+        return self.pending_exercises + self.pending_variations
+
+    class Meta:
+        verbose_name = _('Pending Review Counter')
+        verbose_name_plural = _('Pending Review Counters')
+
+
+class ReviewJob(BaseModel):
+    """
+    Entries selected in the admin to be marked as reviewed by a worker.
+
+    See `eiger.trainers.reviews`, which runs the jobs in id-ordered chunks
+    and records their progress here.
+    """
+
+    class Target(models.TextChoices):
+        EXERCISE = 'exercise', _('Exercises')
+        EXERCISE_VARIATION = 'exercise_variation', _('Exercise variations')
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', _('Queued')
+        RUNNING = 'running', _('Running')
+        SUCCEEDED = 'succeeded', _('Succeeded')
+        FAILED = 'failed', _('Failed')
+
+    target = models.CharField(
+        max_length=32,
+        choices=Target.choices,
+        help_text=_('The kind of entries to review.'),
+    )
+    entry_ids = ArrayField(
+        models.BigIntegerField(),
+        help_text=_('The ids of the selected entries, in ascending order.'),
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.QUEUED,
+        help_text=_('The state of the job.'),
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.SET_NULL,
+        help_text=_('The staff user who selected the entries.'),
+    )
+    total = models.PositiveIntegerField(
+        help_text=_('The number of selected entries.'),
+    )
+    processed = models.PositiveIntegerField(
+        default=0,
+        help_text=_('The number of selected entries already processed.'),
+    )
+    reviewed = models.PositiveIntegerField(
+        default=0,
+        help_text=_('The number of entries marked as reviewed by the job.'),
+    )
+    last_entry_id = models.BigIntegerField(
+        default=0,
+        help_text=_('The id of the last processed entry, to resume from.'),
+    )
+    error = models.TextField(
+        blank=True,
+        help_text=_('The error that made the job fail.'),
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        help_text=_('The timestamp when a worker started the job.'),
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        help_text=_('The timestamp when the job succeeded or failed.'),
+    )
+
+    def __str__(self) -> str:
+        return f'Review job {self.pk} of {self.get_target_display()}'
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the selected entries already processed."""
+        return self.processed / self.total if self.total else 1.0
+
+    class Meta:
+        verbose_name = _('Review Job')
+        verbose_name_plural = _('Review Jobs')
+        indexes = [
+            # The workers only poll the unfinished jobs:
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='reviewjob_unfinished_idx',
+            ),
+        ]
+
+
+class Task(BaseModel):
+    """
+    Deferred call of a registered task, run by the `run_worker` command.
+
+    See `eiger.trainers.tasks`, which claims, runs and retries the tasks.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', _('Queued')
+        RUNNING = 'running', _('Running')
+        SUCCEEDED = 'succeeded', _('Succeeded')
+        FAILED = 'failed', _('Failed')
+
+    name = models.CharField(
+        max_length=100,
+        help_text=_('The name the task function was registered with.'),
+    )
+    args = models.JSONField(
+        default=list,
+        blank=True,
+        help_text=_('The positional arguments of the task.'),
+    )
+    kwargs = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text=_('The keyword arguments of the task.'),
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.QUEUED,
+        help_text=_('The state of the task.'),
+    )
+    unique_key = models.CharField(
+        max_length=100,
+        null=True,
+        blank=True,
+        help_text=_('Only one queued task may have the same key.'),
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        help_text=_('The timestamp from which the task may run.'),
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text=_('The number of times a worker started the task.'),
+    )
+    max_attempts = models.PositiveIntegerField(
+        default=1,
+        help_text=_('The number of attempts before the task fails.'),
+    )
+    error = models.TextField(
+        blank=True,
+        help_text=_('The error raised by the last attempt.'),
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_('The timestamp when the last attempt started.'),
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_('The timestamp when the task succeeded or failed.'),
+    )
+
+    def __str__(self) -> str:
+        return f'Task {self.pk} {self.name}'
+
+    class Meta:
+        verbose_name = _('Task')
+        verbose_name_plural = _('Tasks')
+        indexes = [
+            # The workers only poll the tasks due to run:
+            models.Index(
+                fields=['run_at', 'id'],
+                condition=models.Q(status='queued'),
+                name='task_queued_idx',
+            ),
+            models.Index(
+                fields=['updated_at'],
+                condition=models.Q(status='running'),
+                name='task_running_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['unique_key'],
+                condition=models.Q(status='queued'),
+                name='task_queued_unique_key',
+            ),
+        ]
+
+
+class TrainingLogEntry(models.Model):
+    """
+    Set performed by a trainer, appended to their training log.
+
+    The table is partitioned by month of `performed_at`, see
+    `eiger.trainers.training_log`, so its primary key is `(id,
+    performed_at)` in the database while the ids alone stay unique.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        # Covered by the `(user, performed_at)` index:
+        db_index=False,
+        help_text=_('The trainer who performed the set.'),
+    )
+    exercise_variation = models.ForeignKey(
+        ExerciseVariation,
+        on_delete=models.PROTECT,
+        help_text=_('The exercise variation the set belongs to.'),
+    )
+    performed_at = models.DateTimeField(
+        help_text=_('The timestamp when the set was performed.'),
+    )
+    repetitions = models.PositiveSmallIntegerField(
+        null=True,
+        help_text=_('The number of repetitions achieved.'),
+    )
+    weight_in_kilos = models.PositiveSmallIntegerField(
+        null=True,
+        help_text=_('The weight used in kilograms.'),
+    )
+    duration_seconds = models.PositiveIntegerField(
+        null=True,
+        help_text=_('The duration of the set in seconds.'),
+    )
+
+    def __str__(self) -> str:
+        return f'Set {self.pk} of {self.user_id} at {self.performed_at}'
+
+    class Meta:
+        verbose_name = _('Training Log Entry')
+        verbose_name_plural = _('Training Log Entries')
+        indexes = [
+            # The history of a trainer, newest first:
+            models.Index(
+                fields=['user', 'performed_at', 'id'],
+                name='traininglog_user_idx',
+            ),
+            # Time range scans over all the trainers, a few pages per range
+            # as the rows are appended in time order:
+            BrinIndex(
+                fields=['performed_at'],
+                autosummarize=True,
+                name='traininglog_performed_brin',
+            ),
+        ]
+
+
+class TrainingRollup(models.Model):
+    """
+    Totals of the sets a trainer performed in a category over a period.
+
+    Folded from the training log by `eiger.trainers.rollups`, so the
+    progress charts read a row per period rather than every set.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        # Covered by the unique `(user, period_start, category)` index:
+        db_index=False,
+        help_text=_('The trainer who performed the sets.'),
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        help_text=_('The category of the exercises of the sets.'),
+    )
+    period_start = models.DateField(
+        help_text=_('The first day of the period.'),
+    )
+    sets = models.PositiveIntegerField(
+        default=0,
+        help_text=_('The number of sets performed.'),
+    )
+    repetitions = models.BigIntegerField(
+        default=0,
+        help_text=_('The number of repetitions performed.'),
+    )
+    volume = models.BigIntegerField(
+        default=0,
+        help_text=_('The kilograms lifted over the repetitions.'),
+    )
+    time_under_tension_seconds = models.BigIntegerField(
+        default=0,
+        help_text=_('The seconds spent performing the sets.'),
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text=_('The timestamp when the totals were last folded.'),
+    )
+
+    def __str__(self) -> str:
+        return f'Training of {self.user_id} from {self.period_start}'
+
+    class Meta:
+        abstract = True
+
+
+class DailyTrainingRollup(TrainingRollup):
+    class Meta:
+        verbose_name = _('Daily Training Rollup')
+        verbose_name_plural = _('Daily Training Rollups')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'period_start', 'category'],
+                name='unique_daily_training_rollup',
+            )
+        ]
+
+
+class WeeklyTrainingRollup(TrainingRollup):
+    """Weeks start on Mondays, and are summed from the daily rollups."""
+
+    class Meta:
+        verbose_name = _('Weekly Training Rollup')
+        verbose_name_plural = _('Weekly Training Rollups')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'period_start', 'category'],
+                name='unique_weekly_training_rollup',
+            )
+        ]
+
+
+class RollupWatermark(models.Model):
+    """The last training log entry folded into the rollups of a pipeline."""
+
+    name = models.CharField(
+        max_length=50,
+        primary_key=True,
+        help_text=_('The name of the rollup pipeline.'),
+    )
+    last_entry_id = models.BigIntegerField(
+        default=0,
+        help_text=_('The id of the last training log entry folded.'),
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text=_('The timestamp when the watermark last moved.'),
+    )
+
+    def __str__(self) -> str:
+        return f'{self.name} at entry {self.last_entry_id}'
+
+    class Meta:
+        verbose_name = _('Rollup Watermark')
+        verbose_name_plural = _('Rollup Watermarks')
@@ -0,0 +1,153 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, Mapping, Sequence, TypeVar
+
+from django.core.exceptions import BadRequest
+from django.db.models import Model, Q, QuerySet
+from django.utils.translation import gettext_lazy as _
+
+_ModelT = TypeVar('_ModelT', bound=Model)
+_RowT = TypeVar('_RowT', bound=Model | Mapping[str, object])
+
+CURSOR_SEPARATOR = '|'
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Position of the last seen row given the `(created_at, id)` order."""
+
+    created_at: datetime
+    id: int
+
+    def encode(self) -> str:
+        raw = f'{self.created_at.isoformat()}{CURSOR_SEPARATOR}{self.id}'
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @classmethod
+    def decode(cls, token: str) -> 'Cursor':
+        """
+        Parse a token produced by `Cursor.encode`.
+
+        Raises `BadRequest` so a tampered cursor results in a 400 response.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(token.encode()).decode()
+            created_at, id_ = raw.split(CURSOR_SEPARATOR)
+            return cls(
+                created_at=datetime.fromisoformat(created_at), id=int(id_)
+            )
+        except (binascii.Error, UnicodeDecodeError, ValueError) as error:
+            raise BadRequest(_('Invalid pagination cursor.')) from error
+
+    @classmethod
+    def from_row(cls, row: Model | Mapping[str, object]) -> 'Cursor':
+        """Build the cursor of a model instance or of a `values()` row."""
+        if isinstance(row, Model):
+            return cls(
+                created_at=row.created_at,  # type: ignore[attr-defined]
+                id=row.pk,
+            )
+        return cls(
+            created_at=row['created_at'],  # type: ignore[arg-type]
+            id=row['id'],  # type: ignore[arg-type]
+        )
+
+
+@dataclass(frozen=True)
+class KeysetPage(Generic[_RowT]):
+    items: list[_RowT]
+    next_cursor: str | None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def keyset_queryset(
+    queryset: 'QuerySet[_ModelT, _RowT]', cursor: str | None, page_size: int
+) -> 'QuerySet[_ModelT, _RowT]':
+    """
+    Return the query of a page, ordered by `(created_at, id)`.
+
+    Instead of an `OFFSET`, the rows after the cursor are looked up through
+    the composite index, so the cost of a page does not depend on how deep
+    into the feed it is. PostgreSQL can't start an index scan from the
+    `OR` of the cursor predicate, so it is bounded by `created_at >=` as
+    well, which becomes the index condition. One extra row is fetched to
+    know if there is a next page without issuing a `COUNT`.
+    """
+    queryset = queryset.order_by('created_at', 'id')
+    if cursor:
+        position = Cursor.decode(cursor)
+        queryset = queryset.filter(
+            Q(created_at__gt=position.created_at)
+            | Q(created_at=position.created_at, id__gt=position.id),
+            created_at__gte=position.created_at,
+        )
+    return queryset[: page_size + 1]
+
+
+def keyset_union_queryset(
+    querysets: 'Sequence[QuerySet[_ModelT, _RowT]]',
+    cursor: str | None,
+    page_size: int,
+) -> 'QuerySet[_ModelT, _RowT]':
+    """
+    Return the query of a page over the union of disjoint querysets.
+
+    A filter such as `reviewed OR created_by = user` can't be served by the
+    partial index of either side, so each side is paginated through its own
+    index and the sorted pages are merged by PostgreSQL.
+    """
+    first, *others = (
+        keyset_queryset(queryset, cursor, page_size) for queryset in querysets
+    )
+    if not others:
+        return first
+    return first.union(*others, all=True).order_by('created_at', 'id')[
+        : page_size + 1
+    ]
+
+
+def _slice_page(items: list[_RowT], page_size: int) -> KeysetPage[_RowT]:
+    if len(items) <= page_size:
+        return KeysetPage(items=items, next_cursor=None)
+
+    items = items[:page_size]
+    next_cursor = Cursor.from_row(items[-1]).encode()
+    return KeysetPage(items=items, next_cursor=next_cursor)
+
+
+def paginate_by_keyset(
+    queryset: 'QuerySet[_ModelT, _RowT]', cursor: str | None, page_size: int
+) -> KeysetPage[_RowT]:
+    """
+    Slice the queryset into a page ordered by `(created_at, id)`.
+
+    See `keyset_queryset`. A `values()` queryset must select the
+    `created_at` and `id` columns.
+    """
+    return _slice_page(
+        list(keyset_queryset(queryset, cursor, page_size)), page_size
+    )
+
+
+def paginate_union_by_keyset(
+    querysets: 'Sequence[QuerySet[_ModelT, _RowT]]',
+    cursor: str | None,
+    page_size: int,
+) -> KeysetPage[_RowT]:
+    """Slice the union of disjoint querysets, see `keyset_union_queryset`."""
+    return _slice_page(
+        list(keyset_union_queryset(querysets, cursor, page_size)), page_size
+    )
+
+
+async def apaginate_by_keyset(
+    queryset: 'QuerySet[_ModelT, _RowT]', cursor: str | None, page_size: int
+) -> KeysetPage[_RowT]:
+    """Asynchronous `paginate_by_keyset`, reading the rows with `async for`."""
+    items = [row async for row in keyset_queryset(queryset, cursor, page_size)]
+    return _slice_page(items, page_size)
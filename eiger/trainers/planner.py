@@ -0,0 +1,261 @@
+"""
+Planner of training sessions composed of reviewed exercise variations.
+
+The duration of every variation, its sets of repetitions and the rests
+between them, is kept by a database trigger in `total_duration_seconds`,
+read for the whole reviewed catalogue in a single query. Each process keeps
+the result in a `PlanningCatalogue` holding, per category, the durations in
+ascending order next to the ids of their variations and exercises, as NumPy
+arrays. The snapshot is reloaded once older than `PLANNER_CATALOGUE_MAX_AGE`
+seconds.
+
+`plan_session` splits the time budget between the categories of the mix
+by their weights, then fills the share of each category greedily with the
+longest variation that still fits, found by a binary search, using every
+exercise at most once. The time a category leaves unused is carried over
+to the next one. The range of durations a plan accepts is bounded by
+binary searches as well, so a plan costs a few binary searches per
+variation it picks, whatever the size of the catalogue.
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import chain
+from typing import Iterable, Mapping, Sequence
+
+import numpy
+from django.conf import settings
+
+from eiger.trainers.models import ExerciseVariation
+
+# Columns of the catalogue rows, see `PlanningCatalogue.from_rows`:
+CatalogueRow = tuple[int, int, int, int]
+
+
+class PlannerError(ValueError):
+    """Raised when a session can't be planned with the given options."""
+
+
+@dataclass(frozen=True)
+class CategoryVariations:
+    """The variations of a category, sorted by ascending duration."""
+
+    durations: Sequence[int]
+    variation_ids: Sequence[int]
+    exercise_ids: Sequence[int]
+
+    def __len__(self) -> int:
+        return len(self.durations)
+
+
+@dataclass(frozen=True)
+class PlanningCatalogue:
+    categories: Mapping[int, CategoryVariations]
+    loaded_at: float = 0
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[CatalogueRow], loaded_at: float = 0
+    ) -> 'PlanningCatalogue':
+        """
+        Build the catalogue from the rows of its variations.
+
+        Rows are `(variation_id, exercise_id, category_id, duration)`
+        tuples, those without a positive duration are left out.
+        """
+        return cls(_group_table(rows), loaded_at)
+
+    @classmethod
+    def from_database(cls) -> 'PlanningCatalogue':
+        rows = ExerciseVariation.objects.filter(
+            reviewed=True,
+            exercise__reviewed=True,
+            total_duration_seconds__gt=0,
+        ).values_list(
+            'id',
+            'exercise_id',
+            'exercise__exercise_type__category_id',
+            'total_duration_seconds',
+        )
+        return cls.from_rows(rows, loaded_at=time.monotonic())
+
+
+def _group_table(
+    rows: Iterable[CatalogueRow],
+) -> dict[int, CategoryVariations]:
+    table = numpy.fromiter(
+        chain.from_iterable(rows), dtype=numpy.int64
+    ).reshape(-1, 4)
+    table = table[table[:, 3] > 0]
+    # Sorted by category, then duration, then id, the last key first:
+    table = table[numpy.lexsort((table[:, 0], table[:, 3], table[:, 2]))]
+    category_ids, starts = numpy.unique(table[:, 2], return_index=True)
+    ends = [*starts[1:], len(table)]
+    return {
+        int(category_id): CategoryVariations(
+            durations=table[start:end, 3],
+            variation_ids=table[start:end, 0],
+            exercise_ids=table[start:end, 1],
+        )
+        for category_id, start, end in zip(category_ids, starts, ends)
+    }
+
+
+class PlanningCatalogueCache:
+    """The catalogue snapshot of this process, reloaded once outdated."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshot: PlanningCatalogue | None = None
+
+    def _is_fresh(self, snapshot: PlanningCatalogue | None) -> bool:
+        return (
+            snapshot is not None
+            and time.monotonic() - snapshot.loaded_at
+            < settings.PLANNER_CATALOGUE_MAX_AGE
+        )
+
+    def get(self) -> PlanningCatalogue:
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot  # type: ignore[return-value]
+
+        with self._lock:
+            if not self._is_fresh(self._snapshot):
+                self._snapshot = PlanningCatalogue.from_database()
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+
+planning_catalogue_cache = PlanningCatalogueCache()
+
+
+def get_planning_catalogue() -> PlanningCatalogue:
+    return planning_catalogue_cache.get()
+
+
+@dataclass(frozen=True)
+class PlannedVariation:
+    variation_id: int
+    exercise_id: int
+    category_id: int
+    duration_seconds: int
+
+
+@dataclass(frozen=True)
+class SessionPlan:
+    budget_seconds: int
+    rest_between_seconds: int
+    variations: tuple[PlannedVariation, ...]
+
+    @property
+    def total_seconds(self) -> int:
+        """The duration of the variations and of the rests between them."""
+        return _get_total_seconds(self.variations, self.rest_between_seconds)
+
+
+def plan_session(
+    budget_seconds: int,
+    mix: Mapping[int, float],
+    rest_between_seconds: int = 0,
+    min_variation_seconds: int | None = None,
+    max_variation_seconds: int | None = None,
+    catalogue: PlanningCatalogue | None = None,
+) -> SessionPlan:
+    """
+    Plan a session of at most `budget_seconds` over the categories of `mix`.
+
+    `mix` maps the ids of the categories to their relative share of the
+    budget, and the variations are planned in its order. Variations are
+    separated by `rest_between_seconds`, and only those lasting between
+    `min_variation_seconds` and `max_variation_seconds` are planned.
+    """
+    if budget_seconds <= 0:
+        raise PlannerError('The time budget must be positive.')
+    if rest_between_seconds < 0:
+        raise PlannerError('The rest between variations must not be negative.')
+    if not mix or min(mix.values()) < 0 or not sum(mix.values()):
+        raise PlannerError('The mix must give a positive share to a category.')
+    catalogue = catalogue or get_planning_catalogue()
+
+    total_weight = sum(mix.values())
+    cumulative_weight = 0.0
+    spent = 0
+    planned: list[PlannedVariation] = []
+    used_exercise_ids: set[int] = set()
+    for category_id, weight in mix.items():
+        cumulative_weight += weight
+        allotted = int(budget_seconds * cumulative_weight / total_weight)
+        variations = catalogue.categories.get(category_id)
+        if variations is None:
+            continue
+        start = (
+            bisect_left(variations.durations, min_variation_seconds)
+            if min_variation_seconds is not None
+            else 0
+        )
+        end = (
+            bisect_right(variations.durations, max_variation_seconds)
+            if max_variation_seconds is not None
+            else len(variations)
+        )
+        _fill_category(
+            planned,
+            variations,
+            category_id,
+            (start, end),
+            allotted - spent,
+            rest_between_seconds,
+            used_exercise_ids,
+        )
+        spent = _get_total_seconds(planned, rest_between_seconds)
+    return SessionPlan(
+        budget_seconds=budget_seconds,
+        rest_between_seconds=rest_between_seconds,
+        variations=tuple(planned),
+    )
+
+
+def _fill_category(
+    planned: list[PlannedVariation],
+    variations: CategoryVariations,
+    category_id: int,
+    bounds: tuple[int, int],
+    available: int,
+    rest_between_seconds: int,
+    used_exercise_ids: set[int],
+) -> None:
+    # Only the variations before `end` may still fit, as the time available
+    # decreases with every pick:
+    start, end = bounds
+    while end > start:
+        rest = rest_between_seconds if planned else 0
+        end = bisect_right(variations.durations, available - rest, start, end)
+        if end == start:
+            return
+        end -= 1
+        exercise_id = int(variations.exercise_ids[end])
+        if exercise_id in used_exercise_ids:
+            continue
+        used_exercise_ids.add(exercise_id)
+        duration = int(variations.durations[end])
+        planned.append(
+            PlannedVariation(
+                variation_id=int(variations.variation_ids[end]),
+                exercise_id=exercise_id,
+                category_id=category_id,
+                duration_seconds=duration,
+            )
+        )
+        available -= rest + duration
+
+
+def _get_total_seconds(
+    variations: Sequence[PlannedVariation], rest_between_seconds: int
+) -> int:
+    rests = max(len(variations) - 1, 0) * rest_between_seconds
+    return rests + sum(variation.duration_seconds for variation in variations)
@@ -0,0 +1,199 @@
+"""
+Query plan checks of the querysets run by the views.
+
+Each queryset is explained by PostgreSQL and its plan is searched for
+sequential scans of the tables that grow with the catalogue, which means
+an index is missing or can't be used by the query. A next page read
+through an index of the cursor columns must also start from the cursor,
+which must then be part of its index condition: when it is only a filter,
+every row before the cursor is read and the deeper the page, the slower
+it is.
+"""
+import json
+from dataclasses import dataclass
+from typing import Iterator, Mapping
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.db import connection
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.utils import timezone
+
+from eiger.trainers.api import DEFAULT_PAGE_SIZE, RESOURCES
+from eiger.trainers.importers import batched
+from eiger.trainers.models import (
+    Category,
+    Exercise,
+    ExerciseType,
+    ExerciseVariation,
+)
+from eiger.trainers.pagination import (
+    Cursor,
+    keyset_queryset,
+    keyset_union_queryset,
+)
+from eiger.trainers.search import search_exercises
+from eiger.trainers.views import (
+    HOME_FEED_PAGE_SIZE,
+    get_pending_exercise_variations,
+    get_pending_exercises,
+    get_searchable_exercises,
+)
+
+# Small lookup tables are expected to be read sequentially:
+LARGE_TABLES = frozenset(
+    (Exercise._meta.db_table, ExerciseVariation._meta.db_table)
+)
+SEED_BATCH_SIZE = 1000
+SEED_ENTRIES_PER_AUTHOR = 50
+SEED_PENDING_EVERY = 10
+NEXT_PAGE_SUFFIX = ' next page'
+CURSOR_COLUMN = 'created_at'
+CURSOR_INDEXES = frozenset(
+    index.name
+    for model in (Exercise, ExerciseVariation)
+    for index in model._meta.indexes
+    if CURSOR_COLUMN in index.fields
+)
+
+
+@dataclass(frozen=True)
+class PlanCheck:
+    name: str
+    plan: Mapping[str, object]
+    seq_scans: tuple[str, ...]
+    unbounded_scans: tuple[str, ...] = ()
+
+    @property
+    def passed(self) -> bool:
+        return not self.seq_scans and not self.unbounded_scans
+
+
+def find_seq_scans(plan: Mapping[str, object]) -> Iterator[str]:
+    """Yield the large tables sequentially scanned by the plan node."""
+    if (
+        plan.get('Node Type') == 'Seq Scan'
+        and plan.get('Relation Name') in LARGE_TABLES
+    ):
+        yield str(plan['Relation Name'])
+    for child in plan.get('Plans', ()):  # type: ignore[attr-defined]
+        yield from find_seq_scans(child)
+
+
+def find_unbounded_scans(plan: Mapping[str, object]) -> Iterator[str]:
+    """Yield the cursor indexes scanned without a bound on the cursor."""
+    if plan.get('Index Name') in CURSOR_INDEXES and CURSOR_COLUMN not in str(
+        plan.get('Index Cond', '')
+    ):
+        yield str(plan['Index Name'])
+    for child in plan.get('Plans', ()):  # type: ignore[attr-defined]
+        yield from find_unbounded_scans(child)
+
+
+def explain(
+    queryset: QuerySet,  # type: ignore[type-arg]
+) -> Mapping[str, object]:
+    return json.loads(queryset.explain(format='json'))[0]['Plan']
+
+
+def get_view_querysets(
+    user: AbstractBaseUser,
+) -> dict[str, QuerySet]:  # type: ignore[type-arg]
+    """Build the querysets of the views as they are run for the user."""
+    request = HttpRequest()
+    request.user = user
+    next_page = Cursor(created_at=timezone.now(), id=0).encode()
+    return {
+        'home pending exercises': keyset_queryset(
+            get_pending_exercises(user), None, HOME_FEED_PAGE_SIZE
+        ),
+        f'home pending exercises{NEXT_PAGE_SUFFIX}': keyset_queryset(
+            get_pending_exercises(user), next_page, HOME_FEED_PAGE_SIZE
+        ),
+        'home pending variations': keyset_queryset(
+            get_pending_exercise_variations(user), None, HOME_FEED_PAGE_SIZE
+        ),
+        f'home pending variations{NEXT_PAGE_SUFFIX}': keyset_queryset(
+            get_pending_exercise_variations(user),
+            next_page,
+            HOME_FEED_PAGE_SIZE,
+        ),
+        'api exercises': keyset_union_queryset(
+            RESOURCES['exercises'].get_querysets(request),
+            None,
+            DEFAULT_PAGE_SIZE,
+        ),
+        'api exercise variations': keyset_union_queryset(
+            RESOURCES['exercise-variations'].get_querysets(request),
+            None,
+            DEFAULT_PAGE_SIZE,
+        ),
+        'exercise search': search_exercises(
+            get_searchable_exercises(user), 'hangboard'
+        ),
+    }
+
+
+def check_query_plans(user: AbstractBaseUser) -> list[PlanCheck]:
+    checks = []
+    for name, queryset in get_view_querysets(user).items():
+        plan = explain(queryset)
+        checks.append(
+            PlanCheck(
+                name=name,
+                plan=plan,
+                seq_scans=tuple(find_seq_scans(plan)),
+                unbounded_scans=(
+                    tuple(find_unbounded_scans(plan))
+                    if name.endswith(NEXT_PAGE_SUFFIX)
+                    else ()
+                ),
+            )
+        )
+    return checks
+
+
+def seed_catalogue(user: AbstractBaseUser, size: int) -> None:
+    """
+    Create `size` exercises with a variation each.
+
+    The entries are spread over one author per `SEED_ENTRIES_PER_AUTHOR`,
+    including the user, and most of them are reviewed, as in production.
+    Meant to run inside a transaction that is rolled back.
+    """
+    authors = [
+        user,
+        *get_user_model().objects.bulk_create(
+            get_user_model()(username=f'query-plans-{user.pk}-{index}')
+            for index in range(size // SEED_ENTRIES_PER_AUTHOR)
+        ),
+    ]
+    category = Category.objects.create(
+        name=f'Query plans {user.pk}', color='#FF5722'
+    )
+    exercise_type = ExerciseType.objects.create(
+        name=f'Query plans {user.pk}', category=category
+    )
+    for batch in batched(range(size), SEED_BATCH_SIZE):
+        exercises = Exercise.objects.bulk_create(
+            Exercise(
+                name=f'Query plans {user.pk} {index}',
+                exercise_type=exercise_type,
+                created_by=authors[index % len(authors)],
+                reviewed=index % SEED_PENDING_EVERY != 0,
+            )
+            for index in batch
+        )
+        ExerciseVariation.objects.bulk_create(
+            ExerciseVariation(
+                exercise=exercise,
+                sets=index % 10,
+                created_by=exercise.created_by,
+                reviewed=exercise.reviewed,
+            )
+            for index, exercise in enumerate(exercises)
+        )
+    with connection.cursor() as cursor:
+        for table in sorted(LARGE_TABLES):
+            cursor.execute(f'ANALYZE {table}')
@@ -0,0 +1,173 @@
+"""
+Review jobs of the entries selected in the admin.
+
+A single `UPDATE` over a large selection held its row locks for the whole
+admin request and could hit the statement timeout, so the admin action
+enqueues a `ReviewJob` instead, run by the `run_review_jobs` task or
+command. The worker claims the oldest unfinished job with `SKIP LOCKED`,
+so several workers never run the same job, and marks its entries as
+reviewed in chunks of consecutive ids, each in its own short transaction
+that also refreshes the pending counters and saves the progress. A job
+whose worker died is claimed again once stale and resumes after its last
+chunk.
+"""
+from datetime import timedelta
+
+import structlog
+from django.conf import settings
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.db import transaction
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
+
+from eiger.trainers.counters import refresh_pending_review_counters
+from eiger.trainers.importers import batched
+from eiger.trainers.models import Exercise, ExerciseVariation, ReviewJob
+from eiger.trainers.tasks import defer, task
+
+TARGET_MODELS: dict[str, type[Exercise | ExerciseVariation]] = {
+    ReviewJob.Target.EXERCISE: Exercise,
+    ReviewJob.Target.EXERCISE_VARIATION: ExerciseVariation,
+}
+
+logger = structlog.get_logger()
+
+
+def get_target(model: type[Exercise | ExerciseVariation]) -> str:
+    return next(
+        target
+        for target, target_model in TARGET_MODELS.items()
+        if target_model is model
+    )
+
+
+def enqueue_review_job(
+    queryset: QuerySet[Exercise] | QuerySet[ExerciseVariation],
+    requested_by: AbstractBaseUser | None = None,
+    inline_limit: int = 0,
+) -> ReviewJob | None:
+    """
+    Queue the pending entries of the queryset, if any, for a review.
+
+    Up to `inline_limit` entries are reviewed right away by the caller
+    instead, the job being created as running so no worker claims it.
+    """
+    entry_ids = list(
+        queryset.filter(reviewed=False)
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+    if not entry_ids:
+        return None
+    inline = len(entry_ids) <= inline_limit
+    job = ReviewJob.objects.create(
+        target=get_target(queryset.model),
+        entry_ids=entry_ids,
+        total=len(entry_ids),
+        requested_by=requested_by,
+        status=ReviewJob.Status.RUNNING if inline else ReviewJob.Status.QUEUED,
+        started_at=timezone.now() if inline else None,
+    )
+    if inline:
+        return run_review_job(job)
+    logger.info(
+        'Queued the review job %s of %s entries.', job.pk, len(entry_ids)
+    )
+    defer(run_review_jobs.__name__, unique_key=run_review_jobs.__name__)
+    return job
+
+
+def claim_review_job() -> ReviewJob | None:
+    """
+    Mark the oldest queued, or stale running, job as running and return it.
+
+    A running job is stale when its progress wasn't saved for
+    `REVIEW_JOB_STALE_AFTER` seconds, as its worker is presumably dead.
+    """
+    stale_before = timezone.now() - timedelta(
+        seconds=settings.REVIEW_JOB_STALE_AFTER
+    )
+    with transaction.atomic():
+        job = (
+            ReviewJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=ReviewJob.Status.QUEUED)
+                | Q(
+                    status=ReviewJob.Status.RUNNING,
+                    updated_at__lt=stale_before,
+                )
+            )
+            .order_by('created_at', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ReviewJob.Status.RUNNING
+        job.started_at = job.started_at or timezone.now()
+        job.save(update_fields=['status', 'started_at', 'updated_at'])
+    return job
+
+
+def review_chunk(job: ReviewJob, entry_ids: list[int]) -> int:
+    """Mark the pending entries of the chunk as reviewed and save progress."""
+    model = TARGET_MODELS[job.target]
+    with transaction.atomic():
+        # The id range bounds the index scan, the ids skip the entries that
+        # weren't selected in between:
+        pending = model.objects.filter(
+            id__range=(entry_ids[0], entry_ids[-1]),
+            id__in=entry_ids,
+            reviewed=False,
+        )
+        user_ids = set(
+            pending.values_list('created_by_id', flat=True).distinct()
+        )
+        reviewed = pending.update(reviewed=True, updated_at=timezone.now())
+        refresh_pending_review_counters(user_ids)
+        ReviewJob.objects.filter(pk=job.pk).update(
+            processed=F('processed') + len(entry_ids),
+            reviewed=F('reviewed') + reviewed,
+            last_entry_id=entry_ids[-1],
+            updated_at=timezone.now(),
+        )
+    job.processed += len(entry_ids)
+    job.reviewed += reviewed
+    job.last_entry_id = entry_ids[-1]
+    return reviewed
+
+
+def run_review_job(job: ReviewJob, chunk_size: int | None = None) -> ReviewJob:
+    """Review the entries left after the last chunk, then finish the job."""
+    chunk_size = chunk_size or settings.REVIEW_JOB_CHUNK_SIZE
+    remaining = (
+        entry_id for entry_id in job.entry_ids if entry_id > job.last_entry_id
+    )
+    try:
+        for chunk in batched(remaining, chunk_size):
+            review_chunk(job, chunk)
+    except Exception as error:
+        logger.exception('The review job %s failed.', job.pk)
+        job.status = ReviewJob.Status.FAILED
+        job.error = str(error)
+    else:
+        job.status = ReviewJob.Status.SUCCEEDED
+        logger.info(
+            'The review job %s reviewed %s entries.', job.pk, job.reviewed
+        )
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+    return job
+
+
+def run_next_review_job(chunk_size: int | None = None) -> ReviewJob | None:
+    job = claim_review_job()
+    if job is None:
+        return None
+    return run_review_job(job, chunk_size)
+
+
+@task
+def run_review_jobs() -> None:
+    """Run the queued review jobs until none is left."""
+    while run_next_review_job() is not None:
+        continue
@@ -0,0 +1,262 @@
+"""
+Daily and weekly rollups of the training log, per trainer and category.
+
+The progress charts read `DailyTrainingRollup` and `WeeklyTrainingRollup`,
+a row per period and category, rather than every logged set. The
+`fold_training_log` task, deferred by each logged session, folds the
+entries logged after the `RollupWatermark` in batches. Rather than adding
+the new sets to the totals, which would count them twice whenever a batch
+is folded again, the totals of every day touched by a batch are recomputed
+from the log through its `(user, performed_at)` index, and those of their
+weeks from the daily rollups. Folding is thus idempotent, and the rollups
+can be rebuilt from scratch.
+
+The ids of the entries are drawn on insert but the entries only become
+visible on commit, so a session committing late could hold ids below the
+watermark. The sessions are logged holding a shared advisory lock, which
+the fold takes exclusively to read the last committed id.
+"""
+import operator
+from datetime import date, datetime, time, timedelta
+from functools import reduce
+from typing import Iterable
+
+import structlog
+from django.conf import settings
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.db import connection, transaction
+from django.db.models import BigIntegerField, Count, F, Max, Q, Sum
+from django.db.models.functions import Cast, Coalesce, TruncDate, TruncWeek
+from django.utils import timezone
+
+from eiger.trainers.models import (
+    DailyTrainingRollup,
+    RollupWatermark,
+    TrainingLogEntry,
+    TrainingRollup,
+    WeeklyTrainingRollup,
+)
+from eiger.trainers.tasks import defer, task
+
+LOG_LOCK_ID = 1014231023
+WATERMARK_NAME = 'training_rollups'
+CATEGORY_LOOKUP = 'exercise_variation__exercise__exercise_type__category'
+ROLLUP_FIELDS = (
+    'sets',
+    'repetitions',
+    'volume',
+    'time_under_tension_seconds',
+)
+# The rollup model and the length of each period:
+PERIODS: dict[str, tuple[type[TrainingRollup], timedelta]] = {
+    'day': (DailyTrainingRollup, timedelta(days=1)),
+    'week': (WeeklyTrainingRollup, timedelta(weeks=1)),
+}
+
+# Totals of the sets, the products being computed as `bigint`:
+_repetitions = Cast('repetitions', BigIntegerField())
+_LOG_TOTALS = {
+    'total_sets': Count('id'),
+    'total_repetitions': Coalesce(Sum('repetitions'), 0),
+    'total_volume': Coalesce(Sum(_repetitions * F('weight_in_kilos')), 0),
+    # The duration of a set, or its repetitions in the variation pace:
+    'total_time_under_tension_seconds': Coalesce(
+        Sum(
+            Coalesce(
+                Cast('duration_seconds', BigIntegerField()),
+                _repetitions * F('exercise_variation__seconds_per_repetition'),
+            )
+        ),
+        0,
+    ),
+}
+_ROLLUP_TOTALS = {f'total_{field}': Sum(field) for field in ROLLUP_FIELDS}
+
+logger = structlog.get_logger()
+
+UserPeriod = tuple[int, date]
+
+
+def get_committed_entry_id() -> int:
+    """Return the id of the last entry, below which all are committed."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)', [LOG_LOCK_ID])
+        return (
+            TrainingLogEntry.objects.aggregate(last_id=Max('id'))['last_id']
+            or 0
+        )
+
+
+def get_week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _get_day_start(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time()))
+
+
+def _build_rollups(
+    model: type[TrainingRollup], rows: Iterable[dict]
+) -> list[TrainingRollup]:
+    return [
+        model(
+            user_id=row['user_id'],
+            category_id=row['category_id'],
+            period_start=row['period_start'],
+            **{field: row[f'total_{field}'] for field in ROLLUP_FIELDS},
+        )
+        for row in rows
+    ]
+
+
+def _save_rollups(
+    model: type[TrainingRollup], rollups: list[TrainingRollup]
+) -> None:
+    model.objects.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=['user', 'period_start', 'category'],
+        update_fields=[*ROLLUP_FIELDS, 'updated_at'],
+    )
+
+
+def compute_daily_rollups(days: Iterable[UserPeriod]) -> list[TrainingRollup]:
+    """Total the logged sets of the `(user_id, day)` pairs, in local time."""
+    query = reduce(
+        operator.or_,
+        (
+            Q(
+                user_id=user_id,
+                performed_at__gte=_get_day_start(day),
+                performed_at__lt=_get_day_start(day + timedelta(days=1)),
+            )
+            for user_id, day in days
+        ),
+    )
+    rows = (
+        TrainingLogEntry.objects.filter(query)
+        .values(
+            'user_id',
+            category_id=F(CATEGORY_LOOKUP),
+            period_start=TruncDate('performed_at'),
+        )
+        .annotate(**_LOG_TOTALS)
+        .order_by()
+    )
+    return _build_rollups(DailyTrainingRollup, rows)
+
+
+def compute_weekly_rollups(
+    weeks: Iterable[UserPeriod],
+) -> list[TrainingRollup]:
+    """Total the daily rollups of the `(user_id, week_start)` pairs."""
+    query = reduce(
+        operator.or_,
+        (
+            Q(
+                user_id=user_id,
+                period_start__gte=week_start,
+                period_start__lt=week_start + timedelta(weeks=1),
+            )
+            for user_id, week_start in weeks
+        ),
+    )
+    rows = (
+        DailyTrainingRollup.objects.filter(query)
+        .values(
+            'user_id',
+            'category_id',
+            week_start=TruncWeek('period_start'),
+        )
+        .annotate(**_ROLLUP_TOTALS)
+        .order_by()
+    )
+    return _build_rollups(
+        WeeklyTrainingRollup,
+        ({**row, 'period_start': row['week_start']} for row in rows),
+    )
+
+
+def refresh_rollups(days: set[UserPeriod]) -> None:
+    """Recompute the rollups of the `(user_id, day)` pairs and their weeks."""
+    if not days:
+        return
+    _save_rollups(DailyTrainingRollup, compute_daily_rollups(days))
+    weeks = {(user_id, get_week_start(day)) for user_id, day in days}
+    _save_rollups(WeeklyTrainingRollup, compute_weekly_rollups(weeks))
+
+
+def fold_next_batch(last_entry_id: int, batch_size: int) -> int:
+    """
+    Fold the next batch of entries up to `last_entry_id`.
+
+    Return the number of entries folded, none once the watermark reached
+    `last_entry_id`. The watermark is locked, so concurrent folds run one
+    batch after the other.
+    """
+    with transaction.atomic():
+        (
+            watermark,
+            _,
+        ) = RollupWatermark.objects.select_for_update().get_or_create(
+            name=WATERMARK_NAME
+        )
+        entries = list(
+            TrainingLogEntry.objects.filter(
+                id__gt=watermark.last_entry_id, id__lte=last_entry_id
+            )
+            .order_by('id')
+            .values_list('id', 'user_id', 'performed_at')[:batch_size]
+        )
+        if not entries:
+            return 0
+        refresh_rollups(
+            {
+                (user_id, timezone.localdate(performed_at))
+                for _, user_id, performed_at in entries
+            }
+        )
+        watermark.last_entry_id = entries[-1][0]
+        watermark.save(update_fields=['last_entry_id', 'updated_at'])
+    return len(entries)
+
+
+@task
+def fold_training_log(batch_size: int | None = None) -> int:
+    """Fold the entries committed since the watermark and return how many."""
+    batch_size = batch_size or settings.ROLLUP_BATCH_SIZE
+    last_entry_id = get_committed_entry_id()
+    folded = 0
+    while batch := fold_next_batch(last_entry_id, batch_size):
+        folded += batch
+    logger.info('Folded %s training log entries into the rollups.', folded)
+    return folded
+
+
+def rebuild_training_rollups(batch_size: int | None = None) -> int:
+    """Delete the rollups and fold the whole training log again."""
+    with transaction.atomic():
+        RollupWatermark.objects.select_for_update().filter(
+            name=WATERMARK_NAME
+        ).update(last_entry_id=0, updated_at=timezone.now())
+        DailyTrainingRollup.objects.all().delete()
+        WeeklyTrainingRollup.objects.all().delete()
+    return fold_training_log(batch_size)
+
+
+def enqueue_rollup() -> None:
+    defer(fold_training_log.__name__, unique_key=fold_training_log.__name__)
+
+
+def get_progress(
+    user: AbstractBaseUser, period: str, since: date, until: date
+) -> list[dict[str, object]]:
+    """Return the rollups of the trainer starting within `[since, until)`."""
+    model, _ = PERIODS[period]
+    return list(
+        model.objects.filter(
+            user=user, period_start__gte=since, period_start__lt=until
+        )
+        .order_by('period_start', 'category')
+        .values('period_start', 'category', *ROLLUP_FIELDS)
+    )
@@ -0,0 +1,86 @@
+"""
+Ranked full-text search of exercises.
+
+Queries are matched against `Exercise.search_vector`, where the name
+weighs more than the description, through its GIN index. When nothing
+matches, which usually means a typo, the trigram similarity of the name is
+used instead, also served by a GIN index.
+Both paths annotate a `search_rank`, so callers can order by it.
+"""
+import re
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramSimilarity,
+)
+from django.db.models import (
+    Case,
+    Exists,
+    F,
+    FloatField,
+    Q,
+    QuerySet,
+    When,
+)
+
+from eiger.trainers.models import Exercise
+
+SEARCH_CONFIG = 'english'
+SEARCH_RANK_FIELD = 'search_rank'
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def _prefix_query(query: str) -> SearchQuery | None:
+    """Build `word:* & ...` so partially typed words match."""
+    words = _WORD_PATTERN.findall(query)
+    if not words:
+        return None
+    return SearchQuery(
+        ' & '.join(f'{word}:*' for word in words),
+        config=SEARCH_CONFIG,
+        search_type='raw',
+    )
+
+
+def search_exercises(
+    queryset: 'QuerySet[Exercise]', query: str, *, prefix: bool = False
+) -> 'QuerySet[Exercise]':
+    """
+    Filter the queryset by the query, ordered by decreasing relevance.
+
+    `query` follows the web search syntax (quoted phrases, `or`, `-word`),
+    unless `prefix` is set, where every word is matched as a prefix for
+    autocompletion.
+    """
+    query = query.strip()
+    search_query = (
+        _prefix_query(query)
+        if prefix
+        else SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    )
+    if search_query is None:
+        return queryset.none()
+
+    # A single query: the trigram matches are only kept when no row
+    # matches the full-text query, which PostgreSQL checks once.
+    text_match = Q(search_vector=search_query)
+    has_text_matches = Exists(queryset.filter(text_match))
+    return (
+        queryset.filter(
+            text_match | Q(name__trigram_similar=query) & ~has_text_matches
+        )
+        .annotate(
+            **{
+                SEARCH_RANK_FIELD: Case(
+                    When(
+                        text_match,
+                        then=SearchRank(F('search_vector'), search_query),
+                    ),
+                    default=TrigramSimilarity('name', query),
+                    output_field=FloatField(),
+                )
+            }
+        )
+        .order_by(f'-{SEARCH_RANK_FIELD}', 'id')
+    )
@@ -0,0 +1,127 @@
+from typing import Type
+
+import structlog
+from django.apps import AppConfig
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Model, QuerySet
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from eiger.trainers.counters import (
+    COUNTER_FIELD_BY_MODEL,
+    apply_pending_review_delta,
+)
+from eiger.trainers.models import (
+    Category,
+    Exercise,
+    ExerciseType,
+    ExerciseVariation,
+)
+from eiger.trainers.taxonomy import taxonomy_cache
+from eiger.trainers.training_log import (
+    TABLE_NAME,
+    create_training_log_partitions,
+)
+
+# Only these fields change the pending review counters of an entry:
+PENDING_REVIEW_FIELDS = frozenset(('reviewed', 'created_by'))
+
+logger = structlog.get_logger()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=ExerciseType)
+@receiver(post_delete, sender=ExerciseType)
+def invalidate_taxonomy_cache(
+    sender: Type[Category | ExerciseType], **kwargs
+) -> None:
+    logger.debug('Invalidating the taxonomy cache after a %s change.', sender)
+    taxonomy_cache.invalidate()
+    # A concurrent request may rebuild the tree before this transaction
+    # commits, so the version is bumped again once the change is visible.
+    transaction.on_commit(taxonomy_cache.invalidate)
+
+
+@receiver(pre_save, sender=Exercise)
+@receiver(pre_save, sender=ExerciseVariation)
+def read_saved_review_state(
+    sender: Type[Exercise | ExerciseVariation],
+    instance: Exercise | ExerciseVariation,
+    update_fields: frozenset[str] | None,
+    **kwargs,
+) -> None:
+    # The delta of an update depends on the author and state it replaces:
+    if instance._state.adding or (
+        update_fields is not None and not update_fields & PENDING_REVIEW_FIELDS
+    ):
+        return
+    instance._saved_review_state = (  # type: ignore[union-attr]
+        sender.objects.filter(pk=instance.pk)
+        .values_list('created_by_id', 'reviewed')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Exercise)
+@receiver(post_save, sender=ExerciseVariation)
+def update_counters_after_save(
+    sender: Type[Exercise | ExerciseVariation],
+    instance: Exercise | ExerciseVariation,
+    created: bool,
+    **kwargs,
+) -> None:
+    field_name = COUNTER_FIELD_BY_MODEL[sender]
+    if created:
+        apply_pending_review_delta(
+            instance.created_by_id,
+            field_name,
+            0 if instance.reviewed else 1,
+            submitted_at=instance.created_at,
+        )
+        return
+    saved_state = instance.__dict__.pop('_saved_review_state', None)
+    if saved_state is None or saved_state == (
+        instance.created_by_id,
+        instance.reviewed,
+    ):
+        return
+    saved_user_id, saved_reviewed = saved_state
+    if not saved_reviewed:
+        apply_pending_review_delta(saved_user_id, field_name, -1)
+    if not instance.reviewed:
+        apply_pending_review_delta(instance.created_by_id, field_name, 1)
+
+
+@receiver(post_delete, sender=Exercise)
+@receiver(post_delete, sender=ExerciseVariation)
+def update_counters_after_delete(
+    sender: Type[Exercise | ExerciseVariation],
+    instance: Exercise | ExerciseVariation,
+    origin: Model | QuerySet,  # type: ignore[type-arg]
+    **kwargs,
+) -> None:
+    # The counter of a deleted user is deleted with the entries:
+    origin_model = (
+        origin.model if isinstance(origin, QuerySet) else type(origin)
+    )
+    if issubclass(origin_model, get_user_model()) or instance.reviewed:
+        return
+    apply_pending_review_delta(
+        instance.created_by_id, COUNTER_FIELD_BY_MODEL[sender], -1
+    )
+
+
+@receiver(post_migrate)
+def create_partitions_after_migrate(sender: AppConfig, **kwargs) -> None:
+    # A new deployment can log sessions before the worker runs the task:
+    if sender.name != 'eiger.trainers':
+        return
+    if TABLE_NAME in connection.introspection.table_names():
+        create_training_log_partitions()
@@ -0,0 +1,219 @@
+"""
+Background tasks queued in Postgres.
+
+Slow work is deferred from the request handlers with `defer` and run by the
+`run_worker` command. The tasks are rows of the `Task` table, so a task
+deferred within a transaction is only queued if the transaction commits.
+The workers claim the due tasks with `SELECT ... FOR UPDATE SKIP LOCKED`,
+so concurrent workers neither wait on nor run the same task. A failing
+task is retried with an exponential backoff until it runs out of attempts,
+and the tasks of `TASK_SCHEDULE` are queued again after each run. A running
+task is touched every `TASK_HEARTBEAT_INTERVAL` seconds, so only the tasks
+of a lost worker turn stale and are claimed again.
+"""
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator, TypeVar
+
+import structlog
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from eiger.trainers.models import Task
+
+TaskFunction = TypeVar('TaskFunction', bound=Callable[..., Any])
+
+TASKS: dict[str, Callable[..., Any]] = {}
+
+logger = structlog.get_logger()
+
+
+class TaskError(Exception):
+    """Raised when a task can't be deferred or run."""
+
+
+def task(func: TaskFunction) -> TaskFunction:
+    """Register the function as a task named after it."""
+    TASKS[func.__name__] = func
+    return func
+
+
+def defer(
+    name: str,
+    *args: Any,
+    run_at: datetime | None = None,
+    unique_key: str | None = None,
+    max_attempts: int | None = None,
+    **kwargs: Any,
+) -> Task | None:
+    """
+    Queue a call of the registered task with JSON serialisable arguments.
+
+    Return `None` instead when a task with the same `unique_key` is already
+    queued, which then runs the work of both.
+    """
+    if name not in TASKS:
+        raise TaskError(f'Unknown task {name!r}.')
+    try:
+        with transaction.atomic():
+            queued = Task.objects.create(
+                name=name,
+                args=list(args),
+                kwargs=kwargs,
+                unique_key=unique_key,
+                run_at=run_at or timezone.now(),
+                max_attempts=max_attempts or settings.TASK_MAX_ATTEMPTS,
+            )
+    except IntegrityError:
+        if unique_key is None:
+            raise
+        return None
+    logger.info('Queued the task %s.', queued)
+    return queued
+
+
+def schedule_periodic_tasks() -> None:
+    """Queue the scheduled tasks that aren't queued yet, to run now."""
+    for name in settings.TASK_SCHEDULE:
+        defer(name, unique_key=_get_schedule_key(name))
+
+
+def claim_task() -> Task | None:
+    """
+    Mark the next due, or stale running, task as running and return it.
+
+    A running task is stale when it wasn't touched by its heartbeat for
+    `TASK_STALE_AFTER` seconds, as its worker is presumably dead. A stale
+    task out of attempts is failed instead, as it may be what kills its
+    workers.
+    """
+    now = timezone.now()
+    stale = Q(
+        status=Task.Status.RUNNING,
+        updated_at__lt=now - timedelta(seconds=settings.TASK_STALE_AFTER),
+    )
+    with transaction.atomic():
+        Task.objects.filter(stale, attempts__gte=F('max_attempts')).update(
+            status=Task.Status.FAILED,
+            error='The worker running the task was lost.',
+            finished_at=now,
+            updated_at=now,
+        )
+        claimed = (
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=Task.Status.QUEUED, run_at__lte=now)
+                | stale & Q(attempts__lt=F('max_attempts'))
+            )
+            .order_by('run_at', 'id')
+            .first()
+        )
+        if claimed is None:
+            return None
+        claimed.status = Task.Status.RUNNING
+        claimed.attempts += 1
+        claimed.started_at = now
+        claimed.save(
+            update_fields=['status', 'attempts', 'started_at', 'updated_at']
+        )
+    return claimed
+
+
+def get_retry_delay(attempts: int) -> timedelta:
+    """Return the backoff before retrying a task after its failed attempts."""
+    seconds = settings.TASK_RETRY_BACKOFF * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.TASK_RETRY_BACKOFF_MAX))
+
+
+def touch_task(task_id: int) -> None:
+    Task.objects.filter(pk=task_id, status=Task.Status.RUNNING).update(
+        updated_at=timezone.now()
+    )
+
+
+@contextmanager
+def heartbeat(claimed: Task) -> Iterator[None]:
+    """Touch the running task from another thread until the block exits."""
+    stopped = threading.Event()
+    thread = threading.Thread(
+        target=_beat,
+        args=(claimed.pk, stopped),
+        name=f'heartbeat-{claimed.pk}',
+        daemon=True,
+    )
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def run_task(claimed: Task) -> Task:
+    """Run the claimed task, then record its outcome or queue its retry."""
+    func = TASKS.get(claimed.name)
+    try:
+        if func is None:
+            raise TaskError(f'Unknown task {claimed.name!r}.')
+        with heartbeat(claimed):
+            func(*claimed.args, **claimed.kwargs)
+    except Exception as error:
+        claimed.error = str(error)
+        if func is not None and claimed.attempts < claimed.max_attempts:
+            logger.warning('The task %s failed, retrying it.', claimed)
+            if _retry(claimed):
+                return claimed
+        logger.exception('The task %s failed.', claimed)
+        claimed.status = Task.Status.FAILED
+    else:
+        claimed.status = Task.Status.SUCCEEDED
+        logger.info('The task %s succeeded.', claimed)
+    claimed.finished_at = timezone.now()
+    claimed.save(
+        update_fields=['status', 'error', 'finished_at', 'updated_at']
+    )
+    if claimed.name in settings.TASK_SCHEDULE:
+        defer(
+            claimed.name,
+            run_at=claimed.finished_at
+            + timedelta(seconds=settings.TASK_SCHEDULE[claimed.name]),
+            unique_key=_get_schedule_key(claimed.name),
+        )
+    return claimed
+
+
+def run_next_task() -> Task | None:
+    claimed = claim_task()
+    if claimed is None:
+        return None
+    return run_task(claimed)
+
+
+def _beat(task_id: int, stopped: threading.Event) -> None:
+    try:
+        while not stopped.wait(settings.TASK_HEARTBEAT_INTERVAL):
+            touch_task(task_id)
+    finally:
+        # The thread's own connection:
+        connection.close()
+
+
+def _retry(claimed: Task) -> bool:
+    claimed.status = Task.Status.QUEUED
+    claimed.run_at = timezone.now() + get_retry_delay(claimed.attempts)
+    try:
+        with transaction.atomic():
+            claimed.save(
+                update_fields=['status', 'run_at', 'error', 'updated_at']
+            )
+    except IntegrityError:
+        # A task with the same key was queued meanwhile and does the work:
+        return False
+    return True
+
+
+def _get_schedule_key(name: str) -> str:
+    return f'schedule:{name}'
@@ -0,0 +1,224 @@
+"""
+Read-through cache of the Category -> ExerciseType taxonomy.
+
+The taxonomy is small, read on almost every trainer page and rarely
+written, so each process keeps an immutable snapshot of the whole tree.
+A version token kept in the shared cache backend tells the processes when
+their snapshot is outdated; it is replaced by the `post_save` and
+`post_delete` signals of `Category` and `ExerciseType`. A version expires
+after `settings.TAXONOMY_VERSION_TIMEOUT`, so a process the replacement
+doesn't reach, such as one without a shared backend, catches up in time.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from uuid import uuid4
+
+from django.conf import settings
+
+from eiger.caching import NamespacedCache, get_cache
+from eiger.trainers.models import Category, ExerciseType
+
+TAXONOMY_CACHE_NAMESPACE = 'taxonomy'
+TAXONOMY_VERSION_KEY = 'version'
+TAXONOMY_TREE_KEY = 'tree:{version}'
+
+
+@dataclass(frozen=True)
+class ExerciseTypeNode:
+    id: int
+    name: str
+    category_id: int
+    category_name: str
+
+    def __str__(self) -> str:
+        return f'{self.category_name} - {self.name}'
+
+    def to_model(self) -> ExerciseType:
+        """Build an unsaved `ExerciseType` without touching the database."""
+        exercise_type = ExerciseType(
+            id=self.id, name=self.name, category_id=self.category_id
+        )
+        exercise_type.category = Category(
+            id=self.category_id, name=self.category_name
+        )
+        return exercise_type
+
+
+@dataclass(frozen=True)
+class CategoryNode:
+    id: int
+    name: str
+    color: str
+    exercise_types: tuple[ExerciseTypeNode, ...]
+
+
+@dataclass(frozen=True)
+class Taxonomy:
+    version: str
+    categories: tuple[CategoryNode, ...]
+    _categories_by_id: dict[int, CategoryNode] = field(
+        init=False, repr=False, compare=False
+    )
+    _exercise_types_by_id: dict[int, ExerciseTypeNode] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        categories_by_id = {
+            category.id: category for category in self.categories
+        }
+        exercise_types_by_id = {
+            exercise_type.id: exercise_type
+            for category in self.categories
+            for exercise_type in category.exercise_types
+        }
+        object.__setattr__(self, '_categories_by_id', categories_by_id)
+        object.__setattr__(self, '_exercise_types_by_id', exercise_types_by_id)
+
+    @classmethod
+    def from_database(cls, version: str) -> 'Taxonomy':
+        exercise_types: dict[int, list[ExerciseTypeNode]] = {}
+        categories = tuple(
+            Category.objects.values('id', 'name', 'color').order_by('name')
+        )
+        category_names = {
+            category['id']: category['name'] for category in categories
+        }
+        for exercise_type in ExerciseType.objects.values(
+            'id', 'name', 'category_id'
+        ).order_by('id'):
+            category_id = exercise_type['category_id']
+            exercise_types.setdefault(category_id, []).append(
+                ExerciseTypeNode(
+                    id=exercise_type['id'],
+                    name=exercise_type['name'],
+                    category_id=category_id,
+                    category_name=category_names[category_id],
+                )
+            )
+        return cls(
+            version=version,
+            categories=tuple(
+                CategoryNode(
+                    id=category['id'],
+                    name=category['name'],
+                    color=category['color'],
+                    exercise_types=tuple(
+                        exercise_types.get(category['id'], ())
+                    ),
+                )
+                for category in categories
+            ),
+        )
+
+    @property
+    def exercise_types(self) -> tuple[ExerciseTypeNode, ...]:
+        """Every exercise type, ordered by its category name."""
+        return tuple(
+            exercise_type
+            for category in self.categories
+            for exercise_type in category.exercise_types
+        )
+
+    def get_category(self, category_id: int) -> CategoryNode | None:
+        return self._categories_by_id.get(category_id)
+
+    def get_exercise_type(
+        self, exercise_type_id: int
+    ) -> ExerciseTypeNode | None:
+        return self._exercise_types_by_id.get(exercise_type_id)
+
+
+class TaxonomyCache:
+    """
+    Two-level cache of the taxonomy.
+
+    The first level is the snapshot held by this process. The second one is
+    the `taxonomy` namespace of the cache named by
+    `settings.TAXONOMY_CACHE_ALIAS`, shared by every worker, that stores the
+    current version and the pickled tree.
+    When the alias is empty only the first level is used, with a version of
+    its own that expires as the shared one does.
+    """
+
+    def __init__(self, alias: str | None = None) -> None:
+        self._alias = alias
+        self._lock = threading.Lock()
+        self._snapshot: Taxonomy | None = None
+        self._renew_local_version()
+
+    @property
+    def _shared_cache(self) -> NamespacedCache | None:
+        alias = (
+            settings.TAXONOMY_CACHE_ALIAS
+            if self._alias is None
+            else self._alias
+        )
+        return get_cache(TAXONOMY_CACHE_NAMESPACE, alias) if alias else None
+
+    def _renew_local_version(self) -> None:
+        self._local_version = uuid4().hex
+        self._local_version_expires_at = (
+            time.monotonic() + settings.TAXONOMY_VERSION_TIMEOUT
+        )
+
+    def _current_version(self) -> str:
+        shared_cache = self._shared_cache
+        if shared_cache is None:
+            if time.monotonic() >= self._local_version_expires_at:
+                self._renew_local_version()
+            return self._local_version
+
+        version = shared_cache.get(TAXONOMY_VERSION_KEY)
+        if version is None:
+            shared_cache.add(
+                TAXONOMY_VERSION_KEY,
+                uuid4().hex,
+                timeout=settings.TAXONOMY_VERSION_TIMEOUT,
+            )
+            version = shared_cache.get(TAXONOMY_VERSION_KEY)
+        return version
+
+    def _load(self, version: str) -> Taxonomy:
+        shared_cache = self._shared_cache
+        if shared_cache is None:
+            return Taxonomy.from_database(version)
+
+        tree_key = TAXONOMY_TREE_KEY.format(version=version)
+        taxonomy = shared_cache.get(tree_key)
+        if taxonomy is None:
+            taxonomy = Taxonomy.from_database(version)
+            shared_cache.set(tree_key, taxonomy)
+        return taxonomy
+
+    def get(self) -> Taxonomy:
+        version = self._current_version()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = self._load(version)
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Make every process rebuild its snapshot on the next access."""
+        with self._lock:
+            self._snapshot = None
+            self._renew_local_version()
+        shared_cache = self._shared_cache
+        if shared_cache is not None:
+            shared_cache.set(
+                TAXONOMY_VERSION_KEY,
+                uuid4().hex,
+                timeout=settings.TAXONOMY_VERSION_TIMEOUT,
+            )
+
+
+taxonomy_cache = TaxonomyCache()
+
+
+def get_taxonomy() -> Taxonomy:
+    return taxonomy_cache.get()
@@ -0,0 +1,85 @@
+"""
+Fragment cache of the rendered cards.
+
+`{% cachedfragment name value ... %}` caches its content in the `fragments`
+namespace of `eiger.caching`, under a key built from the fragment name and
+the values it varies on. Model instances contribute their id and
+`updated_at`, so saving the entry, or a related row passed to the tag,
+changes the key: the next render misses and the outdated fragment expires
+with the namespace timeout, without any explicit invalidation.
+
+    {% load fragments %}
+    {% cachedfragment 'exercise_card' exercise exercise.exercise_type %}
+      ...
+    {% endcachedfragment %}
+"""
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.db.models import Model
+from django.template.base import FilterExpression, NodeList, Parser, Token
+
+from eiger.caching import get_cache
+
+FRAGMENTS_CACHE_NAMESPACE = 'fragments'
+
+register = template.Library()
+
+
+def _vary_on_part(value: object) -> str:
+    if isinstance(value, Model):
+        updated_at = getattr(value, 'updated_at', None)
+        version = updated_at.timestamp() if updated_at else ''
+        return f'{value._meta.label_lower}.{value.pk}.{version}'
+    return str(value)
+
+
+def make_fragment_key(fragment_name: str, vary_on: list[object]) -> str:
+    digest = hashlib.md5(
+        ':'.join(_vary_on_part(value) for value in vary_on).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f'{fragment_name}:{digest}'
+
+
+class CachedFragmentNode(template.Node):
+    def __init__(
+        self,
+        nodelist: NodeList,
+        fragment_name: FilterExpression,
+        vary_on: list[FilterExpression],
+    ) -> None:
+        self.nodelist = nodelist
+        self.fragment_name = fragment_name
+        self.vary_on = vary_on
+
+    def render(self, context: template.Context) -> str:
+        key = make_fragment_key(
+            self.fragment_name.resolve(context),
+            [value.resolve(context) for value in self.vary_on],
+        )
+        cache = get_cache(
+            FRAGMENTS_CACHE_NAMESPACE, settings.FRAGMENTS_CACHE_ALIAS
+        )
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = self.nodelist.render(context)
+            cache.set(key, fragment)
+        return fragment
+
+
+@register.tag('cachedfragment')
+def do_cachedfragment(parser: Parser, token: Token) -> CachedFragmentNode:
+    tokens = token.split_contents()
+    if len(tokens) < 2:
+        raise template.TemplateSyntaxError(
+            f'{tokens[0]!r} tag requires at least a fragment name.'
+        )
+    nodelist = parser.parse(('endcachedfragment',))
+    parser.delete_first_token()
+    return CachedFragmentNode(
+        nodelist,
+        parser.compile_filter(tokens[1]),
+        [parser.compile_filter(value) for value in tokens[2:]],
+    )
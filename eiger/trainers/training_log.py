@@ -0,0 +1,305 @@
+"""
+Training log of the sets performed by the trainers.
+
+The log is append-only and grows with every set of every session, so
+`TrainingLogEntry` is a narrow table partitioned by month of
+`performed_at`. A month's partition is created ahead of time by the
+`create_training_log_partitions` task, and rows of months without a
+partition, such as imported history, land in the default partition until
+`create_partition` moves them to their own. A session is written by a
+single `bulk_create`, and the history of a trainer is read newest first
+through the `(user, performed_at, id)` index of the partitions, pruned to
+the requested time range.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone as dt_timezone
+from functools import partial
+from typing import Any, Iterable, Mapping, Sequence
+
+import structlog
+from django.conf import settings
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from eiger.trainers.analytics import invalidate_training_analytics
+from eiger.trainers.models import ExerciseVariation, TrainingLogEntry
+from eiger.trainers.pagination import Cursor, KeysetPage
+from eiger.trainers.rollups import LOG_LOCK_ID, enqueue_rollup
+from eiger.trainers.tasks import task
+
+TABLE_NAME = TrainingLogEntry._meta.db_table
+DEFAULT_PARTITION_NAME = f'{TABLE_NAME}_default'
+MAX_SESSION_SETS = 500
+# Upper bounds of the `smallint` and `integer` columns:
+ENTRY_FIELD_MAX_VALUES = {
+    'repetitions': 32767,
+    'weight_in_kilos': 32767,
+    'duration_seconds': 2147483647,
+}
+ENTRY_FIELDS = (
+    'id',
+    'exercise_variation',
+    'performed_at',
+    'repetitions',
+    'weight_in_kilos',
+    'duration_seconds',
+)
+
+logger = structlog.get_logger()
+
+
+class TrainingLogError(ValueError):
+    """Raised when a session can't be added to the training log."""
+
+
+def get_month(moment: datetime) -> date:
+    """Return the first day of the UTC month of the timestamp."""
+    return moment.astimezone(dt_timezone.utc).date().replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_partition_name(month: date) -> str:
+    return f'{TABLE_NAME}_{month:%Y%m}'
+
+
+def create_partition(month: date) -> bool:
+    """
+    Create the partition of the month, unless it exists, and return if so.
+
+    Its rows are first moved out of the default partition, which would
+    otherwise make the partition bounds overlap.
+    """
+    name = get_partition_name(month)
+    start, end = (
+        datetime.combine(bound, time(), tzinfo=dt_timezone.utc).isoformat()
+        for bound in (month, add_months(month, 1))
+    )
+    quote_name = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s)', [name])
+        if cursor.fetchone()[0] is not None:
+            return False
+        cursor.execute(
+            f'CREATE TABLE {quote_name(name)}'
+            f' (LIKE {quote_name(TABLE_NAME)} INCLUDING DEFAULTS'
+            ' INCLUDING CONSTRAINTS)'
+        )
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {quote_name(DEFAULT_PARTITION_NAME)}'
+            ' WHERE performed_at >= %s AND performed_at < %s RETURNING *)'
+            f' INSERT INTO {quote_name(name)} SELECT * FROM moved',
+            [start, end],
+        )
+        moved = cursor.rowcount
+        cursor.execute(
+            f'ALTER TABLE {quote_name(TABLE_NAME)} ATTACH PARTITION'
+            f" {quote_name(name)} FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+    logger.info(
+        'Created the training log partition %s, moving %s entries to it.',
+        name,
+        moved,
+    )
+    return True
+
+
+@task
+def create_training_log_partitions() -> None:
+    """Create the partitions of this month and of the months ahead."""
+    month = get_month(timezone.now())
+    for months in range(settings.TRAINING_LOG_PARTITIONS_AHEAD + 1):
+        create_partition(add_months(month, months))
+
+
+def parse_timestamp(value: object) -> datetime | None:
+    """Parse an ISO 8601 timestamp, in the current time zone if naive."""
+    if not isinstance(value, str):
+        return None
+    try:
+        moment = parse_datetime(value)
+    except ValueError:
+        return None
+    if moment is None or timezone.is_aware(moment):
+        return moment
+    return timezone.make_aware(moment)
+
+
+def _parse_bound(entry: Mapping[str, Any], field: str) -> int | None:
+    value = entry.get(field)
+    if value is None:
+        return None
+    if (
+        not isinstance(value, int)
+        or isinstance(value, bool)
+        or not 0 <= value <= ENTRY_FIELD_MAX_VALUES[field]
+    ):
+        raise TrainingLogError(f'Invalid {field}.')
+    return value
+
+
+def _parse_entry(
+    user: AbstractBaseUser, entry: Mapping[str, Any]
+) -> TrainingLogEntry:
+    if not isinstance(entry, Mapping):
+        raise TrainingLogError('A set must be an object.')
+    exercise_variation_id = entry.get('exercise_variation')
+    if not isinstance(exercise_variation_id, int) or isinstance(
+        exercise_variation_id, bool
+    ):
+        raise TrainingLogError('Invalid exercise_variation.')
+    performed_at = parse_timestamp(entry.get('performed_at'))
+    if performed_at is None:
+        raise TrainingLogError('Invalid performed_at.')
+    return TrainingLogEntry(
+        user=user,
+        exercise_variation_id=exercise_variation_id,
+        performed_at=performed_at,
+        **{
+            field: _parse_bound(entry, field)
+            for field in ENTRY_FIELD_MAX_VALUES
+        },
+    )
+
+
+def parse_session(
+    user: AbstractBaseUser, sets: Sequence[Mapping[str, Any]]
+) -> list[TrainingLogEntry]:
+    """
+    Build the entries of the sets of a session, without saving them.
+
+    Raises `TrainingLogError` on the first invalid set, or when a set
+    refers to a variation the trainer can't see.
+    """
+    if not isinstance(sets, Sequence) or isinstance(sets, str) or not sets:
+        raise TrainingLogError('A session must have at least one set.')
+    if len(sets) > MAX_SESSION_SETS:
+        raise TrainingLogError(
+            f'A session can have at most {MAX_SESSION_SETS} sets.'
+        )
+    entries = []
+    for index, entry in enumerate(sets):
+        try:
+            entries.append(_parse_entry(user, entry))
+        except TrainingLogError as error:
+            raise TrainingLogError(f'Set {index}: {error}') from None
+
+    exercise_variation_ids = {entry.exercise_variation_id for entry in entries}
+    visible_ids = set(
+        ExerciseVariation.objects.filter(
+            Q(reviewed=True) | Q(created_by=user),
+            id__in=exercise_variation_ids,
+        ).values_list('id', flat=True)
+    )
+    unknown_ids = exercise_variation_ids - visible_ids
+    if unknown_ids:
+        raise TrainingLogError(
+            'Unknown exercise variations: {0}.'.format(
+                ', '.join(map(str, sorted(unknown_ids)))
+            )
+        )
+    return entries
+
+
+def log_session(
+    user: AbstractBaseUser, sets: Sequence[Mapping[str, Any]]
+) -> list[TrainingLogEntry]:
+    """Append the sets of a session to the training log in one statement."""
+    entries = parse_session(user, sets)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT pg_advisory_xact_lock_shared(%s)', [LOG_LOCK_ID]
+        )
+        entries = TrainingLogEntry.objects.bulk_create(entries)
+        enqueue_rollup()
+        transaction.on_commit(partial(invalidate_training_analytics, user.pk))
+    logger.info(
+        'Logged a session of %s sets for the user %s.', len(entries), user
+    )
+    return entries
+
+
+def serialize_entries(
+    entries: Iterable[TrainingLogEntry],
+) -> list[dict[str, object]]:
+    return [
+        {
+            'id': entry.pk,
+            'exercise_variation': entry.exercise_variation_id,
+            'performed_at': entry.performed_at,
+            'repetitions': entry.repetitions,
+            'weight_in_kilos': entry.weight_in_kilos,
+            'duration_seconds': entry.duration_seconds,
+        }
+        for entry in entries
+    ]
+
+
+@dataclass(frozen=True)
+class HistoryRange:
+    since: datetime | None = None
+    until: datetime | None = None
+
+    def as_filter(self) -> Q:
+        """Filter the partitions of the range only."""
+        query = Q()
+        if self.since is not None:
+            query &= Q(performed_at__gte=self.since)
+        if self.until is not None:
+            query &= Q(performed_at__lt=self.until)
+        return query
+
+
+def history_queryset(
+    user: AbstractBaseUser,
+    cursor: str | None,
+    history_range: HistoryRange = HistoryRange(),
+) -> 'QuerySet[TrainingLogEntry, dict[str, object]]':
+    """
+    Return the entries of the trainer after the cursor, newest first.
+
+    The cursor holds the `(performed_at, id)` of the last row of the
+    previous page, see `eiger.trainers.pagination.Cursor`. Its `OR`
+    predicate is bounded by `performed_at <=` as well, so the scan of the
+    `(user, performed_at, id)` index starts from the cursor instead of
+    filtering out every newer entry. Raises `BadRequest` when the cursor
+    was tampered with.
+    """
+    queryset = TrainingLogEntry.objects.filter(
+        history_range.as_filter(), user=user
+    ).order_by('-performed_at', '-id')
+    if cursor:
+        position = Cursor.decode(cursor)
+        queryset = queryset.filter(
+            Q(performed_at__lt=position.created_at)
+            | Q(performed_at=position.created_at, id__lt=position.id),
+            performed_at__lte=position.created_at,
+        )
+    return queryset.values(*ENTRY_FIELDS)
+
+
+def get_training_history(
+    user: AbstractBaseUser,
+    cursor: str | None,
+    page_size: int,
+    history_range: HistoryRange = HistoryRange(),
+) -> KeysetPage[dict[str, object]]:
+    """Return a page of the log of the trainer, see `history_queryset`."""
+    items = list(
+        history_queryset(user, cursor, history_range)[: page_size + 1]
+    )
+    if len(items) <= page_size:
+        return KeysetPage(items=items, next_cursor=None)
+    items = items[:page_size]
+    last = items[-1]
+    next_cursor = Cursor(
+        created_at=last['performed_at'],  # type: ignore[arg-type]
+        id=last['id'],  # type: ignore[arg-type]
+    ).encode()
+    return KeysetPage(items=items, next_cursor=next_cursor)
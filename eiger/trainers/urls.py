@@ -1,17 +1,27 @@
+from django.conf import settings
 from django.urls import URLPattern, URLResolver, path
 
+from eiger.trainers import async_views, views
+from eiger.trainers.api import API_VERSION, api_detail_view, api_list_view
 from eiger.trainers.views import (
-    home_view,
+    autocomplete_exercises_view,
+    export_catalogue_view,
     index_view,
+    log_training_session_view,
     login_view,
     registration_view,
-    retrieve_category_exercise_types_view,
-    retrieve_exercise_variation_view,
-    retrieve_exercise_view,
-    update_exercise_variation_view,
-    update_exercise_view,
+    retrieve_pending_exercises_view,
+    retrieve_pending_summary_view,
+    retrieve_pending_variations_view,
+    retrieve_training_analytics_view,
+    retrieve_training_log_view,
+    retrieve_training_progress_view,
+    search_exercises_view,
 )
 
+# The async views are served by the uvicorn workers, see `async_views`:
+_views = async_views if settings.ASYNC_VIEWS else views
+
 urlpatterns: list[URLPattern | URLResolver] = [
     path('', index_view, name='index'),
     path(
@@ -24,30 +34,90 @@ urlpatterns: list[URLPattern | URLResolver] = [
         registration_view,
         name='register',
     ),
-    path('home/', home_view, name='home'),
+    path('home/', _views.home_view, name='home'),
+    path(
+        'home/pending-summary',
+        retrieve_pending_summary_view,
+        name='retrieve_pending_summary',
+    ),
+    path(
+        'home/pending-exercises',
+        retrieve_pending_exercises_view,
+        name='retrieve_pending_exercises',
+    ),
+    path(
+        'home/pending-variations',
+        retrieve_pending_variations_view,
+        name='retrieve_pending_variations',
+    ),
+    path(
+        'exercises/search',
+        search_exercises_view,
+        name='search_exercises',
+    ),
+    path(
+        'exercises/autocomplete',
+        autocomplete_exercises_view,
+        name='autocomplete_exercises',
+    ),
     path(
         'exercises/<int:exercise_id>',
-        retrieve_exercise_view,
+        _views.retrieve_exercise_view,
         name='retrieve_exercise',
     ),
     path(
         'exercises/<int:exercise_id>/',
-        update_exercise_view,
+        _views.update_exercise_view,
         name='update_exercise',
     ),
     path(
         'categories/<int:category_id>/exercise-types',
-        retrieve_category_exercise_types_view,
+        _views.retrieve_category_exercise_types_view,
         name='retrieve_category_exercise_types',
     ),
     path(
         'exercises/exercises-variations/<int:exercise_variation_id>',
-        retrieve_exercise_variation_view,
+        _views.retrieve_exercise_variation_view,
         name='retrieve_exercise_variation',
     ),
     path(
         'exercises/exercises-variations/<int:exercise_variation_id>/',
-        update_exercise_variation_view,
+        _views.update_exercise_variation_view,
         name='update_exercise_variation',
     ),
+    path(
+        'training-log',
+        retrieve_training_log_view,
+        name='retrieve_training_log',
+    ),
+    path(
+        'training-log/',
+        log_training_session_view,
+        name='log_training_session',
+    ),
+    path(
+        'training-log/progress',
+        retrieve_training_progress_view,
+        name='retrieve_training_progress',
+    ),
+    path(
+        'training-log/analytics',
+        retrieve_training_analytics_view,
+        name='retrieve_training_analytics',
+    ),
+    path(
+        'export/catalogue',
+        export_catalogue_view,
+        name='export_catalogue',
+    ),
+    path(
+        f'api/{API_VERSION}/<slug:resource_name>',
+        api_list_view,
+        name='api_list',
+    ),
+    path(
+        f'api/{API_VERSION}/<slug:resource_name>/<int:pk>',
+        api_detail_view,
+        name='api_detail',
+    ),
 ]
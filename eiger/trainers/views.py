@@ -1,31 +1,76 @@
+import json
+from datetime import date, timedelta
 from http import HTTPStatus
-from typing import Type, TypedDict
+from typing import Type
 
 import structlog
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import login
+from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.decorators import login_required
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import BadRequest
+from django.db.models import Q, QuerySet
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.cache import cache_page
+from django.template.loader import render_to_string
+from django.utils import timezone
 from django.views.decorators.http import require_GET, require_POST
 
+from eiger.trainers.analytics import get_training_analytics
+from eiger.trainers.conditional import (
+    conditional_page,
+    get_exercise_validators,
+    get_exercise_variation_validators,
+    get_home_validators,
+)
+from eiger.trainers.counters import get_pending_review_counter
+from eiger.trainers.exporters import (
+    ExportError,
+    check_export_options,
+    export_catalogue,
+    get_content_type,
+    get_export_filename,
+)
+from eiger.trainers.flash import (
+    clear_form_state,
+    get_form_context_data,
+    get_form_state,
+    set_form_state,
+)
 from eiger.trainers.forms import (
     EditExerciseForm,
     EditExerciseVariationForm,
     TrainerCreationForm,
     TrainerLoginForm,
 )
-from eiger.trainers.models import Exercise, ExerciseType, ExerciseVariation
-
-
-class ContextData(TypedDict):
-    cleaned_data: dict[str, str]
-    errors: dict[str, list[str]]
-
+from eiger.trainers.models import Exercise, ExerciseVariation
+from eiger.trainers.pagination import KeysetPage, paginate_by_keyset
+from eiger.trainers.rollups import PERIODS, get_progress
+from eiger.trainers.search import SEARCH_RANK_FIELD, search_exercises
+from eiger.trainers.taxonomy import get_taxonomy
+from eiger.trainers.training_log import (
+    HistoryRange,
+    TrainingLogError,
+    get_training_history,
+    log_session,
+    parse_timestamp,
+    serialize_entries,
+)
 
-class Context(TypedDict):
-    registration: ContextData
-    login: ContextData
+HOME_FEED_PAGE_SIZE = 20
+SEARCH_RESULTS_LIMIT = 20
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MIN_LENGTH = 2
+TRAINING_LOG_PAGE_SIZE = 50
+# The periods of the progress charts, by default and at most:
+PROGRESS_DEFAULT_PERIODS = 90
+PROGRESS_MAX_PERIODS = 366
 
 
 logger = structlog.get_logger()
@@ -37,7 +82,7 @@ def index_view(request: HttpRequest) -> HttpResponse:
     registration_form: Type[TrainerCreationForm] = TrainerCreationForm
     login_form: Type[TrainerLoginForm] = TrainerLoginForm
 
-    context: Context = request.session.get('context', {})
+    context = get_form_state(request)
     if registration_data := context.get('registration'):
         registration_form: TrainerCreationForm = (  # type: ignore[no-redef]
             registration_form()
@@ -65,10 +110,13 @@ def index_view(request: HttpRequest) -> HttpResponse:
             login_form._errors,  # type: ignore[attr-defined]
         )
 
-    request.session.flush()
-    logger.debug('Flushed the request session.')
+    # Visiting the index logs out. Anonymous visitors have no session to
+    # flush, and flushing an empty one would still mark it as modified:
+    if request.session.session_key is not None:
+        request.session.flush()
+        logger.debug('Flushed the request session.')
 
-    return render(
+    response = render(
         request=request,
         template_name='pages/index.html',
         context={
@@ -76,6 +124,8 @@ def index_view(request: HttpRequest) -> HttpResponse:
             'login_form': login_form,
         },
     )
+    clear_form_state(request, response)
+    return response
 
 
 @require_POST
@@ -83,18 +133,16 @@ def registration_view(request: HttpRequest) -> HttpResponse:
     logger.debug('Received a request for a user sending registration data.')
     form = TrainerCreationForm(request.POST)
     if not form.is_valid():
-        request.session['context'] = {
-            'registration': {
-                'cleaned_data': form.cleaned_data,
-                'errors': form.errors,
-            },
-            'login': None,
-        }
+        response = redirect(to='index')
+        set_form_state(
+            response,
+            {'registration': get_form_context_data(form), 'login': None},
+        )
         logger.debug(
-            'Added the registration form errors %s to the request session.',
+            'Flashed the registration form errors %s to the index.',
             form.errors,
         )
-        return redirect(to='index')
+        return response
 
     user = form.save()
     logger.info('Created the user %s.', user)
@@ -107,18 +155,15 @@ def login_view(request: HttpRequest) -> HttpResponse:
     logger.debug('Received a request for a user sending login data.')
     form = TrainerLoginForm(request, data=request.POST)
     if not form.is_valid():
-        request.session['context'] = {
-            'registration': None,
-            'login': {
-                'cleaned_data': form.cleaned_data,
-                'errors': form.errors,
-            },
-        }
+        response = redirect(to='index')
+        set_form_state(
+            response,
+            {'registration': None, 'login': get_form_context_data(form)},
+        )
         logger.debug(
-            'Added the login form errors %s to the request session.',
-            form.errors,
+            'Flashed the login form errors %s to the index.', form.errors
         )
-        return redirect(to='index')
+        return response
 
     user = form.get_user()
     logger.debug('Retrieved the user %s given the form data.', user)
@@ -126,35 +171,188 @@ def login_view(request: HttpRequest) -> HttpResponse:
     return redirect(to='home')
 
 
+def get_editable_exercises(
+    user: AbstractBaseUser | AnonymousUser,
+) -> QuerySet[Exercise]:
+    return Exercise.objects.select_related(
+        'exercise_type', 'exercise_type__category'
+    ).filter(created_by=user, reviewed=False)
+
+
+def get_editable_exercise_variations(
+    user: AbstractBaseUser | AnonymousUser,
+) -> QuerySet[ExerciseVariation]:
+    return ExerciseVariation.objects.select_related(
+        'exercise',
+        'exercise__exercise_type',
+        'exercise__exercise_type__category',
+    ).filter(created_by=user, reviewed=False)
+
+
+def get_pending_exercises(
+    user: AbstractBaseUser | AnonymousUser,
+) -> QuerySet[Exercise]:
+    return Exercise.objects.select_related(
+        'exercise_type', 'exercise_type__category', 'created_by'
+    ).filter(created_by=user, reviewed=False)
+
+
+def get_pending_exercise_variations(
+    user: AbstractBaseUser | AnonymousUser,
+) -> QuerySet[ExerciseVariation]:
+    return ExerciseVariation.objects.select_related(
+        'exercise',
+        'exercise__exercise_type',
+        'exercise__exercise_type__category',
+        'created_by',
+    ).filter(created_by=user, reviewed=False)
+
+
 @login_required(login_url='/')
 @require_GET
+@conditional_page(get_home_validators)
 def home_view(request: HttpRequest) -> HttpResponse:
     user = request.user
     logger.debug(
         'Received the request from User %s to access the home view.', user
     )
 
-    pending_exercises = Exercise.objects.select_related(
-        'exercise_type', 'exercise_type__category'
-    ).filter(created_by=user, reviewed=False)
-    pending_exercise_variations = ExerciseVariation.objects.select_related(
-        'exercise',
-        'exercise__exercise_type',
-        'exercise__exercise_type__category',
-    ).filter(created_by=user, reviewed=False)
+    exercises_page = paginate_by_keyset(
+        queryset=get_pending_exercises(user),
+        cursor=request.GET.get('exercises_cursor'),
+        page_size=HOME_FEED_PAGE_SIZE,
+    )
+    variations_page = paginate_by_keyset(
+        queryset=get_pending_exercise_variations(user),
+        cursor=request.GET.get('variations_cursor'),
+        page_size=HOME_FEED_PAGE_SIZE,
+    )
+    return render_home(request, exercises_page, variations_page)
 
+
+def render_home(
+    request: HttpRequest,
+    exercises_page: KeysetPage[Exercise],
+    variations_page: KeysetPage[ExerciseVariation],
+) -> HttpResponse:
     return render(
         request=request,
         template_name='pages/home.html',
         context={
-            'pending_exercises': pending_exercises,
-            'pending_variations': pending_exercise_variations,
+            'pending_exercises': exercises_page.items,
+            'next_exercises_cursor': exercises_page.next_cursor,
+            'pending_variations': variations_page.items,
+            'next_variations_cursor': variations_page.next_cursor,
         },
     )
 
 
 @login_required(login_url='/')
 @require_GET
+def retrieve_pending_exercises_view(request: HttpRequest) -> JsonResponse:
+    user = request.user
+    logger.debug(
+        'Received the request from user %s to retrieve a page of pending'
+        ' exercises.',
+        user,
+    )
+    page = paginate_by_keyset(
+        queryset=get_pending_exercises(user),
+        cursor=request.GET.get('cursor'),
+        page_size=HOME_FEED_PAGE_SIZE,
+    )
+    html = render_to_string(
+        template_name='components/pending_exercises.html',
+        context={'pending_exercises': page.items},
+        request=request,
+    )
+    return JsonResponse(data={'html': html, 'next_cursor': page.next_cursor})
+
+
+@login_required(login_url='/')
+@require_GET
+def retrieve_pending_variations_view(request: HttpRequest) -> JsonResponse:
+    user = request.user
+    logger.debug(
+        'Received the request from user %s to retrieve a page of pending'
+        ' exercise variations.',
+        user,
+    )
+    page = paginate_by_keyset(
+        queryset=get_pending_exercise_variations(user),
+        cursor=request.GET.get('cursor'),
+        page_size=HOME_FEED_PAGE_SIZE,
+    )
+    html = render_to_string(
+        template_name='components/pending_variations.html',
+        context={'pending_variations': page.items},
+        request=request,
+    )
+    return JsonResponse(data={'html': html, 'next_cursor': page.next_cursor})
+
+
+@login_required(login_url='/')
+@require_GET
+def retrieve_pending_summary_view(request: HttpRequest) -> JsonResponse:
+    counter = get_pending_review_counter(request.user.pk)
+    return JsonResponse(
+        data={
+            'pending_exercises': counter.pending_exercises,
+            'pending_variations': counter.pending_variations,
+            'last_submitted_at': counter.last_submitted_at,
+        }
+    )
+
+
+def get_searchable_exercises(
+    user: AbstractBaseUser | AnonymousUser,
+) -> QuerySet[Exercise]:
+    return Exercise.objects.filter(Q(reviewed=True) | Q(created_by=user))
+
+
+@login_required(login_url='/')
+@require_GET
+def search_exercises_view(request: HttpRequest) -> JsonResponse:
+    query = request.GET.get('q', '')
+    logger.debug(
+        'Received the request from user %s to search the exercises for %s.',
+        request.user,
+        query,
+    )
+    if not query.strip():
+        return JsonResponse(data={'results': []})
+
+    exercises = search_exercises(
+        get_searchable_exercises(request.user), query
+    ).values(
+        'id',
+        'name',
+        'description',
+        'exercise_type_id',
+        'reviewed',
+        SEARCH_RANK_FIELD,
+    )[
+        :SEARCH_RESULTS_LIMIT
+    ]
+    return JsonResponse(data={'results': list(exercises)})
+
+
+@login_required(login_url='/')
+@require_GET
+def autocomplete_exercises_view(request: HttpRequest) -> JsonResponse:
+    query = request.GET.get('q', '')
+    if len(query.strip()) < AUTOCOMPLETE_MIN_LENGTH:
+        return JsonResponse(data={'results': []})
+
+    names = search_exercises(
+        get_searchable_exercises(request.user), query, prefix=True
+    ).values_list('name', flat=True)[:AUTOCOMPLETE_LIMIT]
+    return JsonResponse(data={'results': list(names)})
+
+
+@login_required(login_url='/')
+@require_GET
+@conditional_page(get_exercise_validators)
 def retrieve_exercise_view(
     request: HttpRequest, exercise_id: int
 ) -> HttpResponse:
@@ -164,16 +362,16 @@ def retrieve_exercise_view(
         user,
         exercise_id,
     )
-    exercise = get_object_or_404(
-        Exercise.objects.select_related(
-            'exercise_type', 'exercise_type__category'
-        ),
-        id=exercise_id,
-        created_by=user,
-        reviewed=False,
-    )
+    exercise = get_object_or_404(get_editable_exercises(user), id=exercise_id)
+    return render_exercise_form(request, exercise, EditExerciseForm(exercise))
+
 
-    form = EditExerciseForm(exercise)
+def render_exercise_form(
+    request: HttpRequest,
+    exercise: Exercise,
+    form: EditExerciseForm,
+    status: int = HTTPStatus.OK,
+) -> HttpResponse:
     return render(
         request=request,
         template_name='pages/edit_exercise.html',
@@ -181,6 +379,7 @@ def retrieve_exercise_view(
             'form': form,
             'exercise': exercise,
         },
+        status=status,
     )
 
 
@@ -195,58 +394,55 @@ def update_exercise_view(
         user,
         exercise_id,
     )
-    exercise = get_object_or_404(
-        Exercise.objects.select_related(
-            'exercise_type',
-        ),
-        id=exercise_id,
-        created_by=user,
-        reviewed=False,
-    )
+    exercise = get_object_or_404(get_editable_exercises(user), id=exercise_id)
+    return save_exercise_form(request, exercise)
+
 
+def save_exercise_form(
+    request: HttpRequest, exercise: Exercise
+) -> HttpResponse:
+    """Save the posted exercise, or render the errors of the form."""
+    user = request.user
     form = EditExerciseForm(data=request.POST, instance=exercise)
     if not form.is_valid():
         logger.debug('Form cleaned data %s.', form.cleaned_data)
-        template_name = 'pages/edit_exercise.html'
         logger.info(
             'Invalid form provided to create an exercise from user %s.'
             ' Rendering the template %s with form errors %s.',
             user,
-            template_name,
+            'pages/edit_exercise.html',
             form.errors,
         )
-        return render(
-            request=request,
-            template_name=template_name,
-            context={
-                'form': form,
-                'exercise': exercise,
-            },
-            status=HTTPStatus.BAD_REQUEST,
+        return render_exercise_form(
+            request, exercise, form, status=HTTPStatus.BAD_REQUEST
         )
 
     form.save()
     logger.info(
         'Successfully updated the exercise %s from the user %s request.'
         ' Redirecting it to the home page.',
-        exercise_id,
+        exercise.id,
         user,
     )
     return redirect('/home/')
 
 
-@cache_page(60 * 60 * 24)
 @login_required(login_url='/')
 @require_GET
 def retrieve_category_exercise_types_view(
     request: HttpRequest, category_id: int
 ) -> JsonResponse:
-    queryset = ExerciseType.objects.filter(category_id=category_id).values(
-        'id', 'name'
-    )
     return JsonResponse(
-        data=tuple(queryset),
-        safe=False,
+        data=get_category_exercise_types(category_id), safe=False
+    )
+
+
+def get_category_exercise_types(category_id: int) -> tuple[dict, ...]:
+    category = get_taxonomy().get_category(category_id)
+    exercise_types = category.exercise_types if category else ()
+    return tuple(
+        {'id': exercise_type.id, 'name': exercise_type.name}
+        for exercise_type in exercise_types
     )
 
 
@@ -263,44 +459,37 @@ def update_exercise_variation_view(
         exercise_variation_id,
     )
     exercise_variation = get_object_or_404(
-        ExerciseVariation.objects.select_related(
-            'exercise',
-            'exercise__exercise_type',
-            'exercise__exercise_type__category',
-        ),
-        id=exercise_variation_id,
-        created_by=user,
-        reviewed=False,
+        get_editable_exercise_variations(user), id=exercise_variation_id
     )
+    return save_exercise_variation_form(request, exercise_variation)
+
 
+def save_exercise_variation_form(
+    request: HttpRequest, exercise_variation: ExerciseVariation
+) -> HttpResponse:
+    """Save the posted exercise variation, or render the form errors."""
+    user = request.user
     form = EditExerciseVariationForm(
         data=request.POST, instance=exercise_variation
     )
     if not form.is_valid():
         logger.debug('Form cleaned data %s.', form.cleaned_data)
-        template_name = 'pages/edit_exercise_variation.html'
         logger.info(
             'Invalid form provided to create an exercise variation from user'
             ' %s. Rendering the template %s with form errors %s.',
             user,
-            template_name,
+            'pages/edit_exercise_variation.html',
             form.errors,
         )
-        return render(
-            request=request,
-            template_name=template_name,
-            context={
-                'form': form,
-                'exercise_variation': exercise_variation,
-            },
-            status=HTTPStatus.BAD_REQUEST,
+        return render_exercise_variation_form(
+            request, exercise_variation, form, status=HTTPStatus.BAD_REQUEST
         )
 
     form.save()
     logger.info(
         'Successfully updated the exercise variation %s from the user %s'
         ' request. Redirecting it to the home page.',
-        exercise_variation_id,
+        exercise_variation.id,
         user,
     )
     return redirect('/home/')
@@ -308,6 +497,7 @@ def update_exercise_variation_view(
 
 @login_required(login_url='/')
 @require_GET
+@conditional_page(get_exercise_variation_validators)
 def retrieve_exercise_variation_view(
     request: HttpRequest, exercise_variation_id: int
 ) -> HttpResponse:
@@ -319,17 +509,21 @@ def retrieve_exercise_variation_view(
         exercise_variation_id,
     )
     exercise_variation = get_object_or_404(
-        ExerciseVariation.objects.select_related(
-            'exercise',
-            'exercise__exercise_type',
-            'exercise__exercise_type__category',
-        ),
-        id=exercise_variation_id,
-        created_by=user,
-        reviewed=False,
+        get_editable_exercise_variations(user), id=exercise_variation_id
     )
+    return render_exercise_variation_form(
+        request,
+        exercise_variation,
+        EditExerciseVariationForm(exercise_variation),
+    )
+
 
-    form = EditExerciseVariationForm(exercise_variation)
+def render_exercise_variation_form(
+    request: HttpRequest,
+    exercise_variation: ExerciseVariation,
+    form: EditExerciseVariationForm,
+    status: int = HTTPStatus.OK,
+) -> HttpResponse:
     return render(
         request=request,
         template_name='pages/edit_exercise_variation.html',
@@ -337,4 +531,165 @@ def retrieve_exercise_variation_view(
             'form': form,
             'exercise_variation': exercise_variation,
         },
+        status=status,
+    )
+
+
+@staff_member_required
+@require_GET
+def export_catalogue_view(request: HttpRequest) -> HttpResponse:
+    file_format = request.GET.get('format', 'csv')
+    compression = request.GET.get('compression', 'none')
+    logger.info(
+        'Received the request from user %s to export the catalogue as %s'
+        ' with the %s compression.',
+        request.user,
+        file_format,
+        compression,
+    )
+    try:
+        check_export_options(file_format, compression)
+    except ExportError as error:
+        return JsonResponse(
+            data={'error': str(error)}, status=HTTPStatus.BAD_REQUEST
+        )
+
+    response = StreamingHttpResponse(
+        export_catalogue(file_format, compression),
+        content_type=get_content_type(file_format, compression),
+    )
+    filename = get_export_filename(file_format, compression)
+    response.headers[
+        'Content-Disposition'
+    ] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _parse_history_range(request: HttpRequest) -> HistoryRange:
+    bounds = {}
+    for parameter in ('since', 'until'):
+        value = request.GET.get(parameter)
+        if value is None:
+            continue
+        bounds[parameter] = parse_timestamp(value)
+        if bounds[parameter] is None:
+            raise BadRequest(f'Invalid {parameter}.')
+    return HistoryRange(**bounds)
+
+
+@login_required(login_url='/')
+@require_GET
+def retrieve_training_log_view(request: HttpRequest) -> JsonResponse:
+    user = request.user
+    logger.debug(
+        'Received the request from user %s to retrieve a page of their'
+        ' training log.',
+        user,
+    )
+    try:
+        page = get_training_history(
+            user,
+            cursor=request.GET.get('cursor'),
+            page_size=TRAINING_LOG_PAGE_SIZE,
+            history_range=_parse_history_range(request),
+        )
+    except BadRequest as error:
+        return JsonResponse(
+            data={'error': str(error)}, status=HTTPStatus.BAD_REQUEST
+        )
+    return JsonResponse(
+        data={'results': page.items, 'next_cursor': page.next_cursor}
+    )
+
+
+@login_required(login_url='/')
+@require_POST
+def log_training_session_view(request: HttpRequest) -> JsonResponse:
+    user = request.user
+    logger.debug(
+        'Received the request from user %s to log a training session.', user
+    )
+    try:
+        payload = json.loads(request.body)
+        if not isinstance(payload, dict):
+            raise TrainingLogError('The session must be an object.')
+        entries = log_session(user, payload.get('sets'))
+    except json.JSONDecodeError:
+        return JsonResponse(
+            data={'error': 'Invalid JSON.'}, status=HTTPStatus.BAD_REQUEST
+        )
+    except TrainingLogError as error:
+        logger.info(
+            'Invalid training session provided by the user %s: %s',
+            user,
+            error,
+        )
+        return JsonResponse(
+            data={'error': str(error)}, status=HTTPStatus.BAD_REQUEST
+        )
+    return JsonResponse(
+        data={'results': serialize_entries(entries)},
+        status=HTTPStatus.CREATED,
+    )
+
+
+def _parse_progress_range(
+    request: HttpRequest, period: str
+) -> tuple[date, date]:
+    _, length = PERIODS[period]
+    bounds = {}
+    for parameter in ('since', 'until'):
+        value = request.GET.get(parameter)
+        if value is None:
+            continue
+        try:
+            bounds[parameter] = date.fromisoformat(value)
+        except ValueError:
+            raise BadRequest(f'Invalid {parameter}.') from None
+    until = bounds.get('until', timezone.localdate() + timedelta(days=1))
+    since = bounds.get('since', until - length * PROGRESS_DEFAULT_PERIODS)
+    if not since < until <= since + length * PROGRESS_MAX_PERIODS:
+        raise BadRequest(
+            f'The range must span up to {PROGRESS_MAX_PERIODS} {period}s.'
+        )
+    return since, until
+
+
+@login_required(login_url='/')
+@require_GET
+def retrieve_training_progress_view(request: HttpRequest) -> JsonResponse:
+    user = request.user
+    period = request.GET.get('period', 'day')
+    logger.debug(
+        'Received the request from user %s to retrieve their progress by %s.',
+        user,
+        period,
+    )
+    try:
+        if period not in PERIODS:
+            raise BadRequest('Invalid period.')
+        since, until = _parse_progress_range(request, period)
+    except BadRequest as error:
+        return JsonResponse(
+            data={'error': str(error)}, status=HTTPStatus.BAD_REQUEST
+        )
+    return JsonResponse(
+        data={
+            'period': period,
+            'since': since,
+            'until': until,
+            'results': get_progress(user, period, since, until),
+        }
+    )
+
+
+@login_required(login_url='/')
+@require_GET
+def retrieve_training_analytics_view(request: HttpRequest) -> JsonResponse:
+    user = request.user
+    logger.debug(
+        'Received the request from user %s to retrieve their training'
+        ' analytics.',
+        user,
     )
+    return JsonResponse(data=get_training_analytics(user))
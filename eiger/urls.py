@@ -19,6 +19,7 @@ from django.contrib import admin
 from django.urls import URLPattern, URLResolver, include, path
 from health_check import urls as health_urls
 
+from eiger.metrics import metrics_view
 from eiger.trainers import urls as trainers_urls
 
 urlpatterns: list[URLPattern | URLResolver] = [
@@ -27,6 +28,8 @@ urlpatterns: list[URLPattern | URLResolver] = [
     path('admin/', admin.site.urls),
     # Health checks:
     path('healthcheck/', include(health_urls)),
+    # Prometheus metrics:
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 if settings.DEBUG:  # pragma: no cover
@@ -34,8 +34,26 @@ find /var/www/django/static -type f \
   -exec brotli --force --best {} \+ \
   -exec gzip --force --keep --best {} \+
 
+# Every worker writes its metrics to memory-mapped files in this directory,
+# which is emptied so counters of a previous run aren't added back:
+PROMETHEUS_MULTIPROC_DIR='/dev/shm/eiger-metrics'
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+export PROMETHEUS_MULTIPROC_DIR
+
+# Uvicorn workers serve the ASGI application with the async views:
+: "${GUNICORN_WORKER_CLASS:=sync}"
+if [ "$GUNICORN_WORKER_CLASS" = 'uvicorn' ]; then
+  GUNICORN_APP='eiger.asgi'
+  ASYNC_VIEWS='True'
+else
+  GUNICORN_APP='eiger.wsgi'
+  ASYNC_VIEWS='False'
+fi
+export GUNICORN_WORKER_CLASS ASYNC_VIEWS
+
 # Start gunicorn:
 # Docs: http://docs.gunicorn.org/en/stable/settings.html
 /usr/local/bin/gunicorn \
   --config python:scripts.gunicorn_config \
-  eiger.wsgi
+  "$GUNICORN_APP"
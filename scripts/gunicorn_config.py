@@ -3,11 +3,28 @@
 # https://docs.gunicorn.org/en/stable/settings.html
 
 import multiprocessing
+import os
+
+from prometheus_client import multiprocess
 
 bind = '0.0.0.0:8080'
 # Concerning `workers` setting see:
 # https://github.com/wemake-services/wemake-django-template/issues/1022
-workers = multiprocessing.cpu_count() * 2 + 1
+# Every worker holds its own database connections, lower it with
+# `GUNICORN_WORKERS` or put PgBouncer in front of the database, see
+# `DATABASE_POOLER` in `eiger/settings.py`:
+workers = int(
+    os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+)
+
+# `sync` workers serve `eiger.wsgi` one request at a time, `uvicorn` ones
+# serve `eiger.asgi` and interleave many requests in an event loop, see
+# `scripts/gunicorn.sh`:
+_WORKER_CLASSES = {
+    'sync': 'sync',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+worker_class = _WORKER_CLASSES[os.environ.get('GUNICORN_WORKER_CLASS', 'sync')]
 
 max_requests = 2000
 max_requests_jitter = 400
@@ -15,3 +32,8 @@ max_requests_jitter = 400
 log_file = '-'
 chdir = '/code'
 worker_tmp_dir = '/dev/shm'  # noqa: S108
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of an exited worker from the shared metrics."""
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone as dt_timezone
 from unittest.mock import MagicMock
 
 import pytest
@@ -8,6 +9,18 @@ from django.contrib.messages.middleware import MessageMiddleware
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.http import HttpRequest
 from django.test import Client, RequestFactory
+from model_bakery import baker
+
+from eiger.trainers.models import Category, ExerciseVariation
+from eiger.trainers.taxonomy import taxonomy_cache
+
+PERFORMED_AT = datetime(2021, 3, 14, 18, 30, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _taxonomy_cache() -> None:
+    """Rolled back test data never reaches the invalidation signals."""
+    taxonomy_cache.invalidate()
 
 
 @pytest.fixture()
@@ -16,8 +29,9 @@ def mocked_request() -> MagicMock:
 
 
 @pytest.fixture()
-def mocked_message_request() -> HttpRequest:
+def mocked_message_request(admin_user: User) -> HttpRequest:
     request = RequestFactory().get('/')
+    request.user = admin_user
     session_ = SessionMiddleware(request)   # type: ignore[arg-type]
     session_.process_request(request)
     message_ = MessageMiddleware(request)  # type: ignore[arg-type]
@@ -55,3 +69,25 @@ def authenticated_client(trainer: User, trainer_raw_password: str) -> Client:
     client = Client()
     client.login(username=trainer.username, password=trainer_raw_password)
     return client
+
+
+def make_variation(category: Category, **fields: object) -> ExerciseVariation:
+    return baker.make(
+        ExerciseVariation,
+        exercise__exercise_type__category=category,
+        reviewed=True,
+        **fields,
+    )
+
+
+def make_set(
+    variation: ExerciseVariation,
+    performed_at: str = PERFORMED_AT.isoformat(),
+    **fields: object,
+) -> dict:
+    """Return a set of the variation, as sent to `log_session`."""
+    return {
+        'exercise_variation': variation.id,
+        'performed_at': performed_at,
+        **fields,
+    }
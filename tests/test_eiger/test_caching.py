@@ -0,0 +1,101 @@
+from pathlib import Path
+from typing import Generator
+
+import fakeredis
+import pytest
+from django.core.cache import caches
+from pytest_django.fixtures import SettingsWrapper
+
+from eiger.caching import cache_stats, get_cache
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache_stats() -> Generator[None, None, None]:
+    cache_stats.reset()
+    yield
+    cache_stats.reset()
+
+
+@pytest.fixture()
+def namespace_settings(settings: SettingsWrapper) -> SettingsWrapper:
+    settings.CACHE_NAMESPACE_TIMEOUTS = {'testing': 42}
+    return settings
+
+
+def test_must_prefix_keys_with_the_namespace(
+    namespace_settings: SettingsWrapper,
+) -> None:
+    namespaced_cache = get_cache('testing')
+
+    namespaced_cache.set('key', 'value')
+
+    assert caches['default'].get('testing:key') == 'value'
+    assert namespaced_cache.get('key') == 'value'
+    assert get_cache('other').get('key') is None
+
+
+def test_must_default_to_the_namespace_timeout(
+    namespace_settings: SettingsWrapper,
+) -> None:
+    assert get_cache('testing').timeout == 42
+    assert get_cache('other').timeout == caches['default'].default_timeout
+
+
+def test_must_count_hits_and_misses_per_namespace(
+    namespace_settings: SettingsWrapper,
+) -> None:
+    namespaced_cache = get_cache('testing')
+    namespaced_cache.set('cached', 'value')
+
+    namespaced_cache.get('cached')
+    namespaced_cache.get('missing')
+    namespaced_cache.get_many(['cached', 'missing', 'other'])
+    namespaced_cache.get_or_set('computed', lambda: 'value')
+
+    assert cache_stats.snapshot() == {'testing': {'hits': 2, 'misses': 4}}
+
+
+def test_must_cache_falsy_values_as_hits(
+    namespace_settings: SettingsWrapper,
+) -> None:
+    namespaced_cache = get_cache('testing')
+    namespaced_cache.set('empty', None)
+
+    assert namespaced_cache.get_or_set('empty', lambda: 'computed') is None
+    assert cache_stats.snapshot() == {'testing': {'hits': 1, 'misses': 0}}
+
+
+def test_must_only_report_the_process_local_backends_as_unshared(
+    settings: SettingsWrapper, tmp_path: Path
+) -> None:
+    settings.CACHES = {
+        **settings.CACHES,
+        'file': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        },
+        'locmem': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+
+    assert get_cache('testing', 'file').is_shared
+    assert not get_cache('testing', 'locmem').is_shared
+
+
+def test_redis_cache_must_work_against_a_local_stand_in(
+    settings: SettingsWrapper,
+) -> None:
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': 'redis://localhost:6379/0',
+            'OPTIONS': {'connection_class': fakeredis.FakeConnection},
+        },
+    }
+    namespaced_cache = get_cache('testing')
+
+    namespaced_cache.set('key', 'value')
+
+    assert namespaced_cache.get('key') == 'value'
+    assert cache_stats.snapshot() == {'testing': {'hits': 1, 'misses': 0}}
@@ -0,0 +1,112 @@
+from unittest.mock import MagicMock
+
+import pytest
+import structlog
+from django.test import Client
+from django.urls import reverse
+from model_bakery import baker
+from pytest_django.fixtures import SettingsWrapper
+
+from eiger.instrumentation import (
+    QueryBudgetExceeded,
+    RequestMetrics,
+    format_server_timing,
+)
+from eiger.trainers.models import Category
+
+
+def test_format_server_timing_must_describe_every_metric() -> None:
+    metrics = RequestMetrics(
+        queries=3,
+        db_seconds=0.0125,
+        cache_hits=2,
+        cache_misses=1,
+        template_seconds=0.004,
+    )
+
+    assert (
+        format_server_timing(metrics, 0.05)
+        == 'db;dur=12.50;desc="3 queries", cache;desc="2 hits, 1 misses",'
+        ' template;dur=4.00, total;dur=50.00'
+    )
+
+
+@pytest.mark.django_db()
+def test_must_send_the_metrics_of_the_request_as_server_timing(
+    authenticated_client: Client, settings: SettingsWrapper
+) -> None:
+    settings.TAXONOMY_CACHE_ALIAS = 'default'
+    category = baker.make(Category)
+
+    response = authenticated_client.get(
+        reverse('retrieve_category_exercise_types', args=(category.id,))
+    )
+
+    server_timing = response['Server-Timing']
+    assert 'db;dur=' in server_timing
+    # The taxonomy version is read, then the tree is missed and rebuilt:
+    assert 'cache;desc="1 hits, 1 misses"' in server_timing
+    assert 'template;dur=0.00' in server_timing
+
+
+@pytest.mark.django_db()
+def test_must_bind_the_metrics_to_the_logging_context(
+    authenticated_client: Client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    logged_contexts = []
+    logger = MagicMock()
+    logger.info.side_effect = lambda *args: logged_contexts.append(
+        structlog.contextvars.get_contextvars()
+    )
+    monkeypatch.setattr('eiger.instrumentation.logger', logger)
+
+    authenticated_client.get(reverse('home'))
+
+    [context] = logged_contexts
+    assert context['view'] == 'home'
+    assert context['db_queries'] > 0
+    assert context['db_time_ms'] > 0
+    assert context['template_time_ms'] > 0
+    assert structlog.contextvars.get_contextvars() == {}
+
+
+@pytest.mark.django_db()
+def test_must_raise_when_a_view_exceeds_its_query_budget(
+    authenticated_client: Client, settings: SettingsWrapper
+) -> None:
+    settings.QUERY_BUDGETS = {'home': 1}
+    settings.QUERY_BUDGET_ACTION = 'raise'
+
+    with pytest.raises(QueryBudgetExceeded, match='over its budget of 1'):
+        authenticated_client.get(reverse('home'))
+
+
+@pytest.mark.django_db()
+def test_must_log_when_a_view_exceeds_its_query_budget(
+    authenticated_client: Client,
+    settings: SettingsWrapper,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    settings.QUERY_BUDGETS = {'home': 1}
+    settings.QUERY_BUDGET_ACTION = 'log'
+    logger = MagicMock()
+    monkeypatch.setattr('eiger.instrumentation.logger', logger)
+
+    response = authenticated_client.get(reverse('home'))
+
+    assert response.status_code == 200
+    [(message,), _] = logger.warning.call_args
+    assert message.startswith('The view home ran ')
+
+
+@pytest.mark.django_db()
+def test_must_use_the_default_budget_of_views_without_one(
+    client: Client, settings: SettingsWrapper
+) -> None:
+    settings.QUERY_BUDGETS = {}
+    settings.QUERY_BUDGET_DEFAULT = None
+
+    response = client.get('/missing/')
+
+    assert response.status_code == 404
+    assert 'db;dur=0.00;desc="0 queries"' in response['Server-Timing']
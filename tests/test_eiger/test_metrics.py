@@ -0,0 +1,129 @@
+import os
+import subprocess
+import sys
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.urls import reverse
+from model_bakery import baker
+from prometheus_client import REGISTRY, generate_latest
+from pytest_django.fixtures import SettingsWrapper
+
+from eiger.metrics import MULTIPROCESS_DIR_VARIABLE, build_registry
+from eiger.trainers.models import PendingReviewCounter
+
+METRICS_TOKEN = 'scraper-token'
+
+
+@pytest.fixture()
+def metrics_token(settings: SettingsWrapper) -> str:
+    settings.METRICS_TOKEN = METRICS_TOKEN
+    return METRICS_TOKEN
+
+
+@pytest.mark.django_db()
+def test_metrics_view_must_expose_the_requests_per_url_name(
+    authenticated_client: Client, metrics_token: str
+) -> None:
+    authenticated_client.get(reverse('home'))
+
+    response = Client().get(
+        reverse('metrics'),
+        headers={'Authorization': f'Bearer {metrics_token}'},
+    )
+
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain')
+    metrics = response.content.decode()
+    assert (
+        'eiger_requests_total{method="GET",status="200",view="home"}'
+        in metrics
+    )
+    assert 'eiger_request_duration_seconds_bucket{' in metrics
+    assert 'eiger_db_queries_total{view="home"}' in metrics
+    assert 'eiger_cache_accesses_total{result="hit",view="home"}' in metrics
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize(
+    'authorization', [None, 'Bearer wrong-token', METRICS_TOKEN]
+)
+def test_metrics_view_must_require_the_token(
+    client: Client, metrics_token: str, authorization: str | None
+) -> None:
+    headers = {'Authorization': authorization} if authorization else {}
+
+    response = client.get(reverse('metrics'), headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response['WWW-Authenticate'] == 'Bearer'
+
+
+@pytest.mark.django_db()
+def test_metrics_view_must_be_disabled_without_a_token(
+    client: Client, settings: SettingsWrapper
+) -> None:
+    settings.METRICS_TOKEN = ''
+
+    response = client.get(
+        reverse('metrics'), headers={'Authorization': 'Bearer '}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db()
+def test_metrics_must_include_the_review_queue_depth() -> None:
+    baker.make(PendingReviewCounter, pending_exercises=3, pending_variations=1)
+    baker.make(PendingReviewCounter, pending_exercises=2, pending_variations=0)
+
+    metrics = generate_latest(build_registry()).decode()
+
+    assert 'eiger_review_queue_depth{kind="exercise"} 5.0' in metrics
+    assert 'eiger_review_queue_depth{kind="variation"} 1.0' in metrics
+
+
+@pytest.mark.django_db()
+def test_metrics_must_include_the_server_connections() -> None:
+    metrics = generate_latest(build_registry()).decode()
+
+    assert 'eiger_db_server_connections{state="active"} ' in metrics
+    assert 'eiger_db_server_max_connections ' in metrics
+
+
+def test_metrics_must_count_the_opened_connections() -> None:
+    def get_opened() -> float | None:
+        return REGISTRY.get_sample_value(
+            'eiger_db_connections_opened_total', {'alias': 'default'}
+        )
+
+    opened = get_opened() or 0
+
+    connection_created.send(sender=type(connection), connection=connection)
+
+    assert get_opened() == opened + 1
+
+
+@pytest.mark.django_db()
+def test_metrics_must_be_aggregated_from_the_multiprocess_directory(
+    tmp_path: Path,
+) -> None:
+    worker = (
+        'from prometheus_client import Counter;'
+        " Counter('eiger_requests', '', ['view']).labels('home').inc()"
+    )
+    for _ in range(2):
+        subprocess.run(
+            [sys.executable, '-c', worker],
+            env={**os.environ, MULTIPROCESS_DIR_VARIABLE: str(tmp_path)},
+            check=True,
+        )
+
+    metrics = generate_latest(build_registry(str(tmp_path))).decode()
+
+    assert 'eiger_requests_total{view="home"} 2.0' in metrics
+    assert 'eiger_review_queue_depth{kind="exercise"} 0.0' in metrics
@@ -1,5 +1,5 @@
 import pytest
-from model_bakery import baker
+from model_bakery import baker, generators
 
 from eiger.trainers.models import (
     Category,
@@ -8,6 +8,11 @@ from eiger.trainers.models import (
     ExerciseVariation,
 )
 
+# The search vector is computed by a database trigger:
+generators.add(
+    'django.contrib.postgres.search.SearchVectorField', lambda: None
+)
+
 
 @pytest.fixture
 def exercise_type() -> ExerciseType:
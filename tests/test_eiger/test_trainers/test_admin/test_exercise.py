@@ -1,3 +1,4 @@
+from http import HTTPStatus
 from typing import Generator
 from unittest import mock
 from unittest.mock import MagicMock, Mock
@@ -5,10 +6,20 @@ from unittest.mock import MagicMock, Mock
 import pytest
 from django.contrib import messages
 from django.contrib.admin import AdminSite
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, override_settings
+from django.urls import reverse
 from model_bakery import baker
 
-from eiger.trainers.admin import ExerciseAdmin
-from eiger.trainers.models import Exercise
+from eiger.trainers.admin import ExerciseAdmin, ExerciseTypeListFilter
+from eiger.trainers.forms import ImportExercisesForm
+from eiger.trainers.models import (
+    Exercise,
+    ExerciseType,
+    PendingReviewCounter,
+    ReviewJob,
+)
 
 
 @pytest.fixture()
@@ -46,11 +57,15 @@ def test_exercise_admin_get_queryset(
         ' "trainers_exercise"."created_by_id",'
         ' "trainers_exercise"."reviewed",'
         ' "trainers_exercise"."should_add_weight",'
+        ' "trainers_exercise"."search_vector",'
         ' "trainers_exercisetype"."id",'
         ' "trainers_exercisetype"."created_at",'
         ' "trainers_exercisetype"."updated_at",'
         ' "trainers_exercisetype"."category_id",'
-        ' "trainers_exercisetype"."name", "auth_user"."id",'
+        ' "trainers_exercisetype"."name", "trainers_category"."id",'
+        ' "trainers_category"."created_at",'
+        ' "trainers_category"."updated_at", "trainers_category"."name",'
+        ' "trainers_category"."color", "auth_user"."id",'
         ' "auth_user"."password", "auth_user"."last_login",'
         ' "auth_user"."is_superuser", "auth_user"."username",'
         ' "auth_user"."first_name", "auth_user"."last_name",'
@@ -58,7 +73,9 @@ def test_exercise_admin_get_queryset(
         ' "auth_user"."is_active", "auth_user"."date_joined" FROM'
         ' "trainers_exercise" INNER JOIN "trainers_exercisetype" ON'
         ' ("trainers_exercise"."exercise_type_id" ='
-        ' "trainers_exercisetype"."id") INNER JOIN "auth_user" ON'
+        ' "trainers_exercisetype"."id") INNER JOIN "trainers_category" ON'
+        ' ("trainers_exercisetype"."category_id" ='
+        ' "trainers_category"."id") INNER JOIN "auth_user" ON'
         ' ("trainers_exercise"."created_by_id" = "auth_user"."id")'
     )
     assert list(queryset) == list(exercise_types)
@@ -76,7 +93,7 @@ def test_exercise_admin_required_list_filter(
     exercise_admin: ExerciseAdmin,
 ) -> None:
     list_filter = exercise_admin.get_list_filter(Mock())
-    assert list_filter == ['exercise_type', 'created_by', 'reviewed']
+    assert list_filter == [ExerciseTypeListFilter, 'created_by', 'reviewed']
 
 
 def test_exercise_admin_required_search_fields(
@@ -175,3 +192,161 @@ def test_admin_action_must_not_update_multiple_already_reviewed_exercises(
         message='Selected entries were already reviewed.',
         level=messages.SUCCESS,
     )
+
+
+@pytest.mark.django_db()
+def test_exercise_type_list_filter_must_use_taxonomy_lookups_and_filter(
+    exercise_admin: ExerciseAdmin, mocked_request: MagicMock
+) -> None:
+    exercise = baker.make(Exercise)
+    baker.make(Exercise)
+
+    list_filter = ExerciseTypeListFilter(
+        mocked_request,
+        {'exercise_type__id__exact': str(exercise.exercise_type_id)},
+        Exercise,
+        exercise_admin,
+    )
+
+    assert (
+        exercise.exercise_type_id,
+        str(exercise.exercise_type),
+    ) in list_filter.lookup_choices
+    assert list(
+        list_filter.queryset(mocked_request, Exercise.objects.all())
+    ) == [exercise]
+
+
+@pytest.mark.django_db()
+def test_exercise_import_view_must_render_the_upload_form(
+    admin_client: Client,
+) -> None:
+    response = admin_client.get(reverse('admin:trainers_exercise_import'))
+
+    assert response.status_code == HTTPStatus.OK
+    assert isinstance(response.context['form'], ImportExercisesForm)
+
+
+@pytest.mark.django_db()
+def test_exercise_import_view_must_import_the_uploaded_file(
+    admin_client: Client, exercise_type: ExerciseType
+) -> None:
+    upload = SimpleUploadedFile(
+        'exercises.csv',
+        (
+            'name,exercise_type,sets\n'
+            f'Max hangs,{exercise_type.name},5\n'
+            'Repeaters,Unknown,\n'
+        ).encode(),
+    )
+
+    response = admin_client.post(
+        reverse('admin:trainers_exercise_import'),
+        data={'file': upload, 'file_format': 'csv', 'on_conflict': 'ignore'},
+        follow=True,
+    )
+
+    assert response.redirect_chain == [
+        (reverse('admin:trainers_exercise_changelist'), HTTPStatus.FOUND)
+    ]
+    assert [str(message) for message in response.context['messages']] == [
+        '2 rows read: 1 exercises created, 0 updated, 1 variations created,'
+        ' 0 already existing and 1 rows failed.',
+        "Line 3: Unknown exercise type 'Unknown'.",
+    ]
+    assert Exercise.objects.get().name == 'Max hangs'
+
+
+@pytest.mark.django_db()
+def test_exercise_import_view_must_require_the_add_permission(
+    authenticated_client: Client, trainer: User
+) -> None:
+    trainer.is_staff = True
+    trainer.save()
+
+    response = authenticated_client.get(
+        reverse('admin:trainers_exercise_import')
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.django_db()
+def test_exercise_admin_search_must_be_ranked(admin_client: Client) -> None:
+    description_match = baker.make(
+        Exercise, name='Max hangs', description='On the hangboard.'
+    )
+    name_match = baker.make(Exercise, name='Hangboard repeaters')
+    baker.make(Exercise, name='Campus ladders')
+
+    response = admin_client.get(
+        reverse('admin:trainers_exercise_changelist'), data={'q': 'hangboard'}
+    )
+
+    assert list(response.context['cl'].result_list) == [
+        name_match,
+        description_match,
+    ]
+
+
+@pytest.mark.django_db()
+def test_admin_action_must_refresh_the_pending_review_counters(
+    exercise_admin: ExerciseAdmin,
+    mocked_message_request: MagicMock,
+    trainer: User,
+) -> None:
+    baker.make(Exercise, created_by=trainer, _quantity=2)
+
+    exercise_admin.review_entry(mocked_message_request, Exercise.objects.all())
+
+    counter = PendingReviewCounter.objects.get(user=trainer)
+    assert counter.pending_exercises == 0
+
+
+@pytest.mark.django_db()
+@override_settings(REVIEW_JOB_INLINE_LIMIT=2)
+def test_admin_action_must_queue_large_selections(
+    exercise_admin: ExerciseAdmin,
+    mocked_message_request: MagicMock,
+    message_user_spy: MagicMock,
+) -> None:
+    baker.make(Exercise, _quantity=3, reviewed=False, _bulk_create=True)
+
+    exercise_admin.review_entry(mocked_message_request, Exercise.objects.all())
+
+    job = ReviewJob.objects.get()
+    assert job.status == ReviewJob.Status.QUEUED
+    assert job.requested_by == mocked_message_request.user
+    assert not Exercise.objects.filter(reviewed=True).exists()
+    message_user_spy.assert_called_once_with(
+        request=mocked_message_request,
+        message=(
+            '3 entries were queued for a review, follow their progress in'
+            f' the review job {job.pk}.'
+        ),
+        level=messages.INFO,
+    )
+
+
+@pytest.mark.django_db()
+def test_review_job_admin_must_list_the_progress_of_the_jobs(
+    admin_client: Client,
+) -> None:
+    baker.make(Exercise, _quantity=4)
+    job = ReviewJob.objects.create(
+        target=ReviewJob.Target.EXERCISE,
+        entry_ids=list(Exercise.objects.values_list('id', flat=True)),
+        total=4,
+        processed=1,
+    )
+
+    response = admin_client.get(reverse('admin:trainers_reviewjob_changelist'))
+    detail = admin_client.get(
+        reverse('admin:trainers_reviewjob_change', args=(job.pk,))
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert '<td class="field-progress_percentage">25%</td>' in (
+        response.content.decode()
+    )
+    assert detail.status_code == HTTPStatus.OK
@@ -4,8 +4,8 @@ import pytest
 from django.contrib.admin import AdminSite
 from model_bakery import baker
 
-from eiger.trainers.admin import ExerciseTypeAdmin
-from eiger.trainers.models import ExerciseType
+from eiger.trainers.admin import CategoryListFilter, ExerciseTypeAdmin
+from eiger.trainers.models import Category, ExerciseType
 
 
 @pytest.fixture()
@@ -50,7 +50,7 @@ def test_exercise_type_admin_required_list_filter(
     exercise_type_admin: ExerciseTypeAdmin, mocked_request: MagicMock
 ) -> None:
     list_filter = exercise_type_admin.get_list_filter(mocked_request)
-    assert list_filter == ['category']
+    assert list_filter == [CategoryListFilter]
 
 
 def test_exercise_type_admin_required_search_fields(
@@ -59,3 +59,24 @@ def test_exercise_type_admin_required_search_fields(
     search_fields = exercise_type_admin.get_search_fields(mocked_request)
 
     assert search_fields == ['name']
+
+
+@pytest.mark.django_db()
+def test_category_list_filter_must_use_taxonomy_lookups_and_filter(
+    exercise_type_admin: ExerciseTypeAdmin, mocked_request: MagicMock
+) -> None:
+    category = baker.make(Category, name='Fingers')
+    exercise_type = baker.make(ExerciseType, category=category)
+    baker.make(ExerciseType)
+
+    list_filter = CategoryListFilter(
+        mocked_request,
+        {'category__id__exact': str(category.id)},
+        ExerciseType,
+        exercise_type_admin,
+    )
+
+    assert (category.id, 'Fingers') in list_filter.lookup_choices
+    assert list(
+        list_filter.queryset(mocked_request, ExerciseType.objects.all())
+    ) == [exercise_type]
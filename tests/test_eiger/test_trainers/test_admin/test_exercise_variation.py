@@ -5,9 +5,15 @@ from unittest.mock import MagicMock
 import pytest
 from django.contrib import messages
 from django.contrib.admin import AdminSite
+from django.test import Client
+from django.urls import reverse
 from model_bakery import baker
 
-from eiger.trainers.admin import ExerciseVariationAdmin
+from eiger.trainers.admin import (
+    DurationListFilter,
+    ExerciseVariationAdmin,
+    VolumeListFilter,
+)
 from eiger.trainers.models import ExerciseVariation
 
 
@@ -50,13 +56,16 @@ def test_exercise_variation_admin_get_queryset(
         ' "trainers_exercisevariation"."weight_in_kilos",'
         ' "trainers_exercisevariation"."created_by_id",'
         ' "trainers_exercisevariation"."reviewed",'
+        ' "trainers_exercisevariation"."total_duration_seconds",'
+        ' "trainers_exercisevariation"."total_volume",'
         ' "trainers_exercise"."id", "trainers_exercise"."created_at",'
         ' "trainers_exercise"."updated_at", "trainers_exercise"."name",'
         ' "trainers_exercise"."description",'
         ' "trainers_exercise"."exercise_type_id",'
         ' "trainers_exercise"."created_by_id",'
         ' "trainers_exercise"."reviewed",'
-        ' "trainers_exercise"."should_add_weight", "auth_user"."id",'
+        ' "trainers_exercise"."should_add_weight",'
+        ' "trainers_exercise"."search_vector", "auth_user"."id",'
         ' "auth_user"."password", "auth_user"."last_login",'
         ' "auth_user"."is_superuser", "auth_user"."username",'
         ' "auth_user"."first_name", "auth_user"."last_name",'
@@ -75,14 +84,26 @@ def test_exercise_variation_admin_required_list_display_fields(
 ) -> None:
     list_display = exercise_variation_admin.get_list_display(mocked_request)
 
-    assert list_display == ['exercise', 'created_by', 'reviewed']
+    assert list_display == [
+        'exercise',
+        'total_duration_seconds',
+        'total_volume',
+        'created_by',
+        'reviewed',
+    ]
 
 
 def test_exercise_variation_admin_required_list_filter(
     exercise_variation_admin: ExerciseVariationAdmin, mocked_request: MagicMock
 ) -> None:
     list_filter = exercise_variation_admin.get_list_filter(mocked_request)
-    assert list_filter == ['exercise', 'created_by', 'reviewed']
+    assert list_filter == [
+        DurationListFilter,
+        VolumeListFilter,
+        'exercise',
+        'created_by',
+        'reviewed',
+    ]
 
 
 def test_exercise_variation_admin_required_search_fields(
@@ -193,3 +214,39 @@ def test_admin_action_must_not_update_multiple_already_reviewed_variations(
         message='Selected entries were already reviewed.',
         level=messages.SUCCESS,
     )
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize(
+    ('params', 'expected_seconds'),
+    [
+        ({'duration': 'under_5'}, [60]),
+        ({'duration': '5_to_10'}, [300]),
+        ({'duration': 'over_20'}, [1800]),
+        ({'volume': 'under_500'}, [60, 300]),
+        ({'volume': '500_to_2000'}, [1800]),
+        ({}, [60, 300, 1800]),
+    ],
+)
+def test_exercise_variation_admin_must_filter_by_range(
+    admin_client: Client, params: dict[str, str], expected_seconds: list[int]
+) -> None:
+    for seconds in (60, 300, 1800):
+        baker.make(
+            ExerciseVariation,
+            seconds_per_repetition=seconds,
+            weight_in_kilos=seconds // 3,
+        )
+
+    response = admin_client.get(
+        reverse('admin:trainers_exercisevariation_changelist'), params
+    )
+
+    assert response.status_code == 200
+    assert (
+        sorted(
+            variation.total_duration_seconds
+            for variation in response.context['cl'].result_list
+        )
+        == expected_seconds
+    )
@@ -0,0 +1,255 @@
+from datetime import date, datetime, time, timezone as dt_timezone
+
+import numpy
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+from model_bakery import baker
+from pytest_django.fixtures import SettingsWrapper
+
+from eiger.trainers.analytics import (
+    CACHE_KEY,
+    WINDOW_DAYS,
+    compute_training_analytics,
+    ewma,
+    get_analytics_cache,
+    get_training_analytics,
+    invalidate_training_analytics,
+    rolling_sum,
+)
+from eiger.trainers.models import (
+    Category,
+    ExerciseVariation,
+    TrainingLogEntry,
+)
+from eiger.trainers.training_log import log_session
+from tests.test_eiger.conftest import make_variation
+
+LAST_DAY = date(2021, 6, 30)
+
+
+@pytest.fixture(autouse=True)
+def utc(settings: SettingsWrapper) -> None:
+    settings.TIME_ZONE = 'UTC'
+
+
+@pytest.fixture(autouse=True)
+def _cache(settings: SettingsWrapper) -> None:
+    settings.ANALYTICS_CACHE_ALIAS = 'default'
+    cache.clear()
+
+
+def make_entry(
+    user: User, variation: ExerciseVariation, day: date, **fields: object
+) -> TrainingLogEntry:
+    return baker.make(
+        TrainingLogEntry,
+        user=user,
+        exercise_variation=variation,
+        performed_at=datetime.combine(day, time(18), tzinfo=dt_timezone.utc),
+        **fields,
+    )
+
+
+def reference_ewma(values: list[float], alpha: float) -> list[float]:
+    averages, average = [], 0.0
+    for value in values:
+        average = alpha * value + (1 - alpha) * average
+        averages.append(average)
+    return averages
+
+
+@pytest.mark.parametrize(
+    ('size', 'alpha'), [(0, 0.25), (10, 1), (200, 0.25), (5000, 2 / 29)]
+)
+def test_ewma_must_match_the_recursive_average(
+    size: int, alpha: float
+) -> None:
+    values = numpy.random.default_rng(0).integers(0, 600, size)
+
+    averages = ewma(values, alpha)
+
+    assert averages.tolist() == pytest.approx(
+        reference_ewma(values.tolist(), alpha)
+    )
+
+
+def test_rolling_sum_must_sum_the_last_values() -> None:
+    sums = rolling_sum(numpy.array([1, 2, 3, 4, 5]), 3)
+
+    assert sums.tolist() == [1, 3, 6, 9, 12]
+
+
+@pytest.mark.django_db()
+def test_compute_training_analytics_must_return_the_window_metrics(
+    trainer: User,
+) -> None:
+    category, other_category = baker.make(Category, _quantity=2)
+    hangboard = make_variation(category, seconds_per_repetition=10)
+    campus = make_variation(other_category, seconds_per_repetition=None)
+    make_entry(
+        trainer,
+        campus,
+        date(2021, 4, 1),
+        repetitions=3,
+        weight_in_kilos=None,
+        duration_seconds=30,
+    )
+    make_entry(
+        trainer,
+        hangboard,
+        date(2021, 6, 16),
+        repetitions=2,
+        weight_in_kilos=10,
+        duration_seconds=None,
+    )
+    make_entry(
+        trainer,
+        hangboard,
+        LAST_DAY,
+        repetitions=6,
+        weight_in_kilos=20,
+        duration_seconds=None,
+    )
+    make_entry(
+        trainer,
+        campus,
+        LAST_DAY,
+        repetitions=5,
+        weight_in_kilos=10,
+        duration_seconds=50,
+    )
+    make_entry(baker.make(User), hangboard, LAST_DAY, repetitions=100)
+
+    result = compute_training_analytics(trainer, last_day=LAST_DAY)
+
+    since = date(2021, 4, 2)
+    assert result['since'] == since
+    assert result['until'] == LAST_DAY
+    daily = result['daily']
+    assert len(daily) == WINDOW_DAYS
+    assert daily[0]['day'] == since
+    assert daily[0]['load'] == 0
+    assert daily[0]['rolling_load'] == 30
+    assert daily[0]['acute_load'] == pytest.approx(30 * 0.25 * 0.75, abs=0.01)
+    assert daily[0]['acute_chronic_ratio'] == pytest.approx(2.92)
+    assert daily[-1]['day'] == LAST_DAY
+    assert daily[-1]['load'] == 110
+    assert daily[-1]['rolling_load'] == 110
+    assert result['weekly_volumes'] == [
+        {
+            'week_start': date(2021, 6, 14),
+            'category': category.id,
+            'volume': 20,
+        },
+        {
+            'week_start': date(2021, 6, 28),
+            'category': category.id,
+            'volume': 120,
+        },
+        {
+            'week_start': date(2021, 6, 28),
+            'category': other_category.id,
+            'volume': 50,
+        },
+    ]
+    assert result['max_hang_loads'] == sorted(
+        [
+            {'exercise': hangboard.exercise_id, 'estimated_max_load': 20.7},
+            {'exercise': campus.exercise_id, 'estimated_max_load': 10.3},
+        ],
+        key=lambda row: row['exercise'],
+    )
+
+
+@pytest.mark.django_db()
+def test_compute_training_analytics_must_skip_the_warmup_max_hang_loads(
+    trainer: User,
+) -> None:
+    hangboard = make_variation(baker.make(Category), seconds_per_repetition=10)
+    make_entry(
+        trainer,
+        hangboard,
+        date(2021, 4, 1),
+        repetitions=1,
+        weight_in_kilos=50,
+        duration_seconds=None,
+    )
+    make_entry(
+        trainer,
+        hangboard,
+        LAST_DAY,
+        repetitions=1,
+        weight_in_kilos=20,
+        duration_seconds=None,
+    )
+
+    result = compute_training_analytics(trainer, last_day=LAST_DAY)
+
+    assert result['max_hang_loads'] == [
+        {'exercise': hangboard.exercise_id, 'estimated_max_load': 20.7}
+    ]
+
+
+@pytest.mark.django_db()
+def test_compute_training_analytics_must_handle_an_empty_log(
+    trainer: User,
+) -> None:
+    result = compute_training_analytics(trainer, last_day=LAST_DAY)
+
+    assert {row['load'] for row in result['daily']} == {0}
+    assert {row['acute_chronic_ratio'] for row in result['daily']} == {None}
+    assert result['weekly_volumes'] == []
+    assert result['max_hang_loads'] == []
+
+
+@pytest.mark.django_db()
+def test_get_training_analytics_must_cache_the_analytics(
+    trainer: User,
+) -> None:
+    variation = make_variation(baker.make(Category))
+    cached = get_training_analytics(trainer)
+    make_entry(trainer, variation, timezone.localdate(), duration_seconds=30)
+
+    assert get_training_analytics(trainer) == cached
+
+    invalidate_training_analytics(trainer.id)
+
+    assert get_training_analytics(trainer) != cached
+
+
+@pytest.mark.django_db()
+def test_get_training_analytics_must_compute_them_without_a_cache(
+    trainer: User, settings: SettingsWrapper
+) -> None:
+    settings.ANALYTICS_CACHE_ALIAS = ''
+    variation = make_variation(baker.make(Category))
+    computed = get_training_analytics(trainer)
+    make_entry(trainer, variation, timezone.localdate(), duration_seconds=30)
+
+    assert get_training_analytics(trainer) != computed
+
+
+@pytest.mark.django_db()
+def test_log_session_must_invalidate_the_cached_analytics(
+    trainer: User, django_capture_on_commit_callbacks
+) -> None:
+    variation = make_variation(baker.make(Category))
+    get_training_analytics(trainer)
+    analytics_cache = get_analytics_cache()
+    key = CACHE_KEY.format(user_id=trainer.id, day=timezone.localdate())
+    assert analytics_cache.get(key) is not None  # type: ignore[union-attr]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        log_session(
+            trainer,
+            [
+                {
+                    'exercise_variation': variation.id,
+                    'performed_at': timezone.now().isoformat(),
+                }
+            ],
+        )
+
+    assert analytics_cache.get(key) is None  # type: ignore[union-attr]
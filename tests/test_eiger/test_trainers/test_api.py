@@ -0,0 +1,241 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+from model_bakery import baker
+
+from eiger.trainers.models import Category, Exercise, ExerciseVariation
+
+
+def list_url(resource_name: str) -> str:
+    return reverse('api_list', kwargs={'resource_name': resource_name})
+
+
+def detail_url(resource_name: str, pk: int) -> str:
+    return reverse(
+        'api_detail', kwargs={'resource_name': resource_name, 'pk': pk}
+    )
+
+
+@pytest.mark.django_db
+def test_must_redirect_to_index_given_non_authenticated_user(
+    client: Client,
+) -> None:
+    url = list_url('categories')
+
+    response = client.get(url)
+
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == f'/?next={url}'  # type: ignore[attr-defined]
+
+
+@pytest.mark.django_db
+def test_must_return_not_found_given_unknown_resource(
+    authenticated_client: Client,
+) -> None:
+    response = authenticated_client.get(list_url('unknown'))
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_must_list_only_reviewed_or_own_exercises(
+    authenticated_client: Client, trainer: User
+) -> None:
+    reviewed = baker.make(Exercise, reviewed=True)
+    own_pending = baker.make(Exercise, created_by=trainer)
+    baker.make(Exercise, reviewed=False)
+
+    response = authenticated_client.get(list_url('exercises'))
+
+    assert response.status_code == HTTPStatus.OK
+    assert [row['id'] for row in response.json()['results']] == [
+        reviewed.id,
+        own_pending.id,
+    ]
+    assert response.json()['next_cursor'] is None
+
+
+@pytest.mark.django_db
+def test_must_return_only_the_requested_fields(
+    authenticated_client: Client,
+) -> None:
+    category = baker.make(Category)
+
+    response = authenticated_client.get(
+        list_url('categories'), {'fields': 'name, color'}
+    )
+
+    assert response.json()['results'] == [
+        {'name': category.name, 'color': category.color}
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    argnames='params, error',
+    argvalues=[
+        ({'fields': 'name,password'}, 'Unknown fields: password.'),
+        ({'limit': '0'}, 'Invalid limit.'),
+        ({'limit': 'all'}, 'Invalid limit.'),
+        ({'cursor': 'invalid'}, 'Invalid pagination cursor.'),
+    ],
+)
+def test_must_return_bad_request_given_invalid_parameters(
+    authenticated_client: Client, params: dict[str, str], error: str
+) -> None:
+    response = authenticated_client.get(list_url('categories'), params)
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'error': error}
+
+
+@pytest.mark.django_db
+def test_must_filter_the_variations_by_range(
+    authenticated_client: Client,
+) -> None:
+    short, medium, _ = (
+        baker.make(
+            ExerciseVariation,
+            seconds_per_repetition=seconds,
+            weight_in_kilos=seconds,
+            reviewed=True,
+        )
+        for seconds in (60, 300, 900)
+    )
+
+    response = authenticated_client.get(
+        list_url('exercise-variations'),
+        {
+            'total_duration_seconds__lte': 600,
+            'fields': 'id,total_duration_seconds,total_volume',
+        },
+    )
+    volume_response = authenticated_client.get(
+        list_url('exercise-variations'),
+        {'total_volume__gte': 300, 'total_volume__lte': 300, 'fields': 'id'},
+    )
+
+    assert response.json()['results'] == [
+        {'id': short.id, 'total_duration_seconds': 60, 'total_volume': 60},
+        {'id': medium.id, 'total_duration_seconds': 300, 'total_volume': 300},
+    ]
+    assert volume_response.json()['results'] == [{'id': medium.id}]
+
+
+@pytest.mark.django_db
+def test_must_return_bad_request_given_an_invalid_range(
+    authenticated_client: Client,
+) -> None:
+    response = authenticated_client.get(
+        list_url('exercise-variations'),
+        {'total_duration_seconds__lte': 'ten minutes'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'error': 'Invalid total_duration_seconds__lte.'}
+
+
+@pytest.mark.django_db
+def test_must_paginate_by_cursor(authenticated_client: Client) -> None:
+    categories = baker.make(Category, _quantity=3)
+
+    first_page = authenticated_client.get(
+        list_url('categories'), {'limit': 2, 'fields': 'id'}
+    ).json()
+    last_page = authenticated_client.get(
+        list_url('categories'),
+        {'limit': 2, 'fields': 'id', 'cursor': first_page['next_cursor']},
+    ).json()
+
+    assert first_page['results'] == [
+        {'id': category.id} for category in categories[:2]
+    ]
+    assert last_page == {
+        'results': [{'id': categories[2].id}],
+        'next_cursor': None,
+    }
+
+
+@pytest.mark.django_db
+def test_list_must_return_not_modified_given_matching_etag(
+    authenticated_client: Client,
+) -> None:
+    category = baker.make(Category)
+    etag = authenticated_client.get(list_url('categories'))['ETag']
+
+    not_modified = authenticated_client.get(
+        list_url('categories'), HTTP_IF_NONE_MATCH=etag
+    )
+    category.save()
+    modified = authenticated_client.get(
+        list_url('categories'), HTTP_IF_NONE_MATCH=etag
+    )
+
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+    assert not_modified.content == b''
+    assert modified.status_code == HTTPStatus.OK
+    assert modified['ETag'] != etag
+
+
+@pytest.mark.django_db
+def test_must_retrieve_exercise_variation_detail(
+    authenticated_client: Client, trainer: User
+) -> None:
+    variation = baker.make(
+        ExerciseVariation, created_by=trainer, _fill_optional=True
+    )
+
+    response = authenticated_client.get(
+        detail_url('exercise-variations', variation.id),
+        {'fields': 'id,exercise,sets'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'id': variation.id,
+        'exercise': variation.exercise_id,
+        'sets': variation.sets,
+    }
+    assert response.has_header('ETag')
+
+
+@pytest.mark.django_db
+def test_detail_must_not_serialize_given_matching_etag(
+    authenticated_client: Client, django_assert_num_queries
+) -> None:
+    exercise = baker.make(Exercise, reviewed=True)
+    url = detail_url('exercises', exercise.id)
+    etag = authenticated_client.get(url)['ETag']
+
+    # Session, user and the `updated_at` lookup, the row is never fetched:
+    with django_assert_num_queries(3):
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_detail_etag_must_depend_on_the_fieldset(
+    authenticated_client: Client,
+) -> None:
+    category = baker.make(Category)
+    url = detail_url('categories', category.id)
+
+    full_etag = authenticated_client.get(url)['ETag']
+    sparse_etag = authenticated_client.get(url, {'fields': 'name'})['ETag']
+
+    assert full_etag != sparse_etag
+
+
+@pytest.mark.django_db
+def test_detail_must_return_not_found_given_another_user_pending_exercise(
+    authenticated_client: Client,
+) -> None:
+    exercise = baker.make(Exercise, reviewed=False)
+
+    response = authenticated_client.get(detail_url('exercises', exercise.id))
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,188 @@
+import time
+
+import pytest
+from django.contrib.auth.models import User
+from pytest_django.live_server_helper import LiveServer
+
+from eiger.trainers.benchmarks import (
+    BENCHMARK_STAFF_USERNAME,
+    BenchmarkError,
+    ClientRunner,
+    ConnectionsSampler,
+    HTTPRunner,
+    Sample,
+    build_request_mix,
+    compare_with_baseline,
+    flush_benchmark_data,
+    percentile,
+    run_benchmark,
+    seed_benchmark_data,
+    summarise,
+)
+from eiger.trainers.models import (
+    Category,
+    Exercise,
+    ExerciseVariation,
+    PendingReviewCounter,
+)
+
+
+def test_percentile_must_use_the_nearest_rank() -> None:
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 99) == 3
+
+
+def test_summarise_must_group_the_samples_by_scenario() -> None:
+    samples = [
+        Sample('home', 200, 0.010, 4),
+        Sample('home', 200, 0.030, 6),
+        Sample('admin exercises', 500, 0.1, None),
+    ]
+
+    results = summarise(samples)
+
+    assert list(results) == ['admin exercises', 'home']
+    assert results['home'].requests == 2
+    assert results['home'].errors == 0
+    assert results['home'].p50 == 10
+    assert results['home'].p99 == 30
+    assert results['home'].mean_queries == 5
+    assert results['home'].max_queries == 6
+    assert results['admin exercises'].errors == 1
+    assert results['admin exercises'].mean_queries is None
+
+
+def test_compare_with_baseline_must_report_the_regressions() -> None:
+    baseline = {
+        'rss_kb': 1000,
+        'scenarios': {
+            'home': {'p50': 10, 'p95': 20, 'p99': 30, 'max_queries': 5},
+            'removed': {'p50': 1, 'p95': 1, 'p99': 1, 'max_queries': 1},
+        },
+    }
+    report = {
+        'rss_kb': 1300,
+        'scenarios': {
+            'home': {'p50': 11, 'p95': 30, 'p99': 30, 'max_queries': 6},
+            'added': {'p50': 1, 'p95': 1, 'p99': 1, 'max_queries': 1},
+        },
+    }
+
+    regressions = compare_with_baseline(report, baseline, tolerance=0.2)
+
+    assert [str(regression) for regression in regressions] == [
+        'home: p95 went from 20 to 30',
+        'home: max_queries went from 5 to 6',
+        'process: rss_kb went from 1000 to 1300',
+    ]
+
+
+@pytest.mark.django_db()
+def test_seed_benchmark_data_must_create_users_exercises_and_variations() -> (
+    None
+):
+    exercises = seed_benchmark_data(users=3, exercises=10, variations=2)
+
+    assert exercises == 30
+    assert User.objects.filter(username__startswith='benchmark-').count() == 4
+    assert Exercise.objects.count() == 30
+    assert Exercise.objects.filter(reviewed=False).count() == 3
+    assert ExerciseVariation.objects.count() == 60
+    assert PendingReviewCounter.objects.count() == 3
+
+
+@pytest.mark.django_db()
+def test_flush_benchmark_data_must_delete_the_seeded_data() -> None:
+    seed_benchmark_data(users=2, exercises=5, variations=1)
+
+    flush_benchmark_data()
+
+    assert not User.objects.exists()
+    assert not Exercise.objects.exists()
+    assert not Category.objects.exists()
+
+
+@pytest.mark.django_db()
+def test_build_request_mix_must_fail_without_benchmark_data() -> None:
+    with pytest.raises(BenchmarkError):
+        build_request_mix(10)
+
+
+@pytest.mark.django_db()
+def test_build_request_mix_must_be_reproducible() -> None:
+    seed_benchmark_data(users=3, exercises=10, variations=1)
+
+    requests = build_request_mix(50, seed=1)
+
+    assert requests == build_request_mix(50, seed=1)
+    assert len(requests) == 50
+    staff = User.objects.get(username=BENCHMARK_STAFF_USERNAME)
+    assert all(
+        (request.user_id == staff.id) == request.path.startswith('/admin/')
+        for request in requests
+    )
+
+
+@pytest.mark.django_db()
+def test_run_benchmark_must_report_every_scenario_of_the_mix() -> None:
+    seed_benchmark_data(users=2, exercises=10, variations=1)
+    requests = build_request_mix(60, seed=0)
+
+    report = run_benchmark(ClientRunner(), requests, warmup=10)
+
+    assert report['requests'] == 50
+    assert report['rss_kb'] > 0
+    scenarios = report['scenarios']
+    assert set(scenarios) == {request.scenario for request in requests[10:]}
+    assert all(result['errors'] == 0 for result in scenarios.values())
+    assert all(result['max_queries'] > 0 for result in scenarios.values())
+
+    assert report['concurrency'] == 1
+    assert report['requests_per_second'] > 0
+    assert report['db_connections']['peak'] >= 1
+
+
+@pytest.mark.django_db()
+def test_run_benchmark_must_send_concurrently_only_to_a_server() -> None:
+    seed_benchmark_data(users=1, exercises=2, variations=0)
+    requests = build_request_mix(2, seed=0)
+
+    with pytest.raises(BenchmarkError, match='server'):
+        run_benchmark(ClientRunner(), requests, concurrency=2)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_benchmark_must_send_concurrent_requests_to_a_server(
+    live_server: LiveServer,
+) -> None:
+    seed_benchmark_data(users=2, exercises=10, variations=1)
+    requests = build_request_mix(24, seed=0)
+
+    report = run_benchmark(
+        HTTPRunner(live_server.url), requests, warmup=4, concurrency=4
+    )
+
+    assert report['requests'] == 20
+    assert report['concurrency'] == 4
+    assert all(
+        result['errors'] == 0 and result['mean_queries'] is None
+        for result in report['scenarios'].values()
+    )
+    # The live server handles every request in a thread of its own:
+    db_connections = report['db_connections']
+    assert db_connections['before'] <= db_connections['peak']
+    assert db_connections['peak'] <= db_connections['max']
+
+
+@pytest.mark.django_db()
+def test_connections_sampler_must_record_the_peak_of_connections() -> None:
+    with ConnectionsSampler(interval=0.01) as sampler:
+        time.sleep(0.05)
+
+    # The sampler thread holds a connection of its own:
+    assert sampler.peak >= 2
+    assert sampler.max_connections > sampler.peak
@@ -0,0 +1,150 @@
+import io
+
+import pytest
+from django.contrib.auth.models import User
+from model_bakery import baker
+
+from eiger.trainers.counters import (
+    get_pending_review_counter,
+    refresh_pending_review_counters,
+)
+from eiger.trainers.importers import ExerciseImporter
+from eiger.trainers.models import (
+    Exercise,
+    ExerciseType,
+    ExerciseVariation,
+    PendingReviewCounter,
+)
+
+
+@pytest.mark.django_db()
+def test_counters_must_be_maintained_when_entries_are_saved(
+    trainer: User,
+) -> None:
+    exercise = baker.make(Exercise, created_by=trainer)
+    variation = baker.make(ExerciseVariation, created_by=trainer)
+
+    counter = PendingReviewCounter.objects.get(user=trainer)
+    assert counter.pending_exercises == 1
+    assert counter.pending_variations == 1
+    reviewed_exercise = baker.make(Exercise, created_by=trainer, reviewed=True)
+    counter.refresh_from_db()
+    assert counter.last_submitted_at == reviewed_exercise.created_at
+
+    exercise.reviewed = True
+    exercise.save()
+    variation.delete()
+
+    counter.refresh_from_db()
+    assert counter.pending_exercises == 0
+    assert counter.pending_variations == 0
+
+
+@pytest.mark.django_db()
+def test_counters_must_not_be_refreshed_given_unrelated_update_fields(
+    trainer: User, django_assert_num_queries
+) -> None:
+    exercise = baker.make(Exercise, created_by=trainer)
+
+    with django_assert_num_queries(1):
+        exercise.save(update_fields=['description'])
+
+
+@pytest.mark.django_db()
+def test_counters_must_apply_deltas_without_counting_the_entries(
+    trainer: User, django_assert_num_queries
+) -> None:
+    exercise, _ = baker.make(Exercise, created_by=trainer, _quantity=2)
+
+    # The saved state is read, then the entry and the counter are updated:
+    with django_assert_num_queries(3):
+        exercise.reviewed = True
+        exercise.save()
+
+    assert get_pending_review_counter(trainer.id).pending_exercises == 1
+
+
+@pytest.mark.django_db()
+def test_counters_must_move_the_entries_given_to_another_user(
+    trainer: User,
+) -> None:
+    other_trainer = baker.make(User)
+    baker.make(Exercise, created_by=other_trainer)
+    exercise = baker.make(Exercise, created_by=trainer)
+
+    exercise.created_by = other_trainer
+    exercise.save(update_fields=['created_by'])
+
+    assert get_pending_review_counter(trainer.id).pending_exercises == 0
+    assert get_pending_review_counter(other_trainer.id).pending_exercises == 2
+
+
+@pytest.mark.django_db()
+def test_counters_must_not_go_below_zero(trainer: User) -> None:
+    exercise = baker.make(Exercise, created_by=trainer)
+    PendingReviewCounter.objects.update(pending_exercises=0)
+
+    exercise.delete()
+
+    assert get_pending_review_counter(trainer.id).pending_exercises == 0
+
+
+@pytest.mark.django_db()
+def test_counters_must_ignore_the_deleted_reviewed_entries(
+    trainer: User, django_assert_num_queries
+) -> None:
+    exercise = baker.make(Exercise, created_by=trainer, reviewed=True)
+
+    # Its variations are collected, then it is deleted:
+    with django_assert_num_queries(2):
+        exercise.delete()
+
+
+@pytest.mark.django_db()
+def test_counters_must_be_deleted_with_their_user(trainer: User) -> None:
+    baker.make(Exercise, created_by=trainer)
+    baker.make(ExerciseVariation, created_by=trainer)
+
+    User.objects.filter(id=trainer.id).delete()
+
+    assert not PendingReviewCounter.objects.filter(user_id=trainer.id).exists()
+
+
+@pytest.mark.django_db()
+def test_counters_must_be_maintained_by_the_importer(
+    trainer: User, exercise_type: ExerciseType
+) -> None:
+    stream = io.StringIO(
+        'name,exercise_type,sets\n'
+        f'Max hangs,{exercise_type.name},5\n'
+        f'Repeaters,{exercise_type.name},\n'
+    )
+
+    ExerciseImporter(trainer).run(stream, 'csv')
+
+    counter = get_pending_review_counter(trainer.id)
+    assert counter.pending_exercises == 2
+    assert counter.pending_variations == 1
+
+
+@pytest.mark.django_db()
+def test_refresh_must_repair_counters_of_bulk_updated_entries(
+    trainer: User,
+) -> None:
+    baker.make(Exercise, created_by=trainer, _quantity=3)
+    Exercise.objects.update(reviewed=True)
+
+    refresh_pending_review_counters([trainer.id, None])
+
+    assert get_pending_review_counter(trainer.id).pending_exercises == 0
+
+
+@pytest.mark.django_db()
+def test_get_pending_review_counter_must_default_to_an_empty_counter(
+    trainer: User,
+) -> None:
+    counter = get_pending_review_counter(trainer.id)
+
+    assert counter.pending_entries == 0
+    assert counter.last_submitted_at is None
+    assert not PendingReviewCounter.objects.exists()
@@ -0,0 +1,175 @@
+import gzip
+import json
+
+import pytest
+from django.db import connection
+from model_bakery import baker
+
+from eiger.trainers.exporters import (
+    EXPORT_COLUMNS,
+    ExportError,
+    check_export_options,
+    export_catalogue,
+    get_content_type,
+    get_export_filename,
+    iter_catalogue_rows,
+)
+from eiger.trainers.models import Exercise, ExerciseType, ExerciseVariation
+
+
+@pytest.fixture()
+def catalogue(exercise_type: ExerciseType) -> list[Exercise]:
+    max_hangs = baker.make(
+        Exercise,
+        name='Max hangs',
+        description='Heavy, short hangs',
+        exercise_type=exercise_type,
+        should_add_weight=True,
+        reviewed=True,
+    )
+    baker.make(
+        ExerciseVariation,
+        exercise=max_hangs,
+        sets=5,
+        repetitions=1,
+        weight_in_kilos=20,
+        reviewed=True,
+    )
+    baker.make(ExerciseVariation, exercise=max_hangs, sets=3, reviewed=False)
+    repeaters = baker.make(
+        Exercise, name='Repeaters', exercise_type=exercise_type, reviewed=True
+    )
+    baker.make(Exercise, name='Pending', reviewed=False)
+    return [max_hangs, repeaters]
+
+
+@pytest.mark.django_db()
+def test_must_yield_reviewed_exercises_and_variations(
+    catalogue: list[Exercise], django_assert_num_queries
+) -> None:
+    max_hangs, repeaters = catalogue
+    variation = max_hangs.exercisevariation_set.get(reviewed=True)
+    exercise_type = max_hangs.exercise_type
+
+    with django_assert_num_queries(2):
+        rows = list(iter_catalogue_rows(chunk_size=10))
+
+    assert [dict(zip(EXPORT_COLUMNS, row)) for row in rows] == [
+        {
+            'exercise_id': max_hangs.id,
+            'name': 'Max hangs',
+            'exercise_type': exercise_type.name,
+            'category': exercise_type.category.name,
+            'description': 'Heavy, short hangs',
+            'should_add_weight': True,
+            'variation_id': variation.id,
+            'sets': 5,
+            'repetitions': 1,
+            'seconds_per_repetition': None,
+            'rest_per_set_in_seconds': None,
+            'rest_per_repetition_in_seconds': None,
+            'weight_in_kilos': 20,
+        },
+        {
+            'exercise_id': repeaters.id,
+            'name': 'Repeaters',
+            'exercise_type': exercise_type.name,
+            'category': exercise_type.category.name,
+            'description': repeaters.description,
+            'should_add_weight': repeaters.should_add_weight,
+            'variation_id': None,
+            'sets': None,
+            'repetitions': None,
+            'seconds_per_repetition': None,
+            'rest_per_set_in_seconds': None,
+            'rest_per_repetition_in_seconds': None,
+            'weight_in_kilos': None,
+        },
+    ]
+
+
+@pytest.mark.django_db()
+def test_must_page_through_the_exercises_without_server_side_cursors(
+    catalogue: list[Exercise],
+    django_assert_num_queries,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    expected = list(iter_catalogue_rows(chunk_size=10))
+    monkeypatch.setitem(
+        connection.settings_dict, 'DISABLE_SERVER_SIDE_CURSORS', True
+    )
+
+    # Two pages of an exercise and their variations, then the empty page:
+    with django_assert_num_queries(5):
+        rows = list(iter_catalogue_rows(chunk_size=1))
+
+    assert rows == expected
+
+
+@pytest.mark.django_db()
+def test_must_export_csv(catalogue: list[Exercise]) -> None:
+    content = b''.join(export_catalogue('csv')).decode()
+
+    lines = content.splitlines()
+    assert lines[0] == ','.join(EXPORT_COLUMNS)
+    assert len(lines) == 3
+    assert lines[1].startswith(f'{catalogue[0].id},Max hangs,')
+    assert lines[1].endswith(',5,1,,,,20')
+
+
+@pytest.mark.django_db()
+def test_must_export_gzip_compressed_jsonl(
+    catalogue: list[Exercise],
+) -> None:
+    content = b''.join(export_catalogue('jsonl', 'gzip', chunk_size=1))
+
+    records = [
+        json.loads(line) for line in gzip.decompress(content).splitlines()
+    ]
+    assert [record['name'] for record in records] == ['Max hangs', 'Repeaters']
+    assert records[0]['sets'] == 5
+
+
+@pytest.mark.django_db()
+def test_must_export_columnar_blocks(catalogue: list[Exercise]) -> None:
+    content = b''.join(export_catalogue('columnar', chunk_size=1))
+
+    header, *blocks = map(json.loads, content.splitlines())
+    assert header == {'version': 1, 'columns': list(EXPORT_COLUMNS)}
+    assert [block['rows'] for block in blocks] == [1, 1]
+    names = [block['data'][EXPORT_COLUMNS.index('name')] for block in blocks]
+    assert names == [['Max hangs'], ['Repeaters']]
+
+
+@pytest.mark.parametrize(
+    ('file_format', 'compression', 'message'),
+    [
+        ('xml', 'none', "Invalid export format 'xml'."),
+        ('csv', 'zip', "Invalid compression 'zip'."),
+    ],
+)
+def test_must_reject_invalid_export_options(
+    file_format: str, compression: str, message: str
+) -> None:
+    with pytest.raises(ExportError, match=message):
+        check_export_options(file_format, compression)
+
+
+@pytest.mark.parametrize(
+    ('file_format', 'compression', 'filename', 'content_type'),
+    [
+        ('csv', 'none', 'catalogue.csv', 'text/csv'),
+        ('jsonl', 'gzip', 'catalogue.jsonl.gz', 'application/gzip'),
+        (
+            'columnar',
+            'brotli',
+            'catalogue.columnar.jsonl.br',
+            'application/x-brotli',
+        ),
+    ],
+)
+def test_export_filename_and_content_type(
+    file_format: str, compression: str, filename: str, content_type: str
+) -> None:
+    assert get_export_filename(file_format, compression) == filename
+    assert get_content_type(file_format, compression) == content_type
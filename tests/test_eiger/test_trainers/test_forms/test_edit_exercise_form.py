@@ -8,6 +8,7 @@ from model_bakery import baker
 
 from eiger.trainers.forms import EditExerciseForm
 from eiger.trainers.models import Exercise, ExerciseType
+from eiger.trainers.taxonomy import get_taxonomy
 
 
 @pytest.fixture
@@ -63,6 +64,25 @@ def test_form_data_with_existing_exercise_name_must_return_duplicated_name_error
     )
 
 
+@pytest.mark.django_db
+def test_exercise_type_must_be_resolved_from_the_taxonomy_cache(
+    form: EditExerciseForm,
+    exercise_type: ExerciseType,
+    django_assert_num_queries,
+) -> None:
+    get_taxonomy()
+
+    with django_assert_num_queries(0):
+        choices = list(form.fields['exercise_type'].choices)  # type: ignore[arg-type]
+        cleaned_exercise_type = form.fields['exercise_type'].clean(
+            exercise_type.id
+        )
+
+    assert (exercise_type.id, str(exercise_type)) in choices
+    assert cleaned_exercise_type == exercise_type
+    assert str(cleaned_exercise_type) == str(exercise_type)
+
+
 class TestEditExerciseForm(TestCase):
     @given(
         name=strategies.one_of(strategies.none(), strategies.text(max_size=0))
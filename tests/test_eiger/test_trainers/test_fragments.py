@@ -0,0 +1,118 @@
+import pytest
+from django.template import Context, Template, TemplateSyntaxError
+from django.template.loader import render_to_string
+from model_bakery import baker
+
+from eiger.caching import cache_stats
+from eiger.trainers.models import Category, Exercise, ExerciseVariation
+from eiger.trainers.templatetags.fragments import (
+    FRAGMENTS_CACHE_NAMESPACE,
+    make_fragment_key,
+)
+
+
+def _fragment_stats() -> dict[str, int]:
+    return cache_stats.snapshot().get(
+        FRAGMENTS_CACHE_NAMESPACE, {'hits': 0, 'misses': 0}
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache_stats() -> None:
+    cache_stats.reset()
+
+
+@pytest.mark.django_db()
+def test_exercise_card_must_be_served_from_the_cache_once_rendered(
+    exercise: Exercise, django_assert_num_queries
+) -> None:
+    context = {'exercise': exercise, 'editable': True}
+    rendered = render_to_string('components/exercise_card.html', context)
+
+    with django_assert_num_queries(0):
+        assert (
+            render_to_string('components/exercise_card.html', context)
+            == rendered
+        )
+    assert _fragment_stats() == {'hits': 1, 'misses': 1}
+
+
+@pytest.mark.django_db()
+def test_exercise_card_must_be_rendered_again_once_saved(
+    exercise: Exercise,
+) -> None:
+    context = {'exercise': exercise, 'editable': True}
+    render_to_string('components/exercise_card.html', context)
+
+    exercise.name = 'Renamed exercise'
+    exercise.save()
+    rendered = render_to_string('components/exercise_card.html', context)
+
+    assert 'Renamed exercise' in rendered
+    assert _fragment_stats() == {'hits': 0, 'misses': 2}
+
+
+@pytest.mark.django_db()
+def test_exercise_card_must_be_rendered_again_once_the_category_changes(
+    exercise: Exercise,
+) -> None:
+    context = {'exercise': exercise, 'editable': True}
+    render_to_string('components/exercise_card.html', context)
+
+    category = exercise.exercise_type.category
+    category.color = '#123456'
+    category.save()
+    rendered = render_to_string('components/exercise_card.html', context)
+
+    assert '#123456' in rendered
+    assert _fragment_stats() == {'hits': 0, 'misses': 2}
+
+
+@pytest.mark.django_db()
+def test_exercise_card_must_cache_the_editable_flag_separately(
+    exercise: Exercise,
+) -> None:
+    editable = render_to_string(
+        'components/exercise_card.html',
+        {'exercise': exercise, 'editable': True},
+    )
+    read_only = render_to_string(
+        'components/exercise_card.html',
+        {'exercise': exercise, 'editable': False},
+    )
+
+    assert 'edit-icon' in editable
+    assert 'edit-icon' not in read_only
+
+
+@pytest.mark.django_db()
+def test_exercise_variation_card_must_be_rendered_again_once_saved(
+    exercise_variation: ExerciseVariation,
+) -> None:
+    context = {'variation': exercise_variation, 'editable': True}
+    render_to_string('components/exercise_variation_card.html', context)
+    render_to_string('components/exercise_variation_card.html', context)
+
+    exercise_variation.sets = 42
+    exercise_variation.save()
+    render_to_string('components/exercise_variation_card.html', context)
+
+    assert _fragment_stats() == {'hits': 1, 'misses': 2}
+
+
+@pytest.mark.django_db()
+def test_make_fragment_key_must_depend_on_the_updated_at_of_models() -> None:
+    category = baker.make(Category)
+    key = make_fragment_key('card', [category, 'value'])
+
+    category.save()
+
+    assert make_fragment_key('card', [category, 'value']) != key
+    assert key.startswith('card:')
+
+
+def test_cachedfragment_must_require_a_fragment_name() -> None:
+    with pytest.raises(TemplateSyntaxError):
+        Template(
+            '{% load fragments %}{% cachedfragment %}{% endcachedfragment %}'
+        ).render(Context())
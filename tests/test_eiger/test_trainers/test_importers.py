@@ -0,0 +1,179 @@
+import io
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import IntegrityError
+from model_bakery import baker
+
+from eiger.trainers.importers import (
+    ExerciseImporter,
+    ImportReport,
+    ReportedError,
+)
+from eiger.trainers.models import (
+    Category,
+    Exercise,
+    ExerciseType,
+    ExerciseVariation,
+)
+
+CSV_HEADER = (
+    'name,exercise_type,category,description,should_add_weight,sets,'
+    'repetitions,seconds_per_repetition,rest_per_set_in_seconds,'
+    'rest_per_repetition_in_seconds,weight_in_kilos\n'
+)
+
+
+@pytest.fixture()
+def hangboard(category: Category) -> ExerciseType:
+    category.name = 'Fingers'
+    category.save()
+    return baker.make(ExerciseType, category=category, name='Hangboard')
+
+
+@pytest.mark.django_db()
+def test_must_import_exercises_and_variations_from_csv(
+    trainer: User, hangboard: ExerciseType
+) -> None:
+    stream = io.StringIO(
+        CSV_HEADER
+        + 'Max hangs,Hangboard,Fingers,Heavy hangs,yes,5,1,10,180,,20\n'
+        + 'Max hangs,Hangboard,,,,3,1,10,180,,25\n'
+        + 'Repeaters,Hangboard,,7/3 repeaters,no,,,,,,\n'
+    )
+
+    report = ExerciseImporter(trainer, batch_size=2).run(stream, 'csv')
+
+    assert report == ImportReport(
+        rows=3, created_exercises=2, created_variations=2
+    )
+    max_hangs = Exercise.objects.get(name='Max hangs')
+    assert max_hangs.exercise_type == hangboard
+    assert max_hangs.should_add_weight
+    assert max_hangs.created_by == trainer
+    assert not max_hangs.reviewed
+    assert sorted(
+        max_hangs.exercisevariation_set.values_list(
+            'weight_in_kilos', flat=True
+        )
+    ) == [20, 25]
+    assert not Exercise.objects.get(
+        name='Repeaters'
+    ).exercisevariation_set.exists()
+
+
+@pytest.mark.django_db()
+def test_must_report_row_errors_without_aborting_the_batch(
+    trainer: User, hangboard: ExerciseType
+) -> None:
+    stream = io.StringIO(
+        '{"name": "Max hangs", "exercise_type": "Hangboard", "sets": 5}\n'
+        '{"name": "", "exercise_type": "Hangboard"}\n'
+        'not json\n'
+        '\n'
+        '{"name": "Pull ups", "exercise_type": "Campus"}\n'
+        '{"name": "Lock offs", "exercise_type": "Hangboard",'
+        ' "category": "Boulder"}\n'
+        '{"name": "Repeaters", "exercise_type": "Hangboard", "sets": -1}\n'
+        '["Repeaters"]\n'
+    )
+
+    report = ExerciseImporter(trainer).run(stream, 'jsonl')
+
+    assert report.rows == 7
+    assert report.created_exercises == 1
+    assert report.created_variations == 1
+    assert report.failed_rows == 6
+    assert report.errors == [
+        ReportedError(2, 'The exercise name is required.'),
+        ReportedError(3, 'Invalid JSON: Expecting value.'),
+        ReportedError(5, "Unknown exercise type 'Campus'."),
+        ReportedError(
+            6,
+            "The exercise type 'Hangboard' does not belong to the category"
+            " 'Boulder'.",
+        ),
+        ReportedError(7, 'The sets must be between 0 and 32767.'),
+        ReportedError(8, 'Each JSON line must be an object.'),
+    ]
+
+
+@pytest.mark.django_db()
+def test_must_skip_existing_variations_and_keep_existing_exercises(
+    trainer: User, hangboard: ExerciseType
+) -> None:
+    exercise = baker.make(
+        Exercise, name='Max hangs', description='Original', created_by=trainer
+    )
+    baker.make(
+        ExerciseVariation,
+        exercise=exercise,
+        sets=5,
+        repetitions=1,
+        seconds_per_repetition=10,
+        rest_per_set_in_seconds=180,
+        rest_per_repetition_in_seconds=0,
+        weight_in_kilos=20,
+    )
+    stream = io.StringIO(
+        CSV_HEADER + 'Max hangs,Hangboard,,Imported,,5,1,10,180,0,20\n'
+    )
+
+    report = ExerciseImporter(trainer).run(stream, 'csv')
+
+    assert report == ImportReport(rows=1, skipped_variations=1)
+    exercise.refresh_from_db()
+    assert exercise.description == 'Original'
+    assert ExerciseVariation.objects.count() == 1
+
+
+@pytest.mark.django_db()
+def test_must_update_existing_exercises_given_update_on_conflict(
+    trainer: User, hangboard: ExerciseType
+) -> None:
+    exercise = baker.make(Exercise, name='Max hangs', description='Original')
+    updated_at = exercise.updated_at
+    stream = io.StringIO(CSV_HEADER + 'Max hangs,Hangboard,,Imported,1\n')
+
+    report = ExerciseImporter(trainer, on_conflict='update').run(stream, 'csv')
+
+    assert report == ImportReport(rows=1, updated_exercises=1)
+    exercise.refresh_from_db()
+    assert exercise.updated_at > updated_at
+    assert exercise.description == 'Imported'
+    assert exercise.exercise_type == hangboard
+    assert exercise.should_add_weight
+
+
+@pytest.mark.django_db()
+def test_must_retry_row_by_row_given_a_database_error(
+    trainer: User, hangboard: ExerciseType, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    stream = io.StringIO(
+        CSV_HEADER
+        + 'Max hangs,Hangboard,,,,5\n'
+        + 'Repeaters,Hangboard,,,,6\n'
+    )
+    importer = ExerciseImporter(trainer)
+    write_batch = importer._write_batch
+
+    def failing_write_batch(rows, report):  # type: ignore[no-untyped-def]
+        if any(row.exercise.name == 'Repeaters' for row in rows):
+            raise IntegrityError('duplicate key value')
+        write_batch(rows, report)
+
+    monkeypatch.setattr(importer, '_write_batch', failing_write_batch)
+
+    report = importer.run(stream, 'csv')
+
+    assert report.created_exercises == 1
+    assert report.created_variations == 1
+    assert report.errors == [ReportedError(3, 'duplicate key value')]
+    assert list(Exercise.objects.values_list('name', flat=True)) == [
+        'Max hangs'
+    ]
+
+
+def test_must_reject_unknown_on_conflict_strategy() -> None:
+    with pytest.raises(ValueError, match="Invalid on_conflict 'replace'."):
+        ExerciseImporter(User(), on_conflict='replace')
@@ -0,0 +1,40 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from eiger.trainers.models import Exercise
+
+
+@pytest.mark.django_db()
+def test_check_query_plans_command_must_pass_given_indexed_queries() -> None:
+    stdout = StringIO()
+
+    call_command(
+        'check_query_plans', '--strict', '--seed', '100', stdout=stdout
+    )
+
+    assert stdout.getvalue().splitlines()[-1] == '7 query plans checked.'
+    assert not Exercise.objects.exists()
+
+
+@pytest.mark.django_db()
+def test_check_query_plans_command_must_fail_given_a_seq_scan(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        'eiger.trainers.query_plans.explain',
+        lambda queryset: {
+            'Node Type': 'Seq Scan',
+            'Relation Name': 'trainers_exercise',
+        },
+    )
+    stdout = StringIO()
+
+    with pytest.raises(CommandError, match='7 queries regressed'):
+        call_command('check_query_plans', stdout=stdout)
+
+    assert (
+        'home pending exercises: sequential scan of trainers_exercise'
+        in stdout.getvalue()
+    )
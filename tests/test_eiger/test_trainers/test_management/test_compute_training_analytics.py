@@ -0,0 +1,67 @@
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+from model_bakery import baker
+from pytest_django.fixtures import SettingsWrapper
+
+from eiger.trainers.analytics import CACHE_KEY, get_analytics_cache
+from eiger.trainers.models import TrainingLogEntry
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(settings: SettingsWrapper, tmp_path: Path) -> None:
+    settings.CACHES = {
+        **settings.CACHES,
+        'shared': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        },
+    }
+    settings.ANALYTICS_CACHE_ALIAS = 'shared'
+
+
+def get_cached(user: User) -> object:
+    return get_analytics_cache().get(  # type: ignore[union-attr]
+        CACHE_KEY.format(user_id=user.id, day=timezone.localdate())
+    )
+
+
+@pytest.mark.django_db()
+def test_compute_training_analytics_must_cache_the_active_trainers() -> None:
+    active, inactive = baker.make(User, _quantity=2)
+    baker.make(TrainingLogEntry, user=active, performed_at=timezone.now())
+    baker.make(
+        TrainingLogEntry,
+        user=inactive,
+        performed_at=timezone.now() - timedelta(days=30),
+    )
+    stdout = StringIO()
+
+    call_command('compute_training_analytics', stdout=stdout)
+
+    assert (
+        stdout.getvalue() == 'Computed the training analytics of 1 trainers.\n'
+    )
+    assert get_cached(active) is not None
+    assert get_cached(inactive) is None
+
+
+@pytest.mark.parametrize(
+    argnames=('alias', 'message'),
+    argvalues=[
+        ('', 'The training analytics are not cached'),
+        ('default', "The cache 'default' is local to this process"),
+    ],
+)
+def test_compute_training_analytics_must_require_a_shared_cache(
+    settings: SettingsWrapper, alias: str, message: str
+) -> None:
+    settings.ANALYTICS_CACHE_ALIAS = alias
+
+    with pytest.raises(CommandError, match=f'^{message}'):
+        call_command('compute_training_analytics', stdout=StringIO())
@@ -0,0 +1,31 @@
+import gzip
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+from eiger.trainers.models import Exercise
+
+
+@pytest.mark.django_db()
+def test_export_catalogue_command_must_write_the_file(tmp_path: Path) -> None:
+    baker.make(Exercise, name='Max hangs', reviewed=True)
+    path = tmp_path / 'catalogue.csv.gz'
+    stdout = StringIO()
+
+    call_command(
+        'export_catalogue',
+        str(path),
+        '--compression',
+        'gzip',
+        stdout=stdout,
+    )
+
+    lines = gzip.decompress(path.read_bytes()).decode().splitlines()
+    assert len(lines) == 2
+    assert ',Max hangs,' in lines[1]
+    assert (
+        stdout.getvalue() == f'Wrote {path.stat().st_size} bytes to {path}.\n'
+    )
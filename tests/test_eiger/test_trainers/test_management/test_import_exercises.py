@@ -0,0 +1,64 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+
+from eiger.trainers.models import Exercise, ExerciseType
+
+
+@pytest.mark.django_db()
+def test_import_exercises_command_must_import_the_file(
+    tmp_path: Path, trainer: User, exercise_type: ExerciseType
+) -> None:
+    path = tmp_path / 'exercises.jsonl'
+    path.write_text(
+        f'{{"name": "Max hangs", "exercise_type": "{exercise_type.name}"}}\n'
+        '{"name": "Repeaters"}\n'
+    )
+    stdout, stderr = StringIO(), StringIO()
+
+    call_command(
+        'import_exercises',
+        str(path),
+        '--created-by',
+        trainer.username,
+        '--reviewed',
+        stdout=stdout,
+        stderr=stderr,
+    )
+
+    exercise = Exercise.objects.get()
+    assert exercise.name == 'Max hangs'
+    assert exercise.reviewed
+    assert exercise.created_by == trainer
+    assert stderr.getvalue() == "Line 2: Unknown exercise type ''.\n"
+    assert (
+        stdout.getvalue()
+        == '2 rows read: 1 exercises created, 0 updated, 0 variations created,'
+        ' 0 already existing and 1 rows failed.\n'
+    )
+
+
+@pytest.mark.django_db()
+def test_import_exercises_command_must_fail_given_an_unknown_user(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / 'exercises.csv'
+    path.write_text('name,exercise_type\n')
+
+    with pytest.raises(CommandError, match='User ghost does not exist.'):
+        call_command('import_exercises', str(path), '--created-by', 'ghost')
+
+
+def test_import_exercises_command_must_fail_given_an_unknown_format(
+    tmp_path: Path,
+) -> None:
+    with pytest.raises(CommandError, match='Unable to infer the format'):
+        call_command(
+            'import_exercises',
+            str(tmp_path / 'exercises.xml'),
+            '--created-by',
+            'x',
+        )
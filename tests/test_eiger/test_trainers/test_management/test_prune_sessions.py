@@ -0,0 +1,93 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+from pytest_django.fixtures import SettingsWrapper
+
+
+@pytest.mark.django_db()
+def test_prune_sessions_must_delete_only_the_expired_sessions_in_batches() -> (
+    None
+):
+    now = timezone.now()
+    Session.objects.bulk_create(
+        Session(
+            session_key=f'expired{index}',
+            session_data='',
+            expire_date=now - timedelta(days=1),
+        )
+        for index in range(5)
+    )
+    Session.objects.create(
+        session_key='active', session_data='', expire_date=now + timedelta(1)
+    )
+    stdout = StringIO()
+
+    call_command('prune_sessions', '--batch-size', '2', stdout=stdout)
+
+    assert list(Session.objects.values_list('session_key', flat=True)) == [
+        'active'
+    ]
+    assert stdout.getvalue() == '5 expired sessions deleted.\n'
+
+
+@pytest.mark.django_db()
+def test_prune_sessions_must_prune_the_cached_db_sessions(
+    settings: SettingsWrapper,
+) -> None:
+    settings.SESSION_ENGINE = settings.SESSION_ENGINES['cached_db']
+    Session.objects.create(
+        session_key='expired',
+        session_data='',
+        expire_date=timezone.now() - timedelta(days=1),
+    )
+
+    call_command('prune_sessions', stdout=StringIO())
+
+    assert not Session.objects.exists()
+
+
+def test_prune_sessions_must_leave_the_cookie_sessions_to_the_clients(
+    settings: SettingsWrapper,
+) -> None:
+    settings.SESSION_ENGINE = settings.SESSION_ENGINES['signed_cookies']
+    stdout = StringIO()
+
+    call_command('prune_sessions', stdout=stdout)
+
+    assert (
+        stdout.getvalue()
+        == 'Expired sessions cleared by'
+        ' django.contrib.sessions.backends.signed_cookies.\n'
+    )
+
+
+@pytest.mark.django_db()
+def test_prune_sessions_must_keep_pruning_given_an_interval() -> None:
+    with mock.patch(
+        'eiger.trainers.management.commands.prune_sessions.time.sleep',
+        side_effect=[None, KeyboardInterrupt],
+    ) as sleep, pytest.raises(KeyboardInterrupt):
+        call_command('prune_sessions', '--every', '60', stdout=StringIO())
+
+    assert sleep.call_count == 2
+    sleep.assert_called_with(60)
+
+
+@pytest.mark.parametrize(
+    argnames=('option', 'value', 'message'),
+    argvalues=[
+        ('--batch-size', '0', 'The batch size must be at least 1.'),
+        ('--batch-size', '-1', 'The batch size must be at least 1.'),
+        ('--every', '0', 'The interval must be at least 1 second.'),
+    ],
+)
+def test_prune_sessions_must_reject_values_below_one(
+    option: str, value: str, message: str
+) -> None:
+    with pytest.raises(CommandError, match=f'^{message}$'):
+        call_command('prune_sessions', option, value, stdout=StringIO())
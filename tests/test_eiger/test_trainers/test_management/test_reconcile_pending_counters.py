@@ -0,0 +1,48 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from model_bakery import baker
+
+from eiger.trainers.models import Exercise, PendingReviewCounter
+
+
+@pytest.mark.django_db()
+def test_reconcile_pending_counters_must_repair_drifted_counters(
+    trainer: User,
+) -> None:
+    baker.make(Exercise, created_by=trainer, _quantity=2)
+    baker.make(Exercise, _quantity=1)
+    PendingReviewCounter.objects.filter(user=trainer).update(
+        pending_exercises=7
+    )
+    stdout, stderr = StringIO(), StringIO()
+
+    call_command(
+        'reconcile_pending_counters',
+        '--batch-size',
+        '1',
+        stdout=stdout,
+        stderr=stderr,
+    )
+
+    assert (
+        PendingReviewCounter.objects.get(user=trainer).pending_exercises == 2
+    )
+    assert stderr.getvalue() == f'Counter of user {trainer.id} drifted.\n'
+    assert stdout.getvalue() == '2 counters checked, 1 repaired.\n'
+
+
+@pytest.mark.django_db()
+def test_reconcile_pending_counters_must_not_save_given_dry_run(
+    trainer: User,
+) -> None:
+    baker.make(Exercise, created_by=trainer)
+    PendingReviewCounter.objects.all().delete()
+    stdout = StringIO()
+
+    call_command('reconcile_pending_counters', '--dry-run', stdout=stdout)
+
+    assert not PendingReviewCounter.objects.exists()
+    assert stdout.getvalue() == '1 counters checked, 1 drifted.\n'
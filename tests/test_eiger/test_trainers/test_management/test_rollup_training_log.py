@@ -0,0 +1,57 @@
+from datetime import date, datetime, timezone as dt_timezone
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+from pytest_django.fixtures import SettingsWrapper
+
+from eiger.trainers.models import (
+    DailyTrainingRollup,
+    RollupWatermark,
+    TrainingLogEntry,
+)
+
+
+@pytest.fixture
+def entries(settings: SettingsWrapper) -> list[TrainingLogEntry]:
+    settings.TIME_ZONE = 'UTC'
+    return baker.make(
+        TrainingLogEntry,
+        performed_at=datetime(2021, 3, 15, 10, tzinfo=dt_timezone.utc),
+        repetitions=5,
+        _quantity=3,
+    )
+
+
+@pytest.mark.django_db()
+def test_rollup_training_log_must_fold_the_new_entries(
+    entries: list[TrainingLogEntry],
+) -> None:
+    stdout = StringIO()
+
+    call_command('rollup_training_log', '--batch-size', '2', stdout=stdout)
+    call_command('rollup_training_log', stdout=stdout)
+
+    assert (
+        stdout.getvalue()
+        == 'Folded 3 training log entries.\nFolded 0 training log entries.\n'
+    )
+    assert DailyTrainingRollup.objects.count() == 3
+    assert RollupWatermark.objects.get().last_entry_id == entries[-1].id
+
+
+@pytest.mark.django_db()
+def test_rollup_training_log_must_rebuild_the_rollups(
+    entries: list[TrainingLogEntry],
+) -> None:
+    call_command('rollup_training_log', stdout=StringIO())
+    DailyTrainingRollup.objects.update(sets=10)
+    stdout = StringIO()
+
+    call_command('rollup_training_log', '--rebuild', stdout=stdout)
+
+    assert stdout.getvalue() == 'Folded 3 training log entries.\n'
+    assert set(
+        DailyTrainingRollup.objects.values_list('period_start', 'sets')
+    ) == {(date(2021, 3, 15), 1)}
@@ -0,0 +1,172 @@
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from eiger.trainers.benchmarks import seed_benchmark_data
+
+
+@pytest.mark.django_db()
+def test_run_benchmark_command_must_fail_without_benchmark_data() -> None:
+    with pytest.raises(CommandError, match='seed_benchmark_data'):
+        call_command('run_benchmark', stdout=StringIO())
+
+
+@pytest.mark.django_db()
+def test_run_benchmark_command_must_save_the_report(tmp_path: Path) -> None:
+    seed_benchmark_data(users=2, exercises=10, variations=1)
+    output = tmp_path / 'report.json'
+    stdout = StringIO()
+
+    call_command(
+        'run_benchmark',
+        '--requests',
+        '30',
+        '--warmup',
+        '5',
+        '--output',
+        str(output),
+        stdout=stdout,
+    )
+
+    report = json.loads(output.read_text())
+    assert report['requests'] == 30
+    assert 'home: ' in stdout.getvalue()
+    assert stdout.getvalue().splitlines()[-1].startswith('RSS: ')
+
+
+@pytest.mark.django_db()
+def test_run_benchmark_command_must_fail_on_a_regression(
+    tmp_path: Path,
+) -> None:
+    seed_benchmark_data(users=2, exercises=10, variations=1)
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(
+        json.dumps(
+            {
+                'rss_kb': None,
+                'scenarios': {
+                    'home': {'p50': 0, 'p95': 0, 'p99': 0, 'max_queries': 0}
+                },
+            }
+        )
+    )
+    stdout = StringIO()
+
+    with pytest.raises(CommandError, match='metrics regressed'):
+        call_command(
+            'run_benchmark',
+            '--requests',
+            '30',
+            '--baseline',
+            str(baseline),
+            stdout=stdout,
+        )
+
+    assert 'home: max_queries went from 0 to' in stdout.getvalue()
+
+
+@pytest.mark.django_db()
+def test_run_benchmark_command_must_pass_given_its_own_baseline(
+    tmp_path: Path,
+) -> None:
+    seed_benchmark_data(users=2, exercises=10, variations=1)
+    baseline = tmp_path / 'baseline.json'
+    call_command(
+        'run_benchmark',
+        '--requests',
+        '20',
+        '--output',
+        str(baseline),
+        stdout=StringIO(),
+    )
+    stdout = StringIO()
+
+    call_command(
+        'run_benchmark',
+        '--requests',
+        '20',
+        '--baseline',
+        str(baseline),
+        '--tolerance',
+        '1000',
+        stdout=stdout,
+    )
+
+    assert (
+        stdout.getvalue().splitlines()[-1]
+        == 'No regression from the baseline.'
+    )
+
+
+@pytest.mark.django_db()
+def test_run_benchmark_command_must_compare_the_session_engines(
+    tmp_path: Path,
+) -> None:
+    seed_benchmark_data(users=2, exercises=10, variations=1)
+    baseline = tmp_path / 'baseline.json'
+    call_command(
+        'run_benchmark',
+        '--requests',
+        '20',
+        '--session-engine',
+        'db',
+        '--output',
+        str(baseline),
+        stdout=StringIO(),
+    )
+    stdout = StringIO()
+
+    call_command(
+        'run_benchmark',
+        '--requests',
+        '20',
+        '--warmup',
+        '20',
+        '--session-engine',
+        'cached_db',
+        '--baseline',
+        str(baseline),
+        '--tolerance',
+        '1000',
+        stdout=stdout,
+    )
+
+    changes = {
+        line.split(': ')[0]: line.split(': ')[1].split(' queries')[0]
+        for line in stdout.getvalue().splitlines()
+        if line.endswith('queries per request')
+    }
+    before, after = (float(value) for value in changes['home'].split(' -> '))
+    assert after < before
+    assert (
+        'Session engine: django.contrib.sessions.backends.cached_db'
+        in stdout.getvalue()
+    )
+    assert (
+        json.loads(baseline.read_text())['session_engine']
+        == 'django.contrib.sessions.backends.db'
+    )
+
+
+def test_run_benchmark_command_must_not_set_the_session_engine_of_a_server() -> (
+    None
+):
+    with pytest.raises(CommandError, match='SESSION_BACKEND'):
+        call_command(
+            'run_benchmark',
+            '--url',
+            'http://localhost:8000',
+            '--session-engine',
+            'db',
+            stdout=StringIO(),
+        )
+
+
+def test_run_benchmark_command_must_send_concurrently_only_to_a_server() -> (
+    None
+):
+    with pytest.raises(CommandError, match='--url'):
+        call_command('run_benchmark', '--concurrency', '4', stdout=StringIO())
@@ -0,0 +1,51 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+from eiger.trainers.models import Exercise, ReviewJob
+from eiger.trainers.reviews import enqueue_review_job
+
+
+@pytest.mark.django_db()
+def test_run_review_jobs_must_run_the_queued_jobs_given_once() -> None:
+    baker.make(Exercise, _quantity=3)
+    job = enqueue_review_job(Exercise.objects.all())
+    stdout = StringIO()
+
+    call_command(
+        'run_review_jobs', '--once', '--chunk-size', '2', stdout=stdout
+    )
+
+    assert stdout.getvalue() == f'{job} reviewed 3 of 3 entries.\n'
+    assert ReviewJob.objects.get().status == ReviewJob.Status.SUCCEEDED
+
+
+@pytest.mark.django_db()
+def test_run_review_jobs_must_report_the_failed_jobs() -> None:
+    baker.make(Exercise)
+    job = enqueue_review_job(Exercise.objects.all())
+    stderr = StringIO()
+
+    with mock.patch(
+        'eiger.trainers.reviews.refresh_pending_review_counters',
+        side_effect=RuntimeError('Counters unavailable'),
+    ):
+        call_command(
+            'run_review_jobs', '--once', stdout=StringIO(), stderr=stderr
+        )
+
+    assert stderr.getvalue() == f'{job} failed: Counters unavailable\n'
+
+
+@pytest.mark.django_db()
+def test_run_review_jobs_must_poll_the_empty_queue() -> None:
+    with mock.patch(
+        'eiger.trainers.management.commands.run_review_jobs.time.sleep',
+        side_effect=[None, KeyboardInterrupt],
+    ) as sleep, pytest.raises(KeyboardInterrupt):
+        call_command('run_review_jobs', '--poll-interval', '0.5')
+
+    sleep.assert_called_with(0.5)
@@ -0,0 +1,72 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from pytest_django.fixtures import SettingsWrapper
+
+from eiger.trainers.models import Task
+from eiger.trainers.tasks import TASKS, defer
+
+
+@pytest.fixture(autouse=True)
+def worker_settings(settings: SettingsWrapper) -> None:
+    settings.TASK_SCHEDULE = {}
+    settings.TASK_RETRY_BACKOFF = 60
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_worker_must_run_each_due_task_once_concurrently(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorded_task = mock.MagicMock()
+    monkeypatch.setitem(TASKS, 'record', recorded_task)
+    for index in range(10):
+        defer('record', index)
+    stdout = StringIO()
+
+    call_command('run_worker', '--once', '--concurrency', '3', stdout=stdout)
+
+    assert sorted(
+        call.args[0] for call in recorded_task.call_args_list
+    ) == list(range(10))
+    assert stdout.getvalue().count('succeeded.') == 10
+    assert set(Task.objects.values_list('status', flat=True)) == {
+        Task.Status.SUCCEEDED
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_worker_must_report_the_failed_tasks(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(
+        TASKS, 'record', mock.MagicMock(side_effect=RuntimeError('Broken'))
+    )
+    retried = defer('record', max_attempts=2)
+    failed = defer('record', max_attempts=1)
+    stderr = StringIO()
+
+    call_command('run_worker', '--once', stdout=StringIO(), stderr=stderr)
+
+    retried.refresh_from_db()  # type: ignore[union-attr]
+    assert stderr.getvalue() == (
+        f'{retried} failed, retrying at'
+        f' {retried.run_at.isoformat()}: Broken\n'  # type: ignore
+        f'{failed} failed: Broken\n'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_worker_must_queue_the_scheduled_tasks(
+    settings: SettingsWrapper,
+) -> None:
+    settings.TASK_SCHEDULE = {'reconcile_pending_counters': 60}
+    stdout = StringIO()
+
+    call_command('run_worker', '--once', stdout=stdout)
+
+    assert 'reconcile_pending_counters succeeded.' in stdout.getvalue()
+    assert Task.objects.filter(
+        name='reconcile_pending_counters', status=Task.Status.QUEUED
+    ).exists()
@@ -0,0 +1,47 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from eiger.trainers.models import Exercise, ExerciseVariation
+
+
+@pytest.mark.django_db()
+def test_seed_benchmark_data_command_must_seed_the_given_sizes() -> None:
+    stdout = StringIO()
+
+    call_command(
+        'seed_benchmark_data',
+        '--users',
+        '2',
+        '--exercises',
+        '5',
+        '--variations',
+        '3',
+        stdout=stdout,
+    )
+
+    assert stdout.getvalue().splitlines() == [
+        '2 users, 10 exercises and 30 variations seeded.'
+    ]
+    assert Exercise.objects.count() == 10
+    assert ExerciseVariation.objects.count() == 30
+
+
+@pytest.mark.django_db()
+def test_seed_benchmark_data_command_must_replace_previous_data_on_flush() -> (
+    None
+):
+    call_command('seed_benchmark_data', '--users', '2', stdout=StringIO())
+
+    call_command(
+        'seed_benchmark_data',
+        '--users',
+        '1',
+        '--exercises',
+        '4',
+        '--flush',
+        stdout=StringIO(),
+    )
+
+    assert Exercise.objects.count() == 4
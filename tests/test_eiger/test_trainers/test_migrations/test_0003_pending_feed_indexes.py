@@ -0,0 +1,41 @@
+from django_test_migrations.migrator import Migrator
+
+from eiger.trainers.apps import TrainersConfig
+from eiger.trainers.models import Exercise, ExerciseVariation
+
+
+def test_0003_pending_feed_indexes(migrator: Migrator) -> None:
+    app_name = TrainersConfig.app_name
+    old_state = migrator.apply_initial_migration(
+        (app_name, '0002_category_color')
+    )
+
+    assert not old_state.apps.get_model(
+        app_name, Exercise.__name__
+    )._meta.indexes
+    assert not old_state.apps.get_model(
+        app_name, ExerciseVariation.__name__
+    )._meta.indexes
+
+    new_state = migrator.apply_tested_migration(
+        (app_name, '0003_pending_feed_indexes')
+    )
+
+    exercise_indexes = new_state.apps.get_model(
+        app_name, Exercise.__name__
+    )._meta.indexes
+    variation_indexes = new_state.apps.get_model(
+        app_name, ExerciseVariation.__name__
+    )._meta.indexes
+    assert [index.name for index in exercise_indexes] == [
+        'exercise_pending_feed_idx'
+    ]
+    assert [index.name for index in variation_indexes] == [
+        'variation_pending_feed_idx'
+    ]
+    assert exercise_indexes[0].fields == [
+        'created_by',
+        'reviewed',
+        'created_at',
+        'id',
+    ]
@@ -0,0 +1,45 @@
+from django_test_migrations.migrator import Migrator
+
+from eiger.trainers.apps import TrainersConfig
+from eiger.trainers.models import Exercise
+
+
+def test_0004_exercise_search_vector(migrator: Migrator) -> None:
+    app_name = TrainersConfig.app_name
+    old_state = migrator.apply_initial_migration(
+        (app_name, '0003_pending_feed_indexes')
+    )
+    user = old_state.apps.get_model('auth', 'User').objects.create(
+        username='trainer'
+    )
+    category = old_state.apps.get_model(app_name, 'Category').objects.create(
+        name='Fingers', color='#FF5722'
+    )
+    exercise_type = old_state.apps.get_model(
+        app_name, 'ExerciseType'
+    ).objects.create(name='Hangboard', category=category)
+    exercise_id = (
+        old_state.apps.get_model(app_name, Exercise.__name__)
+        .objects.create(
+            name='Max hangs',
+            description='Heavy',
+            exercise_type=exercise_type,
+            created_by=user,
+        )
+        .id
+    )
+
+    new_state = migrator.apply_tested_migration(
+        (app_name, '0004_exercise_search_vector')
+    )
+
+    exercise_model = new_state.apps.get_model(app_name, Exercise.__name__)
+    assert [index.name for index in exercise_model._meta.indexes] == [
+        'exercise_pending_feed_idx',
+        'exercise_search_idx',
+        'exercise_name_trigram_idx',
+    ]
+    assert (
+        exercise_model.objects.get(id=exercise_id).search_vector
+        == "'hang':2A 'heavi':3B 'max':1A"
+    )
@@ -0,0 +1,28 @@
+import pytest
+from django.db import connection
+from django_test_migrations.migrator import Migrator
+
+from eiger.trainers.apps import TrainersConfig
+from eiger.trainers.models import PendingReviewCounter
+
+
+def test_0005_pendingreviewcounter(migrator: Migrator) -> None:
+    app_name = TrainersConfig.app_name
+    old_state = migrator.apply_initial_migration(
+        (app_name, '0004_exercise_search_vector')
+    )
+
+    with pytest.raises(LookupError):
+        old_state.apps.get_model(app_name, PendingReviewCounter.__name__)
+
+    new_state = migrator.apply_tested_migration(
+        (app_name, '0005_pendingreviewcounter')
+    )
+
+    counter_model = new_state.apps.get_model(
+        app_name, PendingReviewCounter.__name__
+    )
+    assert counter_model._meta.pk.name == 'user'
+    assert (
+        counter_model._meta.db_table in connection.introspection.table_names()
+    )
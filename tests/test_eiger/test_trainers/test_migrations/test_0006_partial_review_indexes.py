@@ -0,0 +1,43 @@
+from django.db.models import Q
+from django_test_migrations.migrator import Migrator
+
+from eiger.trainers.apps import TrainersConfig
+from eiger.trainers.models import Exercise, ExerciseVariation
+
+
+def test_0006_partial_review_indexes(migrator: Migrator) -> None:
+    app_name = TrainersConfig.app_name
+    migrator.apply_initial_migration((app_name, '0005_pendingreviewcounter'))
+
+    new_state = migrator.apply_tested_migration(
+        (app_name, '0006_partial_review_indexes')
+    )
+
+    exercise_indexes = {
+        index.name: index
+        for index in new_state.apps.get_model(
+            app_name, Exercise.__name__
+        )._meta.indexes
+    }
+    variation_indexes = {
+        index.name: index
+        for index in new_state.apps.get_model(
+            app_name, ExerciseVariation.__name__
+        )._meta.indexes
+    }
+    assert set(exercise_indexes) == {
+        'exercise_search_idx',
+        'exercise_name_trigram_idx',
+        'exercise_pending_idx',
+        'exercise_reviewed_idx',
+    }
+    assert set(variation_indexes) == {
+        'variation_pending_idx',
+        'variation_reviewed_idx',
+    }
+    pending_index = exercise_indexes['exercise_pending_idx']
+    assert pending_index.fields == ['created_by', 'created_at', 'id']
+    assert pending_index.condition == Q(reviewed=False)
+    assert variation_indexes['variation_reviewed_idx'].condition == Q(
+        reviewed=True
+    )
@@ -0,0 +1,21 @@
+import pytest
+from django.db import connection
+from django_test_migrations.migrator import Migrator
+
+from eiger.trainers.apps import TrainersConfig
+from eiger.trainers.models import ReviewJob
+
+
+def test_0007_reviewjob(migrator: Migrator) -> None:
+    app_name = TrainersConfig.app_name
+    old_state = migrator.apply_initial_migration(
+        (app_name, '0006_partial_review_indexes')
+    )
+
+    with pytest.raises(LookupError):
+        old_state.apps.get_model(app_name, ReviewJob.__name__)
+
+    new_state = migrator.apply_tested_migration((app_name, '0007_reviewjob'))
+
+    job_model = new_state.apps.get_model(app_name, ReviewJob.__name__)
+    assert job_model._meta.db_table in connection.introspection.table_names()
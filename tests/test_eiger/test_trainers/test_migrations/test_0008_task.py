@@ -0,0 +1,19 @@
+import pytest
+from django.db import connection
+from django_test_migrations.migrator import Migrator
+
+from eiger.trainers.apps import TrainersConfig
+from eiger.trainers.models import Task
+
+
+def test_0008_task(migrator: Migrator) -> None:
+    app_name = TrainersConfig.app_name
+    old_state = migrator.apply_initial_migration((app_name, '0007_reviewjob'))
+
+    with pytest.raises(LookupError):
+        old_state.apps.get_model(app_name, Task.__name__)
+
+    new_state = migrator.apply_tested_migration((app_name, '0008_task'))
+
+    task_model = new_state.apps.get_model(app_name, Task.__name__)
+    assert task_model._meta.db_table in connection.introspection.table_names()
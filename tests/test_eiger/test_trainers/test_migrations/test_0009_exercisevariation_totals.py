@@ -0,0 +1,45 @@
+from django_test_migrations.migrator import Migrator
+
+from eiger.trainers.apps import TrainersConfig
+from eiger.trainers.models import ExerciseVariation
+
+
+def test_0009_exercisevariation_totals(migrator: Migrator) -> None:
+    app_name = TrainersConfig.app_name
+    old_state = migrator.apply_initial_migration((app_name, '0008_task'))
+    user = old_state.apps.get_model('auth', 'User').objects.create(
+        username='trainer'
+    )
+    category = old_state.apps.get_model(app_name, 'Category').objects.create(
+        name='Fingers', color='#FF5722'
+    )
+    exercise_type = old_state.apps.get_model(
+        app_name, 'ExerciseType'
+    ).objects.create(name='Hangboard', category=category)
+    exercise = old_state.apps.get_model(app_name, 'Exercise').objects.create(
+        name='Max hangs', exercise_type=exercise_type, created_by=user
+    )
+    variation_id = (
+        old_state.apps.get_model(app_name, ExerciseVariation.__name__)
+        .objects.create(
+            exercise=exercise,
+            created_by=user,
+            sets=5,
+            repetitions=1,
+            seconds_per_repetition=10,
+            rest_per_set_in_seconds=180,
+            weight_in_kilos=20,
+        )
+        .id
+    )
+
+    new_state = migrator.apply_tested_migration(
+        (app_name, '0009_exercisevariation_totals')
+    )
+
+    variation_model = new_state.apps.get_model(
+        app_name, ExerciseVariation.__name__
+    )
+    variation = variation_model.objects.get(id=variation_id)
+    assert variation.total_duration_seconds == 5 * 10 + 4 * 180
+    assert variation.total_volume == 5 * 20
@@ -0,0 +1,40 @@
+import pytest
+from django.db import connection
+from django_test_migrations.migrator import Migrator
+
+from eiger.trainers.apps import TrainersConfig
+from eiger.trainers.models import TrainingLogEntry
+
+
+def test_0010_traininglogentry(migrator: Migrator) -> None:
+    app_name = TrainersConfig.app_name
+    old_state = migrator.apply_initial_migration(
+        (app_name, '0009_exercisevariation_totals')
+    )
+
+    with pytest.raises(LookupError):
+        old_state.apps.get_model(app_name, TrainingLogEntry.__name__)
+
+    new_state = migrator.apply_tested_migration(
+        (app_name, '0010_traininglogentry')
+    )
+
+    entry_model = new_state.apps.get_model(app_name, TrainingLogEntry.__name__)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT relkind FROM pg_class WHERE relname = %s',
+            [entry_model._meta.db_table],
+        )
+        assert cursor.fetchone() == ('p',)
+        cursor.execute(
+            'SELECT inhrelid::regclass::text FROM pg_inherits'
+            ' WHERE inhparent = %s::regclass',
+            [entry_model._meta.db_table],
+        )
+        assert cursor.fetchall() == [('trainers_traininglogentry_default',)]
+        indexes = connection.introspection.get_constraints(
+            cursor, entry_model._meta.db_table
+        )
+    assert {'traininglog_user_idx', 'traininglog_performed_brin'} <= set(
+        indexes
+    )
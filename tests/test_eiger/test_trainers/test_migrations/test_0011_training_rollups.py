@@ -0,0 +1,31 @@
+import pytest
+from django.db import connection
+from django_test_migrations.migrator import Migrator
+
+from eiger.trainers.apps import TrainersConfig
+from eiger.trainers.models import (
+    DailyTrainingRollup,
+    RollupWatermark,
+    WeeklyTrainingRollup,
+)
+
+
+def test_0011_training_rollups(migrator: Migrator) -> None:
+    app_name = TrainersConfig.app_name
+    models = (DailyTrainingRollup, WeeklyTrainingRollup, RollupWatermark)
+    old_state = migrator.apply_initial_migration(
+        (app_name, '0010_traininglogentry')
+    )
+
+    for model in models:
+        with pytest.raises(LookupError):
+            old_state.apps.get_model(app_name, model.__name__)
+
+    new_state = migrator.apply_tested_migration(
+        (app_name, '0011_training_rollups')
+    )
+
+    table_names = connection.introspection.table_names()
+    for model in models:
+        new_model = new_state.apps.get_model(app_name, model.__name__)
+        assert new_model._meta.db_table in table_names
@@ -71,6 +71,76 @@ def test_exercise_variation_unique_constraint() -> None:
         )
 
 
+@pytest.mark.django_db()
+@pytest.mark.parametrize(
+    ('fields', 'total_duration_seconds', 'total_volume'),
+    [
+        (
+            {
+                'sets': 3,
+                'repetitions': 6,
+                'seconds_per_repetition': 7,
+                'rest_per_repetition_in_seconds': 3,
+                'rest_per_set_in_seconds': 180,
+                'weight_in_kilos': 20,
+            },
+            3 * (6 * 7 + 5 * 3) + 2 * 180,
+            3 * 6 * 20,
+        ),
+        ({'seconds_per_repetition': 30, 'weight_in_kilos': 5}, 30, 5),
+        ({'sets': 5, 'repetitions': 10}, 0, None),
+        (
+            {
+                'sets': 32767,
+                'repetitions': 32767,
+                'seconds_per_repetition': 32767,
+                'weight_in_kilos': 32767,
+            },
+            32767**3,
+            32767**3,
+        ),
+    ],
+)
+def test_exercise_variation_totals_must_be_computed_by_the_database(
+    fields: dict[str, int],
+    total_duration_seconds: int,
+    total_volume: int | None,
+) -> None:
+    """
+    Test the totals maintained by the database trigger.
+    """
+    variation = baker.make(ExerciseVariation, **fields)
+    variation.refresh_from_db()
+
+    assert variation.total_duration_seconds == total_duration_seconds
+    assert variation.total_volume == total_volume
+
+
+@pytest.mark.django_db()
+def test_exercise_variation_totals_must_follow_the_updates() -> None:
+    """
+    Test the totals are recomputed whatever the way the row is written.
+    """
+    variation = baker.make(
+        ExerciseVariation, sets=2, seconds_per_repetition=10
+    )
+
+    variation.sets = 3
+    variation.save()
+    ExerciseVariation.objects.filter(id=variation.id).update(reviewed=True)
+    ExerciseVariation.objects.bulk_update([variation], ['sets'])
+
+    assert ExerciseVariation.objects.values_list(
+        'total_duration_seconds', 'total_volume'
+    ).get() == (30, None)
+
+    ExerciseVariation.objects.update(weight_in_kilos=4)
+
+    assert ExerciseVariation.objects.values_list(
+        'total_duration_seconds', 'total_volume'
+    ).get() == (30, 12)
+
+
 class TestExerciseVariation(django.TestCase):
     @given(
         sets=positive_small_integer_nullable_strategy,
@@ -0,0 +1,138 @@
+import json
+from datetime import datetime, timezone
+from typing import Iterator, Mapping
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.exceptions import BadRequest
+from django.db import connection
+from model_bakery import baker
+
+from eiger.trainers.models import Exercise
+from eiger.trainers.pagination import (
+    Cursor,
+    keyset_queryset,
+    paginate_by_keyset,
+    paginate_union_by_keyset,
+)
+
+
+def get_index_conditions(plan: Mapping[str, object]) -> Iterator[str]:
+    if 'Index Cond' in plan:
+        yield str(plan['Index Cond'])
+    for child in plan.get('Plans', ()):  # type: ignore[attr-defined]
+        yield from get_index_conditions(child)
+
+
+def test_cursor_must_round_trip_through_its_token() -> None:
+    cursor = Cursor(
+        created_at=datetime(2023, 7, 2, 15, 52, tzinfo=timezone.utc), id=42
+    )
+
+    assert Cursor.decode(cursor.encode()) == cursor
+
+
+@pytest.mark.parametrize(
+    argnames='token',
+    argvalues=['not-base64!', 'bm8tc2VwYXJhdG9y', 'MjAyMy0wNy0wMnxhYmM='],
+)
+def test_cursor_must_raise_bad_request_given_invalid_token(
+    token: str,
+) -> None:
+    with pytest.raises(BadRequest, match='Invalid pagination cursor.'):
+        Cursor.decode(token)
+
+
+@pytest.mark.django_db()
+def test_must_walk_through_every_row_once_ordered_by_creation() -> None:
+    exercises = baker.make(Exercise, _quantity=5)
+
+    first_page = paginate_by_keyset(
+        queryset=Exercise.objects.all(), cursor=None, page_size=2
+    )
+    second_page = paginate_by_keyset(
+        queryset=Exercise.objects.all(),
+        cursor=first_page.next_cursor,
+        page_size=2,
+    )
+    last_page = paginate_by_keyset(
+        queryset=Exercise.objects.all(),
+        cursor=second_page.next_cursor,
+        page_size=2,
+    )
+
+    assert first_page.items == exercises[:2]
+    assert second_page.items == exercises[2:4]
+    assert last_page.items == exercises[4:]
+    assert first_page.has_next
+    assert second_page.has_next
+    assert not last_page.has_next
+
+
+@pytest.mark.django_db()
+def test_must_break_created_at_ties_by_id() -> None:
+    exercises = baker.make(Exercise, _quantity=3)
+    Exercise.objects.update(created_at=exercises[0].created_at)
+
+    first_page = paginate_by_keyset(
+        queryset=Exercise.objects.all(), cursor=None, page_size=1
+    )
+    remaining_page = paginate_by_keyset(
+        queryset=Exercise.objects.all(),
+        cursor=first_page.next_cursor,
+        page_size=2,
+    )
+
+    assert first_page.items == exercises[:1]
+    assert remaining_page.items == exercises[1:]
+    assert remaining_page.next_cursor is None
+
+
+@pytest.mark.django_db()
+def test_must_merge_the_pages_of_disjoint_querysets() -> None:
+    exercises = baker.make(
+        Exercise, reviewed=iter([True, False, True, False, True]), _quantity=5
+    )
+    querysets = [
+        Exercise.objects.filter(reviewed=True).values('id', 'created_at'),
+        Exercise.objects.filter(reviewed=False).values('id', 'created_at'),
+    ]
+
+    first_page = paginate_union_by_keyset(
+        querysets=querysets, cursor=None, page_size=3
+    )
+    last_page = paginate_union_by_keyset(
+        querysets=querysets, cursor=first_page.next_cursor, page_size=3
+    )
+
+    assert [row['id'] for row in first_page.items] == [
+        exercise.id for exercise in exercises[:3]
+    ]
+    assert [row['id'] for row in last_page.items] == [
+        exercise.id for exercise in exercises[3:]
+    ]
+    assert not last_page.has_next
+
+
+@pytest.mark.django_db()
+def test_next_page_must_start_from_the_cursor_in_the_index(
+    trainer: User,
+) -> None:
+    exercises = baker.make(
+        Exercise, created_by=trainer, reviewed=False, _quantity=3
+    )
+    cursor = Cursor.from_row(exercises[0]).encode()
+    with connection.cursor() as db_cursor:
+        db_cursor.execute('SET LOCAL enable_seqscan = off')
+
+    plan = json.loads(
+        keyset_queryset(
+            Exercise.objects.filter(created_by=trainer, reviewed=False),
+            cursor,
+            page_size=2,
+        ).explain(format='json')
+    )[0]['Plan']
+
+    assert any(
+        'created_at' in condition for condition in get_index_conditions(plan)
+    )
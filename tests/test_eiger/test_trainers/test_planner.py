@@ -0,0 +1,239 @@
+import pytest
+from model_bakery import baker
+from pytest_django.fixtures import SettingsWrapper
+
+from eiger.trainers.models import (
+    Category,
+    Exercise,
+    ExerciseType,
+    ExerciseVariation,
+)
+from eiger.trainers.planner import (
+    PlannedVariation,
+    PlannerError,
+    PlanningCatalogue,
+    plan_session,
+    planning_catalogue_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_planning_catalogue_cache() -> None:
+    planning_catalogue_cache.invalidate()
+
+
+@pytest.fixture
+def catalogue() -> PlanningCatalogue:
+    # Rows of (variation_id, exercise_id, category_id, duration):
+    return PlanningCatalogue.from_rows(
+        [
+            (1, 10, 1, 600),
+            (2, 10, 1, 400),
+            (3, 11, 1, 300),
+            (4, 12, 1, 120),
+            (5, 20, 2, 900),
+            (6, 21, 2, 200),
+            (7, 22, 2, 0),
+        ]
+    )
+
+
+@pytest.mark.django_db()
+def test_planning_catalogue_must_hold_the_reviewed_variations() -> None:
+    categories = baker.make(Category, _quantity=2)
+    exercises = [
+        baker.make(
+            Exercise,
+            exercise_type=baker.make(ExerciseType, category=category),
+            reviewed=True,
+        )
+        for category in categories
+    ]
+    long, short = (
+        baker.make(
+            ExerciseVariation,
+            exercise=exercises[0],
+            seconds_per_repetition=seconds,
+            reviewed=True,
+        )
+        for seconds in (60, 30)
+    )
+    other = baker.make(
+        ExerciseVariation,
+        exercise=exercises[1],
+        seconds_per_repetition=10,
+        reviewed=True,
+    )
+    baker.make(
+        ExerciseVariation,
+        exercise=exercises[1],
+        seconds_per_repetition=20,
+        reviewed=False,
+    )
+    baker.make(ExerciseVariation, exercise=exercises[1], reviewed=True)
+    baker.make(
+        ExerciseVariation,
+        exercise=baker.make(
+            Exercise, exercise_type=exercises[0].exercise_type, reviewed=False
+        ),
+        seconds_per_repetition=40,
+        reviewed=True,
+    )
+
+    catalogue = PlanningCatalogue.from_database()
+
+    first, second = (
+        catalogue.categories[category.id] for category in categories
+    )
+    assert list(first.durations) == [30, 60]
+    assert list(first.variation_ids) == [short.id, long.id]
+    assert list(first.exercise_ids) == [exercises[0].id] * 2
+    assert list(second.variation_ids) == [other.id]
+
+
+def test_planning_catalogue_must_sort_the_variations_by_duration(
+    catalogue: PlanningCatalogue,
+) -> None:
+    assert set(catalogue.categories) == {1, 2}
+    assert list(catalogue.categories[1].durations) == [120, 300, 400, 600]
+    assert list(catalogue.categories[1].variation_ids) == [4, 3, 2, 1]
+    assert list(catalogue.categories[2].durations) == [200, 900]
+
+
+def test_plan_session_must_fill_each_share_with_the_longest_variations(
+    catalogue: PlanningCatalogue,
+) -> None:
+    plan = plan_session(1400, {1: 1, 2: 1}, catalogue=catalogue)
+
+    # The first category leaves 100 of its 700 seconds to the second one,
+    # which still can't fit its 900 seconds variation:
+    assert plan.variations == (
+        PlannedVariation(1, 10, 1, 600),
+        PlannedVariation(6, 21, 2, 200),
+    )
+    assert plan.total_seconds == 800
+    assert plan.budget_seconds == 1400
+
+
+def test_plan_session_must_use_every_exercise_once(
+    catalogue: PlanningCatalogue,
+) -> None:
+    plan = plan_session(1500, {1: 1}, catalogue=catalogue)
+
+    assert [variation.variation_id for variation in plan.variations] == [
+        1,
+        3,
+        4,
+    ]
+    assert plan.total_seconds == 1020
+
+
+def test_plan_session_must_count_the_rests_between_variations(
+    catalogue: PlanningCatalogue,
+) -> None:
+    plan = plan_session(
+        1000, {1: 1}, rest_between_seconds=100, catalogue=catalogue
+    )
+
+    assert [variation.variation_id for variation in plan.variations] == [
+        1,
+        3,
+    ]
+    assert plan.total_seconds == 1000
+
+
+def test_plan_session_must_skip_the_categories_without_variations(
+    catalogue: PlanningCatalogue,
+) -> None:
+    plan = plan_session(100, {3: 1, 1: 1}, catalogue=catalogue)
+
+    assert plan.variations == ()
+    assert plan.total_seconds == 0
+
+
+def test_plan_session_must_plan_only_the_variations_within_the_range(
+    catalogue: PlanningCatalogue,
+) -> None:
+    plan = plan_session(
+        1500,
+        {1: 1},
+        min_variation_seconds=150,
+        max_variation_seconds=450,
+        catalogue=catalogue,
+    )
+
+    assert [variation.variation_id for variation in plan.variations] == [
+        2,
+        3,
+    ]
+
+
+@pytest.mark.parametrize(
+    ('budget_seconds', 'mix', 'rest_between_seconds', 'message'),
+    [
+        (0, {1: 1}, 0, 'budget'),
+        (600, {1: 1}, -1, 'rest'),
+        (600, {}, 0, 'mix'),
+        (600, {1: 0}, 0, 'mix'),
+        (600, {1: 2, 2: -1}, 0, 'mix'),
+    ],
+)
+def test_plan_session_must_reject_invalid_options(
+    catalogue: PlanningCatalogue,
+    budget_seconds: int,
+    mix: dict[int, float],
+    rest_between_seconds: int,
+    message: str,
+) -> None:
+    with pytest.raises(PlannerError, match=message):
+        plan_session(
+            budget_seconds,
+            mix,
+            rest_between_seconds=rest_between_seconds,
+            catalogue=catalogue,
+        )
+
+
+def test_plan_session_must_plan_over_a_large_catalogue() -> None:
+    catalogue = PlanningCatalogue.from_rows(
+        (index, index // 2, index % 4, 30 + index % 900)
+        for index in range(200_000)
+    )
+
+    plan = plan_session(
+        3600, {0: 2, 1: 1, 3: 1}, rest_between_seconds=60, catalogue=catalogue
+    )
+
+    assert plan.total_seconds == 3600
+    assert {variation.category_id for variation in plan.variations} == {
+        0,
+        1,
+        3,
+    }
+    assert len({variation.exercise_id for variation in plan.variations}) == (
+        len(plan.variations)
+    )
+
+
+@pytest.mark.django_db()
+def test_plan_session_must_reuse_the_catalogue_of_the_process(
+    settings: SettingsWrapper, django_assert_num_queries
+) -> None:
+    variation = baker.make(
+        ExerciseVariation,
+        exercise__reviewed=True,
+        seconds_per_repetition=60,
+        reviewed=True,
+    )
+    category_id = variation.exercise.exercise_type.category_id
+
+    with django_assert_num_queries(1):
+        plan_session(60, {category_id: 1})
+        plan = plan_session(60, {category_id: 1})
+
+    assert plan.variations[0].variation_id == variation.id
+
+    settings.PLANNER_CATALOGUE_MAX_AGE = 0
+
+    with django_assert_num_queries(1):
+        plan_session(60, {category_id: 1})
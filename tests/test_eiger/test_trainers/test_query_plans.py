@@ -0,0 +1,78 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+
+from eiger.trainers.query_plans import (
+    check_query_plans,
+    find_seq_scans,
+    find_unbounded_scans,
+    seed_catalogue,
+)
+
+
+def test_find_seq_scans_must_only_report_large_tables() -> None:
+    plan = {
+        'Node Type': 'Hash Join',
+        'Plans': [
+            {'Node Type': 'Seq Scan', 'Relation Name': 'trainers_exercise'},
+            {
+                'Node Type': 'Hash',
+                'Plans': [
+                    {
+                        'Node Type': 'Seq Scan',
+                        'Relation Name': 'trainers_exercisetype',
+                    }
+                ],
+            },
+        ],
+    }
+
+    assert list(find_seq_scans(plan)) == ['trainers_exercise']
+
+
+def test_find_unbounded_scans_must_report_cursors_left_to_filters() -> None:
+    plan = {
+        'Node Type': 'Append',
+        'Plans': [
+            {
+                'Node Type': 'Index Scan',
+                'Index Name': 'exercise_pending_idx',
+                'Index Cond': '(created_by_id = 1)',
+                'Filter': "((created_at > '2021-03-14') OR (id > 1))",
+            },
+            {
+                'Node Type': 'Bitmap Heap Scan',
+                'Plans': [
+                    {
+                        'Node Type': 'Bitmap Index Scan',
+                        'Index Name': 'variation_pending_idx',
+                        'Index Cond': (
+                            '((created_by_id = 1) AND (created_at >='
+                            " '2021-03-14'))"
+                        ),
+                    }
+                ],
+            },
+            {
+                'Node Type': 'Index Scan',
+                'Index Name': 'trainers_exercise_pkey',
+                'Index Cond': '(id = trainers_exercisevariation.exercise_id)',
+            },
+        ],
+    }
+
+    assert list(find_unbounded_scans(plan)) == ['exercise_pending_idx']
+
+
+@pytest.mark.django_db()
+def test_every_view_query_must_be_served_by_an_index(
+    trainer: User,
+) -> None:
+    seed_catalogue(trainer, 200)
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')
+
+    checks = check_query_plans(trainer)
+
+    assert [check.name for check in checks if not check.passed] == []
+    assert len(checks) == 7
@@ -0,0 +1,179 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+from model_bakery import baker
+
+from eiger.trainers.models import (
+    Exercise,
+    ExerciseVariation,
+    PendingReviewCounter,
+    ReviewJob,
+    Task,
+)
+from eiger.trainers.reviews import (
+    claim_review_job,
+    enqueue_review_job,
+    run_next_review_job,
+    run_review_job,
+)
+from eiger.trainers.tasks import run_next_task
+
+
+@pytest.mark.django_db()
+def test_enqueue_review_job_must_queue_only_the_pending_entries(
+    trainer: User,
+) -> None:
+    pending = baker.make(Exercise, _quantity=3)
+    baker.make(Exercise, reviewed=True)
+
+    job = enqueue_review_job(Exercise.objects.all(), requested_by=trainer)
+
+    assert job is not None
+    assert job.status == ReviewJob.Status.QUEUED
+    assert job.target == ReviewJob.Target.EXERCISE
+    assert job.entry_ids == sorted(exercise.id for exercise in pending)
+    assert job.total == 3
+    assert job.requested_by == trainer
+    assert Exercise.objects.filter(reviewed=False).count() == 3
+
+
+@pytest.mark.django_db()
+def test_enqueue_review_job_must_not_queue_reviewed_selections() -> None:
+    baker.make(Exercise, reviewed=True)
+
+    assert enqueue_review_job(Exercise.objects.all()) is None
+    assert not ReviewJob.objects.exists()
+
+
+@pytest.mark.django_db()
+def test_enqueue_review_job_must_run_small_selections_inline() -> None:
+    baker.make(ExerciseVariation, _quantity=2)
+
+    job = enqueue_review_job(ExerciseVariation.objects.all(), inline_limit=2)
+
+    assert job is not None
+    assert job.status == ReviewJob.Status.SUCCEEDED
+    assert job.reviewed == 2
+    assert not ExerciseVariation.objects.filter(reviewed=False).exists()
+
+
+@pytest.mark.django_db()
+def test_run_review_job_must_review_in_chunks_and_record_progress(
+    trainer: User, django_assert_num_queries
+) -> None:
+    baker.make(Exercise, created_by=trainer, _quantity=5)
+    job = enqueue_review_job(Exercise.objects.all())
+    job = claim_review_job()
+
+    with mock.patch(
+        'eiger.trainers.reviews.refresh_pending_review_counters'
+    ) as refresh:
+        run_review_job(job, chunk_size=2)  # type: ignore[arg-type]
+
+    assert refresh.call_count == 3
+    job = ReviewJob.objects.get()
+    assert job.status == ReviewJob.Status.SUCCEEDED
+    assert (job.processed, job.reviewed, job.progress) == (5, 5, 1.0)
+    assert job.last_entry_id == job.entry_ids[-1]
+    assert job.started_at <= job.finished_at  # type: ignore[operator]
+    assert not Exercise.objects.filter(reviewed=False).exists()
+
+
+@pytest.mark.django_db()
+def test_run_review_job_must_refresh_the_pending_review_counters(
+    trainer: User,
+) -> None:
+    baker.make(Exercise, created_by=trainer, _quantity=2)
+
+    enqueue_review_job(Exercise.objects.all())
+    run_next_review_job()
+
+    counter = PendingReviewCounter.objects.get(user=trainer)
+    assert counter.pending_exercises == 0
+
+
+@pytest.mark.django_db()
+def test_run_review_job_must_resume_after_the_last_chunk() -> None:
+    exercises = baker.make(Exercise, _quantity=3)
+    job = enqueue_review_job(Exercise.objects.all())
+    ReviewJob.objects.filter(pk=job.pk).update(  # type: ignore[union-attr]
+        last_entry_id=exercises[0].id, processed=1
+    )
+
+    run_next_review_job()
+
+    job = ReviewJob.objects.get()
+    assert (job.processed, job.reviewed) == (3, 2)
+    assert not Exercise.objects.get(id=exercises[0].id).reviewed
+
+
+@pytest.mark.django_db()
+def test_run_review_job_must_record_the_failure() -> None:
+    baker.make(Exercise)
+    enqueue_review_job(Exercise.objects.all())
+
+    with mock.patch(
+        'eiger.trainers.reviews.refresh_pending_review_counters',
+        side_effect=RuntimeError('Counters unavailable'),
+    ):
+        job = run_next_review_job()
+
+    assert job is not None
+    assert job.status == ReviewJob.Status.FAILED
+    assert job.error == 'Counters unavailable'
+    assert Exercise.objects.filter(reviewed=False).exists()
+
+
+@pytest.mark.django_db()
+def test_claim_review_job_must_claim_the_oldest_unfinished_job() -> None:
+    baker.make(Exercise, _quantity=2)
+    first = enqueue_review_job(Exercise.objects.all())
+    enqueue_review_job(Exercise.objects.all())
+
+    claimed = claim_review_job()
+
+    assert claimed == first
+    assert claimed.status == ReviewJob.Status.RUNNING  # type: ignore[union-attr]
+    assert claim_review_job() != first
+
+
+@pytest.mark.django_db()
+def test_claim_review_job_must_claim_again_only_the_stale_running_jobs() -> (
+    None
+):
+    baker.make(Exercise)
+    job = enqueue_review_job(Exercise.objects.all())
+    claim_review_job()
+
+    assert claim_review_job() is None
+
+    ReviewJob.objects.filter(pk=job.pk).update(  # type: ignore[union-attr]
+        updated_at=timezone.now() - timedelta(hours=1)
+    )
+
+    assert claim_review_job() == job
+
+
+@pytest.mark.django_db()
+def test_enqueue_review_job_must_defer_the_review_task_once() -> None:
+    baker.make(Exercise, _quantity=2)
+
+    enqueue_review_job(Exercise.objects.filter(id__gt=0))
+    enqueue_review_job(Exercise.objects.all())
+
+    task = Task.objects.get()
+    assert (task.name, task.unique_key) == (
+        'run_review_jobs',
+        'run_review_jobs',
+    )
+
+    run_next_task()
+
+    assert (
+        ReviewJob.objects.filter(status=ReviewJob.Status.SUCCEEDED).count()
+        == 2
+    )
+    assert not Exercise.objects.filter(reviewed=False).exists()
@@ -0,0 +1,255 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+import pytest
+from django.contrib.auth.models import User
+from model_bakery import baker
+from pytest_django.fixtures import SettingsWrapper
+
+from eiger.trainers.models import (
+    Category,
+    DailyTrainingRollup,
+    RollupWatermark,
+    Task,
+    TrainingLogEntry,
+    WeeklyTrainingRollup,
+)
+from eiger.trainers.rollups import (
+    WATERMARK_NAME,
+    fold_training_log,
+    get_committed_entry_id,
+    get_progress,
+    get_week_start,
+    rebuild_training_rollups,
+)
+from eiger.trainers.training_log import log_session
+from tests.test_eiger.conftest import make_set, make_variation
+
+ROLLUP_VALUES = (
+    'user',
+    'category',
+    'period_start',
+    'sets',
+    'repetitions',
+    'volume',
+    'time_under_tension_seconds',
+)
+
+
+@pytest.fixture(autouse=True)
+def utc(settings: SettingsWrapper) -> None:
+    settings.TIME_ZONE = 'UTC'
+
+
+@pytest.fixture
+def trainer() -> User:
+    return baker.make(User)
+
+
+@pytest.fixture
+def category() -> Category:
+    return baker.make(Category)
+
+
+def get_rollups(model: type) -> list[tuple]:
+    return list(
+        model.objects.order_by('user', 'period_start', 'category').values_list(
+            *ROLLUP_VALUES
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    ('day', 'week_start'),
+    [
+        (date(2021, 3, 15), date(2021, 3, 15)),
+        (date(2021, 3, 21), date(2021, 3, 15)),
+        (date(2021, 3, 1), date(2021, 3, 1)),
+        (date(2021, 1, 1), date(2020, 12, 28)),
+    ],
+)
+def test_get_week_start_must_return_the_monday(
+    day: date, week_start: date
+) -> None:
+    assert get_week_start(day) == week_start
+
+
+@pytest.mark.django_db()
+def test_fold_training_log_must_total_the_sets_by_day_and_week(
+    trainer: User, category: Category
+) -> None:
+    hangboard = make_variation(category, seconds_per_repetition=10)
+    other_category = baker.make(Category)
+    campus = make_variation(other_category, seconds_per_repetition=None)
+    log_session(
+        trainer,
+        [
+            make_set(
+                hangboard,
+                '2021-03-15T10:00:00Z',
+                repetitions=6,
+                weight_in_kilos=20,
+            ),
+            make_set(
+                hangboard,
+                '2021-03-15T10:05:00Z',
+                repetitions=5,
+                duration_seconds=40,
+            ),
+            make_set(campus, '2021-03-15T10:10:00Z', repetitions=3),
+            make_set(
+                hangboard,
+                '2021-03-17T23:59:59Z',
+                repetitions=2,
+                weight_in_kilos=30,
+            ),
+            make_set(hangboard, '2021-03-22T00:00:00Z', repetitions=1),
+        ],
+    )
+
+    folded = fold_training_log()
+
+    assert folded == 5
+    assert get_rollups(DailyTrainingRollup) == [
+        (trainer.id, category.id, date(2021, 3, 15), 2, 11, 120, 100),
+        (trainer.id, other_category.id, date(2021, 3, 15), 1, 3, 0, 0),
+        (trainer.id, category.id, date(2021, 3, 17), 1, 2, 60, 20),
+        (trainer.id, category.id, date(2021, 3, 22), 1, 1, 0, 10),
+    ]
+    assert get_rollups(WeeklyTrainingRollup) == [
+        (trainer.id, category.id, date(2021, 3, 15), 3, 13, 180, 120),
+        (trainer.id, other_category.id, date(2021, 3, 15), 1, 3, 0, 0),
+        (trainer.id, category.id, date(2021, 3, 22), 1, 1, 0, 10),
+    ]
+    assert RollupWatermark.objects.get(name=WATERMARK_NAME).last_entry_id == (
+        TrainingLogEntry.objects.latest('id').id
+    )
+
+
+@pytest.mark.django_db()
+def test_fold_training_log_must_use_the_local_days(
+    trainer: User, category: Category, settings: SettingsWrapper
+) -> None:
+    settings.TIME_ZONE = 'Europe/Paris'
+    variation = make_variation(category)
+    log_session(trainer, [make_set(variation, '2021-03-14T23:30:00Z')])
+
+    fold_training_log()
+
+    assert DailyTrainingRollup.objects.get().period_start == date(2021, 3, 15)
+
+
+@pytest.mark.django_db()
+def test_fold_training_log_must_be_idempotent(
+    trainer: User, category: Category
+) -> None:
+    variation = make_variation(category)
+    log_session(
+        trainer,
+        [
+            make_set(variation, '2021-03-15T10:00:00Z', repetitions=6),
+            make_set(variation, '2021-03-16T10:00:00Z', repetitions=4),
+        ],
+    )
+    fold_training_log(batch_size=1)
+    log_session(
+        trainer, [make_set(variation, '2021-03-15T18:00:00Z', repetitions=5)]
+    )
+
+    assert fold_training_log() == 1
+    assert fold_training_log() == 0
+
+    daily = get_rollups(DailyTrainingRollup)
+    weekly = get_rollups(WeeklyTrainingRollup)
+    assert [row[3:5] for row in daily] == [(2, 11), (1, 4)]
+    assert [row[3:5] for row in weekly] == [(3, 15)]
+
+    RollupWatermark.objects.update(last_entry_id=0)
+    assert fold_training_log(batch_size=2) == 3
+
+    assert get_rollups(DailyTrainingRollup) == daily
+    assert get_rollups(WeeklyTrainingRollup) == weekly
+
+
+@pytest.mark.django_db()
+def test_rebuild_training_rollups_must_fold_the_whole_log_again(
+    trainer: User, category: Category
+) -> None:
+    variation = make_variation(category)
+    log_session(
+        trainer, [make_set(variation, '2021-03-15T10:00:00Z', repetitions=6)]
+    )
+    fold_training_log()
+    DailyTrainingRollup.objects.update(repetitions=1)
+    baker.make(
+        WeeklyTrainingRollup, user=trainer, period_start=date(2020, 1, 6)
+    )
+
+    assert rebuild_training_rollups() == 1
+
+    assert [row[2:5] for row in get_rollups(DailyTrainingRollup)] == [
+        (date(2021, 3, 15), 1, 6)
+    ]
+    assert [row[2:5] for row in get_rollups(WeeklyTrainingRollup)] == [
+        (date(2021, 3, 15), 1, 6)
+    ]
+
+
+@pytest.mark.django_db()
+def test_log_session_must_defer_a_single_fold(
+    trainer: User, category: Category
+) -> None:
+    variation = make_variation(category)
+
+    for _ in range(2):
+        log_session(trainer, [make_set(variation, '2021-03-15T10:00:00Z')])
+
+    assert list(Task.objects.values_list('name', 'unique_key')) == [
+        (fold_training_log.__name__, fold_training_log.__name__)
+    ]
+
+
+@pytest.mark.django_db()
+def test_get_committed_entry_id_must_return_the_last_entry_id() -> None:
+    assert get_committed_entry_id() == 0
+
+    entries = baker.make(
+        TrainingLogEntry,
+        performed_at=datetime(2021, 3, 15, tzinfo=dt_timezone.utc),
+        _quantity=2,
+    )
+
+    assert get_committed_entry_id() == entries[-1].id
+
+
+@pytest.mark.django_db()
+def test_get_progress_must_return_the_rollups_of_the_range(
+    trainer: User, category: Category
+) -> None:
+    for period_start in (
+        date(2021, 3, 1),
+        date(2021, 3, 8),
+        date(2021, 3, 15),
+    ):
+        baker.make(
+            WeeklyTrainingRollup,
+            user=trainer,
+            category=category,
+            period_start=period_start,
+            sets=period_start.day,
+        )
+    baker.make(WeeklyTrainingRollup, period_start=date(2021, 3, 8))
+
+    progress = get_progress(
+        trainer, 'week', since=date(2021, 3, 8), until=date(2021, 3, 15)
+    )
+
+    assert progress == [
+        {
+            'period_start': date(2021, 3, 8),
+            'category': category.id,
+            'sets': 8,
+            'repetitions': 0,
+            'volume': 0,
+            'time_under_tension_seconds': 0,
+        }
+    ]
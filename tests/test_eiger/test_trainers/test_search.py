@@ -0,0 +1,103 @@
+import pytest
+from model_bakery import baker
+
+from eiger.trainers.models import Exercise
+from eiger.trainers.search import SEARCH_RANK_FIELD, search_exercises
+
+
+@pytest.fixture()
+def exercises() -> dict[str, Exercise]:
+    return {
+        exercise.name: exercise
+        for exercise in [
+            baker.make(
+                Exercise,
+                name='Hangboard repeaters',
+                description='Seven seconds on, three off.',
+            ),
+            baker.make(
+                Exercise,
+                name='Max hangs',
+                description='Short hangs on the hangboard.',
+            ),
+            baker.make(Exercise, name='Campus ladders', description='Power.'),
+        ]
+    }
+
+
+@pytest.mark.django_db()
+def test_search_vector_must_be_maintained_by_the_database() -> None:
+    Exercise.objects.bulk_create(
+        [baker.prepare(Exercise, name='Lock offs', _save_related=True)]
+    )
+    exercise = Exercise.objects.get()
+    assert exercise.search_vector == "'lock':1A 'off':2A"
+
+    Exercise.objects.filter(id=exercise.id).update(description='Pulling')
+    exercise.refresh_from_db()
+    assert exercise.search_vector == "'lock':1A 'off':2A 'pull':3B"
+
+
+@pytest.mark.django_db()
+def test_must_rank_name_matches_above_description_matches(
+    exercises: dict[str, Exercise],
+) -> None:
+    results = search_exercises(Exercise.objects.all(), 'hangboard')
+
+    assert [exercise.name for exercise in results] == [
+        'Hangboard repeaters',
+        'Max hangs',
+    ]
+    assert getattr(results[0], SEARCH_RANK_FIELD) > getattr(
+        results[1], SEARCH_RANK_FIELD
+    )
+
+
+@pytest.mark.django_db()
+def test_must_support_the_web_search_syntax(
+    exercises: dict[str, Exercise],
+) -> None:
+    results = search_exercises(Exercise.objects.all(), 'hangboard -repeaters')
+
+    assert [exercise.name for exercise in results] == ['Max hangs']
+
+
+@pytest.mark.django_db()
+def test_must_match_word_prefixes_given_prefix(
+    exercises: dict[str, Exercise],
+) -> None:
+    results = search_exercises(
+        Exercise.objects.all(), 'campu lad', prefix=True
+    )
+
+    assert [exercise.name for exercise in results] == ['Campus ladders']
+
+
+@pytest.mark.django_db()
+def test_must_fall_back_to_trigram_similarity_given_a_typo(
+    exercises: dict[str, Exercise],
+) -> None:
+    results = search_exercises(Exercise.objects.all(), 'Max hnags')
+
+    assert [exercise.name for exercise in results] == ['Max hangs']
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize(
+    argnames='query', argvalues=['hangboard', 'Max hnags']
+)
+def test_must_search_in_a_single_query(
+    exercises: dict[str, Exercise], query: str, django_assert_num_queries
+) -> None:
+    with django_assert_num_queries(1):
+        assert list(search_exercises(Exercise.objects.all(), query))
+
+
+@pytest.mark.django_db()
+def test_must_return_nothing_given_a_query_without_words(
+    exercises: dict[str, Exercise], django_assert_num_queries
+) -> None:
+    with django_assert_num_queries(0):
+        results = search_exercises(Exercise.objects.all(), '&!', prefix=True)
+
+    assert not results
@@ -0,0 +1,289 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+from model_bakery import baker
+from pytest_django.fixtures import SettingsWrapper
+
+from eiger.trainers.models import Exercise, PendingReviewCounter, Task
+from eiger.trainers.tasks import (
+    TASKS,
+    TaskError,
+    claim_task,
+    defer,
+    get_retry_delay,
+    run_next_task,
+    schedule_periodic_tasks,
+    touch_task,
+)
+
+
+@pytest.fixture
+def recorded_task(monkeypatch: pytest.MonkeyPatch) -> mock.MagicMock:
+    recorded_task = mock.MagicMock()
+    monkeypatch.setitem(TASKS, 'record', recorded_task)
+    return recorded_task
+
+
+@pytest.fixture(autouse=True)
+def task_settings(settings: SettingsWrapper) -> None:
+    settings.TASK_MAX_ATTEMPTS = 3
+    settings.TASK_RETRY_BACKOFF = 10
+    settings.TASK_RETRY_BACKOFF_MAX = 30
+    settings.TASK_SCHEDULE = {}
+
+
+@pytest.mark.django_db()
+def test_defer_must_queue_the_call_of_the_task(
+    recorded_task: mock.MagicMock,
+) -> None:
+    task = defer('record', 1, 'two', three=3)
+
+    assert task is not None
+    assert (task.name, task.args, task.kwargs) == (
+        'record',
+        [1, 'two'],
+        {'three': 3},
+    )
+    assert (task.status, task.max_attempts) == (Task.Status.QUEUED, 3)
+    recorded_task.assert_not_called()
+
+
+@pytest.mark.django_db()
+def test_defer_must_refuse_the_unknown_tasks() -> None:
+    with pytest.raises(TaskError, match="Unknown task 'unknown'."):
+        defer('unknown')
+
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db()
+def test_defer_must_queue_a_unique_key_once(
+    recorded_task: mock.MagicMock,
+) -> None:
+    task = defer('record', unique_key='key')
+
+    assert defer('record', unique_key='key') is None
+
+    Task.objects.filter(pk=task.pk).update(  # type: ignore[union-attr]
+        status=Task.Status.RUNNING
+    )
+    assert defer('record', unique_key='key') is not None
+    assert Task.objects.count() == 2
+
+
+@pytest.mark.django_db()
+def test_claim_task_must_claim_the_due_tasks_in_order(
+    recorded_task: mock.MagicMock,
+) -> None:
+    now = timezone.now()
+    defer('record', run_at=now + timedelta(minutes=1))
+    second = defer('record', run_at=now - timedelta(minutes=1))
+    first = defer('record', run_at=now - timedelta(minutes=2))
+
+    assert claim_task() == first
+    assert claim_task() == second
+    assert claim_task() is None
+    first.refresh_from_db()  # type: ignore[union-attr]
+    assert first.status == Task.Status.RUNNING  # type: ignore[union-attr]
+    assert first.attempts == 1  # type: ignore[union-attr]
+
+
+@pytest.mark.django_db()
+def test_claim_task_must_claim_again_the_stale_running_tasks(
+    recorded_task: mock.MagicMock, settings: SettingsWrapper
+) -> None:
+    settings.TASK_STALE_AFTER = 60
+    task = defer('record')
+    claim_task()
+
+    assert claim_task() is None
+
+    Task.objects.filter(pk=task.pk).update(  # type: ignore[union-attr]
+        updated_at=timezone.now() - timedelta(minutes=2)
+    )
+    claimed = claim_task()
+
+    assert claimed == task
+    assert claimed.attempts == 2  # type: ignore[union-attr]
+
+
+@pytest.mark.django_db()
+def test_claim_task_must_fail_the_stale_tasks_out_of_attempts(
+    recorded_task: mock.MagicMock, settings: SettingsWrapper
+) -> None:
+    settings.TASK_STALE_AFTER = 60
+    task = defer('record', max_attempts=1)
+    claim_task()
+    Task.objects.filter(pk=task.pk).update(  # type: ignore[union-attr]
+        updated_at=timezone.now() - timedelta(minutes=2)
+    )
+
+    assert claim_task() is None
+
+    failed = Task.objects.get()
+    assert failed.status == Task.Status.FAILED
+    assert failed.error == 'The worker running the task was lost.'
+
+
+@pytest.mark.django_db()
+def test_touch_task_must_keep_the_running_task_from_turning_stale(
+    recorded_task: mock.MagicMock, settings: SettingsWrapper
+) -> None:
+    settings.TASK_STALE_AFTER = 60
+    task = defer('record')
+    claim_task()
+    Task.objects.filter(pk=task.pk).update(  # type: ignore[union-attr]
+        updated_at=timezone.now() - timedelta(minutes=2)
+    )
+
+    touch_task(task.pk)  # type: ignore[union-attr]
+
+    assert claim_task() is None
+
+
+@pytest.mark.django_db()
+def test_run_next_task_must_touch_the_task_while_it_runs(
+    recorded_task: mock.MagicMock,
+    settings: SettingsWrapper,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    settings.TASK_HEARTBEAT_INTERVAL = 0.01
+    touched = mock.MagicMock()
+    monkeypatch.setattr('eiger.trainers.tasks.touch_task', touched)
+    recorded_task.side_effect = lambda: time.sleep(0.1)
+    task = defer('record')
+
+    run_next_task()
+
+    touched.assert_called_with(task.pk)  # type: ignore[union-attr]
+
+
+@pytest.mark.django_db()
+def test_run_next_task_must_call_the_task(
+    recorded_task: mock.MagicMock,
+) -> None:
+    defer('record', 1, two=2)
+
+    task = run_next_task()
+
+    recorded_task.assert_called_once_with(1, two=2)
+    assert task is not None
+    assert task.status == Task.Status.SUCCEEDED
+    assert task.finished_at is not None
+    assert run_next_task() is None
+
+
+@pytest.mark.django_db()
+def test_run_next_task_must_retry_the_failed_task_with_a_backoff(
+    recorded_task: mock.MagicMock,
+) -> None:
+    recorded_task.side_effect = [RuntimeError('Broken'), None]
+    defer('record')
+
+    before = timezone.now()
+    task = run_next_task()
+
+    assert task is not None
+    assert (task.status, task.error) == (Task.Status.QUEUED, 'Broken')
+    assert task.run_at >= before + timedelta(seconds=10)
+    assert run_next_task() is None
+
+    Task.objects.update(run_at=before)
+    task = run_next_task()
+
+    assert task is not None
+    assert (task.status, task.attempts) == (Task.Status.SUCCEEDED, 2)
+
+
+@pytest.mark.django_db()
+def test_run_next_task_must_fail_the_task_out_of_attempts(
+    recorded_task: mock.MagicMock,
+) -> None:
+    recorded_task.side_effect = RuntimeError('Broken')
+    defer('record', max_attempts=1)
+
+    task = run_next_task()
+
+    assert task is not None
+    assert (task.status, task.error) == (Task.Status.FAILED, 'Broken')
+    assert task.finished_at is not None
+
+
+@pytest.mark.django_db()
+def test_run_next_task_must_fail_the_unregistered_task() -> None:
+    Task.objects.create(name='removed', max_attempts=3)
+
+    task = run_next_task()
+
+    assert task is not None
+    assert task.status == Task.Status.FAILED
+    assert task.error == "Unknown task 'removed'."
+
+
+@pytest.mark.django_db()
+def test_run_next_task_must_fail_the_retry_of_a_task_queued_meanwhile(
+    recorded_task: mock.MagicMock,
+) -> None:
+    def fail_after_queuing_again() -> None:
+        defer('record', unique_key='key')
+        raise RuntimeError('Broken')
+
+    recorded_task.side_effect = fail_after_queuing_again
+    defer('record', unique_key='key')
+
+    task = run_next_task()
+
+    assert task is not None
+    assert task.status == Task.Status.FAILED
+    assert Task.objects.filter(status=Task.Status.QUEUED).count() == 1
+
+
+@pytest.mark.parametrize(
+    ('attempts', 'delay'),
+    [(1, 10), (2, 20), (3, 30), (10, 30)],
+)
+def test_get_retry_delay_must_double_up_to_the_maximum(
+    attempts: int, delay: int, settings: SettingsWrapper
+) -> None:
+    assert get_retry_delay(attempts) == timedelta(seconds=delay)
+
+
+@pytest.mark.django_db()
+def test_scheduled_task_must_be_queued_again_after_its_run(
+    recorded_task: mock.MagicMock, settings: SettingsWrapper
+) -> None:
+    settings.TASK_SCHEDULE = {'record': 60}
+    schedule_periodic_tasks()
+    schedule_periodic_tasks()
+
+    task = run_next_task()
+
+    assert task is not None
+    recorded_task.assert_called_once_with()
+    next_task = Task.objects.get(status=Task.Status.QUEUED)
+    assert next_task.run_at == task.finished_at + timedelta(  # type: ignore
+        seconds=60
+    )
+    assert next_task.unique_key == 'schedule:record'
+
+
+@pytest.mark.django_db()
+def test_reconcile_pending_counters_task_must_repair_the_counters(
+    trainer: User,
+) -> None:
+    baker.make(Exercise, created_by=trainer, reviewed=False)
+    PendingReviewCounter.objects.filter(user=trainer).update(
+        pending_exercises=5
+    )
+    defer('reconcile_pending_counters')
+
+    with mock.patch('sys.stdout'):
+        run_next_task()
+
+    assert (
+        PendingReviewCounter.objects.get(user=trainer).pending_exercises == 1
+    )
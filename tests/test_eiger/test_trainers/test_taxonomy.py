@@ -0,0 +1,149 @@
+import time
+
+import pytest
+from django.core.cache import caches
+from model_bakery import baker
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
+
+from eiger.caching import get_cache
+from eiger.trainers.models import Category, ExerciseType
+from eiger.trainers.taxonomy import (
+    TAXONOMY_CACHE_NAMESPACE,
+    TAXONOMY_VERSION_KEY,
+    Taxonomy,
+    TaxonomyCache,
+    get_taxonomy,
+)
+
+
+@pytest.mark.django_db()
+def test_taxonomy_must_build_the_category_tree_ordered_by_name() -> None:
+    boulder = baker.make(Category, name='Boulder')
+    fingers = baker.make(Category, name='Fingers')
+    crimp = baker.make(ExerciseType, category=fingers, name='Crimp')
+    limit = baker.make(ExerciseType, category=boulder, name='Limit')
+
+    taxonomy = Taxonomy.from_database(version='v1')
+
+    assert [category.name for category in taxonomy.categories] == [
+        'Boulder',
+        'Fingers',
+    ]
+    assert [node.id for node in taxonomy.exercise_types] == [
+        limit.id,
+        crimp.id,
+    ]
+    assert str(taxonomy.get_exercise_type(crimp.id)) == str(crimp)
+    assert taxonomy.get_category(fingers.id).exercise_types[0].name == (  # type: ignore[union-attr]
+        'Crimp'
+    )
+    assert taxonomy.get_category(0) is None
+
+
+@pytest.mark.django_db()
+def test_get_taxonomy_must_not_query_once_cached(
+    django_assert_num_queries,
+) -> None:
+    baker.make(ExerciseType)
+    get_taxonomy()
+
+    with django_assert_num_queries(0):
+        get_taxonomy()
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize(argnames='model', argvalues=[Category, ExerciseType])
+def test_signals_must_invalidate_the_taxonomy(
+    model: type[Category | ExerciseType],
+) -> None:
+    instance = baker.make(model)
+    cached_version = get_taxonomy().version
+
+    instance.delete()
+
+    assert get_taxonomy().version != cached_version
+
+
+@pytest.mark.django_db()
+def test_processes_must_share_the_tree_through_the_cache_backend(
+    django_assert_num_queries,
+) -> None:
+    baker.make(ExerciseType)
+    worker, other_worker = TaxonomyCache('default'), TaxonomyCache('default')
+    taxonomy = worker.get()
+
+    with django_assert_num_queries(0):
+        assert other_worker.get() == taxonomy
+
+    worker.invalidate()
+
+    assert other_worker.get().version == get_cache(
+        TAXONOMY_CACHE_NAMESPACE
+    ).get(TAXONOMY_VERSION_KEY)
+    assert other_worker.get().version != taxonomy.version
+
+
+@pytest.mark.django_db()
+def test_taxonomy_cache_must_work_without_a_shared_backend(
+    settings: SettingsWrapper,
+) -> None:
+    settings.TAXONOMY_CACHE_ALIAS = ''
+    taxonomy_cache = TaxonomyCache()
+    exercise_type = baker.make(ExerciseType)
+
+    taxonomy = taxonomy_cache.get()
+    taxonomy_cache.invalidate()
+
+    assert taxonomy.get_exercise_type(exercise_type.id) is not None
+    assert taxonomy_cache.get().version != taxonomy.version
+
+
+@pytest.mark.django_db()
+def test_version_must_expire_in_the_caches_missed_by_an_invalidation(
+    settings: SettingsWrapper, mocker: MockerFixture
+) -> None:
+    settings.CACHES = {
+        **settings.CACHES,
+        **{
+            alias: {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': alias,
+            }
+            for alias in ('worker', 'other-worker')
+        },
+    }
+    settings.TAXONOMY_VERSION_TIMEOUT = 60
+    caches['worker'].clear()
+    caches['other-worker'].clear()
+    baker.make(ExerciseType)
+    worker = TaxonomyCache('worker')
+    other_worker = TaxonomyCache('other-worker')
+    taxonomy = other_worker.get()
+
+    worker.invalidate()
+
+    assert other_worker.get() is taxonomy
+
+    mocker.patch('time.time', return_value=time.time() + 61)
+
+    assert other_worker.get().version != taxonomy.version
+
+
+@pytest.mark.django_db()
+def test_local_version_must_expire_without_a_shared_backend(
+    settings: SettingsWrapper, mocker: MockerFixture
+) -> None:
+    settings.TAXONOMY_CACHE_ALIAS = ''
+    settings.TAXONOMY_VERSION_TIMEOUT = 60
+    baker.make(ExerciseType)
+    worker, other_worker = TaxonomyCache(), TaxonomyCache()
+    taxonomy = other_worker.get()
+
+    worker.invalidate()
+
+    assert other_worker.get() is taxonomy
+
+    mocker.patch('time.monotonic', return_value=time.monotonic() + 61)
+
+    assert other_worker.get().version != taxonomy.version
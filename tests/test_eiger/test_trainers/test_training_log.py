@@ -0,0 +1,372 @@
+import json
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Iterator
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.exceptions import BadRequest
+from django.db import connection
+from model_bakery import baker
+from pytest_django.fixtures import SettingsWrapper
+
+from eiger.trainers.models import ExerciseVariation, TrainingLogEntry
+from eiger.trainers.pagination import Cursor
+from eiger.trainers.training_log import (
+    MAX_SESSION_SETS,
+    HistoryRange,
+    TrainingLogError,
+    add_months,
+    create_partition,
+    create_training_log_partitions,
+    get_month,
+    get_partition_name,
+    get_training_history,
+    history_queryset,
+    log_session,
+)
+from tests.test_eiger.conftest import PERFORMED_AT, make_set
+
+
+@pytest.fixture
+def trainer() -> User:
+    return baker.make(User)
+
+
+@pytest.fixture
+def variation() -> ExerciseVariation:
+    return baker.make(ExerciseVariation, reviewed=True)
+
+
+def iter_plan(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get('Plans', ()):
+        yield from iter_plan(child)
+
+
+def get_partition_of(entry: TrainingLogEntry) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT tableoid::regclass::text FROM trainers_traininglogentry'
+            ' WHERE id = %s',
+            [entry.pk],
+        )
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.parametrize(
+    ('month', 'months', 'expected'),
+    [
+        (date(2021, 1, 1), 0, date(2021, 1, 1)),
+        (date(2021, 1, 1), 11, date(2021, 12, 1)),
+        (date(2021, 11, 1), 3, date(2022, 2, 1)),
+        (date(2021, 1, 1), -1, date(2020, 12, 1)),
+    ],
+)
+def test_add_months_must_roll_over_the_years(
+    month: date, months: int, expected: date
+) -> None:
+    assert add_months(month, months) == expected
+
+
+def test_get_month_must_use_the_utc_month() -> None:
+    moment = datetime(2021, 4, 1, 1, tzinfo=dt_timezone(timedelta(hours=2)))
+
+    assert get_month(moment) == date(2021, 3, 1)
+
+
+@pytest.mark.django_db()
+def test_log_session_must_store_the_sets_in_their_month_partition(
+    trainer: User, variation: ExerciseVariation
+) -> None:
+    create_partition(date(2021, 3, 1))
+
+    entries = log_session(
+        trainer,
+        [
+            make_set(variation, repetitions=5, weight_in_kilos=20),
+            make_set(variation, repetitions=4, duration_seconds=45),
+        ],
+    )
+
+    assert [entry.pk is not None for entry in entries] == [True, True]
+    assert list(
+        TrainingLogEntry.objects.order_by('id').values_list(
+            'user', 'repetitions', 'weight_in_kilos', 'duration_seconds'
+        )
+    ) == [(trainer.id, 5, 20, None), (trainer.id, 4, None, 45)]
+    assert {get_partition_of(entry) for entry in entries} == {
+        'trainers_traininglogentry_202103'
+    }
+
+
+@pytest.mark.django_db()
+def test_log_session_must_accept_the_own_pending_variations(
+    trainer: User,
+) -> None:
+    variation = baker.make(
+        ExerciseVariation, reviewed=False, created_by=trainer
+    )
+
+    entries = log_session(trainer, [make_set(variation)])
+
+    assert entries[0].exercise_variation_id == variation.id
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize(
+    ('sets', 'message'),
+    [
+        ([], 'A session must have at least one set.'),
+        (None, 'A session must have at least one set.'),
+        ('sets', 'A session must have at least one set.'),
+        (['set'], 'Set 0: A set must be an object.'),
+        (
+            [{'performed_at': '2021-03-14'}],
+            'Set 0: Invalid exercise_variation.',
+        ),
+        (
+            [{'exercise_variation': True}],
+            'Set 0: Invalid exercise_variation.',
+        ),
+        ([{'exercise_variation': 1}], 'Set 0: Invalid performed_at.'),
+        (
+            [{'exercise_variation': 1, 'performed_at': 'yesterday'}],
+            'Set 0: Invalid performed_at.',
+        ),
+        (
+            [{'exercise_variation': 1, 'performed_at': '2021-13-14T10:00'}],
+            'Set 0: Invalid performed_at.',
+        ),
+        (
+            [
+                {'exercise_variation': 1, 'performed_at': '2021-03-14T10:00'},
+                {
+                    'exercise_variation': 1,
+                    'performed_at': '2021-03-14T10:00',
+                    'repetitions': -1,
+                },
+            ],
+            'Set 1: Invalid repetitions.',
+        ),
+        (
+            [
+                {
+                    'exercise_variation': 1,
+                    'performed_at': '2021-03-14T10:00',
+                    'weight_in_kilos': 32768,
+                }
+            ],
+            'Set 0: Invalid weight_in_kilos.',
+        ),
+        (
+            [
+                {
+                    'exercise_variation': 1,
+                    'performed_at': '2021-03-14T10:00',
+                    'duration_seconds': '60',
+                }
+            ],
+            'Set 0: Invalid duration_seconds.',
+        ),
+        (
+            [{'exercise_variation': 1, 'performed_at': '2021-03-14T10:00'}]
+            * (MAX_SESSION_SETS + 1),
+            f'A session can have at most {MAX_SESSION_SETS} sets.',
+        ),
+    ],
+)
+def test_log_session_must_reject_invalid_sets(
+    trainer: User, sets: object, message: str
+) -> None:
+    with pytest.raises(TrainingLogError, match=f'^{message}$'):
+        log_session(trainer, sets)  # type: ignore[arg-type]
+
+    assert not TrainingLogEntry.objects.exists()
+
+
+@pytest.mark.django_db()
+def test_log_session_must_reject_the_variations_of_other_trainers(
+    trainer: User, variation: ExerciseVariation
+) -> None:
+    pending = baker.make(ExerciseVariation, reviewed=False)
+
+    with pytest.raises(
+        TrainingLogError,
+        match=(
+            f'^Unknown exercise variations: {pending.id}, {pending.id + 1}.$'
+        ),
+    ):
+        log_session(
+            trainer,
+            [
+                make_set(variation),
+                make_set(pending),
+                {
+                    'exercise_variation': pending.id + 1,
+                    'performed_at': PERFORMED_AT.isoformat(),
+                },
+            ],
+        )
+
+    assert not TrainingLogEntry.objects.exists()
+
+
+@pytest.mark.django_db()
+def test_log_session_must_make_naive_timestamps_aware(
+    trainer: User, variation: ExerciseVariation, settings: SettingsWrapper
+) -> None:
+    settings.TIME_ZONE = 'UTC'
+
+    entries = log_session(
+        trainer,
+        [{'exercise_variation': variation.id, 'performed_at': '2021-03-14'}],
+    )
+
+    assert entries[0].performed_at == datetime(
+        2021, 3, 14, tzinfo=dt_timezone.utc
+    )
+
+
+@pytest.mark.django_db()
+def test_create_partition_must_move_the_rows_of_the_default_partition(
+    trainer: User, variation: ExerciseVariation
+) -> None:
+    entries = log_session(
+        trainer,
+        [
+            make_set(variation, performed_at='2019-05-31T23:59:59+00:00'),
+            make_set(variation, performed_at='2019-06-01T00:00:00+00:00'),
+        ],
+    )
+    assert [get_partition_of(entry) for entry in entries] == [
+        'trainers_traininglogentry_default',
+        'trainers_traininglogentry_default',
+    ]
+
+    created = create_partition(date(2019, 6, 1))
+
+    assert created is True
+    assert [get_partition_of(entry) for entry in entries] == [
+        'trainers_traininglogentry_default',
+        'trainers_traininglogentry_201906',
+    ]
+    assert create_partition(date(2019, 6, 1)) is False
+
+
+@pytest.mark.django_db()
+def test_create_training_log_partitions_must_create_the_months_ahead(
+    settings: SettingsWrapper,
+) -> None:
+    settings.TRAINING_LOG_PARTITIONS_AHEAD = 13
+    month = get_month(datetime.now(dt_timezone.utc))
+
+    create_training_log_partitions()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT inhrelid::regclass::text FROM pg_inherits'
+            " WHERE inhparent = 'trainers_traininglogentry'::regclass"
+        )
+        partitions = {row[0] for row in cursor.fetchall()}
+    assert partitions >= {
+        get_partition_name(add_months(month, months)) for months in range(14)
+    }
+
+
+@pytest.mark.django_db()
+def test_get_training_history_must_paginate_newest_first(
+    trainer: User, variation: ExerciseVariation
+) -> None:
+    baker.make(
+        TrainingLogEntry,
+        exercise_variation=variation,
+        performed_at=PERFORMED_AT,
+    )
+    entries = log_session(
+        trainer,
+        [
+            make_set(variation, performed_at='2021-02-01T10:00:00+00:00'),
+            make_set(variation),
+            make_set(variation),
+            make_set(variation, performed_at='2021-04-01T10:00:00+00:00'),
+        ],
+    )
+
+    first_page = get_training_history(trainer, cursor=None, page_size=3)
+    second_page = get_training_history(
+        trainer, cursor=first_page.next_cursor, page_size=3
+    )
+
+    assert [row['id'] for row in first_page.items] == [
+        entries[3].pk,
+        entries[2].pk,
+        entries[1].pk,
+    ]
+    assert first_page.items[0] == {
+        'id': entries[3].pk,
+        'exercise_variation': variation.id,
+        'performed_at': datetime(2021, 4, 1, 10, tzinfo=dt_timezone.utc),
+        'repetitions': None,
+        'weight_in_kilos': None,
+        'duration_seconds': None,
+    }
+    assert [row['id'] for row in second_page.items] == [entries[0].pk]
+    assert second_page.next_cursor is None
+
+
+@pytest.mark.django_db()
+def test_history_queryset_must_start_from_the_cursor_in_the_index(
+    trainer: User, variation: ExerciseVariation
+) -> None:
+    (entry,) = log_session(trainer, [make_set(variation)])
+    cursor = Cursor(created_at=PERFORMED_AT, id=entry.pk).encode()
+    # As for a long history, read in order through the index:
+    with connection.cursor() as db_cursor:
+        db_cursor.execute('SET LOCAL enable_seqscan = off')
+        db_cursor.execute('SET LOCAL enable_bitmapscan = off')
+
+    plan = json.loads(
+        history_queryset(trainer, cursor).explain(format='json')
+    )[0]['Plan']
+
+    assert 'performed_at' in json.dumps(
+        [
+            node['Index Cond']
+            for node in iter_plan(plan)
+            if 'Index Cond' in node
+        ]
+    )
+
+
+@pytest.mark.django_db()
+def test_get_training_history_must_filter_the_time_range(
+    trainer: User, variation: ExerciseVariation
+) -> None:
+    entries = log_session(
+        trainer,
+        [
+            make_set(variation, performed_at='2021-02-28T23:59:59+00:00'),
+            make_set(variation, performed_at='2021-03-01T00:00:00+00:00'),
+            make_set(variation, performed_at='2021-04-01T00:00:00+00:00'),
+        ],
+    )
+
+    page = get_training_history(
+        trainer,
+        cursor=None,
+        page_size=10,
+        history_range=HistoryRange(
+            since=datetime(2021, 3, 1, tzinfo=dt_timezone.utc),
+            until=datetime(2021, 4, 1, tzinfo=dt_timezone.utc),
+        ),
+    )
+
+    assert [row['id'] for row in page.items] == [entries[1].pk]
+
+
+@pytest.mark.django_db()
+def test_get_training_history_must_reject_a_tampered_cursor(
+    trainer: User,
+) -> None:
+    with pytest.raises(BadRequest):
+        get_training_history(trainer, cursor='tampered', page_size=10)
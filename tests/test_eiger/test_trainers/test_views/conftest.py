@@ -1,6 +1,11 @@
+from typing import Callable
+
 import pytest
 from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
 
+from eiger.trainers.flash import Context, get_form_state, set_form_state
 from eiger.trainers.models import Exercise, ExerciseVariation
 
 
@@ -22,3 +27,25 @@ def exercise_variation_from_authenticated_user_without_weight(
     exercise_variation.exercise.should_add_weight = False
     exercise_variation.save()
     return exercise_variation
+
+
+@pytest.fixture()
+def flash_form_state() -> Callable[[Client, Context], None]:
+    def flash(client: Client, context: Context) -> None:
+        response = HttpResponse()
+        set_form_state(response, context)
+        client.cookies.update(response.cookies)
+
+    return flash
+
+
+@pytest.fixture()
+def read_form_state() -> Callable[[Client], Context]:
+    def read(client: Client) -> Context:
+        request = RequestFactory().get('/')
+        request.COOKIES = {
+            name: morsel.value for name, morsel in client.cookies.items()
+        }
+        return get_form_state(request)
+
+    return read
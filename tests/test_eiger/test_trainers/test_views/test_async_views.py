@@ -0,0 +1,196 @@
+import importlib
+import re
+from http import HTTPStatus
+from typing import Generator
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import AsyncClient, Client
+from django.urls import clear_url_caches, resolve, reverse
+from model_bakery import baker
+from pytest_django.fixtures import SettingsWrapper
+
+import eiger.urls
+from eiger.trainers import urls as trainers_urls
+from eiger.trainers.models import Category, Exercise, ExerciseType
+
+
+def _reload_urls() -> None:
+    importlib.reload(trainers_urls)
+    importlib.reload(eiger.urls)
+    clear_url_caches()
+
+
+async def _send(method, *args: object, **kwargs: object) -> HttpResponse:  # type: ignore
+    # `AsyncClient` methods return awaitables, without being coroutines:
+    return await method(*args, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def _async_views(settings: SettingsWrapper) -> Generator[None, None, None]:
+    settings.ASYNC_VIEWS = True
+    _reload_urls()
+    yield
+    settings.ASYNC_VIEWS = False
+    _reload_urls()
+
+
+@pytest.fixture()
+def async_client(trainer: User) -> AsyncClient:
+    client = AsyncClient()
+    client.force_login(trainer)
+    return client
+
+
+@pytest.mark.parametrize(
+    'url_name',
+    [
+        'home',
+        'retrieve_exercise',
+        'update_exercise',
+        'retrieve_category_exercise_types',
+        'retrieve_exercise_variation',
+        'update_exercise_variation',
+    ],
+)
+def test_must_route_to_the_async_views(url_name: str) -> None:
+    url = reverse(url_name, args=() if url_name == 'home' else (1,))
+
+    assert iscoroutinefunction(resolve(url).func)
+
+
+@pytest.mark.django_db()
+def test_must_redirect_to_index_given_non_authenticated_user(
+    client: Client,
+) -> None:
+    response = client.get(reverse('home'))
+
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == '/?next=/home/'  # type: ignore[attr-defined]
+
+
+@pytest.mark.django_db()
+def test_must_not_allow_other_methods(authenticated_client: Client) -> None:
+    response = authenticated_client.post(reverse('home'))
+
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_home_view_must_render_the_user_pending_entries_over_asgi(
+    async_client: AsyncClient, trainer: User
+) -> None:
+    pending_exercise = baker.make(Exercise, created_by=trainer)
+    baker.make(Exercise)
+
+    response = async_to_sync(_send)(async_client.get, reverse('home'))
+
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context['pending_exercises']) == [pending_exercise]
+    # The queries run in the threads of `sync_to_async` are recorded:
+    queries = re.search(r'desc="(\d+) queries"', response['Server-Timing'])
+    assert int(queries.group(1)) > 0
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_home_view_must_not_render_given_a_matching_etag_over_asgi(
+    async_client: AsyncClient, trainer: User
+) -> None:
+    baker.make(Exercise, created_by=trainer)
+    etag = async_to_sync(_send)(async_client.get, reverse('home'))['ETag']
+
+    response = async_to_sync(_send)(
+        async_client.get,
+        reverse('home'),
+        headers={'If-None-Match': etag},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response['ETag'] == etag
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_retrieve_exercise_view_must_render_the_form(
+    authenticated_client: Client, trainer: User
+) -> None:
+    exercise = baker.make(Exercise, created_by=trainer)
+
+    response = authenticated_client.get(
+        reverse('retrieve_exercise', args=(exercise.id,))
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['exercise'] == exercise
+
+
+@pytest.mark.django_db()
+def test_retrieve_exercise_view_must_not_find_other_users_exercises(
+    authenticated_client: Client,
+) -> None:
+    exercise = baker.make(Exercise)
+
+    response = authenticated_client.get(
+        reverse('retrieve_exercise', args=(exercise.id,))
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db()
+def test_update_exercise_view_must_save_a_valid_form(
+    async_client: AsyncClient, trainer: User
+) -> None:
+    exercise = baker.make(Exercise, created_by=trainer)
+
+    response = async_to_sync(_send)(
+        async_client.post,
+        reverse('update_exercise', args=(exercise.id,)),
+        {
+            'name': 'Updated Exercise',
+            'exercise_type': exercise.exercise_type_id,
+            'description': 'Updated Description',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == '/home/'
+    exercise.refresh_from_db()
+    assert exercise.name == 'Updated Exercise'
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_update_exercise_view_must_render_the_errors_of_an_invalid_form(
+    authenticated_client: Client, trainer: User
+) -> None:
+    exercise = baker.make(Exercise, created_by=trainer)
+
+    response = authenticated_client.post(
+        reverse('update_exercise', args=(exercise.id,)),
+        {'name': '', 'exercise_type': exercise.exercise_type_id},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'name' in response.context['form'].errors
+
+
+@pytest.mark.django_db()
+def test_retrieve_category_exercise_types_view_must_list_the_types(
+    async_client: AsyncClient,
+) -> None:
+    category = baker.make(Category)
+    exercise_type = baker.make(ExerciseType, category=category)
+
+    response = async_to_sync(_send)(
+        async_client.get,
+        reverse('retrieve_category_exercise_types', args=(category.id,)),
+    )
+
+    assert response.json() == [
+        {'id': exercise_type.id, 'name': exercise_type.name}
+    ]
@@ -0,0 +1,186 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+from model_bakery import baker
+
+from eiger.trainers.models import Category, Exercise, ExerciseVariation
+
+
+@pytest.fixture()
+def pending_exercise(trainer: User) -> Exercise:
+    return baker.make(Exercise, created_by=trainer)
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_home_view_must_send_its_validators(
+    authenticated_client: Client, pending_exercise: Exercise
+) -> None:
+    response = authenticated_client.get(reverse('home'))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'].startswith('W/"')
+    assert 'Last-Modified' in response
+    assert response['Cache-Control'] == 'private, no-cache'
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_home_view_must_not_render_given_a_matching_etag(
+    authenticated_client: Client,
+    pending_exercise: Exercise,
+    django_assert_max_num_queries,
+) -> None:
+    etag = authenticated_client.get(reverse('home'))['ETag']
+
+    # The session, the user and the validators:
+    with django_assert_max_num_queries(3):
+        response = authenticated_client.get(
+            reverse('home'), HTTP_IF_NONE_MATCH=etag
+        )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b''
+    assert not response.templates
+    assert response['ETag'] == etag
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_home_view_must_not_render_given_a_matching_last_modified(
+    authenticated_client: Client, pending_exercise: Exercise
+) -> None:
+    last_modified = authenticated_client.get(reverse('home'))['Last-Modified']
+
+    response = authenticated_client.get(
+        reverse('home'), HTTP_IF_MODIFIED_SINCE=last_modified
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+@pytest.mark.parametrize(
+    argnames='change',
+    argvalues=[
+        pytest.param(lambda entry: entry.save(), id='updated entry'),
+        pytest.param(lambda entry: entry.delete(), id='deleted entry'),
+        pytest.param(
+            lambda entry: Exercise.objects.filter(pk=entry.pk).update(
+                reviewed=True
+            ),
+            id='reviewed entry',
+        ),
+        pytest.param(
+            lambda entry: baker.make(
+                ExerciseVariation, created_by=entry.created_by
+            ),
+            id='new variation',
+        ),
+        pytest.param(lambda entry: baker.make(Category), id='new category'),
+    ],
+)
+def test_home_view_must_render_again_once_the_pending_entries_change(
+    authenticated_client: Client, pending_exercise: Exercise, change
+) -> None:
+    etag = authenticated_client.get(reverse('home'))['ETag']
+
+    change(pending_exercise)
+    response = authenticated_client.get(
+        reverse('home'), HTTP_IF_NONE_MATCH=etag
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_home_view_must_not_share_validators_between_users(
+    authenticated_client: Client, trainer_raw_password: str
+) -> None:
+    etag = authenticated_client.get(reverse('home'))['ETag']
+    other_user = get_user_model().objects.create_user(
+        username='otheruser', password=trainer_raw_password
+    )
+    client = Client()
+    client.login(username=other_user.username, password=trainer_raw_password)
+
+    response = client.get(reverse('home'), HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db()
+def test_home_view_must_redirect_anonymous_users_given_an_etag(
+    client: Client,
+) -> None:
+    response = client.get(reverse('home'), HTTP_IF_NONE_MATCH='W/"etag"')
+
+    assert response.status_code == HTTPStatus.FOUND
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_retrieve_exercise_view_must_not_build_the_form_given_a_matching_etag(
+    authenticated_client: Client, pending_exercise: Exercise
+) -> None:
+    url = reverse('retrieve_exercise', args=(pending_exercise.id,))
+    etag = authenticated_client.get(url)['ETag']
+
+    response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.context is None
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_retrieve_exercise_view_must_render_again_once_saved(
+    authenticated_client: Client, pending_exercise: Exercise
+) -> None:
+    url = reverse('retrieve_exercise', args=(pending_exercise.id,))
+    etag = authenticated_client.get(url)['ETag']
+
+    pending_exercise.name = 'Renamed exercise'
+    pending_exercise.save()
+    response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['form'].initial['name'] == 'Renamed exercise'
+
+
+@pytest.mark.django_db()
+def test_retrieve_exercise_view_must_not_find_other_users_exercises(
+    authenticated_client: Client,
+) -> None:
+    exercise = baker.make(Exercise)
+
+    response = authenticated_client.get(
+        reverse('retrieve_exercise', args=(exercise.id,)),
+        HTTP_IF_NONE_MATCH='*',
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_retrieve_exercise_variation_view_must_render_again_once_the_exercise_changes(
+    authenticated_client: Client, trainer: User
+) -> None:
+    variation = baker.make(ExerciseVariation, created_by=trainer)
+    url = reverse('retrieve_exercise_variation', args=(variation.id,))
+    etag = authenticated_client.get(url)['ETag']
+
+    not_modified = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    variation.exercise.save()
+    modified = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+    assert modified.status_code == HTTPStatus.OK
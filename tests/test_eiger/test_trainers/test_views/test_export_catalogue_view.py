@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+from model_bakery import baker
+
+from eiger.trainers.models import Exercise
+
+
+@pytest.mark.django_db()
+def test_export_catalogue_view_must_stream_the_export(
+    admin_client: Client,
+) -> None:
+    baker.make(Exercise, name='Max hangs', reviewed=True)
+
+    response = admin_client.get(
+        reverse('export_catalogue'), data={'format': 'jsonl'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.streaming
+    assert response.headers['Content-Type'] == 'application/x-ndjson'
+    assert (
+        response.headers['Content-Disposition']
+        == 'attachment; filename="catalogue.jsonl"'
+    )
+    assert b'"name": "Max hangs"' in b''.join(response.streaming_content)
+
+
+@pytest.mark.django_db()
+def test_export_catalogue_view_must_reject_invalid_options(
+    admin_client: Client,
+) -> None:
+    response = admin_client.get(
+        reverse('export_catalogue'), data={'format': 'xml'}
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'error': "Invalid export format 'xml'."}
+
+
+@pytest.mark.django_db()
+def test_export_catalogue_view_must_be_restricted_to_staff(
+    authenticated_client: Client, trainer: User
+) -> None:
+    response = authenticated_client.get(reverse('export_catalogue'))
+
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url.startswith(reverse('admin:login'))
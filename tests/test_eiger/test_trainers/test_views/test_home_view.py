@@ -0,0 +1,75 @@
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+from model_bakery import baker
+from pytest_django.asserts import assertTemplateUsed
+
+from eiger.trainers.models import Exercise, ExerciseVariation
+
+
+@pytest.fixture()
+def url() -> str:
+    return reverse('home')
+
+
+@pytest.mark.django_db
+def test_must_redirect_to_index_given_non_authenticated_user(
+    client: Client, url: str
+) -> None:
+    response = client.get(url)
+
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == f'/?next={url}'  # type: ignore[attr-defined]
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_must_render_only_the_user_pending_entries(
+    authenticated_client: Client, trainer: User, url: str
+) -> None:
+    pending_exercise = baker.make(Exercise, created_by=trainer)
+    baker.make(Exercise, created_by=trainer, reviewed=True)
+    baker.make(Exercise)
+    pending_variation = baker.make(ExerciseVariation, created_by=trainer)
+    baker.make(ExerciseVariation, created_by=trainer, reviewed=True)
+
+    response = authenticated_client.get(url)
+
+    assert response.status_code == HTTPStatus.OK
+    assertTemplateUsed(response, 'pages/home.html')  # type: ignore[arg-type]
+    assert response.context['pending_exercises'] == [pending_exercise]
+    assert response.context['pending_variations'] == [pending_variation]
+    assert response.context['next_exercises_cursor'] is None
+    assert response.context['next_variations_cursor'] is None
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_must_paginate_pending_exercises_by_cursor(
+    authenticated_client: Client, trainer: User, url: str
+) -> None:
+    exercises = baker.make(Exercise, created_by=trainer, _quantity=3)
+
+    with mock.patch('eiger.trainers.views.HOME_FEED_PAGE_SIZE', 2):
+        first_response = authenticated_client.get(url)
+        cursor = first_response.context['next_exercises_cursor']
+        second_response = authenticated_client.get(
+            url, {'exercises_cursor': cursor}
+        )
+
+    assert first_response.context['pending_exercises'] == exercises[:2]
+    assert second_response.context['pending_exercises'] == exercises[2:]
+    assert second_response.context['next_exercises_cursor'] is None
+
+
+@pytest.mark.django_db()
+def test_must_return_bad_request_given_invalid_cursor(
+    authenticated_client: Client, url: str
+) -> None:
+    response = authenticated_client.get(url, {'exercises_cursor': 'invalid'})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
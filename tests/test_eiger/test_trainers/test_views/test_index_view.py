@@ -1,12 +1,14 @@
 from http import HTTPStatus
+from typing import Callable
 
 import pytest
+from django.conf import settings
 from django.test import Client
 from django.urls import reverse
 from pytest_django.asserts import assertInHTML, assertTemplateUsed
 
 from eiger.trainers.forms import TrainerCreationForm, TrainerLoginForm
-from eiger.trainers.views import Context
+from eiger.trainers.flash import FORM_STATE_COOKIE_NAME, Context
 
 
 @pytest.fixture()
@@ -99,15 +101,14 @@ def test_must_render_template_passing_empty_forms(
         ),
     ],
 )
-def test_must_render_html_passing_registration_form_with_errors_given_request_session_context_with_failed_registration_data(
+def test_must_render_html_passing_registration_form_with_errors_given_flashed_failed_registration_data(
     client: Client,
     index_url: str,
+    flash_form_state: Callable[[Client, Context], None],
     context_data: Context,
     expected_html: str,
 ) -> None:
-    session = client.session
-    session['context'] = context_data
-    session.save()
+    flash_form_state(client, context_data)
 
     response = client.get(path=index_url)
 
@@ -121,35 +122,31 @@ def test_must_render_html_passing_registration_form_with_errors_given_request_se
         expected_html,
         response.content.decode(),
     )
-    assert 'context' not in client.session
+    assert response.cookies[FORM_STATE_COOKIE_NAME].value == ''
 
 
 @pytest.mark.ignore_template_errors()
 @pytest.mark.django_db()
-def test_must_render_html_passing_login_form_with_errors_given_request_session_context_with_failed_login_data(
-    client: Client, index_url: str
+def test_must_render_html_passing_login_form_with_errors_given_flashed_failed_login_data(
+    client: Client,
+    index_url: str,
+    flash_form_state: Callable[[Client, Context], None],
 ) -> None:
-    session = client.session
-    session.update(
+    flash_form_state(
+        client,
         {
-            'context': {
-                'registration': None,
-                'login': {
-                    'cleaned_data': {
-                        'username': 'random',
-                        'password': 'random',
-                    },
-                    'errors': {
-                        '__all__': [
-                            'Please enter a correct username and password.'
-                            ' Note that both fields may be case-sensitive.'
-                        ]
-                    },
+            'registration': None,
+            'login': {
+                'cleaned_data': {'username': 'random'},
+                'errors': {
+                    '__all__': [
+                        'Please enter a correct username and password.'
+                        ' Note that both fields may be case-sensitive.'
+                    ]
                 },
-            }
-        }
+            },
+        },
     )
-    session.save()
 
     response = client.get(path=index_url)
 
@@ -169,7 +166,7 @@ def test_must_render_html_passing_login_form_with_errors_given_request_session_c
         ' Note that both fields may be case-sensitive.</p>',
         response.content.decode(),
     )
-    assert 'context' not in client.session
+    assert response.cookies[FORM_STATE_COOKIE_NAME].value == ''
 
 
 @pytest.mark.ignore_template_errors()
@@ -184,3 +181,38 @@ def test_must_flush_session_after_rendering_html(
     client.get(path=index_url)
 
     assert 'testing' not in client.session
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_must_ignore_tampered_form_state(
+    client: Client, index_url: str
+) -> None:
+    client.cookies[FORM_STATE_COOKIE_NAME] = '{"login": {"errors": {}}}'
+
+    response = client.get(path=index_url)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['login_form'] == TrainerLoginForm
+
+
+@pytest.mark.ignore_template_errors()
+@pytest.mark.django_db()
+def test_must_not_write_sessions_given_anonymous_visitors(
+    client: Client,
+    index_url: str,
+    flash_form_state: Callable[[Client, Context], None],
+    django_assert_num_queries,
+) -> None:
+    flash_form_state(
+        client,
+        {
+            'registration': None,
+            'login': {'cleaned_data': {}, 'errors': {'__all__': ['Error']}},
+        },
+    )
+
+    with django_assert_num_queries(0):
+        response = client.get(path=index_url)
+
+    assert settings.SESSION_COOKIE_NAME not in response.cookies
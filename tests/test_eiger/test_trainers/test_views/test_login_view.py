@@ -1,10 +1,13 @@
 from http import HTTPStatus
+from typing import Callable
 
 import pytest
 from django.contrib.auth.models import User
 from django.test import Client
 from django.urls import reverse
 
+from eiger.trainers.flash import Context
+
 
 @pytest.fixture()
 def login_url() -> str:
@@ -24,18 +27,23 @@ def test_must_return_method_not_allowed_for_requests_that_are_not_post(
 
 
 @pytest.mark.django_db()
-def test_must_add_context_to_session_given_invalid_user_credentials_and_redirect_to_index(
-    client: Client, login_url: str
+def test_must_flash_context_given_invalid_user_credentials_and_redirect_to_index(
+    client: Client,
+    login_url: str,
+    read_form_state: Callable[[Client], Context],
+    django_assert_max_num_queries,
 ) -> None:
-    response = client.post(
-        path=login_url, data={'username': 'random', 'password': 'random'}
-    )
+    # Only the user lookup, no session is written:
+    with django_assert_max_num_queries(1):
+        response = client.post(
+            path=login_url, data={'username': 'random', 'password': 'random'}
+        )
 
     assert response.status_code == HTTPStatus.FOUND
-    assert client.session['context'] == {
+    assert read_form_state(client) == {
         'registration': None,
         'login': {
-            'cleaned_data': {'username': 'random', 'password': 'random'},
+            'cleaned_data': {'username': 'random'},
             'errors': {
                 '__all__': [
                     'Please enter a correct username and password. Note that'
@@ -50,7 +58,9 @@ def test_must_add_context_to_session_given_invalid_user_credentials_and_redirect
 
 @pytest.mark.django_db()
 def test_must_authenticate_user_and_redirect_to_home_page_given_valid_form_data(
-    client: Client, login_url: str
+    client: Client,
+    login_url: str,
+    read_form_state: Callable[[Client], Context],
 ) -> None:
     raw_password = '123456'
     user: User = User.objects.create_user(
@@ -63,15 +73,17 @@ def test_must_authenticate_user_and_redirect_to_home_page_given_valid_form_data(
     )
 
     assert response.status_code == HTTPStatus.FOUND
-    assert client.session.get('context') is None
+    assert read_form_state(client) == {'registration': None, 'login': None}
     assert client.session.get('_auth_user_id') == str(user.id)
     assert response.wsgi_request.user == user
     assert response.url == reverse('home')  # type: ignore[attr-defined]
 
 
 @pytest.mark.django_db()
-def test_must_add_context_to_session_given_non_active_user_and_redirect_to_index(
-    client: Client, login_url: str
+def test_must_flash_context_given_non_active_user_and_redirect_to_index(
+    client: Client,
+    login_url: str,
+    read_form_state: Callable[[Client], Context],
 ) -> None:
     raw_password = '123456'
     user: User = User.objects.create_user(
@@ -83,13 +95,10 @@ def test_must_add_context_to_session_given_non_active_user_and_redirect_to_index
     )
 
     assert response.status_code == HTTPStatus.FOUND
-    assert client.session['context'] == {
+    assert read_form_state(client) == {
         'registration': None,
         'login': {
-            'cleaned_data': {
-                'username': user.username,
-                'password': raw_password,
-            },
+            'cleaned_data': {'username': user.username},
             'errors': {
                 '__all__': [
                     'Please enter a correct username and password. Note that'
@@ -1,11 +1,15 @@
 from http import HTTPStatus
+from typing import Callable
 from uuid import uuid4
 
 import pytest
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.test import Client
 from django.urls import reverse
 
+from eiger.trainers.flash import Context
+
 
 @pytest.fixture()
 def registration_url() -> str:
@@ -37,10 +41,7 @@ def test_must_return_method_not_allowed_for_requests_that_are_not_post(
             {
                 'login': None,
                 'registration': {
-                    'cleaned_data': {
-                        'password1': 'random',
-                        'username': 'random',
-                    },
+                    'cleaned_data': {'username': 'random'},
                     'errors': {
                         'password2': [
                             'The password is too similar to the username.',
@@ -80,10 +81,7 @@ def test_must_return_method_not_allowed_for_requests_that_are_not_post(
             {
                 'login': None,
                 'registration': {
-                    'cleaned_data': {
-                        'password1': 'random',
-                        'username': 'random',
-                    },
+                    'cleaned_data': {'username': 'random'},
                     'errors': {
                         'password2': ['The two password fields didn’t match.']
                     },
@@ -93,11 +91,12 @@ def test_must_return_method_not_allowed_for_requests_that_are_not_post(
     ],
 )
 @pytest.mark.django_db()
-def test_must_add_context_to_session_given_invalid_form_and_redirect_to_index(
+def test_must_flash_context_given_invalid_form_and_redirect_to_index(
     client: Client,
     registration_url: str,
     credentials: dict[str, str],
-    expected_context: dict[str, str | None],
+    expected_context: Context,
+    read_form_state: Callable[[Client], Context],
 ) -> None:
     response = client.post(
         path=registration_url,
@@ -105,7 +104,8 @@ def test_must_add_context_to_session_given_invalid_form_and_redirect_to_index(
     )
 
     assert response.status_code == HTTPStatus.FOUND
-    assert client.session['context'] == expected_context
+    assert read_form_state(client) == expected_context
+    assert settings.SESSION_COOKIE_NAME not in response.cookies
     assert response.url == reverse('index')  # type: ignore[attr-defined]
     assert client.session.get('_auth_user_id') is None
 
@@ -126,7 +126,6 @@ def test_must_register_user_and_redirect_to_home_page_given_valid_form_data(
     )
 
     assert response.status_code == HTTPStatus.FOUND
-    assert 'context' not in client.session
     assert response.url == reverse('home')  # type: ignore[attr-defined]
     user = User.objects.get()
     assert client.session.get('_auth_user_id') == str(user.id)
@@ -59,18 +59,37 @@ def test_must_redirect_to_index_given_non_authenticated_user(
 
 
 @pytest.mark.django_db
-def test_view_caching(
+def test_must_not_query_the_taxonomy_once_cached(
     authenticated_client: Client,
-    category: Category,
     exercise_types: list[ExerciseType],
     url: str,
+    django_assert_num_queries,
 ) -> None:
+    authenticated_client.get(url)
 
-    response = authenticated_client.get(url)
+    # Only the session and the authenticated user are retrieved:
+    with django_assert_num_queries(2):
+        response = authenticated_client.get(url)
 
-    assert response.get('Cache-Control') == f'max-age={60 * 60 * 24}'
-    assert response.has_header('Expires')
     assert response.json() == [
         {'id': exercise_type.id, 'name': exercise_type.name}
         for exercise_type in exercise_types
     ]
+
+
+@pytest.mark.django_db
+def test_must_return_exercise_types_created_after_caching(
+    authenticated_client: Client,
+    category: Category,
+    exercise_types: list[ExerciseType],
+    url: str,
+) -> None:
+    authenticated_client.get(url)
+    new_exercise_type = baker.make(ExerciseType, category=category)
+
+    response = authenticated_client.get(url)
+
+    assert response.json()[-1] == {
+        'id': new_exercise_type.id,
+        'name': new_exercise_type.name,
+    }
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+from model_bakery import baker
+
+from eiger.trainers.models import Exercise, ExerciseVariation
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    argnames='url_name',
+    argvalues=['retrieve_pending_exercises', 'retrieve_pending_variations'],
+)
+def test_must_redirect_to_index_given_non_authenticated_user(
+    client: Client, url_name: str
+) -> None:
+    url = reverse(url_name)
+
+    response = client.get(url)
+
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == f'/?next={url}'  # type: ignore[attr-defined]
+
+
+@pytest.mark.django_db()
+def test_must_return_pending_exercises_fragment_and_next_cursor(
+    authenticated_client: Client, trainer: User
+) -> None:
+    exercises = baker.make(Exercise, created_by=trainer, _quantity=3)
+    url = reverse('retrieve_pending_exercises')
+
+    with mock.patch('eiger.trainers.views.HOME_FEED_PAGE_SIZE', 2):
+        first_page = authenticated_client.get(url).json()
+        last_page = authenticated_client.get(
+            url, {'cursor': first_page['next_cursor']}
+        ).json()
+
+    assert first_page['html'].count('pending-exercises-card') == 2
+    assert exercises[0].name in first_page['html']
+    assert exercises[2].name not in first_page['html']
+    assert last_page['html'].count('pending-exercises-card') == 1
+    assert exercises[2].name in last_page['html']
+    assert last_page['next_cursor'] is None
+
+
+@pytest.mark.django_db()
+def test_must_return_pending_variations_fragment(
+    authenticated_client: Client, trainer: User
+) -> None:
+    variation = baker.make(ExerciseVariation, created_by=trainer)
+    baker.make(ExerciseVariation, created_by=trainer, reviewed=True)
+
+    response = authenticated_client.get(reverse('retrieve_pending_variations'))
+
+    assert response.status_code == HTTPStatus.OK
+    page = response.json()
+    assert page['html'].count('pending-variations-card') == 1
+    assert variation.exercise.name in page['html']
+    assert page['next_cursor'] is None
@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import Client
+from django.urls import reverse
+from model_bakery import baker
+
+from eiger.trainers.models import Exercise, ExerciseVariation
+
+
+@pytest.fixture()
+def url() -> str:
+    return reverse('retrieve_pending_summary')
+
+
+@pytest.mark.django_db()
+def test_must_return_the_user_pending_review_counter(
+    authenticated_client: Client, trainer: User, url: str
+) -> None:
+    baker.make(Exercise, created_by=trainer, _quantity=2)
+    variation = baker.make(ExerciseVariation, created_by=trainer)
+    baker.make(Exercise)
+
+    response = authenticated_client.get(url)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'pending_exercises': 2,
+        'pending_variations': 1,
+        'last_submitted_at': DjangoJSONEncoder().default(variation.created_at),
+    }
+
+
+@pytest.mark.django_db()
+def test_must_return_empty_counters_given_no_entries(
+    authenticated_client: Client, url: str
+) -> None:
+    response = authenticated_client.get(url)
+
+    assert response.json() == {
+        'pending_exercises': 0,
+        'pending_variations': 0,
+        'last_submitted_at': None,
+    }
+
+
+@pytest.mark.django_db()
+def test_navbar_must_show_the_pending_entries(
+    authenticated_client: Client, trainer: User
+) -> None:
+    baker.make(Exercise, created_by=trainer, _quantity=2)
+    baker.make(ExerciseVariation, created_by=trainer)
+
+    response = authenticated_client.get(reverse('home'))
+
+    assert 'title="2 exercises, 1 variations"' in response.content.decode()
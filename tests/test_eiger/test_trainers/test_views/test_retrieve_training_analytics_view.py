@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from eiger.trainers import analytics
+from eiger.trainers.models import TrainingLogEntry
+
+
+@pytest.fixture(autouse=True)
+def _cache() -> None:
+    cache.clear()
+
+
+@pytest.mark.django_db()
+def test_retrieve_training_analytics_view_must_return_the_own_analytics(
+    authenticated_client: Client, trainer: User
+) -> None:
+    baker.make(
+        TrainingLogEntry,
+        user=trainer,
+        performed_at=timezone.now(),
+        repetitions=5,
+        weight_in_kilos=10,
+        duration_seconds=40,
+    )
+    baker.make(TrainingLogEntry, performed_at=timezone.now())
+
+    response = authenticated_client.get(reverse('retrieve_training_analytics'))
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data['until'] == timezone.localdate().isoformat()
+    assert len(data['daily']) == analytics.WINDOW_DAYS
+    assert data['daily'][-1]['load'] == 40
+    assert [row['volume'] for row in data['weekly_volumes']] == [50]
+    assert len(data['max_hang_loads']) == 1
+
+
+@pytest.mark.django_db()
+def test_retrieve_training_analytics_view_must_require_a_login(
+    client: Client,
+) -> None:
+    response = client.get(reverse('retrieve_training_analytics'))
+
+    assert response.status_code == HTTPStatus.FOUND
@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from eiger.trainers.models import DailyTrainingRollup, WeeklyTrainingRollup
+
+
+@pytest.mark.django_db()
+def test_retrieve_training_progress_view_must_return_the_daily_rollups(
+    authenticated_client: Client, trainer: User
+) -> None:
+    today = timezone.localdate()
+    rollup = baker.make(
+        DailyTrainingRollup, user=trainer, period_start=today, sets=4
+    )
+    baker.make(
+        DailyTrainingRollup,
+        user=trainer,
+        period_start=today - timedelta(days=90),
+    )
+    baker.make(DailyTrainingRollup, period_start=today)
+
+    response = authenticated_client.get(reverse('retrieve_training_progress'))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'period': 'day',
+        'since': (today - timedelta(days=89)).isoformat(),
+        'until': (today + timedelta(days=1)).isoformat(),
+        'results': [
+            {
+                'period_start': today.isoformat(),
+                'category': rollup.category_id,
+                'sets': 4,
+                'repetitions': rollup.repetitions,
+                'volume': rollup.volume,
+                'time_under_tension_seconds': (
+                    rollup.time_under_tension_seconds
+                ),
+            }
+        ],
+    }
+
+
+@pytest.mark.django_db()
+def test_retrieve_training_progress_view_must_return_the_weekly_rollups(
+    authenticated_client: Client, trainer: User
+) -> None:
+    baker.make(
+        WeeklyTrainingRollup, user=trainer, period_start=date(2021, 3, 8)
+    )
+    baker.make(
+        WeeklyTrainingRollup, user=trainer, period_start=date(2021, 3, 15)
+    )
+
+    response = authenticated_client.get(
+        reverse('retrieve_training_progress'),
+        data={'period': 'week', 'since': '2021-03-01', 'until': '2021-03-15'},
+    )
+
+    assert [
+        result['period_start'] for result in response.json()['results']
+    ] == ['2021-03-08']
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize(
+    ('params', 'error'),
+    [
+        ({'period': 'month'}, 'Invalid period.'),
+        ({'since': '2021-03'}, 'Invalid since.'),
+        ({'until': 'today'}, 'Invalid until.'),
+        (
+            {'since': '2021-03-15', 'until': '2021-03-15'},
+            'The range must span up to 366 days.',
+        ),
+        (
+            {'period': 'week', 'since': '2000-01-01', 'until': '2021-03-15'},
+            'The range must span up to 366 weeks.',
+        ),
+    ],
+)
+def test_retrieve_training_progress_view_must_reject_invalid_parameters(
+    authenticated_client: Client, params: dict[str, str], error: str
+) -> None:
+    response = authenticated_client.get(
+        reverse('retrieve_training_progress'), data=params
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'error': error}
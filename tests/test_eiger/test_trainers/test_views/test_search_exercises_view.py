@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+from model_bakery import baker
+
+from eiger.trainers.models import Exercise
+
+
+@pytest.mark.django_db()
+def test_search_exercises_view_must_return_visible_ranked_exercises(
+    authenticated_client: Client, trainer: User
+) -> None:
+    reviewed = baker.make(
+        Exercise, name='Max hangs', description='Hangboard.', reviewed=True
+    )
+    own = baker.make(Exercise, name='Hangboard repeaters', created_by=trainer)
+    baker.make(Exercise, name='Hangboard pull ups', reviewed=False)
+
+    response = authenticated_client.get(
+        reverse('search_exercises'), data={'q': 'hangboard'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    results = response.json()['results']
+    assert [result['id'] for result in results] == [own.id, reviewed.id]
+    assert set(results[0]) == {
+        'id',
+        'name',
+        'description',
+        'exercise_type_id',
+        'reviewed',
+        'search_rank',
+    }
+
+
+@pytest.mark.django_db()
+def test_search_exercises_view_must_return_nothing_given_no_query(
+    authenticated_client: Client,
+) -> None:
+    response = authenticated_client.get(reverse('search_exercises'))
+
+    assert response.json() == {'results': []}
+
+
+@pytest.mark.django_db()
+def test_autocomplete_exercises_view_must_return_matching_names(
+    authenticated_client: Client,
+) -> None:
+    baker.make(Exercise, name='Campus ladders', reviewed=True)
+    baker.make(Exercise, name='Max hangs', reviewed=True)
+
+    response = authenticated_client.get(
+        reverse('autocomplete_exercises'), data={'q': 'camp'}
+    )
+
+    assert response.json() == {'results': ['Campus ladders']}
+
+
+@pytest.mark.django_db()
+def test_autocomplete_exercises_view_must_ignore_short_queries(
+    authenticated_client: Client,
+) -> None:
+    baker.make(Exercise, name='Campus ladders', reviewed=True)
+
+    response = authenticated_client.get(
+        reverse('autocomplete_exercises'), data={'q': 'c'}
+    )
+
+    assert response.json() == {'results': []}
+
+
+@pytest.mark.django_db()
+def test_search_views_must_require_authentication(client: Client) -> None:
+    response = client.get(reverse('search_exercises'), data={'q': 'max'})
+
+    assert response.status_code == HTTPStatus.FOUND
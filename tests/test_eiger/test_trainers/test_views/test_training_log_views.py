@@ -0,0 +1,129 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+from model_bakery import baker
+
+from eiger.trainers.models import ExerciseVariation, TrainingLogEntry
+
+
+@pytest.mark.django_db()
+def test_log_training_session_view_must_log_the_sets(
+    authenticated_client: Client, trainer: User
+) -> None:
+    variation = baker.make(ExerciseVariation, reviewed=True)
+
+    response = authenticated_client.post(
+        reverse('log_training_session'),
+        data={
+            'sets': [
+                {
+                    'exercise_variation': variation.id,
+                    'performed_at': '2021-03-14T18:30:00Z',
+                    'repetitions': 8,
+                    'weight_in_kilos': 10,
+                },
+            ]
+        },
+        content_type='application/json',
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    entry = TrainingLogEntry.objects.get()
+    assert entry.user == trainer
+    assert response.json() == {
+        'results': [
+            {
+                'id': entry.id,
+                'exercise_variation': variation.id,
+                'performed_at': '2021-03-14T18:30:00Z',
+                'repetitions': 8,
+                'weight_in_kilos': 10,
+                'duration_seconds': None,
+            }
+        ]
+    }
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize(
+    ('body', 'error'),
+    [
+        ('{"sets": ', 'Invalid JSON.'),
+        ('[]', 'The session must be an object.'),
+        ('{"sets": []}', 'A session must have at least one set.'),
+    ],
+)
+def test_log_training_session_view_must_reject_an_invalid_session(
+    authenticated_client: Client, body: str, error: str
+) -> None:
+    response = authenticated_client.post(
+        reverse('log_training_session'),
+        data=body,
+        content_type='application/json',
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'error': error}
+
+
+@pytest.mark.django_db()
+def test_retrieve_training_log_view_must_return_the_own_history(
+    authenticated_client: Client, trainer: User
+) -> None:
+    entry = baker.make(
+        TrainingLogEntry, user=trainer, performed_at='2021-03-14T18:30:00Z'
+    )
+    baker.make(TrainingLogEntry, performed_at='2021-03-14T18:30:00Z')
+    baker.make(
+        TrainingLogEntry, user=trainer, performed_at='2021-02-14T18:30:00Z'
+    )
+
+    response = authenticated_client.get(
+        reverse('retrieve_training_log'),
+        data={'since': '2021-03-01T00:00:00Z'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'results': [
+            {
+                'id': entry.id,
+                'exercise_variation': entry.exercise_variation_id,
+                'performed_at': '2021-03-14T18:30:00Z',
+                'repetitions': entry.repetitions,
+                'weight_in_kilos': entry.weight_in_kilos,
+                'duration_seconds': entry.duration_seconds,
+            }
+        ],
+        'next_cursor': None,
+    }
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize(
+    ('params', 'error'),
+    [
+        ({'since': 'last week'}, 'Invalid since.'),
+        ({'until': '2021-02-30'}, 'Invalid until.'),
+        ({'cursor': 'tampered'}, 'Invalid pagination cursor.'),
+    ],
+)
+def test_retrieve_training_log_view_must_reject_invalid_parameters(
+    authenticated_client: Client, params: dict[str, str], error: str
+) -> None:
+    response = authenticated_client.get(
+        reverse('retrieve_training_log'), data=params
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'error': error}
+
+
+@pytest.mark.django_db()
+def test_training_log_views_must_require_a_login(client: Client) -> None:
+    response = client.get(reverse('retrieve_training_log'))
+
+    assert response.status_code == HTTPStatus.FOUND